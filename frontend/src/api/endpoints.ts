@@ -136,6 +136,7 @@ export const endpoints = {
 
   // WebSocket
   ws: '/ws',
+  stream: (portfolio: string) => `${V2}/stream/${encodeURIComponent(portfolio)}`,
 } as const
 
 // Reports
@@ -162,4 +163,5 @@ export const explorerEndpoints = {
   table: (name: string) => `${EXPLORER}/tables/${name}`,
   query: `${EXPLORER}/query`,
   queryCsv: `${EXPLORER}/query/csv`,
+  queryNdjson: `${EXPLORER}/query/ndjson`,
 } as const
@@ -1679,3 +1679,16 @@ export interface WSMessage {
   payload: unknown
   timestamp: string
 }
+
+// Container stream frames (/api/v2/stream/{portfolio})
+export interface StreamCell {
+  grid: 'portfolio' | 'positions' | 'risk_factors' | 'trades'
+  rowId: string
+  column: string
+  value: unknown
+}
+
+export type StreamFrame =
+  | { type: 'snapshot'; bundle: string; seq: number; state: Record<string, unknown> }
+  | { type: 'diff'; bundle: string; seq: number; cells: StreamCell[]; sources: string[]; timestamp: string }
+  | { type: 'pong'; seq: number }
@@ -0,0 +1,102 @@
+import { useEffect, useRef, useState } from 'react'
+import { useQueryClient } from '@tanstack/react-query'
+import { endpoints } from '../api/endpoints'
+import type { StreamCell, StreamFrame } from '../api/types'
+
+// Query keys refreshed when a grid changes on the server
+const GRID_QUERIES: Record<StreamCell['grid'], string[][]> = {
+  portfolio: [['portfolios'], ['portfolio'], ['capital']],
+  positions: [['positions'], ['portfolioTrades'], ['riskFactors']],
+  trades: [['positions'], ['portfolioTrades'], ['position']],
+  risk_factors: [['riskFactors']],
+}
+
+let liveStreams = 0
+
+/** True while at least one bundle stream is connected — polling hooks back off. */
+export function isStreamLive(): boolean {
+  return liveStreams > 0
+}
+
+/** Poll interval for REST hooks: slow safety poll while the stream pushes changes. */
+export function pollInterval(ms: number): () => number {
+  return () => (isStreamLive() ? Math.max(ms, 120_000) : ms)
+}
+
+function streamUrl(portfolio: string, since: number | null): string {
+  const base = import.meta.env.VITE_API_URL || window.location.origin
+  const url = new URL(endpoints.stream(portfolio), base)
+  url.protocol = url.protocol === 'https:' ? 'wss:' : 'ws:'
+  if (since !== null) url.searchParams.set('since', String(since))
+  return url.toString()
+}
+
+/**
+ * Subscribe to cell-level diffs for one portfolio bundle.
+ *
+ * Applies the snapshot, then each diff in seq order; a gap triggers a
+ * resync. Affected REST queries are invalidated so cached views refetch
+ * only when something actually changed. Reconnects with ?since=<seq>.
+ */
+export function useBundleStream(portfolio?: string) {
+  const qc = useQueryClient()
+  const [connected, setConnected] = useState(false)
+  const [seq, setSeq] = useState<number | null>(null)
+  const seqRef = useRef<number | null>(null)
+
+  useEffect(() => {
+    if (!portfolio) return
+    let socket: WebSocket | null = null
+    let retry: ReturnType<typeof setTimeout> | undefined
+    let closed = false
+    let live = false
+
+    const setLive = (value: boolean) => {
+      if (value === live) return
+      live = value
+      liveStreams += value ? 1 : -1
+      setConnected(value)
+    }
+
+    const connect = () => {
+      socket = new WebSocket(streamUrl(portfolio, seqRef.current))
+      socket.onopen = () => setLive(true)
+      socket.onmessage = (msg) => {
+        const frame = JSON.parse(msg.data) as StreamFrame
+        if (frame.type === 'snapshot') {
+          seqRef.current = frame.seq
+          Object.values(GRID_QUERIES).flat().forEach((queryKey) => qc.invalidateQueries({ queryKey }))
+        } else if (frame.type === 'diff') {
+          const last = seqRef.current
+          if (last !== null && frame.seq <= last) return
+          if (last !== null && frame.seq !== last + 1) {
+            socket?.send(JSON.stringify({ type: 'resync', since: last }))
+            return
+          }
+          seqRef.current = frame.seq
+          const grids = new Set(frame.cells.map((c) => c.grid))
+          grids.forEach((grid) =>
+            (GRID_QUERIES[grid] ?? []).forEach((queryKey) => qc.invalidateQueries({ queryKey })),
+          )
+        } else {
+          return
+        }
+        setSeq(seqRef.current)
+      }
+      socket.onclose = () => {
+        setLive(false)
+        if (!closed) retry = setTimeout(connect, 3_000)
+      }
+    }
+
+    connect()
+    return () => {
+      closed = true
+      clearTimeout(retry)
+      setLive(false)
+      socket?.close()
+    }
+  }, [portfolio, qc])
+
+  return { connected, seq }
+}
@@ -1,6 +1,7 @@
 import { useQuery } from '@tanstack/react-query'
 import { api } from '../api/client'
 import { endpoints } from '../api/endpoints'
+import { pollInterval } from './useBundleStream'
 import type { CapitalUtilization } from '../api/types'
 
 export function useCapitalData() {
@@ -10,6 +11,6 @@ export function useCapitalData() {
       const { data } = await api.get(endpoints.capital)
       return Array.isArray(data) ? data : data?.portfolios ?? []
     },
-    refetchInterval: 15_000,
+    refetchInterval: pollInterval(15_000),
   })
 }
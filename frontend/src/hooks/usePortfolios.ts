@@ -1,6 +1,7 @@
 import { useQuery } from '@tanstack/react-query'
 import { api } from '../api/client'
 import { endpoints } from '../api/endpoints'
+import { pollInterval } from './useBundleStream'
 import type { Portfolio } from '../api/types'
 
 export function usePortfolios() {
@@ -10,7 +11,7 @@ export function usePortfolios() {
       const { data } = await api.get(endpoints.portfolios, { timeout: 30_000 })
       return data
     },
-    refetchInterval: 15_000,
+    refetchInterval: pollInterval(15_000),
     retry: 2,
     retryDelay: 3_000,
   })
@@ -24,6 +25,6 @@ export function usePortfolio(name: string) {
       return data
     },
     enabled: !!name,
-    refetchInterval: 15_000,
+    refetchInterval: pollInterval(15_000),
   })
 }
@@ -1,6 +1,7 @@
 import { useQuery } from '@tanstack/react-query'
 import { api } from '../api/client'
 import { endpoints } from '../api/endpoints'
+import { pollInterval } from './useBundleStream'
 import type { Trade } from '../api/types'
 
 export function usePositions(portfolioName?: string) {
@@ -12,7 +13,7 @@ export function usePositions(portfolioName?: string) {
       const { data } = await api.get(endpoints.positions, { params })
       return data
     },
-    refetchInterval: 15_000,
+    refetchInterval: pollInterval(15_000),
   })
 }
 
@@ -24,7 +25,7 @@ export function usePosition(tradeId: string) {
       return data
     },
     enabled: !!tradeId,
-    refetchInterval: 15_000,
+    refetchInterval: pollInterval(15_000),
   })
 }
 
@@ -36,6 +37,6 @@ export function usePortfolioTrades(portfolioName: string) {
       return data
     },
     enabled: !!portfolioName,
-    refetchInterval: 15_000,
+    refetchInterval: pollInterval(15_000),
   })
 }
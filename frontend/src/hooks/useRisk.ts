@@ -1,6 +1,7 @@
 import { useQuery } from '@tanstack/react-query'
 import { api } from '../api/client'
 import { endpoints } from '../api/endpoints'
+import { pollInterval } from './useBundleStream'
 import type { RiskFactor, BrokerPosition } from '../api/types'
 
 export function useRiskFactors(portfolio?: string) {
@@ -12,7 +13,7 @@ export function useRiskFactors(portfolio?: string) {
       const { data } = await api.get(endpoints.riskFactors, { params })
       return data.factors ?? []
     },
-    refetchInterval: 15_000,
+    refetchInterval: pollInterval(15_000),
   })
 }
 
@@ -25,6 +26,6 @@ export function useBrokerPositions(portfolio?: string) {
       const { data } = await api.get(endpoints.brokerPositions, { params })
       return data.positions ?? []
     },
-    refetchInterval: 15_000,
+    refetchInterval: pollInterval(15_000),
   })
 }
@@ -13,6 +13,7 @@ import { useRiskFactors } from '../hooks/useRisk'
 import { useLiveOrders } from '../hooks/useLiveOrders'
 import { usePerformanceMetrics, useWeeklyPnL, useStrategyBreakdown, useSourceAttribution } from '../hooks/usePerformance'
 import { useCapitalData } from '../hooks/useCapital'
+import { useBundleStream } from '../hooks/useBundleStream'
 import { PortfolioGrid } from '../components/grids/PortfolioGrid'
 import { BrokerPositionGrid } from '../components/grids/BrokerPositionGrid'
 import { PnLDisplay } from '../components/common/PnLDisplay'
@@ -771,6 +772,7 @@ export function PortfolioPage() {
   )
   const { data: riskFactors } = useRiskFactors(selectedPortfolio || undefined)
   const { data: liveOrders } = useLiveOrders()
+  useBundleStream(selectedPortfolio || undefined)
 
   const filteredPortfolios = useMemo(() => {
     if (!portfolios) return []
@@ -0,0 +1,464 @@
+"""
+DXLink Stream Manager — One long-lived DXLink connection with a last-value cache.
+
+The one-shot fetch path in TastytradeAdapter opens a fresh DXLinkStreamer per
+call, waits for events, then tears it down. This module keeps a single
+streamer open on a background event loop instead:
+
+    - Subscriptions are reference-counted per (kind, symbol). A symbol is
+      subscribed on the first acquire and unsubscribed when the last holder
+      releases it.
+    - Every Quote / Greeks event is written into LiveMarketCache. Readers get
+      a synchronous dict lookup; they only block (briefly) for symbols that
+      have never been seen on the current connection.
+    - On disconnect the manager reconnects with backoff and re-subscribes
+      everything still referenced. Values from the previous connection are
+      treated as stale until the new snapshot arrives.
+    - Listeners registered with add_listener() see every event as it lands
+      in the cache (on the stream thread), for consumers that react to
+      ticks instead of polling.
+
+Usage:
+    manager = DXLinkStreamManager(adapter.data_session)
+    manager.start()
+    quotes = manager.get_quotes(['SPY', '.SPY260320P550'])   # {sym: {bid, ask}}
+    greeks = manager.get_greeks(['.SPY260320P550'])          # {sym: dm.Greeks}
+    manager.add_listener(lambda sym, quote: ..., QUOTE)       # push, per tick
+    manager.stop()
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import logging
+import threading
+import time
+
+import trading_cotrader.core.models.domain as dm
+
+logger = logging.getLogger(__name__)
+
+QUOTE = 'quote'
+GREEKS = 'greeks'
+KINDS = (QUOTE, GREEKS)
+
+
+def greeks_from_event(event) -> dm.Greeks:
+    """Convert a DXLink Greeks event to per-contract domain Greeks."""
+    return dm.Greeks(
+        delta=Decimal(str(event.delta or 0)),
+        gamma=Decimal(str(event.gamma or 0)),
+        theta=Decimal(str(event.theta or 0)),
+        vega=Decimal(str(event.vega or 0)),
+        rho=Decimal(str(event.rho or 0)),
+        timestamp=datetime.utcnow(),
+    )
+
+
+def quote_from_event(event) -> Dict[str, float]:
+    """Convert a DXLink Quote event to the {bid, ask} dict used across services."""
+    return {
+        'bid': float(event.bid_price or 0),
+        'ask': float(event.ask_price or 0),
+    }
+
+
+@dataclass
+class CachedValue:
+    """Last value seen for one (kind, symbol), stamped with receipt time."""
+    value: Any
+    received_at: float  # time.monotonic()
+    generation: int     # connection generation the value arrived on
+
+
+class LiveMarketCache:
+    """
+    Thread-safe last-value cache for streamed quotes and Greeks.
+
+    Freshness has two bounds:
+        - generation: values from an earlier connection are stale
+        - max_age: optional caller bound in seconds since receipt
+    """
+
+    def __init__(self):
+        self._values: Dict[Tuple[str, str], CachedValue] = {}
+        self._cond = threading.Condition()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def new_generation(self) -> int:
+        """Start a new connection generation (called on every (re)connect)."""
+        with self._cond:
+            self._generation += 1
+            return self._generation
+
+    def put(self, kind: str, symbol: str, value: Any) -> None:
+        with self._cond:
+            self._values[(kind, symbol)] = CachedValue(
+                value=value, received_at=time.monotonic(), generation=self._generation,
+            )
+            self._cond.notify_all()
+
+    def evict(self, kind: str, symbols: Iterable[str]) -> None:
+        with self._cond:
+            for symbol in symbols:
+                self._values.pop((kind, symbol), None)
+
+    def clear(self) -> None:
+        with self._cond:
+            self._values.clear()
+
+    def _fresh(self, kind: str, symbols: Iterable[str], max_age: Optional[float]) -> Dict[str, Any]:
+        """Collect fresh values. Caller must hold the lock."""
+        now = time.monotonic()
+        result = {}
+        for symbol in symbols:
+            cached = self._values.get((kind, symbol))
+            if cached is None or cached.generation != self._generation:
+                continue
+            if max_age is not None and now - cached.received_at > max_age:
+                continue
+            result[symbol] = cached.value
+        return result
+
+    def get(self, kind: str, symbols: Iterable[str], max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Return fresh values for the requested symbols without blocking."""
+        with self._cond:
+            return self._fresh(kind, symbols, max_age)
+
+    def wait_for(
+        self,
+        kind: str,
+        symbols: List[str],
+        max_age: Optional[float] = None,
+        timeout: float = 0.0,
+    ) -> Dict[str, Any]:
+        """
+        Return fresh values, waiting up to `timeout` seconds for missing ones.
+
+        Returns immediately when every symbol is already cached — the common
+        case once a symbol has been subscribed for one cycle.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            result = self._fresh(kind, symbols, max_age)
+            while len(result) < len(set(symbols)):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+                result = self._fresh(kind, symbols, max_age)
+            return result
+
+
+class DXLinkStreamManager:
+    """
+    Long-lived DXLink connection with ref-counted subscriptions.
+
+    Runs its own asyncio loop on a daemon thread so sync callers (engine,
+    services) and async callers (FastAPI) can both read the cache without
+    touching the streamer.
+
+    Two ways to hold a subscription:
+        - acquire()/release(): explicit ref-counting for long-lived holders
+        - get_quotes()/get_greeks(): implicit hold, released after `idle_ttl`
+          seconds without a read so ad-hoc lookups do not leak subscriptions
+    """
+
+    def __init__(
+        self,
+        session,
+        max_age: Optional[float] = None,
+        first_event_timeout: float = 3.0,
+        idle_ttl: float = 3600.0,
+        streamer_factory: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.session = session
+        self.max_age = max_age
+        self.first_event_timeout = first_event_timeout
+        self.idle_ttl = idle_ttl
+        self.cache = LiveMarketCache()
+
+        if streamer_factory is None:
+            from tastytrade.streamer import DXLinkStreamer
+            streamer_factory = DXLinkStreamer
+        self._streamer_factory = streamer_factory
+
+        from tastytrade.dxfeed import Quote as DXQuote, Greeks as DXGreeks
+        self._event_classes = {QUOTE: DXQuote, GREEKS: DXGreeks}
+        self._converters = {QUOTE: quote_from_event, GREEKS: greeks_from_event}
+
+        self._lock = threading.Lock()
+        self._refs: Dict[Tuple[str, str], int] = {}
+        self._implicit: Dict[Tuple[str, str], float] = {}  # key -> last read (monotonic)
+        # kind -> listeners, replaced (not mutated) so the pump can iterate without the lock
+        self._listeners: Dict[str, Tuple[Callable[[str, Any], None], ...]] = {k: () for k in KINDS}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._streamer = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._connected = threading.Event()
+
+    # -----------------------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------------------
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected.is_set()
+
+    def start(self, wait: float = 10.0) -> bool:
+        """Start the background loop. Returns True once connected (or False on timeout)."""
+        if self.is_running:
+            return self.is_connected
+
+        ready = threading.Event()
+
+        def _thread_main():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._stop_event = asyncio.Event()
+            ready.set()
+            try:
+                self._loop.run_until_complete(self._run())
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=_thread_main, name='dxlink-stream', daemon=True)
+        self._thread.start()
+        ready.wait()
+        connected = self._connected.wait(wait)
+        if connected:
+            logger.info("DXLink stream connected")
+        else:
+            logger.warning(f"DXLink stream not connected after {wait}s — will keep retrying")
+        return connected
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Close the streamer and join the background thread."""
+        if not self.is_running:
+            return
+        self._loop.call_soon_threadsafe(self._stop_event.set)
+        self._thread.join(timeout)
+        self._thread = None
+        self._connected.clear()
+        self.cache.clear()
+        logger.info("DXLink stream stopped")
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            try:
+                async with self._streamer_factory(self.session) as streamer:
+                    self._streamer = streamer
+                    self.cache.new_generation()
+                    await self._resubscribe_all()
+                    self._connected.set()
+                    backoff = 1.0
+                    await self._pump_until_stopped(streamer)
+            except Exception as e:
+                logger.warning(f"DXLink stream error: {e}")
+            finally:
+                self._streamer = None
+                self._connected.clear()
+
+            if self._stop_event.is_set():
+                break
+            logger.info(f"DXLink stream reconnecting in {backoff:.0f}s")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, 30.0)
+
+    async def _pump_until_stopped(self, streamer) -> None:
+        """Drain events into the cache until stop is requested or a pump dies."""
+        tasks = [
+            asyncio.create_task(self._pump(streamer, kind)) for kind in KINDS
+        ]
+        tasks.append(asyncio.create_task(self._sweep_idle()))
+        stopper = asyncio.create_task(self._stop_event.wait())
+        try:
+            done, _ = await asyncio.wait(tasks + [stopper], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is not stopper and task.exception():
+                    raise task.exception()
+        finally:
+            for task in tasks + [stopper]:
+                task.cancel()
+            await asyncio.gather(*tasks, stopper, return_exceptions=True)
+
+    async def _pump(self, streamer, kind: str) -> None:
+        convert = self._converters[kind]
+        async for event in streamer.listen(self._event_classes[kind]):
+            try:
+                value = convert(event)
+                self.cache.put(kind, event.event_symbol, value)
+            except Exception as e:
+                logger.debug(f"Dropped {kind} event: {e}")
+                continue
+            for listener in self._listeners[kind]:
+                try:
+                    listener(event.event_symbol, value)
+                except Exception as e:
+                    logger.warning(f"DXLink {kind} listener failed on {event.event_symbol}: {e}")
+
+    async def _sweep_idle(self, interval: float = 60.0) -> None:
+        """Release implicit holds that nobody has read for `idle_ttl` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            cutoff = time.monotonic() - self.idle_ttl
+            with self._lock:
+                idle = [key for key, last in self._implicit.items() if last < cutoff]
+                for key in idle:
+                    del self._implicit[key]
+            for kind in KINDS:
+                symbols = [s for k, s in idle if k == kind]
+                if symbols:
+                    self.release(symbols, kind)
+
+    # -----------------------------------------------------------------
+    # Listeners
+    # -----------------------------------------------------------------
+
+    def add_listener(self, callback: Callable[[str, Any], None], kind: str = QUOTE) -> None:
+        """
+        Call callback(symbol, value) for every `kind` event, right after it
+        is cached. Runs on the stream thread — keep it short and non-blocking.
+        """
+        with self._lock:
+            if callback not in self._listeners[kind]:
+                self._listeners[kind] = self._listeners[kind] + (callback,)
+
+    def remove_listener(self, callback: Callable[[str, Any], None], kind: str = QUOTE) -> None:
+        with self._lock:
+            self._listeners[kind] = tuple(cb for cb in self._listeners[kind] if cb != callback)
+
+    # -----------------------------------------------------------------
+    # Subscriptions
+    # -----------------------------------------------------------------
+
+    def subscribed(self, kind: str) -> List[str]:
+        with self._lock:
+            return [s for k, s in self._refs if k == kind]
+
+    def refcount(self, symbol: str, kind: str = QUOTE) -> int:
+        with self._lock:
+            return self._refs.get((kind, symbol), 0)
+
+    def acquire(self, symbols: Iterable[str], kind: str = QUOTE) -> None:
+        """Add one reference per symbol; subscribe symbols going 0 → 1."""
+        added = []
+        with self._lock:
+            for symbol in set(symbols):
+                key = (kind, symbol)
+                if key not in self._refs:
+                    added.append(symbol)
+                self._refs[key] = self._refs.get(key, 0) + 1
+        if added:
+            self._submit(self._subscribe(kind, added))
+
+    def release(self, symbols: Iterable[str], kind: str = QUOTE) -> None:
+        """Drop one reference per symbol; unsubscribe symbols going 1 → 0."""
+        removed = []
+        with self._lock:
+            for symbol in set(symbols):
+                key = (kind, symbol)
+                count = self._refs.get(key, 0)
+                if count <= 1:
+                    if self._refs.pop(key, None) is not None:
+                        removed.append(symbol)
+                else:
+                    self._refs[key] = count - 1
+        if removed:
+            self.cache.evict(kind, removed)
+            self._submit(self._unsubscribe(kind, removed))
+
+    def _hold(self, symbols: List[str], kind: str) -> None:
+        """Take (or refresh) the implicit hold used by ad-hoc readers."""
+        now = time.monotonic()
+        new = []
+        with self._lock:
+            for symbol in set(symbols):
+                key = (kind, symbol)
+                if key not in self._implicit:
+                    new.append(symbol)
+                self._implicit[key] = now
+        if new:
+            self.acquire(new, kind)
+
+    def _submit(self, coro) -> None:
+        """Schedule a coroutine on the stream loop (no-op while disconnected)."""
+        if self._loop is None or self._loop.is_closed() or self._streamer is None:
+            coro.close()  # resubscribe on connect picks up current refs
+            return
+        asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _subscribe(self, kind: str, symbols: List[str]) -> None:
+        streamer = self._streamer
+        if streamer is None:
+            return
+        try:
+            await streamer.subscribe(self._event_classes[kind], symbols)
+            logger.debug(f"DXLink subscribed {kind}: {len(symbols)} symbols")
+        except Exception as e:
+            logger.warning(f"DXLink subscribe {kind} failed: {e}")
+
+    async def _unsubscribe(self, kind: str, symbols: List[str]) -> None:
+        streamer = self._streamer
+        if streamer is None:
+            return
+        try:
+            await streamer.unsubscribe(self._event_classes[kind], symbols)
+            logger.debug(f"DXLink unsubscribed {kind}: {len(symbols)} symbols")
+        except Exception as e:
+            logger.warning(f"DXLink unsubscribe {kind} failed: {e}")
+
+    async def _resubscribe_all(self) -> None:
+        for kind in KINDS:
+            symbols = self.subscribed(kind)
+            if symbols:
+                await self._subscribe(kind, symbols)
+
+    # -----------------------------------------------------------------
+    # Reads
+    # -----------------------------------------------------------------
+
+    def get_quotes(
+        self,
+        symbols: List[str],
+        max_age: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Dict]:
+        """Return {symbol: {bid, ask}} from the cache, subscribing unseen symbols."""
+        return self._read(QUOTE, symbols, max_age, timeout)
+
+    def get_greeks(
+        self,
+        symbols: List[str],
+        max_age: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, dm.Greeks]:
+        """Return {symbol: per-contract Greeks} from the cache, subscribing unseen symbols."""
+        return self._read(GREEKS, symbols, max_age, timeout)
+
+    def _read(self, kind: str, symbols: List[str], max_age: Optional[float], timeout: Optional[float]) -> Dict:
+        if not symbols:
+            return {}
+        self._hold(symbols, kind)
+        return self.cache.wait_for(
+            kind,
+            symbols,
+            max_age=self.max_age if max_age is None else max_age,
+            timeout=self.first_event_timeout if timeout is None else timeout,
+        )
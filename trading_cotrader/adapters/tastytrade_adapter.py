@@ -27,7 +27,11 @@ import os
 import re
 
 from trading_cotrader.adapters.base import BrokerAdapterBase
+from trading_cotrader.adapters.dxlink_stream import (
+    DXLinkStreamManager, greeks_from_event, quote_from_event,
+)
 import trading_cotrader.core.models.domain as dm
+from trading_cotrader.core.models.option_key import OptionKey
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +54,7 @@ class TastytradeAdapter(BrokerAdapterBase):
         self.account = None
         self.accounts = {}
         self._account_number = account_number
+        self._stream: Optional[DXLinkStreamManager] = None  # Persistent DXLink (start_streaming)
 
         # Load credentials — env vars only, no YAML files
         self._load_credentials()
@@ -231,14 +236,7 @@ class TastytradeAdapter(BrokerAdapterBase):
                         event_symbol = greeks_event.event_symbol
 
                         if event_symbol in symbols_needed:
-                            greeks_map[event_symbol] = dm.Greeks(
-                                delta=Decimal(str(greeks_event.delta or 0)),
-                                gamma=Decimal(str(greeks_event.gamma or 0)),
-                                theta=Decimal(str(greeks_event.theta or 0)),
-                                vega=Decimal(str(greeks_event.vega or 0)),
-                                rho=Decimal(str(greeks_event.rho or 0)),
-                                timestamp=datetime.utcnow()
-                            )
+                            greeks_map[event_symbol] = greeks_from_event(greeks_event)
                             symbols_needed.remove(event_symbol)
                             logger.info(f"✓ Got Greeks for {event_symbol}: Δ={greeks_event.delta:.4f}")
 
@@ -410,7 +408,7 @@ class TastytradeAdapter(BrokerAdapterBase):
             # Fetch Greeks for all options via DXLink
             if streamer_symbols:
                 logger.info(f"Fetching Greeks for {len(streamer_symbols)} option positions via DXLink...")
-                greeks_map = self._run_async(self._fetch_greeks_via_dxlink(streamer_symbols))
+                greeks_map = self.get_greeks(streamer_symbols)
                 logger.info(f"✓ Fetched Greeks for {len(greeks_map)} options")
                 # Attach Greeks to positions
                 for streamer_symbol, greeks in greeks_map.items():
@@ -462,20 +460,7 @@ class TastytradeAdapter(BrokerAdapterBase):
         Format: .{TICKER}{YYMMDD}{C/P}{STRIKE}
         """
         try:
-            # Clean up ticker (remove spaces)
-            ticker = occ_symbol[:6].strip()
-            exp_date = occ_symbol[6:12]  # YYMMDD
-            option_type = occ_symbol[12]  # C or P
-            strike_str = occ_symbol[13:21]  # 00263000
-
-            # Convert strike: 00263000 -> 263
-            strike_int = int(strike_str) // 1000
-
-            # Build streamer symbol
-            streamer_symbol = f".{ticker}{exp_date}{option_type}{strike_int}"
-
-            return streamer_symbol
-
+            return OptionKey.from_occ(occ_symbol).streamer_symbol
         except Exception as e:
             logger.error(f"Error converting OCC to streamer symbol: {occ_symbol} - {e}")
             return None
@@ -525,27 +510,7 @@ class TastytradeAdapter(BrokerAdapterBase):
     def _parse_occ_symbol(self, symbol_str: str) -> dm.Symbol:
         """Parse OCC format option symbol"""
         try:
-            if len(symbol_str) < 21:
-                raise ValueError(f"Invalid OCC symbol length: {symbol_str}")
-
-            ticker = symbol_str[:6].strip()
-            exp_str = symbol_str[6:12]
-            opt_type_char = symbol_str[12]
-            strike_str = symbol_str[13:21]
-
-            expiration = datetime.strptime(exp_str, "%y%m%d")
-            option_type = dm.OptionType.CALL if opt_type_char == 'C' else dm.OptionType.PUT
-            strike = Decimal(strike_str) / 1000
-
-            return dm.Symbol(
-                ticker=ticker,
-                asset_type=dm.AssetType.OPTION,
-                option_type=option_type,
-                strike=strike,
-                expiration=expiration,
-                multiplier=100
-            )
-
+            return OptionKey.from_occ(symbol_str).to_symbol()
         except Exception as e:
             logger.error(f"Failed to parse OCC symbol {symbol_str}: {e}")
             ticker = symbol_str[:6].strip() if len(symbol_str) >= 6 else symbol_str
@@ -579,7 +544,12 @@ class TastytradeAdapter(BrokerAdapterBase):
         """
         Fetch bid/ask quotes for symbols via DXLink streaming.
         Returns dict of {symbol: {bid, ask}}.
+
+        Reads the persistent stream cache when streaming is on; otherwise
+        opens a one-shot DXLink connection.
         """
+        if self.is_streaming:
+            return self._stream.get_quotes(symbols)
         return self._run_async(self._fetch_quotes_via_dxlink(symbols))
 
     async def _fetch_quotes_via_dxlink(self, symbols: List[str]) -> Dict[str, Dict]:
@@ -604,10 +574,7 @@ class TastytradeAdapter(BrokerAdapterBase):
                             streamer.get_event(DXQuote), timeout=0.5
                         )
                         if event:
-                            quotes[event.event_symbol] = {
-                                'bid': float(event.bid_price or 0),
-                                'ask': float(event.ask_price or 0),
-                            }
+                            quotes[event.event_symbol] = quote_from_event(event)
                             if len(quotes) >= len(symbols):
                                 break
                     except asyncio.TimeoutError:
@@ -619,9 +586,62 @@ class TastytradeAdapter(BrokerAdapterBase):
         return quotes
 
     def get_greeks(self, symbols: List[str]) -> Dict[str, dm.Greeks]:
-        """Fetch Greeks for multiple symbols via DXLink streaming."""
+        """Fetch Greeks for multiple symbols via DXLink streaming (cache-first)."""
+        if self.is_streaming:
+            return self._stream.get_greeks(symbols)
         return self._run_async(self._fetch_greeks_via_dxlink(symbols))
 
+    # -----------------------------------------------------------------
+    # Persistent DXLink streaming
+    # -----------------------------------------------------------------
+
+    @property
+    def is_streaming(self) -> bool:
+        return self._stream is not None and self._stream.is_running
+
+    def start_streaming(
+        self,
+        max_age: Optional[float] = None,
+        first_event_timeout: float = 3.0,
+    ) -> bool:
+        """
+        Open one long-lived DXLink connection and serve get_quotes/get_greeks
+        from its last-value cache.
+
+        Args:
+            max_age: Optional staleness bound in seconds for cached values.
+                None = any value received on the current connection.
+            first_event_timeout: How long a read waits for a symbol that has
+                never been seen (first subscription only).
+
+        Returns:
+            True if connected. The manager keeps retrying in the background
+            either way; reads fall back to one-shot fetches only when
+            streaming has not been started.
+        """
+        if not self.data_session:
+            raise ValueError("Not authenticated — call authenticate() first")
+        if self.is_streaming:
+            return self._stream.is_connected
+
+        self._stream = DXLinkStreamManager(
+            self.data_session,
+            max_age=max_age,
+            first_event_timeout=first_event_timeout,
+        )
+        return self._stream.start()
+
+    def stop_streaming(self) -> None:
+        """Close the persistent DXLink connection."""
+        if self._stream:
+            self._stream.stop()
+            self._stream = None
+
+    @property
+    def stream(self) -> Optional[DXLinkStreamManager]:
+        """Persistent stream manager (for explicit acquire/release), or None."""
+        return self._stream
+
     def get_public_watchlists(self, name: Optional[str] = None) -> Any:
         """Get TastyTrade public watchlists.
         If name is None, returns list of watchlist names.
@@ -54,10 +54,12 @@ class AtlasAgent(BaseAgent):
         "monitoring", "reporting", "eod_evaluation",
     ]
 
-    def __init__(self, container=None, config=None, broker=None, ma=None):
+    def __init__(self, container=None, config=None, broker=None, ma=None,
+                 container_manager=None):
         super().__init__(container=container, config=config)
         self._broker = broker
         self._ma = ma
+        self._container_manager = container_manager
 
     def run(self, context: dict) -> AgentResult:
         """Run all health checks and analytics. Returns findings."""
@@ -407,7 +409,15 @@ class AtlasAgent(BaseAgent):
     # B14: Cross-desk risk aggregation
     # -----------------------------------------------------------------
     def _compute_cross_desk_risk(self) -> dict:
-        """Compute aggregate risk across ALL desks."""
+        """Compute aggregate risk across ALL desks.
+
+        One GROUP BY over desks and their open trades, or the loaded trade
+        containers when every desk is covered by a bundle.
+        """
+        from trading_cotrader.repositories.desk_aggregates import (
+            DeskAggregateRepository, risk_from_containers,
+        )
+
         result = {
             'total_delta': 0, 'total_gamma': 0, 'total_theta': 0, 'total_vega': 0,
             'total_positions': 0, 'total_risk': 0, 'desks': {},
@@ -415,37 +425,29 @@ class AtlasAgent(BaseAgent):
         }
 
         with session_scope() as session:
-            desks = session.query(PortfolioORM).filter(
-                PortfolioORM.portfolio_type == 'what_if'
-            ).all()
-
-            for desk in desks:
-                trades = session.query(TradeORM).filter(
-                    TradeORM.portfolio_id == desk.id,
-                    TradeORM.is_open == True,
-                ).all()
-
-                desk_delta = sum(float(t.current_delta or 0) for t in trades)
-                desk_theta = sum(float(t.current_theta or 0) for t in trades)
-                desk_gamma = sum(float(t.current_gamma or 0) for t in trades)
-                desk_vega = sum(float(t.current_vega or 0) for t in trades)
-                desk_risk = sum(float(t.max_risk or 0) for t in trades)
-
-                result['desks'][desk.name] = {
-                    'delta': round(desk_delta, 2),
-                    'theta': round(desk_theta, 2),
-                    'gamma': round(desk_gamma, 4),
-                    'vega': round(desk_vega, 2),
-                    'positions': len(trades),
-                    'risk': round(desk_risk, 0),
-                }
-
-                result['total_delta'] += desk_delta
-                result['total_gamma'] += desk_gamma
-                result['total_theta'] += desk_theta
-                result['total_vega'] += desk_vega
-                result['total_positions'] += len(trades)
-                result['total_risk'] += desk_risk
+            repo = DeskAggregateRepository(session)
+            desk_totals = None
+            if self._container_manager is not None:
+                desk_totals = risk_from_containers(self._container_manager, repo.desks())
+            if desk_totals is None:
+                desk_totals = repo.risk_by_desk()
+
+        for desk in desk_totals:
+            result['desks'][desk.name] = {
+                'delta': round(desk.delta, 2),
+                'theta': round(desk.theta, 2),
+                'gamma': round(desk.gamma, 4),
+                'vega': round(desk.vega, 2),
+                'positions': desk.positions,
+                'risk': round(desk.risk, 0),
+            }
+
+            result['total_delta'] += desk.delta
+            result['total_gamma'] += desk.gamma
+            result['total_theta'] += desk.theta
+            result['total_vega'] += desk.vega
+            result['total_positions'] += desk.positions
+            result['total_risk'] += desk.risk
 
         result['total_delta'] = round(result['total_delta'], 2)
         result['total_theta'] = round(result['total_theta'], 2)
@@ -467,7 +469,9 @@ class AtlasAgent(BaseAgent):
     # K7: Greek P&L attribution
     # -----------------------------------------------------------------
     def _compute_greek_attribution(self) -> dict:
-        """Compute P&L attribution by Greek across all desks."""
+        """Compute P&L attribution by Greek across all desks (one GROUP BY)."""
+        from trading_cotrader.repositories.desk_aggregates import DeskAggregateRepository
+
         result = {
             'delta_pnl': 0, 'theta_pnl': 0, 'gamma_pnl': 0, 'vega_pnl': 0,
             'unexplained_pnl': 0, 'total_pnl': 0,
@@ -476,27 +480,14 @@ class AtlasAgent(BaseAgent):
         }
 
         with session_scope() as session:
-            desks = session.query(PortfolioORM).filter(
-                PortfolioORM.portfolio_type == 'what_if'
-            ).all()
-
-            for desk in desks:
-                trades = session.query(TradeORM).filter(
-                    TradeORM.portfolio_id == desk.id,
-                ).all()
-
-                desk_attr = {
-                    'delta_pnl': sum(float(t.delta_pnl or 0) for t in trades),
-                    'theta_pnl': sum(float(t.theta_pnl or 0) for t in trades),
-                    'gamma_pnl': sum(float(t.gamma_pnl or 0) for t in trades),
-                    'vega_pnl': sum(float(t.vega_pnl or 0) for t in trades),
-                    'unexplained_pnl': sum(float(t.unexplained_pnl or 0) for t in trades),
-                    'total_pnl': sum(float(t.total_pnl or 0) for t in trades),
-                }
-                result['by_desk'][desk.name] = desk_attr
-
-                for key in ['delta_pnl', 'theta_pnl', 'gamma_pnl', 'vega_pnl', 'unexplained_pnl', 'total_pnl']:
-                    result[key] += desk_attr[key]
+            desk_totals = DeskAggregateRepository(session).attribution_by_desk()
+
+        keys = ['delta_pnl', 'theta_pnl', 'gamma_pnl', 'vega_pnl', 'unexplained_pnl', 'total_pnl']
+        for desk in desk_totals:
+            desk_attr = {key: getattr(desk, key) for key in keys}
+            result['by_desk'][desk.name] = desk_attr
+            for key in keys:
+                result[key] += desk_attr[key]
 
         for key in result:
             if isinstance(result[key], float):
@@ -15,16 +15,39 @@ market_analyzer. Maverick enforces portfolio-level and risk-level gates:
 """
 
 import logging
-from datetime import date, datetime
+from datetime import datetime
 from decimal import Decimal
 from typing import Any, ClassVar, Dict, List, Optional
 
 from trading_cotrader.agents.base import BaseAgent
 from trading_cotrader.agents.protocol import AgentResult, AgentStatus
+from trading_cotrader.core.models.option_key import OptionKey
 
 logger = logging.getLogger(__name__)
 
 
+def _spec_leg_key(ticker: str, leg: Dict[str, Any]) -> Optional[OptionKey]:
+    """Interned OptionKey for a TradeSpec leg dict (None if the leg is malformed)."""
+    try:
+        return OptionKey.of(
+            ticker, leg.get('expiration', ''), leg.get('option_type', 'put'), leg.get('strike', 0),
+        )
+    except ValueError:
+        logger.warning(f"Invalid TradeSpec leg for {ticker}: {leg}")
+        return None
+
+
+def _spec_dxlink_symbols(ticker: str, legs: List[Dict[str, Any]]):
+    """(DXLink symbols, actions) for the well-formed legs of a TradeSpec."""
+    symbols, actions = [], []
+    for leg in legs:
+        key = _spec_leg_key(ticker, leg)
+        if key is not None:
+            symbols.append(key.streamer_symbol)
+            actions.append(leg.get('action', 'BTO'))
+    return symbols, actions
+
+
 def _trade_spec_to_leg_inputs(
     ticker: str,
     trade_spec: Dict[str, Any],
@@ -43,29 +66,14 @@ def _trade_spec_to_leg_inputs(
     legs = trade_spec.get('legs', [])
     result = []
     for leg in legs:
-        strike = leg.get('strike', 0)
-        exp_str = leg.get('expiration', '')  # ISO date string from model_dump
-        option_type = leg.get('option_type', 'put')
         action = leg.get('action', 'BTO')
         leg_qty = leg.get('quantity', 1)  # Per-spread quantity (usually 1, 2 for ratios)
 
-        # Parse expiration
-        if isinstance(exp_str, str):
-            try:
-                exp_date = date.fromisoformat(exp_str)
-            except ValueError:
-                logger.warning(f"Invalid expiration: {exp_str}")
-                continue
-        elif isinstance(exp_str, date):
-            exp_date = exp_str
-        else:
+        # DXLink streamer symbol: .TICKER YYMMDD P/C STRIKE
+        key = _spec_leg_key(ticker, leg)
+        if key is None:
             continue
-
-        # Build DXLink streamer symbol: .TICKER YYMMDD P/C STRIKE
-        opt_char = 'C' if option_type == 'call' else 'P'
-        date_part = exp_date.strftime('%y%m%d')
-        strike_int = int(strike)
-        streamer_symbol = f".{ticker}{date_part}{opt_char}{strike_int}"
+        streamer_symbol = key.streamer_symbol
 
         # Scale quantity by position size, preserve leg ratio
         total_qty = leg_qty * position_size
@@ -485,25 +493,7 @@ class MaverickAgent(BaseAgent):
                 return None  # Not enough data to run gates
 
             # Build DXLink symbols from trade_spec legs
-            symbols = []
-            actions = []
-            for leg in legs:
-                strike = leg.get('strike', 0)
-                exp = leg.get('expiration', '')
-                opt = leg.get('option_type', 'put')
-                action = leg.get('action', 'BTO')
-                if isinstance(exp, str):
-                    from datetime import date as d
-                    try:
-                        exp_date = d.fromisoformat(exp)
-                    except ValueError:
-                        continue
-                else:
-                    exp_date = exp
-                opt_char = 'C' if opt == 'call' else 'P'
-                date_part = exp_date.strftime('%y%m%d')
-                symbols.append(f".{ticker}{date_part}{opt_char}{int(strike)}")
-                actions.append(action)
+            symbols, actions = _spec_dxlink_symbols(ticker, legs)
 
             if not symbols:
                 return None
@@ -650,25 +640,7 @@ class MaverickAgent(BaseAgent):
             ticker = trade_spec.get('ticker', '')
             price = trade_spec.get('underlying_price', 0) or 0
             if legs and ticker and price:
-                symbols = []
-                actions = []
-                for leg in legs:
-                    strike = leg.get('strike', 0)
-                    exp = leg.get('expiration', '')
-                    opt = leg.get('option_type', 'put')
-                    action = leg.get('action', 'BTO')
-                    if isinstance(exp, str):
-                        from datetime import date as d
-                        try:
-                            exp_date = d.fromisoformat(exp)
-                        except ValueError:
-                            continue
-                    else:
-                        exp_date = exp
-                    opt_char = 'C' if opt == 'call' else 'P'
-                    date_part = exp_date.strftime('%y%m%d')
-                    symbols.append(f".{ticker}{date_part}{opt_char}{int(strike)}")
-                    actions.append(action)
+                symbols, actions = _spec_dxlink_symbols(ticker, legs)
 
                 if symbols:
                     spec_obj = from_dxlink_symbols(symbols, actions, float(price))
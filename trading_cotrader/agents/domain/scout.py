@@ -12,10 +12,12 @@ Every MONITORING cycle:
 """
 
 import logging
-from pathlib import Path
-from typing import Any, ClassVar, Dict, List, Optional, TYPE_CHECKING
-
-import yaml
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, ClassVar, Dict, List, Optional, TYPE_CHECKING
 
 from trading_cotrader.agents.base import BaseAgent
 from trading_cotrader.agents.protocol import AgentResult, AgentStatus
@@ -26,6 +28,213 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+# ---------------------------------------------------------------------------
+# Populate fan-out
+# ---------------------------------------------------------------------------
+
+# Max in-flight calls per stage. Fundamentals hit yfinance, so keep it lower.
+DEFAULT_STAGE_LIMITS: Dict[str, int] = {
+    'regime_batch': 1,
+    'regime': 4,
+    'technicals': 8,
+    'phase': 8,
+    'opportunity': 8,
+    'levels': 8,
+    'fundamentals': 4,
+    'macro': 1,
+}
+
+# Per-call timeout in seconds, measured from dispatch.
+DEFAULT_STAGE_TIMEOUTS: Dict[str, float] = {
+    'regime_batch': 120.0,
+    'regime': 30.0,
+    'technicals': 30.0,
+    'phase': 30.0,
+    'opportunity': 30.0,
+    'levels': 30.0,
+    'fundamentals': 45.0,
+    'macro': 30.0,
+}
+
+DEFAULT_MAX_WORKERS = 16
+
+# Overall bound on one populate() fan-out; tasks not started by then fail.
+DEFAULT_FANOUT_DEADLINE = 240.0
+
+
+@dataclass
+class StageTiming:
+    """Per-stage timing for one populate() fan-out."""
+    stage: str
+    calls: int = 0
+    ok: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        finished = self.ok + self.failed + self.timed_out
+        return {
+            'calls': self.calls,
+            'ok': self.ok,
+            'failed': self.failed,
+            'timed_out': self.timed_out,
+            'total_seconds': round(self.total_seconds, 3),
+            'mean_seconds': round(self.total_seconds / finished, 3) if finished else 0.0,
+            'max_seconds': round(self.max_seconds, 3),
+        }
+
+
+@dataclass
+class _StageTask:
+    """One library call: `call` runs on a worker, `apply` runs on the caller thread.
+
+    `apply` may return follow-up tasks (e.g. regime batch → per-ticker research).
+    """
+    stage: str
+    ticker: Optional[str]
+    call: Callable[[], Any]
+    apply: Callable[[Any], Optional[List['_StageTask']]]
+    label: str = ''
+    log_level: int = logging.WARNING
+    record_error: bool = True
+    started: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        parts = [p for p in (self.ticker, self.label) if p]
+        return f"{self.stage}({', '.join(parts)})" if parts else self.stage
+
+
+class _StageFanOut:
+    """Bounded fan-out with per-stage concurrency limits and timeouts.
+
+    Tasks are dispatched in list order whenever their stage and the pool both
+    have a free slot. Each call runs on its own daemon thread, so its clock
+    starts at dispatch and a hung call never blocks interpreter exit.
+
+    A call that overruns its stage timeout is abandoned (its late result is
+    dropped) but keeps its stage and pool slot until the thread returns, so
+    limits hold while calls hang — including into the next run(). Tasks that
+    have not started when the run's deadline passes fail, so a pool full of
+    hung calls cannot stall the cycle.
+    """
+
+    POLL_SECONDS = 0.05
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 stage_limits: Optional[Dict[str, int]] = None,
+                 stage_timeouts: Optional[Dict[str, float]] = None,
+                 deadline: float = DEFAULT_FANOUT_DEADLINE):
+        self.max_workers = max(1, max_workers)
+        self.stage_limits = {**DEFAULT_STAGE_LIMITS, **(stage_limits or {})}
+        self.stage_timeouts = {**DEFAULT_STAGE_TIMEOUTS, **(stage_timeouts or {})}
+        self.deadline = deadline
+        # Worker threads still running (in flight or abandoned), owned by run()
+        self._running = 0
+        self._stage_running: Dict[str, int] = {}
+        self._results: queue.Queue = queue.Queue()
+
+    def run(self, tasks: List[_StageTask], errors: List[str]) -> tuple[Dict[str, StageTiming], float]:
+        """Run all tasks (and follow-ups). Returns (timings by stage, wall seconds)."""
+        start = time.monotonic()
+        deadline = start + self.deadline
+        timings: Dict[str, StageTiming] = {}
+        pending = deque(tasks)
+        inflight: Dict[int, _StageTask] = {}  # id(task) → task
+
+        def timing(stage: str) -> StageTiming:
+            return timings.setdefault(stage, StageTiming(stage=stage))
+
+        def fail(task: _StageTask, message: str) -> None:
+            logger.log(task.log_level, f"{task.name} failed: {message}")
+            if task.record_error:
+                errors.append(f"{task.name}: {message}")
+
+        def finish(task: _StageTask, result: Any, error: Optional[Exception], seconds: float) -> None:
+            self._running -= 1
+            self._stage_running[task.stage] -= 1
+            if inflight.pop(id(task), None) is None:
+                return  # abandoned after a timeout — drop the late result
+            t = timing(task.stage)
+            t.record(seconds)
+            if error is not None:
+                t.failed += 1
+                fail(task, str(error))
+                return
+            try:
+                followups = task.apply(result)
+            except Exception as e:
+                t.failed += 1
+                fail(task, str(e))
+                return
+            t.ok += 1
+            if followups:
+                pending.extend(followups)
+
+        while pending or inflight:
+            # Dispatch in order, skipping tasks whose stage is saturated
+            skipped = deque()
+            while pending and self._running < self.max_workers:
+                task = pending.popleft()
+                if self._stage_running.get(task.stage, 0) >= self.stage_limits.get(task.stage, self.max_workers):
+                    skipped.append(task)
+                    continue
+                timing(task.stage).calls += 1
+                inflight[id(task)] = task
+                self._start(task)
+            skipped.extend(pending)
+            pending = skipped
+
+            try:
+                item = self._results.get(timeout=self.POLL_SECONDS)
+                while True:
+                    finish(*item)
+                    item = self._results.get_nowait()
+            except queue.Empty:
+                pass
+
+            # Abandon calls past their stage timeout; past the deadline, everything
+            now = time.monotonic()
+            expired = now >= deadline
+            for task in list(inflight.values()):
+                limit = self.stage_timeouts.get(task.stage)
+                if not expired and (limit is None or now - task.started <= limit):
+                    continue
+                del inflight[id(task)]
+                t = timing(task.stage)
+                t.timed_out += 1
+                t.record(now - task.started)
+                fail(task, f"timed out after {now - task.started:.0f}s")
+            if expired:
+                for task in pending:
+                    timing(task.stage).timed_out += 1
+                    fail(task, f"not started within the {self.deadline:.0f}s deadline")
+                pending.clear()
+
+        return timings, time.monotonic() - start
+
+    def _start(self, task: _StageTask) -> None:
+        self._running += 1
+        self._stage_running[task.stage] = self._stage_running.get(task.stage, 0) + 1
+        task.started = time.monotonic()
+        threading.Thread(target=self._work, args=(task,), daemon=True,
+                         name=f'scout-{task.stage}').start()
+
+    def _work(self, task: _StageTask) -> None:
+        result, error = None, None
+        try:
+            result = task.call()
+        except Exception as e:
+            error = e
+        self._results.put((task, result, error, time.monotonic() - task.started))
+
+
 # ---------------------------------------------------------------------------
 # ScoutAgent
 # ---------------------------------------------------------------------------
@@ -69,11 +278,20 @@ class ScoutAgent(BaseAgent):
     runs_during: ClassVar[List[str]] = ["monitoring"]
 
     def __init__(self, container: 'ResearchContainer' = None, config=None,
-                 market_data=None, market_metrics=None, watchlist_provider=None):
+                 market_data=None, market_metrics=None, watchlist_provider=None,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 stage_limits: Optional[Dict[str, int]] = None,
+                 stage_timeouts: Optional[Dict[str, float]] = None):
         super().__init__(container=container, config=config)
         self._injected_market_data = market_data
         self._injected_market_metrics = market_metrics
         self._watchlist_provider = watchlist_provider
+        # One fan-out per agent so slots held by hung calls carry across cycles
+        self._fan_out = _StageFanOut(
+            max_workers=max_workers,
+            stage_limits=stage_limits,
+            stage_timeouts=stage_timeouts,
+        )
 
     def safety_check(self, context: dict) -> tuple[bool, str]:
         """Research pipeline is always safe -- no real capital involved."""
@@ -89,11 +307,10 @@ class ScoutAgent(BaseAgent):
 
         Steps:
           1. Load watchlist if not loaded
-          2. Batch regime detection
-          3. Per-ticker technicals
-          4. Per-ticker fundamentals (unless skip_fundamentals=True)
-          5. Macro calendar
-          6. Persist to DB
+          2. Fan out regime, technicals, phase, opportunities, levels,
+             fundamentals (unless skip_fundamentals=True) and macro calendar
+             on a bounded pool (see _populate_from_library)
+          3. Persist to DB
 
         Returns AgentResult with populate stats.
         """
@@ -129,7 +346,8 @@ class ScoutAgent(BaseAgent):
             f"{stats.get('phase', 0)} phase, "
             f"{stats.get('opportunities', 0)} opportunities, "
             f"{stats.get('levels', 0)} levels, "
-            f"{stats.get('fundamentals', 0)} fundamentals"
+            f"{stats.get('fundamentals', 0)} fundamentals "
+            f"in {stats.get('elapsed_seconds', 0):.1f}s"
         )
         errors = stats.get('errors', [])
         messages = [msg]
@@ -147,7 +365,14 @@ class ScoutAgent(BaseAgent):
         """
         Populate ResearchContainer from market_analyzer library for given tickers.
 
-        Returns summary dict with counts of what was populated.
+        Every stage for every ticker (technicals, phase, the four opportunity
+        assessments, levels, fundamentals) plus batch regime and macro is fanned
+        out on a bounded thread pool. Each stage has its own in-flight limit and
+        per-call timeout; results are written into the container as they finish
+        (on this thread, so the container needs no locking).
+
+        Returns summary dict with counts of what was populated, plus a
+        per-stage timing report under 'timings'.
         """
         ma = self._get_market_analyzer()
         container = self.container
@@ -156,104 +381,105 @@ class ScoutAgent(BaseAgent):
             'phase': 0, 'opportunities': 0, 'levels': 0,
             'macro': False, 'errors': [],
         }
+        opportunity_tickers: set = set()
 
-        # 1. Batch regime detection (fast -- one call)
-        try:
-            results = ma.regime.detect_batch(tickers=tickers)
+        def on_regime_batch(results) -> List[_StageTask]:
+            # Write regimes immediately; strategy comments stream in per ticker.
+            followups = []
             for ticker_key, r in results.items():
-                strategy_comment = ''
-                try:
-                    research = ma.regime.research(ticker_key)
-                    strategy_comment = research.strategy_comment
-                except Exception:
-                    pass
-
-                container.update_regime(ticker_key, {
+                regime_data = {
                     'regime': r.regime.value,
                     'regime_name': r.regime.name,
                     'confidence': r.confidence,
                     'trend_direction': r.trend_direction,
-                    'strategy_comment': strategy_comment,
-                })
+                    'strategy_comment': '',
+                }
+                container.update_regime(ticker_key, regime_data)
+                container.cache_analysis(ticker_key, 'regime', r)
                 stats['regime'] += 1
-        except Exception as e:
-            logger.warning(f"Batch regime detection failed: {e}")
-            stats['errors'].append(f"regime: {e}")
-
-        # 2. Technicals per ticker (includes smart money + MACD line/signal)
-        for ticker in tickers:
-            try:
-                snap = ma.technicals.snapshot(ticker)
-                container.update_technicals(ticker, snap.model_dump(mode='json'))
-                stats['technicals'] += 1
-            except Exception as e:
-                logger.warning(f"Technicals failed for {ticker}: {e}")
-                stats['errors'].append(f"technicals({ticker}): {e}")
-
-        # 3. Phase per ticker (enhanced Wyckoff from PhaseService)
-        for ticker in tickers:
-            try:
-                phase_result = ma.phase.detect(ticker)
-                container.update_phase(ticker, phase_result.model_dump(mode='json'))
-                stats['phase'] += 1
-            except Exception as e:
-                logger.warning(f"Phase detection failed for {ticker}: {e}")
-                stats['errors'].append(f"phase({ticker}): {e}")
-
-        # 4. Opportunities per ticker (4 horizons)
-        for ticker in tickers:
-            opps = {}
-            try:
-                opps['zero_dte'] = ma.opportunity.assess_zero_dte(ticker).model_dump(mode='json')
-            except Exception as e:
-                logger.debug(f"0DTE opportunity failed for {ticker}: {e}")
-            try:
-                opps['leap'] = ma.opportunity.assess_leap(ticker).model_dump(mode='json')
-            except Exception as e:
-                logger.debug(f"LEAP opportunity failed for {ticker}: {e}")
-            try:
-                opps['breakout'] = ma.opportunity.assess_breakout(ticker).model_dump(mode='json')
-            except Exception as e:
-                logger.debug(f"Breakout opportunity failed for {ticker}: {e}")
-            try:
-                opps['momentum'] = ma.opportunity.assess_momentum(ticker).model_dump(mode='json')
-            except Exception as e:
-                logger.debug(f"Momentum opportunity failed for {ticker}: {e}")
+                followups.append(_StageTask(
+                    'regime', ticker_key,
+                    lambda t=ticker_key: ma.regime.research(t).strategy_comment,
+                    lambda comment, t=ticker_key, d=regime_data: container.update_regime(
+                        t, {**d, 'strategy_comment': comment}),
+                    log_level=logging.DEBUG, record_error=False,
+                ))
+            return followups
+
+        def on_macro(data: dict) -> None:
+            container.update_macro(data)
+            stats['macro'] = True
 
-            if opps:
-                container.update_opportunities(ticker, opps)
-                stats['opportunities'] += 1
+        def on_opportunity(ticker: str, horizon: str, data: dict) -> None:
+            container.update_opportunities(ticker, {horizon: data})
+            opportunity_tickers.add(ticker)
+
+        def on_technicals(ticker: str, snapshot) -> None:
+            # Keep the raw snapshot for health checks alongside the flat fields
+            container.cache_analysis(ticker, 'technicals', snapshot)
+            container.update_technicals(ticker, snapshot.model_dump(mode='json'))
+            stats['technicals'] += 1
+
+        def counted(key: str, update):
+            def apply(ticker: str, data: dict) -> None:
+                update(ticker, data)
+                stats[key] += 1
+            return apply
+
+        def per_ticker(stage: str, ticker: str, call, apply, **kwargs) -> _StageTask:
+            return _StageTask(
+                stage, ticker,
+                lambda: call(ticker).model_dump(mode='json'),
+                lambda data: apply(ticker, data),
+                **kwargs,
+            )
 
-        # 5. Levels analysis per ticker
+        tasks: List[_StageTask] = [
+            _StageTask('regime_batch', None,
+                       lambda: ma.regime.detect_batch(tickers=tickers), on_regime_batch),
+            _StageTask('macro', None,
+                       lambda: ma.macro.calendar(lookahead_days=90).model_dump(mode='json'),
+                       on_macro),
+        ]
+        opportunity_calls = {
+            'zero_dte': ma.opportunity.assess_zero_dte,
+            'leap': ma.opportunity.assess_leap,
+            'breakout': ma.opportunity.assess_breakout,
+            'momentum': ma.opportunity.assess_momentum,
+        }
+        # Ticker-major order so each ticker's stages run side by side.
         for ticker in tickers:
-            try:
-                levels_result = ma.levels.analyze(ticker)
-                container.update_levels(ticker, levels_result.model_dump(mode='json'))
-                stats['levels'] += 1
-            except Exception as e:
-                logger.debug(f"Levels analysis failed for {ticker}: {e}")
-                stats['errors'].append(f"levels({ticker}): {e}")
-
-        # 6. Fundamentals per ticker (slower -- yfinance calls, but cached)
-        if not skip_fundamentals:
-            for ticker in tickers:
-                try:
-                    fund = ma.fundamentals.get(ticker)
-                    container.update_fundamentals(ticker, fund.model_dump(mode='json'))
-                    stats['fundamentals'] += 1
-                except Exception as e:
-                    logger.warning(f"Fundamentals failed for {ticker}: {e}")
-                    stats['errors'].append(f"fundamentals({ticker}): {e}")
-
-        # 7. Macro calendar (one call)
-        try:
-            cal_data = ma.macro.calendar(lookahead_days=90)
-            container.update_macro(cal_data.model_dump(mode='json'))
-            stats['macro'] = True
-        except Exception as e:
-            logger.warning(f"Macro calendar failed: {e}")
-            stats['errors'].append(f"macro: {e}")
-
+            tasks.append(_StageTask('technicals', ticker,
+                                    lambda t=ticker: ma.technicals.snapshot(t),
+                                    lambda snap, t=ticker: on_technicals(t, snap)))
+            tasks.append(per_ticker('phase', ticker, ma.phase.detect,
+                                    counted('phase', container.update_phase)))
+            for horizon, call in opportunity_calls.items():
+                tasks.append(per_ticker(
+                    'opportunity', ticker, call,
+                    lambda t, data, h=horizon: on_opportunity(t, h, data),
+                    label=horizon, log_level=logging.DEBUG, record_error=False,
+                ))
+            tasks.append(per_ticker('levels', ticker, ma.levels.analyze,
+                                    counted('levels', container.update_levels),
+                                    log_level=logging.DEBUG))
+            if not skip_fundamentals:
+                tasks.append(per_ticker('fundamentals', ticker, ma.fundamentals.get,
+                                        counted('fundamentals', container.update_fundamentals)))
+
+        timings, elapsed = self._fan_out.run(tasks, stats['errors'])
+        stats['opportunities'] = len(opportunity_tickers)
+        stats['timings'] = {stage: t.to_dict() for stage, t in timings.items()}
+        stats['elapsed_seconds'] = round(elapsed, 3)
+
+        logger.info(
+            f"Research fan-out: {len(tickers)} tickers in {elapsed:.1f}s — "
+            + ", ".join(
+                f"{stage} {t.ok}/{t.calls} ok, max {t.max_seconds:.1f}s"
+                + (f", {t.timed_out} timed out" if t.timed_out else "")
+                for stage, t in timings.items()
+            )
+        )
         return stats
 
     def _resolve_tickers(self) -> List[str]:
@@ -323,11 +549,11 @@ class ScoutAgent(BaseAgent):
 
     def _load_watchlist(self) -> None:
         """Load market_watchlist.yaml into container."""
-        config_path = Path(__file__).parent.parent.parent / 'config' / 'market_watchlist.yaml'
-        if not config_path.exists():
+        from trading_cotrader.config.config_registry import CONFIG_DIR, get_config_registry
+        try:
+            cfg = get_config_registry().get_raw(CONFIG_DIR / 'market_watchlist.yaml')
+        except FileNotFoundError:
             return
-        with open(config_path, 'r') as f:
-            cfg = yaml.safe_load(f)
         items = cfg.get('watchlist', [])
         self.container.load_watchlist_config(items)
 
@@ -69,9 +69,12 @@ class SentinelAgent(BaseAgent):
     ]
     runs_during: ClassVar[List[str]] = ["booting", "screening", "monitoring", "execution"]
 
-    def __init__(self, config: WorkflowConfig = None, container=None, container_manager=None):
+    def __init__(self, config: WorkflowConfig = None, container=None, container_manager=None,
+                 var_engine=None):
         super().__init__(container=container, config=config)
         self._container_manager = container_manager
+        # VaREngine is kept across cycles so its CorrelationAnalyzer cache survives
+        self._var_engine = var_engine
 
     def safety_check(self, context: dict) -> tuple[bool, str]:
         """Pre-flight check -- same as run() but returns tuple."""
@@ -202,17 +205,29 @@ class SentinelAgent(BaseAgent):
             try:
                 underlying_counts: dict[str, int] = {}
                 total_positions = 0
-                for bundle in self._container_manager.get_all_bundles():
+                bundles = self._container_manager.get_all_bundles()
+                for bundle in bundles:
                     for rf in bundle.risk_factors.get_all():
                         underlying_counts[rf.underlying] = (
                             underlying_counts.get(rf.underlying, 0) + rf.position_count
                         )
                         total_positions += rf.position_count
 
-                    # Read VaR from portfolio state if available
-                    pstate = bundle.portfolio.state or {}
-                    risk_data['var_95'] += float(pstate.get('var_1d_95', 0) or 0)
-                    risk_data['var_99'] += float(pstate.get('var_1d_99', 0) or 0)
+                report = self._compute_var(bundles) if total_positions else None
+                if report:
+                    risk_data['var_95'] = report.total_var_95
+                    risk_data['var_99'] = report.total_var_99
+                    risk_data['es_95'] = report.total_es_95
+                    risk_data['var_method'] = report.method.value
+                    risk_data['var_by_portfolio'] = {
+                        name: bv.to_dict() for name, bv in report.bundles.items()
+                    }
+                else:
+                    # Last persisted VaR from portfolio state
+                    for bundle in bundles:
+                        pstate = bundle.portfolio.state
+                        risk_data['var_95'] += float(getattr(pstate, 'var_1d_95', 0) or 0)
+                        risk_data['var_99'] += float(getattr(pstate, 'var_1d_99', 0) or 0)
 
                 risk_data['open_positions'] = total_positions
                 risk_data['underlying_concentration'] = underlying_counts
@@ -252,6 +267,24 @@ class SentinelAgent(BaseAgent):
             logger.error(f"Risk calculation failed: {e}")
             return {}
 
+    def _compute_var(self, bundles: list):
+        """Run the VaR engine over all bundles and write results to PortfolioORM + containers."""
+        try:
+            from trading_cotrader.core.database.session import session_scope
+            from trading_cotrader.services.risk.var import VaREngine
+
+            if self._var_engine is None:
+                self._var_engine = VaREngine()
+
+            report = self._var_engine.compute_for_bundles(bundles)
+            with session_scope() as session:
+                self._var_engine.persist(report, session)
+            self._var_engine.apply_to_containers(report, bundles)
+            return report
+        except Exception as e:
+            logger.warning(f"VaR computation failed: {e}")
+            return None
+
     # -----------------------------------------------------------------
     # Trading constraints (from GuardianAgent)
     # -----------------------------------------------------------------
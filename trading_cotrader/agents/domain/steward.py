@@ -23,8 +23,6 @@ from pathlib import Path
 from typing import ClassVar, Dict, List, Optional, TYPE_CHECKING
 import logging
 
-import yaml
-
 from trading_cotrader.agents.base import BaseAgent
 from trading_cotrader.agents.protocol import AgentResult, AgentStatus
 
@@ -358,15 +356,14 @@ class StewardAgent(BaseAgent):
 
     def _load_portfolio_configs(self) -> Dict[str, dict]:
         """Load portfolio section from risk_config.yaml as raw dict."""
+        from trading_cotrader.config.config_registry import CONFIG_DIR, get_config_registry
         paths = [
             Path('config/risk_config.yaml'),
-            Path(__file__).parent.parent.parent / 'config' / 'risk_config.yaml',
+            CONFIG_DIR / 'risk_config.yaml',
         ]
         for p in paths:
             if p.exists():
-                with open(p, 'r') as f:
-                    raw = yaml.safe_load(f)
-                return raw.get('portfolios', {})
+                return get_config_registry().get_raw(p).get('portfolios', {})
         return {}
 
     def _apply_staggered_ramp(
@@ -618,102 +615,97 @@ class StewardAgent(BaseAgent):
 
         Returns Sharpe, drawdown, regime performance per desk.
         """
-        from trading_cotrader.services.ml_learning_service import MLLearningService
+        from trading_cotrader.core.database.session import session_scope
+        from trading_cotrader.repositories.desk_aggregates import DeskAggregateRepository
+        from trading_cotrader.services.outcome_dataset import get_outcome_dataset
 
         result = {'desks': {}, 'recommendation': '', 'messages': []}
-        ml = MLLearningService()
+        dataset = get_outcome_dataset()
 
         with session_scope() as session:
-            desks = session.query(PortfolioORM).filter(
-                PortfolioORM.portfolio_type == 'what_if'
-            ).all()
+            desks = DeskAggregateRepository(session).desks()
 
-            all_outcomes = ml._build_outcomes(days=days)
-            if not all_outcomes:
-                result['messages'].append("No closed trades to analyze")
-                return result
+        all_outcomes = dataset.trade_outcomes(days=days)
+        if not all_outcomes:
+            result['messages'].append("No closed trades to analyze")
+            return result
 
-            for desk in desks:
-                # Filter outcomes to this desk's trades
-                desk_trades = session.query(TradeORM).filter(
-                    TradeORM.portfolio_id == desk.id,
-                    TradeORM.is_open == False,
-                ).all()
-                desk_trade_ids = {t.id for t in desk_trades}
-                desk_outcomes = [o for o in all_outcomes if o.trade_id in desk_trade_ids]
-
-                if not desk_outcomes:
-                    result['desks'][desk.name] = {
-                        'trades': 0, 'message': 'No closed trades yet'
-                    }
-                    continue
+        for desk in desks:
+            # Desk slice comes from the dataset's portfolio index
+            desk_outcomes = dataset.trade_outcomes(days=days, portfolio_id=desk.id)
 
-                desk_data = {
-                    'trades': len(desk_outcomes),
-                    'capital': float(desk.initial_capital or 0),
+            if not desk_outcomes:
+                result['desks'][desk.name] = {
+                    'trades': 0, 'message': 'No closed trades yet'
                 }
+                continue
 
-                # Sharpe
-                try:
-                    from market_analyzer import compute_sharpe
-                    sharpe = compute_sharpe(desk_outcomes)
-                    desk_data['sharpe'] = round(sharpe.sharpe_ratio, 2)
-                    desk_data['sortino'] = round(sharpe.sortino_ratio, 2)
-                    desk_data['annualized_return'] = round(sharpe.annualized_return_pct, 1)
-                except Exception as e:
-                    desk_data['sharpe_error'] = str(e)
-
-                # Drawdown
-                try:
-                    from market_analyzer import compute_drawdown
-                    dd = compute_drawdown(desk_outcomes)
-                    desk_data['max_drawdown_pct'] = round(dd.max_drawdown_pct, 1)
-                    desk_data['max_drawdown_dollars'] = round(dd.max_drawdown_dollars, 0)
-                except Exception as e:
-                    desk_data['drawdown_error'] = str(e)
-
-                # Regime performance
-                try:
-                    from market_analyzer import compute_regime_performance
-                    regime_perf = compute_regime_performance(desk_outcomes)
-                    desk_data['regime_performance'] = {}
-                    for regime_id, perf in regime_perf.items():
-                        desk_data['regime_performance'][f'R{regime_id}'] = {
-                            'win_rate': round(perf.win_rate * 100, 0),
-                            'avg_pnl': round(perf.avg_pnl_pct * 100, 1),
-                            'trades': perf.trade_count,
-                        }
-                except Exception as e:
-                    desk_data['regime_error'] = str(e)
-
-                # Win rate + P&L
-                wins = sum(1 for o in desk_outcomes if o.pnl_dollars > 0)
-                total_pnl = sum(o.pnl_dollars for o in desk_outcomes)
-                desk_data['win_rate'] = round(wins / len(desk_outcomes) * 100, 0)
-                desk_data['total_pnl'] = round(total_pnl, 2)
-                desk_data['avg_pnl'] = round(total_pnl / len(desk_outcomes), 2)
-                desk_data['avg_holding_days'] = round(
-                    sum(o.holding_days for o in desk_outcomes) / len(desk_outcomes), 1
-                )
+            desk_data = {
+                'trades': len(desk_outcomes),
+                'capital': desk.initial_capital,
+            }
 
-                result['desks'][desk.name] = desk_data
-
-            # Recommendation: which desk deserves more capital?
-            best_sharpe = -999
-            best_desk = None
-            for name, data in result['desks'].items():
-                sharpe = data.get('sharpe', -999)
-                if sharpe > best_sharpe and data.get('trades', 0) >= 5:
-                    best_sharpe = sharpe
-                    best_desk = name
-
-            if best_desk:
-                result['recommendation'] = (
-                    f"{best_desk} has the best risk-adjusted return (Sharpe {best_sharpe:.2f}). "
-                    f"Consider increasing its capital allocation."
-                )
-                result['messages'].append(result['recommendation'])
-            else:
-                result['messages'].append("Not enough trades for capital reallocation recommendation (need 5+ per desk)")
+            # Sharpe
+            try:
+                from market_analyzer import compute_sharpe
+                sharpe = compute_sharpe(desk_outcomes)
+                desk_data['sharpe'] = round(sharpe.sharpe_ratio, 2)
+                desk_data['sortino'] = round(sharpe.sortino_ratio, 2)
+                desk_data['annualized_return'] = round(sharpe.annualized_return_pct, 1)
+            except Exception as e:
+                desk_data['sharpe_error'] = str(e)
+
+            # Drawdown
+            try:
+                from market_analyzer import compute_drawdown
+                dd = compute_drawdown(desk_outcomes)
+                desk_data['max_drawdown_pct'] = round(dd.max_drawdown_pct, 1)
+                desk_data['max_drawdown_dollars'] = round(dd.max_drawdown_dollars, 0)
+            except Exception as e:
+                desk_data['drawdown_error'] = str(e)
+
+            # Regime performance
+            try:
+                from market_analyzer import compute_regime_performance
+                regime_perf = compute_regime_performance(desk_outcomes)
+                desk_data['regime_performance'] = {}
+                for regime_id, perf in regime_perf.items():
+                    desk_data['regime_performance'][f'R{regime_id}'] = {
+                        'win_rate': round(perf.win_rate * 100, 0),
+                        'avg_pnl': round(perf.avg_pnl_pct * 100, 1),
+                        'trades': perf.trade_count,
+                    }
+            except Exception as e:
+                desk_data['regime_error'] = str(e)
+
+            # Win rate + P&L
+            wins = sum(1 for o in desk_outcomes if o.pnl_dollars > 0)
+            total_pnl = sum(o.pnl_dollars for o in desk_outcomes)
+            desk_data['win_rate'] = round(wins / len(desk_outcomes) * 100, 0)
+            desk_data['total_pnl'] = round(total_pnl, 2)
+            desk_data['avg_pnl'] = round(total_pnl / len(desk_outcomes), 2)
+            desk_data['avg_holding_days'] = round(
+                sum(o.holding_days for o in desk_outcomes) / len(desk_outcomes), 1
+            )
+
+            result['desks'][desk.name] = desk_data
+
+        # Recommendation: which desk deserves more capital?
+        best_sharpe = -999
+        best_desk = None
+        for name, data in result['desks'].items():
+            sharpe = data.get('sharpe', -999)
+            if sharpe > best_sharpe and data.get('trades', 0) >= 5:
+                best_sharpe = sharpe
+                best_desk = name
+
+        if best_desk:
+            result['recommendation'] = (
+                f"{best_desk} has the best risk-adjusted return (Sharpe {best_sharpe:.2f}). "
+                f"Consider increasing its capital allocation."
+            )
+            result['messages'].append(result['recommendation'])
+        else:
+            result['messages'].append("Not enough trades for capital reallocation recommendation (need 5+ per desk)")
 
         return result
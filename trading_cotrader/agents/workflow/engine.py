@@ -17,8 +17,9 @@ Usage:
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 import json
+import threading
 import uuid
 import logging
 
@@ -178,6 +179,14 @@ class WorkflowEngine:
             'engine_start_time': datetime.utcnow().isoformat(),
         }
 
+        # Quote-driven exit triggers (built at boot, rebuilt each monitoring cycle)
+        self._exit_triggers = None
+        self._exit_close_executor = None
+
+        # Agent pipeline graph (built on first cycle) and its cancel switch
+        self._pipeline = None
+        self._pipeline_cancel = threading.Event()
+
         # Initialize ContainerManager so API endpoints have live data
         self._init_container_manager()
 
@@ -193,7 +202,8 @@ class WorkflowEngine:
         self.maverick = MaverickAgent(container_manager=self.container_manager, config=self.config, broker=broker)
         # Pass MA instance to Maverick for health checks + analytics gates
         self.maverick._ma = self._ma
-        self.atlas = AtlasAgent(config=self.config, broker=broker, ma=self._ma)
+        self.atlas = AtlasAgent(config=self.config, broker=broker, ma=self._ma,
+                                container_manager=self.container_manager)
 
         # Interaction manager (command router, not an agent)
         self.interaction = InteractionManager(self)
@@ -264,6 +274,9 @@ class WorkflowEngine:
         # Run full agent pipeline
         self._run_agent_pipeline()
 
+        # Arm quote-driven exit triggers for the open book
+        self._sync_exit_triggers()
+
         # Advance to monitoring
         self.check_macro()
 
@@ -325,222 +338,337 @@ class WorkflowEngine:
         """Trading halted — persist state."""
         reason = self.context.get('halt_reason', 'Unknown')
         logger.warning(f"=== HALTED: {reason} ===")
+        self.cancel_pipeline()
         self._persist_state()
 
+    def stop(self):
+        """Engine shutdown: cancel the running pipeline and stop exit-trigger closes."""
+        self.cancel_pipeline()
+        self._stop_exit_triggers()
+        logger.info("Workflow engine stopped")
+
     # -----------------------------------------------------------------
     # Agent pipeline
     # -----------------------------------------------------------------
 
     def _run_agent_pipeline(self):
         """
-        Run the full agent pipeline:
-        Steward.populate → Sentinel.run → Steward.run → Scout.populate → Scout.run → Maverick.run
+        Run the agent pipeline against one frozen config snapshot.
+
+        Config files edited mid-cycle are picked up by the next cycle, so
+        every agent in this one sees the same risk/workflow settings.
+        """
+        from trading_cotrader.config.config_registry import get_config_registry
+        registry = get_config_registry()
+        with registry.frozen():
+            self.context['config_version'] = registry.version
+            self._run_agent_steps()
+
+    # Stage graph. Edges are real data dependencies:
+    #   Sentinel / Steward.run / mark-to-market read what Steward.populate loaded;
+    #   Scout's research is independent of the portfolio side;
+    #   Maverick needs risk, capital, rankings and fresh marks;
+    #   booking → closes → adjustments touch the same trades, so they stay serial;
+    #   ML learning and Atlas only read the settled book and run side by side.
+    PIPELINE_MAX_WORKERS = 4
+
+    def _build_pipeline(self):
+        from trading_cotrader.agents.workflow.pipeline import PipelineScheduler, PipelineStage
+
+        def ml_due() -> bool:
+            cycle = self.context.get('cycle_count', 0)
+            return cycle % 10 == 0 and cycle > 0
+
+        # Writers carry no timeout: an abandoned stage keeps running, so its
+        # dependants would read (or write) state it is still rewriting.
+        # Steward.populate reloads every bundle container and Scout.populate
+        # refills the ResearchContainer (bounded by its own fan-out deadline);
+        # booking → closes → adjustments must stay strictly serial.
+        stages = [
+            PipelineStage('steward.populate', self._stage_steward_populate, mutates=True),
+            PipelineStage('sentinel.run', self._stage_sentinel, after=('steward.populate',), timeout=60),
+            PipelineStage('steward.run', self._stage_steward_run, after=('steward.populate',), timeout=60),
+            PipelineStage('scout.populate', self._stage_scout_populate, mutates=True),
+            PipelineStage('scout.run', self._stage_scout_run, after=('scout.populate',), timeout=300),
+            PipelineStage('mark_to_market', self._stage_mark_to_market, after=('steward.populate',),
+                          mutates=True),
+            PipelineStage(
+                'maverick.run', self._stage_maverick,
+                after=('sentinel.run', 'steward.run', 'scout.run', 'mark_to_market'), mutates=True,
+            ),
+            PipelineStage(
+                'auto_book', self._stage_auto_book, after=('maverick.run',), mutates=True,
+                when=lambda: any(p.get('status') == 'proposed' for p in self.context.get('trade_proposals', [])),
+            ),
+            PipelineStage(
+                'auto_close', self._stage_auto_close, after=('auto_book',), mutates=True,
+                when=lambda: bool(self.context.get('exit_signals')),
+            ),
+            PipelineStage(
+                'adjustments', self._stage_adjustments, after=('auto_close',), mutates=True,
+                when=lambda: bool(getattr(self, '_ma', None)),
+            ),
+            PipelineStage('trade_learner', self._stage_trade_learner, after=('adjustments',),
+                          timeout=300, when=ml_due),
+            PipelineStage('ml_learning', self._stage_ml_learning, after=('adjustments',),
+                          timeout=300, when=lambda: ml_due() and bool(self._ma)),
+            PipelineStage('atlas.run', self._stage_atlas, after=('adjustments',), timeout=120),
+        ]
+        return PipelineScheduler(stages, max_workers=self.PIPELINE_MAX_WORKERS,
+                                 on_stage_done=self._record_stage_run)
+
+    def cancel_pipeline(self) -> None:
+        """Stop dispatching pipeline stages; running stages finish, the rest are skipped."""
+        self._pipeline_cancel.set()
+
+    def _run_agent_steps(self):
+        """
+        Run the agent pipeline graph (see _build_pipeline).
 
-        Each agent is wrapped in try/except so one failure doesn't block the rest.
+        Independent stages run concurrently; each stage is timed, bounded by
+        its timeout and recorded to AgentRunORM. A failing stage never blocks
+        the rest.
         """
         logger.info("--- Agent pipeline start ---")
+        if self._pipeline is None:
+            self._pipeline = self._build_pipeline()
+        self._pipeline_cancel.clear()
+
+        started = datetime.utcnow()
+        runs = self._pipeline.run(cancel=self._pipeline_cancel)
+        wall_ms = int((datetime.utcnow() - started).total_seconds() * 1000)
+        self.context['pipeline_timings'] = {
+            'wall_ms': wall_ms,
+            'critical_path_ms': self._pipeline.critical_path_ms(runs),
+            'stages': {name: {'status': r.status, 'duration_ms': r.duration_ms} for name, r in runs.items()},
+        }
 
-        # 1. Steward: load portfolio state from DB into containers
-        try:
-            result = self.steward.populate(self.context)
-            logger.info(f"Steward.populate: {result.status.value} — {result.messages}")
-        except Exception as e:
-            logger.warning(f"Steward.populate failed: {e}")
+        # Log summary
+        proposals = self.context.get('trade_proposals', [])
+        proposed = [p for p in proposals if p.get('status') == 'proposed']
+        exit_signals = self.context.get('exit_signals', [])
+        urgent_exits = [s for s in exit_signals if s.severity == 'URGENT']
 
-        # 2. Sentinel: risk checks
-        try:
-            result = self.sentinel.run(self.context)
-            logger.info(f"Sentinel.run: {result.status.value} — {result.messages}")
-        except Exception as e:
-            logger.warning(f"Sentinel.run failed: {e}")
+        parts = []
+        if proposed:
+            parts.append(f"{len(proposed)} trade proposal(s)")
+        if urgent_exits:
+            parts.append(f"{len(urgent_exits)} URGENT exit(s)")
+        if exit_signals and not urgent_exits:
+            parts.append(f"{len(exit_signals)} exit signal(s)")
 
-        # 3. Steward: capital analysis
-        try:
-            result = self.steward.run(self.context)
-            logger.info(f"Steward.run: {result.status.value} — {result.messages}")
-        except Exception as e:
-            logger.warning(f"Steward.run failed: {e}")
+        summary = ", ".join(parts) if parts else "no proposals, no exits"
+        timings = self.context['pipeline_timings']
+        serial_ms = sum(r.duration_ms for r in runs.values())
+        logger.info(
+            f"--- Agent pipeline done: {summary} ({wall_ms}ms wall, "
+            f"{timings['critical_path_ms']}ms critical path, {serial_ms}ms serial) ---"
+        )
 
-        # 4. Scout: populate research from MarketAnalyzer
-        try:
-            result = self.scout.populate(self.context)
-            logger.info(f"Scout.populate: {result.status.value} — {result.messages}")
-        except Exception as e:
-            logger.warning(f"Scout.populate failed: {e}")
+    # -----------------------------------------------------------------
+    # Pipeline stages
+    # -----------------------------------------------------------------
+
+    def _stage_steward_populate(self):
+        """Steward: load portfolio state from DB into containers."""
+        result = self.steward.populate(self.context)
+        logger.info(f"Steward.populate: {result.status.value} — {result.messages}")
+        return result
 
-        # 5. Scout: screening + ranking
+    def _stage_sentinel(self):
+        """Sentinel: risk checks."""
+        result = self.sentinel.run(self.context)
+        logger.info(f"Sentinel.run: {result.status.value} — {result.messages}")
+        return result
+
+    def _stage_steward_run(self):
+        """Steward: capital analysis."""
+        result = self.steward.run(self.context)
+        logger.info(f"Steward.run: {result.status.value} — {result.messages}")
+        return result
+
+    def _stage_scout_populate(self):
+        """Scout: populate research from MarketAnalyzer."""
+        result = self.scout.populate(self.context)
+        logger.info(f"Scout.populate: {result.status.value} — {result.messages}")
+        return result
+
+    def _stage_scout_run(self):
+        """Scout: screening + ranking."""
         try:
             result = self.scout.run(self.context)
-            logger.info(f"Scout.run: {result.status.value} — {result.messages}")
         except Exception as e:
-            logger.warning(f"Scout.run failed: {e}")
             try:
                 from trading_cotrader.agents.domain.atlas import AtlasAgent
                 AtlasAgent.log_error('scout', f'Scout.run failed: {e}')
             except Exception:
                 pass
+            raise
+        logger.info(f"Scout.run: {result.status.value} — {result.messages}")
+        return result
 
-        # 6. Mark-to-market: update open trade prices before Maverick checks exits
-        try:
-            m2m_result = self.maverick.mark_to_market()
-            if m2m_result.trades_marked > 0:
-                logger.info(
-                    f"Mark-to-market: {m2m_result.trades_marked} trades, "
-                    f"P&L=${m2m_result.total_pnl:+.2f}"
-                )
-        except Exception as e:
-            logger.warning(f"Mark-to-market failed: {e}")
+    def _stage_mark_to_market(self):
+        """Mark-to-market: update open trade prices before Maverick checks exits."""
+        m2m_result = self.maverick.mark_to_market()
+        if m2m_result.trades_marked > 0:
+            logger.info(
+                f"Mark-to-market: {m2m_result.trades_marked} trades, "
+                f"P&L=${m2m_result.total_pnl:+.2f}"
+            )
+        return m2m_result
 
-        # 7. Maverick: trade proposals + exit monitoring
+    def _stage_maverick(self):
+        """Maverick: trade proposals + exit monitoring."""
         try:
             result = self.maverick.run(self.context)
-            logger.info(f"Maverick.run: {result.status.value} — {result.messages}")
         except Exception as e:
-            logger.warning(f"Maverick.run failed: {e}")
             try:
                 from trading_cotrader.agents.domain.atlas import AtlasAgent
                 AtlasAgent.log_error('maverick', f'Maverick.run failed: {e}')
             except Exception:
                 pass
+            raise
+        logger.info(f"Maverick.run: {result.status.value} — {result.messages}")
+        return result
 
-        # 7b. Auto-book proposed trades to WhatIf desks
-        proposals = self.context.get('trade_proposals', [])
-        proposed = [p for p in proposals if p.get('status') == 'proposed']
-        if proposed:
-            try:
-                book_results = self.maverick.book_proposals(self.context)
-                booked = sum(1 for r in book_results if r.get('success'))
-                if booked:
-                    logger.info(f"Auto-booked {booked} trade(s) to WhatIf desks")
-                    self._refresh_containers()
-                # Clear proposals after booking attempt
-                self.context['trade_proposals'] = []
-            except Exception as e:
-                logger.warning(f"Auto-book failed: {e}")
-
-        # 8. Auto-close trades on URGENT exit signals + profit targets
+    def _stage_auto_book(self):
+        """Auto-book proposed trades to WhatIf desks."""
+        book_results = self.maverick.book_proposals(self.context)
+        booked = sum(1 for r in book_results if r.get('success'))
+        if booked:
+            logger.info(f"Auto-booked {booked} trade(s) to WhatIf desks")
+            self._refresh_containers(self._trade_delta(
+                'maverick_booking', book_results,
+            ))
+        # Clear proposals after booking attempt
+        self.context['trade_proposals'] = []
+        return {'booked': booked}
+
+    def _stage_auto_close(self):
+        """Auto-close trades on URGENT exit signals + profit targets."""
+        from trading_cotrader.services.trade_lifecycle import TradeLifecycleService
         exit_signals = self.context.get('exit_signals', [])
-        if exit_signals:
-            try:
-                from trading_cotrader.services.trade_lifecycle import TradeLifecycleService
-                lifecycle = TradeLifecycleService(container_manager=self.container_manager)
-                close_results = lifecycle.auto_close_from_signals(exit_signals)
-                closed_count = sum(1 for r in close_results if r.get('success'))
-                if closed_count:
-                    logger.info(f"Auto-closed {closed_count} trade(s) from exit signals")
-                    # Refresh containers after closing
-                    self._refresh_containers()
-                    # Clear processed signals
-                    self.context['exit_signals'] = [
-                        s for s in exit_signals
-                        if s.severity not in ('URGENT',) and s.signal_type != 'PROFIT_TARGET'
-                    ]
-            except Exception as e:
-                logger.warning(f"Auto-close failed: {e}")
-
-        # 8b. Adjustment pipeline for TESTED/BREACHED positions (G9, G23)
-        if hasattr(self, '_ma') and self._ma:
-            try:
-                from trading_cotrader.services.trade_health_service import TradeHealthService
-                health_service = TradeHealthService(ma=self._ma, broker=self.broker)
-                health_result = health_service.check_all_positions()
-                for action in health_result.actions:
-                    if action.action == 'CLOSE' and action.urgency == 'immediate':
-                        # Auto-close via lifecycle
-                        try:
-                            from trading_cotrader.services.trade_lifecycle import TradeLifecycleService
-                            lifecycle = TradeLifecycleService(container_manager=self.container_manager)
-                            lifecycle.close_trade(action.trade_id, reason=f'adjustment:{action.adjustment_type}')
-                            logger.info(f"Auto-closed {action.ticker} ({action.rationale})")
-                        except Exception as e:
-                            logger.warning(f"Auto-close adjustment failed for {action.ticker}: {e}")
-                    elif action.action in ('ADJUST', 'ROLL'):
-                        # Flag for human execution (adjustments = new orders)
-                        adjustment = {
-                            'trade_id': action.trade_id,
-                            'ticker': action.ticker,
-                            'type': action.adjustment_type,
-                            'urgency': action.urgency,
-                            'rationale': action.rationale,
-                            'close_legs': action.close_legs,  # A17: legs to close
-                            'new_legs': action.new_legs,      # A17: legs to open
-                        }
-                        self.context.setdefault('pending_adjustments', []).append(adjustment)
-
-                        # Log detail for human execution
-                        if action.close_legs:
-                            leg_str = ', '.join(
-                                f"{l.get('action','?')} {l.get('option_type','?')}{l.get('strike','?')}"
-                                for l in action.close_legs
-                            )
-                            logger.info(f"Adjustment {action.ticker} CLOSE: {leg_str}")
-                        if action.new_legs:
-                            leg_str = ', '.join(
-                                f"{l.get('action','?')} {l.get('option_type','?')}{l.get('strike','?')}"
-                                for l in action.new_legs
-                            )
-                            logger.info(f"Adjustment {action.ticker} OPEN: {leg_str}")
-                        logger.info(f"Adjustment queued: {action.ticker} {action.adjustment_type} ({action.urgency})")
-            except Exception as e:
-                logger.debug(f"Adjustment pipeline skipped: {e}")
-
-        # 9. Run ML learning after closes (periodic — every 10th cycle)
-        cycle = self.context.get('cycle_count', 0)
-        if cycle % 10 == 0 and cycle > 0:
-            try:
-                from trading_cotrader.services.trade_learner import TradeLearner
-                learner = TradeLearner()
-                learn_result = learner.learn_from_history(days=90)
-                if learn_result.trades_analyzed > 0:
-                    logger.info(
-                        f"ML learning: {learn_result.trades_analyzed} trades, "
-                        f"{learn_result.patterns_updated} patterns updated"
+        lifecycle = TradeLifecycleService(container_manager=self.container_manager)
+        close_results = lifecycle.auto_close_from_signals(exit_signals)
+        closed_count = sum(1 for r in close_results if r.get('success'))
+        if closed_count:
+            logger.info(f"Auto-closed {closed_count} trade(s) from exit signals")
+            # Refresh containers after closing
+            self._refresh_containers(self._trade_delta(
+                'auto_close', close_results,
+            ))
+            # Clear processed signals
+            self.context['exit_signals'] = [
+                s for s in exit_signals
+                if s.severity not in ('URGENT',) and s.signal_type != 'PROFIT_TARGET'
+            ]
+        return {'closed': closed_count}
+
+    def _stage_adjustments(self):
+        """Adjustment pipeline for TESTED/BREACHED positions (G9, G23)."""
+        from trading_cotrader.services.trade_health_service import TradeHealthService
+        health_service = TradeHealthService(
+            ma=self._ma, broker=self.broker, expiry_index=self._expiry_index,
+        )
+        health_result = health_service.check_all_positions()
+        for action in health_result.actions:
+            if action.action == 'CLOSE' and action.urgency == 'immediate':
+                # Auto-close via lifecycle
+                try:
+                    from trading_cotrader.services.trade_lifecycle import TradeLifecycleService
+                    lifecycle = TradeLifecycleService(container_manager=self.container_manager)
+                    lifecycle.close_trade(action.trade_id, reason=f'adjustment:{action.adjustment_type}')
+                    logger.info(f"Auto-closed {action.ticker} ({action.rationale})")
+                except Exception as e:
+                    logger.warning(f"Auto-close adjustment failed for {action.ticker}: {e}")
+            elif action.action in ('ADJUST', 'ROLL'):
+                # Flag for human execution (adjustments = new orders)
+                adjustment = {
+                    'trade_id': action.trade_id,
+                    'ticker': action.ticker,
+                    'type': action.adjustment_type,
+                    'urgency': action.urgency,
+                    'rationale': action.rationale,
+                    'close_legs': action.close_legs,  # A17: legs to close
+                    'new_legs': action.new_legs,      # A17: legs to open
+                }
+                self.context.setdefault('pending_adjustments', []).append(adjustment)
+
+                # Log detail for human execution
+                if action.close_legs:
+                    leg_str = ', '.join(
+                        f"{l.get('action','?')} {l.get('option_type','?')}{l.get('strike','?')}"
+                        for l in action.close_legs
                     )
-            except Exception as e:
-                logger.debug(f"ML learning failed (non-blocking): {e}")
-
-        # 9b. ML learning cycle — drift, bandits, thresholds, POP (ML-E1 to ML-E4)
-        if cycle % 10 == 0 and cycle > 0 and self._ma:
-            try:
-                from trading_cotrader.services.ml_learning_service import MLLearningService
-                ml = MLLearningService(ma=self._ma)
-                ml_result = ml.run_full_learning_cycle()
-                # Store drift alerts in context for Maverick
-                self.context['drift_alerts'] = ml.get_drift_alerts()
-                self.context['ml_thresholds'] = ml.get_thresholds()
-                if ml_result.get('drift', {}).get('critical', 0) > 0:
-                    logger.warning(f"ML: {ml_result['drift']['critical']} CRITICAL drift alerts!")
-                else:
-                    logger.info(f"ML cycle: {ml_result}")
-            except Exception as e:
-                logger.debug(f"ML learning cycle skipped: {e}")
-
-        # 10. Atlas: system health, ML monitoring, analytics (V1-V6, B14, K7)
-        try:
-            result = self.atlas.run(self.context)
-            if result.metrics.get('high_alerts', 0) > 0:
-                logger.warning(f"Atlas: {result.metrics['high_alerts']} HIGH alerts!")
-            elif result.metrics.get('alerts', 0) > 0:
-                logger.info(f"Atlas: {result.metrics['alerts']} alerts, {result.metrics.get('checks_passed', 0)} checks OK")
-        except Exception as e:
-            logger.debug(f"Atlas.run failed (non-blocking): {e}")
-
-        # Log summary
-        proposals = self.context.get('trade_proposals', [])
-        proposed = [p for p in proposals if p.get('status') == 'proposed']
-        exit_signals = self.context.get('exit_signals', [])
-        urgent_exits = [s for s in exit_signals if s.severity == 'URGENT']
-
-        parts = []
-        if proposed:
-            parts.append(f"{len(proposed)} trade proposal(s)")
-        if urgent_exits:
-            parts.append(f"{len(urgent_exits)} URGENT exit(s)")
-        if exit_signals and not urgent_exits:
-            parts.append(f"{len(exit_signals)} exit signal(s)")
+                    logger.info(f"Adjustment {action.ticker} CLOSE: {leg_str}")
+                if action.new_legs:
+                    leg_str = ', '.join(
+                        f"{l.get('action','?')} {l.get('option_type','?')}{l.get('strike','?')}"
+                        for l in action.new_legs
+                    )
+                    logger.info(f"Adjustment {action.ticker} OPEN: {leg_str}")
+                logger.info(f"Adjustment queued: {action.ticker} {action.adjustment_type} ({action.urgency})")
+        return {'actions': len(health_result.actions)}
+
+    def _stage_trade_learner(self):
+        """ML learning after closes (periodic — every 10th cycle)."""
+        from trading_cotrader.services.trade_learner import TradeLearner
+        learner = TradeLearner()
+        learn_result = learner.learn_from_history(days=90)
+        if learn_result.trades_analyzed > 0:
+            logger.info(
+                f"ML learning: {learn_result.trades_analyzed} trades, "
+                f"{learn_result.patterns_updated} patterns updated"
+            )
+        return learn_result
+
+    def _stage_ml_learning(self):
+        """ML learning cycle — drift, bandits, thresholds, POP (ML-E1 to ML-E4)."""
+        from trading_cotrader.services.ml_learning_service import MLLearningService
+        ml = MLLearningService(ma=self._ma)
+        ml_result = ml.run_full_learning_cycle()
+        # Store drift alerts in context for Maverick
+        self.context['drift_alerts'] = ml.get_drift_alerts()
+        self.context['ml_thresholds'] = ml.get_thresholds()
+        if ml_result.get('drift', {}).get('critical', 0) > 0:
+            logger.warning(f"ML: {ml_result['drift']['critical']} CRITICAL drift alerts!")
+        else:
+            logger.info(f"ML cycle: {ml_result}")
+        return ml_result
+
+    def _stage_atlas(self):
+        """Atlas: system health, ML monitoring, analytics (V1-V6, B14, K7)."""
+        result = self.atlas.run(self.context)
+        if result.metrics.get('high_alerts', 0) > 0:
+            logger.warning(f"Atlas: {result.metrics['high_alerts']} HIGH alerts!")
+        elif result.metrics.get('alerts', 0) > 0:
+            logger.info(f"Atlas: {result.metrics['alerts']} alerts, {result.metrics.get('checks_passed', 0)} checks OK")
+        return result
 
-        summary = ", ".join(parts) if parts else "no proposals, no exits"
-        logger.info(f"--- Agent pipeline done: {summary} ---")
+    def _record_stage_run(self, run) -> None:
+        """Persist one pipeline StageRun to AgentRunORM (agent stages keep their AgentResult)."""
+        from trading_cotrader.agents.protocol import AgentResult
+        from trading_cotrader.agents.workflow.pipeline import OK, SKIPPED, CANCELLED
+        if run.status in (SKIPPED, CANCELLED):
+            return
+        result = run.result if isinstance(run.result, AgentResult) else None
+        if run.status != OK:
+            status, messages = AgentStatus.ERROR.value, [f"{run.name} {run.error}"]
+        elif result is not None:
+            status, messages = result.status.value, result.messages or []
+        else:
+            status, messages = AgentStatus.COMPLETED.value, []
+        self._persist_agent_run(
+            agent_name=result.agent_name if result is not None else run.name,
+            status=status,
+            started_at=run.started_at,
+            finished_at=run.finished_at,
+            duration_ms=run.duration_ms,
+            result=result,
+            messages=messages,
+            metrics={**((result.metrics or {}) if result is not None else {}),
+                     'stage': run.name, 'stage_status': run.status},
+        )
 
     # -----------------------------------------------------------------
     # Condition methods (used by transitions library)
@@ -590,10 +718,13 @@ class WorkflowEngine:
             logger.debug(f"Skip monitoring cycle: state is {current}")
             return
 
-        # Sync broker + refresh containers + run agents
+        # Sync broker (applies its own position deltas) + periodic consistency
+        # reload of containers + run agents
         self._sync_broker_positions()
-        self._refresh_containers()
+        self._capture_intraday_greeks()
+        self._refresh_containers(self._trade_delta('monitoring_cycle', []))
         self._run_agent_pipeline()
+        self._sync_exit_triggers()
 
     def eod(self):
         """End-of-day: overnight risk check + daily report."""
@@ -603,7 +734,7 @@ class WorkflowEngine:
         if self._ma:
             try:
                 from trading_cotrader.services.trade_health_service import TradeHealthService
-                health_service = TradeHealthService(ma=self._ma)
+                health_service = TradeHealthService(ma=self._ma, expiry_index=self._expiry_index)
                 overnight = health_service.assess_overnight_risk(
                     cross_market=self.context.get('cross_market'),
                 )
@@ -622,6 +753,9 @@ class WorkflowEngine:
         # Generate daily report
         self.report()
 
+        # Compact intraday snapshot history into 5m / 1h / 1d tiers
+        self._compact_snapshot_history()
+
     def report(self):
         """Generate and log daily P&L report."""
         logger.info("--- Daily Report ---")
@@ -647,7 +781,7 @@ class WorkflowEngine:
 
         try:
             from trading_cotrader.services.intraday_monitor import IntradayMonitorService
-            service = IntradayMonitorService(ma=self._ma)
+            service = IntradayMonitorService(ma=self._ma, expiry_index=self._expiry_index)
             result = service.run_fast_cycle()
 
             if not result.signals:
@@ -661,7 +795,9 @@ class WorkflowEngine:
                         lifecycle = TradeLifecycleService(container_manager=self.container_manager)
                         lifecycle.close_trade(signal.trade_id, reason=f'intraday:{signal.signal_type}')
                         logger.info(f"0DTE auto-close: {signal.ticker} ({signal.message})")
-                        self._refresh_containers()
+                        self._refresh_containers(self._trade_delta(
+                            'intraday_close', [{'success': True, 'trade_id': signal.trade_id}],
+                        ))
                     except Exception as e:
                         logger.warning(f"0DTE auto-close failed for {signal.ticker}: {e}")
                 elif signal.action == 'ALERT':
@@ -784,19 +920,43 @@ class WorkflowEngine:
         except Exception as e:
             logger.warning(f"ContainerManager init failed (non-blocking): {e}")
 
-    def _refresh_containers(self):
-        """Refresh ContainerManager from DB — populates positions, risk factors, trades."""
+    @property
+    def _expiry_index(self):
+        """Open trades bucketed by expiration (None until containers exist)."""
+        cm = self.container_manager
+        return cm.expiry_index if cm is not None else None
+
+    def _refresh_containers(self, delta=None):
+        """
+        Refresh ContainerManager from DB — populates positions, risk factors, trades.
+
+        With a ContainerDelta only the named rows are re-read, unless the
+        periodic full-reload consistency check is due. Without one, every
+        bundle is reloaded.
+        """
         cm = self.container_manager
         if cm is None:
             return
         try:
             from trading_cotrader.core.database.session import session_scope
             with session_scope() as session:
-                cm.load_all_bundles(session)
-            logger.info("Containers refreshed from DB")
+                cm.sync(session, delta)
+            if delta is None:
+                logger.info("Containers refreshed from DB")
+            else:
+                logger.debug(f"Containers synced ({delta.source})")
         except Exception as e:
             logger.warning(f"Container refresh failed (non-blocking): {e}")
 
+    @staticmethod
+    def _trade_delta(source: str, results: List[Dict]):
+        """ContainerDelta for the trades in successful booking/close results."""
+        from trading_cotrader.containers.container_manager import ContainerDelta
+        return ContainerDelta(
+            source=source,
+            trades={r['trade_id'] for r in results if r.get('success') and r.get('trade_id')},
+        )
+
     def _sync_broker_positions(self):
         """
         Sync positions from all API-capable brokers into DB.
@@ -825,6 +985,9 @@ class WorkflowEngine:
                 with session_scope() as session:
                     sync_svc = PortfolioSyncService(session, adapter)
                     result = sync_svc.sync_portfolio()
+                    # Push only the reconciled rows into the owning bundle
+                    if result.success and self.container_manager:
+                        self.container_manager.apply_position_changes(session, result.changes)
 
                 if result.success:
                     logger.info(
@@ -852,14 +1015,11 @@ class WorkflowEngine:
             return
         try:
             # Load watchlist config first
-            from pathlib import Path
-            import yaml
-            config_path = Path(__file__).parent.parent / 'config' / 'market_watchlist.yaml'
-            if config_path.exists():
-                with open(config_path, 'r') as f:
-                    cfg = yaml.safe_load(f)
-                items = cfg.get('watchlist', [])
-                cm.research.load_watchlist_config(items)
+            from trading_cotrader.config.config_registry import CONFIG_DIR, get_config_registry
+            watchlist_path = CONFIG_DIR / 'market_watchlist.yaml'
+            if watchlist_path.exists():
+                cfg = get_config_registry().get_raw(watchlist_path)
+                cm.research.load_watchlist_config(cfg.get('watchlist', []))
 
             from trading_cotrader.core.database.session import session_scope
             with session_scope() as session:
@@ -974,6 +1134,125 @@ class WorkflowEngine:
             logger.error(f"Snapshot capture failed: {e}")
             return {}
 
+    def _capture_intraday_greeks(self) -> int:
+        """Snapshot position Greeks for this cycle (one bulk upsert)."""
+        try:
+            from trading_cotrader.core.database.session import session_scope
+            from trading_cotrader.services.snapshot_service import SnapshotService
+
+            with session_scope() as session:
+                return SnapshotService(session).capture_intraday_greeks()
+        except Exception as e:
+            logger.warning(f"Intraday Greeks snapshot failed: {e}")
+            return 0
+
+    def _compact_snapshot_history(self) -> dict:
+        """Roll up snapshot history and apply retention (non-blocking)."""
+        try:
+            from trading_cotrader.core.database.session import session_scope
+            from trading_cotrader.services.snapshot_rollup import SnapshotRollupService
+
+            with session_scope() as session:
+                return SnapshotRollupService(session).compact().to_dict()
+        except Exception as e:
+            logger.warning(f"Snapshot compaction failed: {e}")
+            return {}
+
+    # -----------------------------------------------------------------
+    # Quote-driven exit triggers
+    # -----------------------------------------------------------------
+
+    def _sync_exit_triggers(self):
+        """
+        Rebuild the exit trigger index from the open book and subscribe its
+        symbols on the persistent DXLink stream. No-op without streaming —
+        the monitoring cycle's ExitMonitorService still covers exits.
+        """
+        stream = getattr(self.broker, 'stream', None)
+        if stream is None:
+            return
+        try:
+            from trading_cotrader.core.database.session import session_scope
+            from trading_cotrader.core.database.tenant import scoped_open_trades
+            from trading_cotrader.repositories.trade import TradeQuery
+            from trading_cotrader.services.exit_trigger_index import ExitTriggerIndex
+            from trading_cotrader.services.mark_to_market import _build_streamer_symbol
+
+            with session_scope() as session:
+                trades = TradeQuery(session, scoped_open_trades(session)).all()
+                index = ExitTriggerIndex.from_trades(trades, symbol_fn=_build_streamer_symbol)
+        except Exception as e:
+            logger.warning(f"Exit trigger index not rebuilt (non-blocking): {e}")
+            return
+
+        previous = self._exit_triggers
+        self._exit_triggers = index
+        # Acquire before releasing so symbols held by both are never unsubscribed
+        stream.acquire(index.symbols)
+        if previous is None:
+            stream.add_listener(self._on_exit_quote)
+        else:
+            stream.release(previous.symbols)
+        logger.info(f"Exit triggers: {len(index)} levels on {len(index.symbols)} symbols "
+                    f"for {len(index.trade_ids)} trades")
+
+    def _stop_exit_triggers(self):
+        """Detach from the stream and let queued trigger closes finish."""
+        stream = getattr(self.broker, 'stream', None)
+        if stream is not None and self._exit_triggers is not None:
+            stream.remove_listener(self._on_exit_quote)
+            stream.release(self._exit_triggers.symbols)
+        self._exit_triggers = None
+        executor, self._exit_close_executor = self._exit_close_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _on_exit_quote(self, symbol: str, quote: dict):
+        """Stream-thread listener: push fired triggers onto the exit signal path."""
+        index = self._exit_triggers
+        if index is None:
+            return
+        signals = index.on_quote(symbol, quote)
+        if not signals:
+            return
+
+        # Replace rather than mutate — the pipeline may be iterating the old list
+        self.context['exit_signals'] = list(self.context.get('exit_signals') or []) + signals
+
+        # Same auto-close policy as the pipeline: URGENT + profit targets
+        actionable = [s for s in signals if s.severity == 'URGENT' or s.signal_type == 'PROFIT_TARGET']
+        if actionable:
+            if self._exit_close_executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._exit_close_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix='exit-trigger',
+                )
+            # Closing touches the DB — keep it off the stream thread
+            self._exit_close_executor.submit(self._close_triggered_exits, actionable)
+
+    def _close_triggered_exits(self, signals: list):
+        """Auto-close trades whose stop / target fired between cycles."""
+        try:
+            from trading_cotrader.services.trade_lifecycle import TradeLifecycleService
+            lifecycle = TradeLifecycleService(container_manager=self.container_manager)
+            # Exit at the tick that fired the trigger, not the last cycle's DB mark
+            results = lifecycle.auto_close_from_signals(signals, at_signal_price=True)
+        except Exception as e:
+            logger.warning(f"Auto-close from exit triggers failed: {e}")
+            return
+
+        closed = {r['trade_id'] for r in results if r.get('success')}
+        if not closed:
+            return
+        logger.info(f"Auto-closed {len(closed)} trade(s) from live exit triggers")
+        index = self._exit_triggers
+        if index is not None:
+            for trade_id in closed:
+                index.remove_trade(trade_id)
+        self.context['exit_signals'] = [
+            s for s in self.context.get('exit_signals') or [] if s.trade_id not in closed
+        ]
+
     def _run_agent(self, agent, context: dict, method: str = 'run') -> 'AgentResult':
         """
         Run an agent method with timing, persist result to AgentRunORM.
@@ -1002,6 +1281,25 @@ class WorkflowEngine:
             logger.log(level, f"[{result.agent_name}] {msg}")
 
         # Persist to DB (fire-and-forget)
+        self._persist_agent_run(
+            agent_name=result.agent_name,
+            status=result.status.value if hasattr(result.status, 'value') else str(result.status),
+            started_at=started_at,
+            finished_at=finished_at,
+            duration_ms=duration_ms,
+            result=result,
+            messages=result.messages or [],
+            metrics=result.metrics or {},
+        )
+
+        return result
+
+    def _persist_agent_run(
+        self, agent_name: str, status: str, started_at, finished_at, duration_ms: int,
+        result=None, messages: Optional[List[str]] = None, metrics: Optional[dict] = None,
+    ) -> None:
+        """Write one AgentRunORM row (fire-and-forget — failures never block the workflow)."""
+        messages = messages or []
         try:
             from trading_cotrader.core.database.session import session_scope
             from trading_cotrader.core.database.schema import AgentRunORM
@@ -1009,26 +1307,24 @@ class WorkflowEngine:
             with session_scope() as session:
                 run = AgentRunORM(
                     id=str(uuid.uuid4()),
-                    agent_name=result.agent_name,
+                    agent_name=agent_name,
                     cycle_id=self.context.get('cycle_count', 0),
                     workflow_state=self.state,
-                    status=result.status.value if hasattr(result.status, 'value') else str(result.status),
+                    status=status,
                     started_at=started_at,
                     finished_at=finished_at,
                     duration_ms=duration_ms,
-                    data_json=result.data or {},
-                    messages=result.messages or [],
-                    metrics_json=result.metrics or {},
-                    objectives=result.objectives or [],
-                    requires_human=result.requires_human,
-                    human_prompt=result.human_prompt,
-                    error_message=result.messages[0] if result.status == AgentStatus.ERROR and result.messages else None,
+                    data_json=(result.data if result is not None else None) or {},
+                    messages=messages,
+                    metrics_json=metrics or {},
+                    objectives=(result.objectives if result is not None else None) or [],
+                    requires_human=result.requires_human if result is not None else False,
+                    human_prompt=result.human_prompt if result is not None else None,
+                    error_message=messages[0] if status == AgentStatus.ERROR.value and messages else None,
                 )
                 session.add(run)
         except Exception as e:
-            logger.debug(f"Failed to persist agent run for {result.agent_name}: {e}")
-
-        return result
+            logger.debug(f"Failed to persist agent run for {agent_name}: {e}")
 
     def _log_agent(self, result):
         """Log agent result (legacy — used for results already obtained)."""
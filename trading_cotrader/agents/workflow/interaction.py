@@ -2368,7 +2368,7 @@ class InteractionManager:
                 pass
 
         learner = TradeLearner()
-        result = learner.learn_from_history(days=days)
+        result = learner.learn_from_history(days=days, full_rebuild=True)
 
         lines.append(f"  Analyzed {result.trades_analyzed} closed trades (last {days} days)")
         lines.append(f"  Patterns: {result.patterns_updated} updated, {result.patterns_discovered} new")
@@ -2588,7 +2588,7 @@ class InteractionManager:
 
         try:
             from trading_cotrader.services.trade_health_service import TradeHealthService
-            service = TradeHealthService(ma=engine._ma, broker=engine.broker)
+            service = TradeHealthService(ma=engine._ma, broker=engine.broker, expiry_index=engine._expiry_index)
             result = service.check_all_positions()
 
             lines.append(f"  Checked: {result.trades_checked} | Healthy: {result.trades_healthy} | Need action: {result.trades_needing_action}")
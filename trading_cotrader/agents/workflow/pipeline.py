@@ -0,0 +1,229 @@
+"""
+Pipeline Scheduler — Runs the agent pipeline as a dependency graph.
+
+Each stage declares the stages it must run after. Stages whose dependencies
+are done run concurrently on a small thread pool, so a cycle costs roughly
+its critical path instead of the sum of all stages.
+
+Semantics (same as the old sequential pipeline):
+    - A stage that fails or times out does not block its dependants —
+      every stage already guarded itself with try/except.
+    - A stage with ``when`` returning False at dispatch time is SKIPPED.
+    - A timed-out stage is abandoned (Python threads cannot be killed); its
+      worker finishes in the background and its result is discarded. Its
+      dependants start while it may still be running, so stages that write
+      shared state (``mutates=True``) may not have a timeout — the scheduler
+      rejects the combination.
+    - Setting the cancel event stops dispatching: running stages finish,
+      not-yet-started stages are CANCELLED.
+    - Each stage runs in a copy of the caller's contextvars context, so
+      context-scoped state (e.g. a frozen config snapshot) reaches workers.
+
+Usage:
+    scheduler = PipelineScheduler([
+        PipelineStage('populate', populate),
+        PipelineStage('risk', risk, after=('populate',), timeout=60),
+        PipelineStage('research', research),
+        PipelineStage('trade', trade, after=('risk', 'research')),
+    ], on_stage_done=persist)
+    runs = scheduler.run()
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import contextvars
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+OK = 'ok'
+ERROR = 'error'
+TIMEOUT = 'timeout'
+SKIPPED = 'skipped'
+CANCELLED = 'cancelled'
+
+
+@dataclass
+class PipelineStage:
+    """One node of the pipeline graph."""
+    name: str
+    fn: Callable[[], Any]
+    after: Tuple[str, ...] = ()
+    timeout: Optional[float] = None           # seconds; None = no limit
+    when: Optional[Callable[[], bool]] = None  # evaluated when the stage becomes ready
+    mutates: bool = False                      # writes trades / DB: never abandoned
+
+
+@dataclass
+class StageRun:
+    """Outcome and timing of one stage in one pipeline run."""
+    name: str
+    status: str = CANCELLED
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_ms: int = 0
+    result: Any = None
+    error: Optional[str] = None
+
+
+class PipelineScheduler:
+    """Validates a stage graph once and executes it per run()."""
+
+    def __init__(
+        self,
+        stages: Sequence[PipelineStage],
+        max_workers: int = 4,
+        on_stage_done: Optional[Callable[[StageRun], None]] = None,
+    ):
+        self.stages: Dict[str, PipelineStage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate pipeline stage: {stage.name}")
+            if stage.mutates and stage.timeout:
+                raise ValueError(
+                    f"Stage '{stage.name}' mutates shared state and cannot have a timeout "
+                    f"(an abandoned stage keeps running alongside its dependants)"
+                )
+            self.stages[stage.name] = stage
+        self.max_workers = max_workers
+        self.on_stage_done = on_stage_done
+        self.order = self._topological_order()
+        self._lock = threading.Lock()  # guards StageRun status between worker and scheduler
+
+    def _topological_order(self) -> List[str]:
+        indegree = {name: 0 for name in self.stages}
+        for stage in self.stages.values():
+            for dep in stage.after:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+                indegree[stage.name] += 1
+        ready = [name for name, d in indegree.items() if d == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for other in self.stages.values():
+                if name in other.after:
+                    indegree[other.name] -= 1
+                    if indegree[other.name] == 0:
+                        ready.append(other.name)
+        if len(order) != len(self.stages):
+            cyclic = sorted(set(self.stages) - set(order))
+            raise ValueError(f"Pipeline has a dependency cycle through: {cyclic}")
+        return order
+
+    def critical_path_ms(self, runs: Dict[str, StageRun]) -> int:
+        """Longest dependency chain by measured stage durations."""
+        finish: Dict[str, int] = {}
+        for name in self.order:
+            deps = self.stages[name].after
+            finish[name] = max((finish[d] for d in deps), default=0) + runs[name].duration_ms
+        return max(finish.values(), default=0)
+
+    # -----------------------------------------------------------------
+    # Execution
+    # -----------------------------------------------------------------
+
+    def run(self, cancel: Optional[threading.Event] = None) -> Dict[str, StageRun]:
+        """Execute the graph; returns a StageRun per stage (in topological order)."""
+        runs = {name: StageRun(name=name) for name in self.order}
+        pending = {name: set(self.stages[name].after) for name in self.order}
+        running: Dict[Future, Tuple[str, float]] = {}  # future → (stage, monotonic deadline)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pipeline')
+        try:
+            while pending or running:
+                if cancel is not None and cancel.is_set():
+                    break
+
+                for name in [n for n, deps in pending.items() if not deps]:
+                    del pending[name]
+                    stage = self.stages[name]
+                    if stage.when is not None and not self._guard(stage):
+                        runs[name].status = SKIPPED
+                        self._finished(name, pending)
+                        continue
+                    runs[name].started_at = datetime.utcnow()
+                    deadline = time.monotonic() + stage.timeout if stage.timeout else float('inf')
+                    ctx = contextvars.copy_context()
+                    running[executor.submit(ctx.run, self._call, stage, runs[name])] = (name, deadline)
+
+                if not running:
+                    continue
+
+                next_deadline = min(d for _, d in running.values())
+                wait_for = None if next_deadline == float('inf') else max(0.0, next_deadline - time.monotonic())
+                if cancel is not None:
+                    wait_for = 0.1 if wait_for is None else min(wait_for, 0.1)
+                done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name, _ = running.pop(future)
+                    self._emit(runs[name])
+                    self._finished(name, pending)
+
+                now = time.monotonic()
+                for future, (name, deadline) in list(running.items()):
+                    if deadline > now:
+                        continue
+                    run = runs[name]
+                    with self._lock:
+                        if run.finished_at is not None:
+                            continue  # finished just in time; reported next round
+                        run.status = TIMEOUT
+                        run.finished_at = datetime.utcnow()
+                        run.duration_ms = int(self.stages[name].timeout * 1000)
+                        run.error = f"timed out after {self.stages[name].timeout:g}s"
+                    running.pop(future)
+                    future.cancel()
+                    logger.warning(f"Pipeline stage {name} {run.error} — continuing without it")
+                    self._emit(run)
+                    self._finished(name, pending)
+
+            if pending or running:
+                logger.warning(f"Pipeline cancelled: {len(pending)} stage(s) not started")
+                for future, (name, _) in running.items():
+                    wait([future])
+                    self._emit(runs[name])
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return runs
+
+    def _guard(self, stage: PipelineStage) -> bool:
+        try:
+            return bool(stage.when())
+        except Exception as e:
+            logger.warning(f"Pipeline stage {stage.name} condition failed: {e}")
+            return False
+
+    def _call(self, stage: PipelineStage, run: StageRun) -> None:
+        t0 = time.monotonic()
+        result, error = None, None
+        try:
+            result = stage.fn()
+        except Exception as e:
+            error = str(e)
+            logger.warning(f"Pipeline stage {stage.name} failed: {e}")
+        with self._lock:
+            if run.status == TIMEOUT:
+                return  # already reported; late result is discarded
+            run.result, run.error = result, error
+            run.duration_ms = int((time.monotonic() - t0) * 1000)
+            run.finished_at = datetime.utcnow()
+            run.status = ERROR if error is not None else OK
+
+    def _finished(self, name: str, pending: Dict[str, set]) -> None:
+        for deps in pending.values():
+            deps.discard(name)
+
+    def _emit(self, run: StageRun) -> None:
+        if self.on_stage_done is None:
+            return
+        try:
+            self.on_stage_done(run)
+        except Exception as e:
+            logger.debug(f"Pipeline stage callback failed for {run.name}: {e}")
@@ -5,6 +5,7 @@ CLI: Audit codebase for hardcoded market data / local math violations
 Enforces the ZERO LOCAL MATH policy:
   - Greeks and prices ALWAYS come from the broker (DXLink streaming)
   - No Black-Scholes, POP/EV, VaR calculations
+    (except the portfolio VaR engine — see RULE_EXEMPTIONS)
   - No hardcoded prices, correlations, volatilities, rates
   - No fallback values that mask missing real data
 
@@ -28,6 +29,14 @@ SKIP_DIRS = {'tests', 'playground', '__pycache__', 'frontend', 'node_modules', '
 SKIP_DIRS.add('harness')
 # Files to skip
 SKIP_FILES = {'audit_market_data.py'}  # don't flag ourselves
+# Per-file rule exemptions, keyed by path relative to the scan root.
+# The portfolio VaR engine is the sanctioned exception to "no VaR calculations":
+# it aggregates broker-supplied Greeks over a historical covariance, so its
+# normal quantile/density (parametric VaR/ES) and the 1/2 in the delta-gamma
+# expansion are risk-model math, not option pricing or fallback Greeks.
+RULE_EXEMPTIONS = {
+    'services/risk/var.py': {'NO_LOCAL_MATH', 'NO_HARDCODED_GREEKS'},
+}
 
 
 @dataclass
@@ -304,6 +313,8 @@ def scan_codebase(root: Path, strict: bool = False) -> List[Violation]:
             continue
 
         file_violations = scan_file(pyfile)
+        exempt = RULE_EXEMPTIONS.get('/'.join(rel_parts), set())
+        file_violations = [v for v in file_violations if v.rule not in exempt]
 
         if not strict:
             file_violations = [v for v in file_violations if v.severity == 'ERROR']
@@ -13,9 +13,10 @@ Usage:
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from pathlib import Path
-import yaml
 import logging
 
+from trading_cotrader.config.config_registry import get_config_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -73,7 +74,7 @@ def load_broker_registry(config_path: str = None) -> BrokerRegistry:
         config_path: Explicit path. If None, searches default locations.
 
     Returns:
-        BrokerRegistry with all brokers loaded.
+        BrokerRegistry with all brokers loaded (cached per file version).
     """
     if config_path:
         path = Path(config_path)
@@ -82,12 +83,13 @@ def load_broker_registry(config_path: str = None) -> BrokerRegistry:
     else:
         path = _find_config_file()
 
-    logger.info(f"Loading broker config from: {path}")
-    with open(path, 'r') as f:
-        raw = yaml.safe_load(f)
+    return get_config_registry().get(path, _parse_registry)
+
 
+def _parse_registry(raw: dict) -> BrokerRegistry:
+    """Parse raw YAML dict into a BrokerRegistry."""
     brokers_dict = {}
-    for name, data in raw.get('brokers', {}).items():
+    for name, data in (raw or {}).get('brokers', {}).items():
         brokers_dict[name] = BrokerConfig(
             name=name,
             display_name=data.get('display_name', name),
@@ -114,13 +116,6 @@ def _find_config_file() -> Path:
     )
 
 
-# Singleton
-_broker_registry: Optional[BrokerRegistry] = None
-
-
 def get_broker_registry() -> BrokerRegistry:
-    """Get global broker registry (singleton)."""
-    global _broker_registry
-    if _broker_registry is None:
-        _broker_registry = load_broker_registry()
-    return _broker_registry
+    """Get global broker registry (shared via the config registry, hot-reloaded)."""
+    return load_broker_registry()
@@ -0,0 +1,202 @@
+"""
+Config Registry — Parse-once, file-watched cache for the YAML configs.
+
+Every YAML under config/ is read and parsed once; later reads are served
+from memory. Each read re-stats the file (at most once per
+``check_interval`` seconds); when mtime/size move, the bytes are hashed and
+only a real content change re-parses the file and bumps its version.
+
+Provides:
+- get_raw(path): parsed YAML dict (shared — treat as read-only)
+- get(path, parser): typed object built by ``parser(raw)``, cached per file
+  version so e.g. RiskConfig is rebuilt only when risk_config.yaml changes
+- version / file_version(path): counters downstream caches key on
+- frozen(): inside the block (and in contexts copied from it, e.g. pipeline
+  stage workers) each file is pinned at its first read, so every agent in a
+  workflow cycle sees the same snapshot even if a file is edited mid-cycle.
+  Other threads keep reading live files.
+
+Usage:
+    from trading_cotrader.config.config_registry import CONFIG_DIR, get_config_registry
+    registry = get_config_registry()
+    raw = registry.get_raw(CONFIG_DIR / 'risk_config.yaml')
+    desks = registry.get(CONFIG_DIR / 'risk_config.yaml', parse_desks)
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+import hashlib
+import logging
+import threading
+import time
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+CONFIG_DIR = Path(__file__).parent
+
+PathLike = Union[str, Path]
+
+# Files pinned by the innermost frozen() block of the current context
+_snapshot: ContextVar[Optional[Dict[Path, '_ConfigFile']]] = ContextVar('config_snapshot', default=None)
+
+
+@dataclass
+class _ConfigFile:
+    """One cached YAML file"""
+    path: Path
+    raw: Any
+    digest: str
+    stat_key: Tuple[int, int]  # (mtime_ns, size)
+    version: int = 1
+    checked_at: float = 0.0
+    parsed: Dict[Any, Tuple[int, Any]] = field(default_factory=dict)  # parser → (version, obj)
+
+
+class ConfigRegistry:
+    """
+    Process-wide cache of parsed config files.
+
+    Thread-safe: web handlers and the workflow engine read concurrently.
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self._files: Dict[Path, _ConfigFile] = {}
+        self._lock = threading.RLock()
+        self.version = 0  # bumped on every load / content change of any file
+        self.loads = 0    # YAML parses performed (observability)
+
+    # -----------------------------------------------------------------
+    # Reads
+    # -----------------------------------------------------------------
+
+    def get_raw(self, path: PathLike) -> Any:
+        """Parsed YAML for ``path``. Raises FileNotFoundError if missing."""
+        return self._entry(path).raw
+
+    def get(self, path: PathLike, parser: Callable[[Any], Any]) -> Any:
+        """Typed view of ``path`` built by ``parser(raw)``, cached per file version."""
+        with self._lock:
+            entry = self._entry(path)
+            cached = entry.parsed.get(parser)
+            if cached is not None and cached[0] == entry.version:
+                return cached[1]
+            obj = parser(entry.raw)
+            entry.parsed[parser] = (entry.version, obj)
+            return obj
+
+    def file_version(self, path: PathLike) -> int:
+        """Version of one file (0 if never loaded)"""
+        entry = self._files.get(self._key(path))
+        return entry.version if entry else 0
+
+    # -----------------------------------------------------------------
+    # Invalidation
+    # -----------------------------------------------------------------
+
+    def invalidate(self, path: Optional[PathLike] = None) -> None:
+        """Force a re-stat/hash of one file (or all) on next read — e.g. after writing it"""
+        with self._lock:
+            entries = self._files.values() if path is None else [self._files.get(self._key(path))]
+            for entry in entries:
+                if entry is not None:
+                    entry.checked_at = 0.0
+                    entry.stat_key = (-1, -1)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files.clear()
+
+    @contextmanager
+    def frozen(self):
+        """Pin each config at its first read for the current context (nests)"""
+        if _snapshot.get() is not None:
+            yield self
+            return
+        token = _snapshot.set({})
+        try:
+            yield self
+        finally:
+            _snapshot.reset(token)
+
+    # -----------------------------------------------------------------
+    # Internals
+    # -----------------------------------------------------------------
+
+    @staticmethod
+    def _key(path: PathLike) -> Path:
+        return Path(path).resolve()
+
+    def _entry(self, path: PathLike) -> _ConfigFile:
+        key = self._key(path)
+        pinned = _snapshot.get()
+        with self._lock:
+            if pinned is not None and key in pinned:
+                return pinned[key]
+            entry = self._files.get(key)
+            if entry is None or time.monotonic() - entry.checked_at >= self.check_interval:
+                entry = self._refresh(key, entry)
+            if pinned is not None:
+                # Private copy: a reload elsewhere mutates the shared entry in place
+                entry = pinned[key] = replace(entry, parsed=dict(entry.parsed))
+            return entry
+
+    def _refresh(self, key: Path, entry: Optional[_ConfigFile]) -> _ConfigFile:
+        try:
+            st = key.stat()
+        except FileNotFoundError:
+            if entry is not None:
+                logger.warning(f"Config file disappeared, serving last good copy: {key}")
+                entry.checked_at = time.monotonic()
+                return entry
+            raise FileNotFoundError(f"Config file not found: {key}")
+
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if entry is not None and entry.stat_key == stat_key:
+            entry.checked_at = time.monotonic()
+            return entry
+
+        data = key.read_bytes()
+        digest = hashlib.sha1(data).hexdigest()
+        if entry is not None and entry.digest == digest:
+            # Touched but unchanged — keep parsed objects
+            entry.stat_key = stat_key
+            entry.checked_at = time.monotonic()
+            return entry
+
+        raw = yaml.safe_load(data)
+        self.loads += 1
+        self.version += 1
+        if entry is None:
+            entry = _ConfigFile(path=key, raw=raw, digest=digest, stat_key=stat_key)
+            self._files[key] = entry
+            logger.info(f"Config loaded: {key.name}")
+        else:
+            entry.raw = raw
+            entry.digest = digest
+            entry.stat_key = stat_key
+            entry.version += 1
+            entry.parsed.clear()
+            logger.info(f"Config reloaded: {key.name} (v{entry.version})")
+        entry.checked_at = time.monotonic()
+        return entry
+
+
+# Singleton
+_registry: Optional[ConfigRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_config_registry() -> ConfigRegistry:
+    """Get the process-wide config registry (singleton)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ConfigRegistry()
+    return _registry
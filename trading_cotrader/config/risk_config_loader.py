@@ -9,9 +9,10 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
 from pathlib import Path
 from decimal import Decimal
-import yaml
 import logging
 
+from trading_cotrader.config.config_registry import get_config_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -404,26 +405,21 @@ class RiskConfigLoader:
             path = self._find_config_file()
         
         self._config_path = path
-        logger.info(f"Loading risk config from: {path}")
-        
-        # Load YAML
-        with open(path, 'r') as f:
-            raw_config = yaml.safe_load(f)
-        
-        # Parse into typed config
-        self._config = self._parse_config(raw_config)
         
-        logger.info(f"✓ Loaded risk configuration")
+        # Parsed once per file version, shared by every loader instance
+        self._config = get_config_registry().get(path, RiskConfigLoader._parse_config)
         return self._config
     
     def get_config(self) -> RiskConfig:
-        """Get loaded config (load if not already loaded)."""
-        if self._config is None:
+        """Get loaded config (load if not already loaded, pick up file edits)."""
+        if self._config_path is None:
             return self.load()
+        self._config = get_config_registry().get(self._config_path, RiskConfigLoader._parse_config)
         return self._config
     
     def reload(self) -> RiskConfig:
         """Reload configuration from file."""
+        get_config_registry().invalidate(self._config_path)
         if self._config_path:
             return self.load(str(self._config_path))
         return self.load()
@@ -438,8 +434,10 @@ class RiskConfigLoader:
             f"Risk config file not found. Tried: {[str(p) for p in self.DEFAULT_PATHS]}"
         )
     
-    def _parse_config(self, raw: Dict) -> RiskConfig:
+    @staticmethod
+    def _parse_config(raw: Dict) -> RiskConfig:
         """Parse raw YAML into typed config."""
+        raw = raw or {}
         config = RiskConfig()
         
         # Portfolio risk
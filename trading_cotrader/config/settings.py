@@ -114,6 +114,11 @@ class Settings(BaseSettings):
         description="Automatically validate data after sync"
     )
     
+    data_dir: Path = Field(
+        default=Path("data"),
+        description="Local data directory (returns store, cached market history)"
+    )
+    
     # ========================================================================
     # Risk Management Defaults
     # ========================================================================
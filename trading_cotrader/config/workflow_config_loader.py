@@ -12,9 +12,10 @@ Usage:
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from pathlib import Path
-import yaml
 import logging
 
+from trading_cotrader.config.config_registry import get_config_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -172,7 +173,8 @@ def load_workflow_config(config_path: str = None) -> WorkflowConfig:
         config_path: Explicit path. If None, searches default locations.
 
     Returns:
-        WorkflowConfig with all rules loaded.
+        WorkflowConfig with all rules loaded. Parsed once per file version
+        via the config registry, so repeated calls are cheap.
     """
     if config_path:
         path = Path(config_path)
@@ -181,11 +183,7 @@ def load_workflow_config(config_path: str = None) -> WorkflowConfig:
     else:
         path = _find_config_file()
 
-    logger.info(f"Loading workflow config from: {path}")
-    with open(path, 'r') as f:
-        raw = yaml.safe_load(f)
-
-    return _parse_config(raw)
+    return get_config_registry().get(path, _parse_config)
 
 
 def _find_config_file() -> Path:
@@ -200,6 +198,7 @@ def _find_config_file() -> Path:
 
 def _parse_config(raw: dict) -> WorkflowConfig:
     """Parse raw YAML dict into typed WorkflowConfig."""
+    raw = raw or {}
     wf = raw.get('workflow', {})
     config = WorkflowConfig(
         cycle_frequency_minutes=wf.get('cycle_frequency_minutes', 30),
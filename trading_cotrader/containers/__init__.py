@@ -10,6 +10,7 @@ They provide:
 Design:
 - Containers load data from repositories on init/refresh
 - Changes are tracked at the field level for efficient UI updates
+- Services publish ContainerDelta notices; only the affected rows are patched
 - Containers emit events when data changes
 """
 
@@ -18,8 +19,9 @@ from .position_container import PositionContainer
 from .risk_factor_container import RiskFactorContainer
 from .trade_container import TradeContainer
 from .portfolio_bundle import PortfolioBundle
-from .container_manager import ContainerManager, CellUpdate, ContainerEvent
+from .container_manager import ContainerManager, CellUpdate, ContainerEvent, ContainerDelta
 from .research_container import ResearchContainer, ResearchEntry, MacroContext
+from .expiry_index import ExpiryIndex, ExpiringTrade
 
 __all__ = [
     'PortfolioContainer',
@@ -30,7 +32,10 @@ __all__ = [
     'ContainerManager',
     'CellUpdate',
     'ContainerEvent',
+    'ContainerDelta',
     'ResearchContainer',
     'ResearchEntry',
     'MacroContext',
+    'ExpiryIndex',
+    'ExpiringTrade',
 ]
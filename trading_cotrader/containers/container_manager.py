@@ -6,13 +6,25 @@ Provides:
 - Event bus for container updates
 - Cell-level change tracking for WebSocket push
 - Repository integration for loading data
+- Incremental refresh from ContainerDelta change notices, with a periodic
+  full reload as consistency check
+- A state lock: every load/patch and every full-state read holds it, so
+  readers on other threads (API, WebSocket stream) never see a half-applied
+  update
+
+Usage:
+    delta = ContainerDelta(source='trade_booking', trades={trade_id})
+    cm.sync(session, delta)     # patches affected rows; full reload when due
+    cm.sync(session)            # explicit full reload
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Dict, List, Any, Callable, Optional
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Callable, Iterable, Optional, Set
 from enum import Enum
+import functools
 import logging
+import threading
 
 from .portfolio_container import PortfolioContainer
 from .position_container import PositionContainer
@@ -21,6 +33,7 @@ from .trade_container import TradeContainer
 from .portfolio_bundle import PortfolioBundle
 from .market_data_container import MarketDataContainer
 from .research_container import ResearchContainer
+from .expiry_index import ExpiryIndex
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +48,11 @@ class EventType(Enum):
     FULL_REFRESH = "full_refresh"
     CELL_UPDATE = "cell_update"
     MARKET_DATA_UPDATE = "market_data_update"
+    INCREMENTAL_UPDATE = "incremental_update"
+
+
+# How long incremental deltas are trusted before sync() forces a full reload
+DEFAULT_FULL_RELOAD_INTERVAL = timedelta(minutes=15)
 
 
 @dataclass
@@ -77,6 +95,57 @@ class ContainerEvent:
         }
 
 
+@dataclass
+class ContainerDelta:
+    """
+    Row-level change notice published by services after they write to the DB.
+
+    Carries ids only. ContainerManager.apply_delta() re-reads exactly those
+    rows and patches the owning bundles instead of rebuilding every container.
+    A trade that is no longer open (closed, auto-closed) drops out of its
+    bundle; marked legs resolve to their trade.
+    """
+    source: str = 'unknown'
+    trades: Set[str] = field(default_factory=set)             # booked / marked / closed
+    legs: Set[str] = field(default_factory=set)               # leg marked → owning trade reloaded
+    positions: Set[str] = field(default_factory=set)          # position inserted / updated
+    removed_positions: Set[str] = field(default_factory=set)
+    portfolios: Set[str] = field(default_factory=set)         # portfolio aggregates changed
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.trades or self.legs or self.positions
+                    or self.removed_positions or self.portfolios)
+
+    def merge(self, other: 'ContainerDelta') -> 'ContainerDelta':
+        """Fold another delta into this one (in place). Returns self."""
+        self.trades |= other.trades
+        self.legs |= other.legs
+        self.positions |= other.positions
+        self.removed_positions |= other.removed_positions
+        self.portfolios |= other.portfolios
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'source': self.source,
+            'trades': sorted(self.trades),
+            'legs': sorted(self.legs),
+            'positions': sorted(self.positions),
+            'removed_positions': sorted(self.removed_positions),
+            'portfolios': sorted(self.portfolios),
+        }
+
+
+def _locked(method):
+    """Run a ContainerManager method under its state lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._state_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class ContainerManager:
     """
     Manages per-portfolio container bundles and coordinates updates.
@@ -98,6 +167,9 @@ class ContainerManager:
 
         self._event_listeners: List[Callable] = []
 
+        # Held by loads/patches and full-state reads (reentrant: loads nest)
+        self._state_lock = threading.RLock()
+
         # Default bundle name (first real portfolio initialized)
         self._default_bundle: Optional[str] = None
 
@@ -107,6 +179,15 @@ class ContainerManager:
         # Cross-portfolio research container (superset of market data)
         self._research: ResearchContainer = ResearchContainer()
 
+        # All open trades bucketed by leg expiration (0DTE fast cycle, DTE lookups)
+        self._expiry_index: ExpiryIndex = ExpiryIndex()
+
+        # Incremental refresh bookkeeping
+        # Maps trade portfolio ID (real or whatif) → bundle config name
+        self._trade_portfolio_to_bundle: Dict[str, str] = {}
+        self._last_full_load: Optional[datetime] = None
+        self.full_reload_interval: timedelta = DEFAULT_FULL_RELOAD_INTERVAL
+
     # -----------------------------------------------------------------
     # Bundle initialization
     # -----------------------------------------------------------------
@@ -161,6 +242,19 @@ class ContainerManager:
             return self._bundles.get(mapped)
         return None
 
+    def get_trade_bundle(self, portfolio_id: str) -> Optional[PortfolioBundle]:
+        """Bundle whose trade container holds the open trades of a DB portfolio ID."""
+        name = self._trade_portfolio_to_bundle.get(portfolio_id)
+        return self._bundles.get(name) if name else None
+
+    def _whatif_owner(self, whatif_name: str) -> Optional[str]:
+        """
+        Bundle that loads a WhatIf desk's trades: its mirrors_real parent, or
+        the default bundle for desks not in risk_config (e.g. trader_benchmark).
+        Each desk has exactly one owner so full and incremental loads agree.
+        """
+        return self._whatif_to_real.get(whatif_name, self._default_bundle)
+
     def get_all_bundles(self) -> List[PortfolioBundle]:
         """Get all portfolio bundles."""
         return list(self._bundles.values())
@@ -187,6 +281,11 @@ class ContainerManager:
         """Cross-portfolio research container (technicals + regime + fundamentals + macro)."""
         return self._research
 
+    @property
+    def expiry_index(self) -> ExpiryIndex:
+        """Open trades (all portfolios) bucketed by leg expiration date."""
+        return self._expiry_index
+
     # -----------------------------------------------------------------
     # Backward compatibility: default bundle properties
     # -----------------------------------------------------------------
@@ -256,7 +355,10 @@ class ContainerManager:
             self._event_listeners.remove(callback)
 
     def _emit_event(self, event: ContainerEvent):
-        """Emit event to all listeners"""
+        """Emit event to all listeners (and bump the affected bundle's version)"""
+        bundle = self.get_bundle(event.data.get('portfolio_name') or '') if event.data else None
+        if bundle is not None:
+            bundle.touch()
         for listener in self._event_listeners:
             try:
                 listener(event)
@@ -267,6 +369,7 @@ class ContainerManager:
     # Data loading — per-portfolio
     # -----------------------------------------------------------------
 
+    @_locked
     def load_from_repositories(self, session, portfolio_name: str = None) -> ContainerEvent:
         """
         Load containers from database repositories.
@@ -276,8 +379,8 @@ class ContainerManager:
 
         Returns event with all changes.
         """
-        from trading_cotrader.repositories.portfolio import PortfolioRepository
         from trading_cotrader.core.database.schema import PositionORM, PortfolioORM, TradeORM
+        from trading_cotrader.repositories.trade import TradeQuery
 
         target_name = portfolio_name or self._default_bundle
         bundle = self.get_bundle(target_name) if target_name else self._default
@@ -346,64 +449,30 @@ class ContainerManager:
             positions_orm = session.query(PositionORM).all()
 
         pos_changes = bundle.positions.load_from_orm_list(positions_orm)
-        for pos_id, changes in pos_changes.items():
-            for field_name, change in changes.items():
-                if field_name.startswith('_'):
-                    continue
-                all_cell_updates.append(CellUpdate(
-                    grid_type='positions',
-                    row_id=pos_id,
-                    column=field_name,
-                    old_value=change.get('old'),
-                    new_value=change.get('new'),
-                ))
-
-        # Load trades (real + whatif) for this bundle
-        if bundle.portfolio_ids:
-            trades_orm = session.query(TradeORM).filter(
-                TradeORM.portfolio_id.in_(bundle.portfolio_ids),
+        all_cell_updates.extend(self._cell_updates('positions', pos_changes))
+
+        # Load trades (real + whatif) for this bundle in one pass
+        trade_portfolio_ids = list(bundle.portfolio_ids)
+        whatif_portfolios = session.query(PortfolioORM.id, PortfolioORM.name).filter(
+            PortfolioORM.portfolio_type == 'what_if',
+        ).all()
+        trade_portfolio_ids += [wp.id for wp in whatif_portfolios
+                                if wp.id not in bundle.portfolio_ids
+                                and self._whatif_owner(wp.name) == bundle.config_name]
+        for pid in trade_portfolio_ids:
+            self._trade_portfolio_to_bundle[pid] = bundle.config_name
+
+        trades_orm = []
+        if trade_portfolio_ids:
+            trades_orm = TradeQuery(session).filter(
+                TradeORM.portfolio_id.in_(trade_portfolio_ids),
                 TradeORM.is_open == True,
             ).all()
-        else:
-            trades_orm = []
 
-        if trades_orm:
+        if trades_orm or bundle.trades.count:
+            # trade_type distinguishes real from whatif in the shared container
             trade_changes = bundle.trades.load_from_orm_list(trades_orm)
-            for tid, changes in trade_changes.items():
-                for field_name, change in changes.items():
-                    if field_name.startswith('_'):
-                        continue
-                    all_cell_updates.append(CellUpdate(
-                        grid_type='trades',
-                        row_id=tid,
-                        column=field_name,
-                        old_value=change.get('old'),
-                        new_value=change.get('new'),
-                    ))
-
-        # Also load trades from the paired whatif portfolio
-        real_name = bundle.config_name
-        for whatif_name, paired_real in self._whatif_to_real.items():
-            if paired_real == real_name:
-                # Find whatif portfolio ID
-                from trading_cotrader.core.database.schema import PortfolioORM as PO
-                whatif_portfolio = session.query(PO).filter(
-                    PO.portfolio_type == 'what_if',
-                ).all()
-                whatif_ids = [wp.id for wp in whatif_portfolio
-                              if wp.id not in bundle.portfolio_ids]
-                if whatif_ids:
-                    whatif_trades_orm = session.query(TradeORM).filter(
-                        TradeORM.portfolio_id.in_(whatif_ids),
-                        TradeORM.is_open == True,
-                    ).all()
-                    if whatif_trades_orm:
-                        # Add to same trade container (trade_type distinguishes them)
-                        for t in whatif_trades_orm:
-                            if t.id not in {to.id for to in trades_orm}:
-                                trades_orm.append(t)
-                        bundle.trades.load_from_orm_list(trades_orm)
-                break
+            all_cell_updates.extend(self._cell_updates('trades', trade_changes))
 
         # Aggregate risk factors from filtered positions
         rf_changes = bundle.risk_factors.aggregate_from_positions(bundle.positions)
@@ -430,11 +499,255 @@ class ContainerManager:
         self._emit_event(event)
         return event
 
+    @_locked
+    def apply_position_changes(self, session, change_set) -> Optional[ContainerEvent]:
+        """
+        Apply a PortfolioSyncService PositionChangeSet to the owning bundle.
+
+        Reloads only the inserted/updated rows and drops deleted ones, then
+        re-aggregates the affected risk factors. Returns None when the change
+        set is empty or no loaded bundle owns the portfolio (next full load
+        picks it up).
+        """
+        if change_set is None or change_set.is_empty:
+            return None
+        bundle = next(
+            (b for b in self._bundles.values() if change_set.portfolio_id in b.portfolio_ids),
+            None,
+        )
+        if bundle is None:
+            return None
+
+        positions_by_bundle = self._load_positions(session, change_set.upserted)
+        cell_updates = self._patch_bundle(
+            bundle,
+            positions=positions_by_bundle.get(bundle.config_name, []),
+            removed_positions=list(change_set.deleted),
+        )
+
+        event = ContainerEvent(
+            event_type=EventType.POSITION_UPDATE,
+            source='portfolio_sync',
+            data={
+                'portfolio_name': bundle.config_name,
+                'positions_count': bundle.positions.count,
+                'inserted': list(change_set.inserted),
+                'updated': list(change_set.updated),
+                'deleted': list(change_set.deleted),
+            },
+            cell_updates=cell_updates,
+        )
+
+        self._emit_event(event)
+        return event
+
+    # -----------------------------------------------------------------
+    # Incremental refresh — change deltas
+    # -----------------------------------------------------------------
+
+    @property
+    def full_reload_due(self) -> bool:
+        """True when no full load has run yet or the consistency interval elapsed."""
+        if self._last_full_load is None:
+            return True
+        return datetime.utcnow() - self._last_full_load >= self.full_reload_interval
+
+    def sync(self, session, delta: Optional[ContainerDelta] = None) -> List[ContainerEvent]:
+        """
+        Bring containers up to date after a DB write.
+
+        Applies the delta incrementally; falls back to a full reload of all
+        bundles when no delta is given or the periodic consistency check is due.
+        """
+        if delta is None or self.full_reload_due:
+            self.load_all_bundles(session)
+            return []
+        return self.apply_delta(session, delta)
+
+    @_locked
+    def apply_delta(self, session, delta: ContainerDelta) -> List[ContainerEvent]:
+        """
+        Patch only the rows named in the delta. Returns one INCREMENTAL_UPDATE
+        event per affected bundle.
+
+        Rows whose portfolio is not owned by any loaded bundle are skipped —
+        the next full reload picks them up.
+        """
+        from trading_cotrader.core.database.schema import LegORM, PortfolioORM, TradeORM
+        from trading_cotrader.repositories.trade import TradeQuery
+
+        if delta is None or delta.is_empty:
+            return []
+
+        # Trades: marked legs resolve to their owning trade
+        trade_ids = set(delta.trades)
+        if delta.legs:
+            trade_ids.update(
+                tid for (tid,) in session.query(LegORM.trade_id).filter(
+                    LegORM.id.in_(delta.legs)
+                ).distinct()
+            )
+
+        trade_upserts: Dict[str, List] = {}
+        trade_removals: Dict[str, List[str]] = {}
+        if trade_ids:
+            trades_orm = TradeQuery(session).filter(TradeORM.id.in_(trade_ids)).all()
+            found = set()
+            for trade_orm in trades_orm:
+                found.add(trade_orm.id)
+                self._expiry_index.upsert_trade(trade_orm)
+                name = self._trade_portfolio_to_bundle.get(trade_orm.portfolio_id)
+                if trade_orm.is_open and name:
+                    trade_upserts.setdefault(name, []).append(trade_orm)
+                else:
+                    self._collect_trade_removal(trade_orm.id, trade_removals)
+            for tid in trade_ids - found:
+                self._expiry_index.remove(tid)
+                self._collect_trade_removal(tid, trade_removals)
+
+        # Positions
+        position_upserts = self._load_positions(session, delta.positions)
+        position_removals: Dict[str, List[str]] = {}
+        for pid in delta.removed_positions:
+            for name, bundle in self._bundles.items():
+                if bundle.positions.get(pid) is not None:
+                    position_removals.setdefault(name, []).append(pid)
+
+        # Portfolio summary rows
+        portfolio_rows: Dict[str, Any] = {}
+        for name, bundle in self._bundles.items():
+            if bundle.portfolio_ids and delta.portfolios & set(bundle.portfolio_ids):
+                portfolio_rows[name] = session.query(PortfolioORM).filter(
+                    PortfolioORM.id.in_(bundle.portfolio_ids)
+                ).first()
+
+        touched = (set(trade_upserts) | set(trade_removals) | set(position_upserts)
+                   | set(position_removals) | set(portfolio_rows))
+        events = []
+        for name in touched:
+            bundle = self._bundles[name]
+            cell_updates = self._patch_bundle(
+                bundle,
+                trades=trade_upserts.get(name, []),
+                removed_trades=trade_removals.get(name, []),
+                positions=position_upserts.get(name, []),
+                removed_positions=position_removals.get(name, []),
+                portfolio_orm=portfolio_rows.get(name),
+            )
+            event = ContainerEvent(
+                event_type=EventType.INCREMENTAL_UPDATE,
+                source=delta.source,
+                data={
+                    'portfolio_name': name,
+                    'positions_count': bundle.positions.count,
+                    'trades_count': bundle.trades.count,
+                    'delta': delta.to_dict(),
+                },
+                cell_updates=cell_updates,
+            )
+            self._emit_event(event)
+            events.append(event)
+
+        logger.debug(f"Applied {delta.source} delta to {len(events)} bundle(s)")
+        return events
+
+    def _collect_trade_removal(self, trade_id: str, removals: Dict[str, List[str]]) -> None:
+        for name, bundle in self._bundles.items():
+            if bundle.trades.get(trade_id) is not None:
+                removals.setdefault(name, []).append(trade_id)
+
+    def _load_positions(self, session, position_ids: Iterable[str]) -> Dict[str, List]:
+        """Load PositionORM rows (with symbol) grouped by owning bundle name."""
+        from sqlalchemy.orm import joinedload
+        from trading_cotrader.core.database.schema import PositionORM
+
+        position_ids = list(position_ids)
+        if not position_ids:
+            return {}
+        grouped: Dict[str, List] = {}
+        rows = session.query(PositionORM).options(
+            joinedload(PositionORM.symbol)
+        ).filter(PositionORM.id.in_(position_ids)).all()
+        for pos_orm in rows:
+            for name, bundle in self._bundles.items():
+                if pos_orm.portfolio_id in bundle.portfolio_ids:
+                    grouped.setdefault(name, []).append(pos_orm)
+                    break
+        return grouped
+
+    def _patch_bundle(
+        self,
+        bundle: PortfolioBundle,
+        trades: List = (),
+        removed_trades: List[str] = (),
+        positions: List = (),
+        removed_positions: List[str] = (),
+        portfolio_orm=None,
+    ) -> List[CellUpdate]:
+        """Apply row-level changes to one bundle; re-aggregate touched underlyings only."""
+        cell_updates: List[CellUpdate] = []
+
+        if portfolio_orm is not None:
+            changes = bundle.portfolio.load_from_orm(portfolio_orm)
+            cell_updates.extend(
+                self._cell_updates('portfolio', {'portfolio_summary': changes})
+            )
+
+        if trades or removed_trades:
+            trade_changes = bundle.trades.apply_orm_changes(list(trades), list(removed_trades))
+            cell_updates.extend(self._cell_updates('trades', trade_changes))
+
+        if positions or removed_positions:
+            underlyings = set()
+            for pid in [p.id for p in positions] + list(removed_positions):
+                previous = bundle.positions.get(pid)
+                if previous is not None:
+                    underlyings.add(previous.underlying)
+            pos_changes = bundle.positions.apply_orm_changes(list(positions), list(removed_positions))
+            cell_updates.extend(self._cell_updates('positions', pos_changes))
+            for pos_orm in positions:
+                underlyings.add(bundle.positions.get(pos_orm.id).underlying)
+
+            rf_changes = bundle.risk_factors.apply_position_deltas(bundle.positions, underlyings)
+            cell_updates.extend(self._cell_updates('risk_factors', rf_changes))
+
+        return cell_updates
+
+    @staticmethod
+    def _cell_updates(grid_type: str, changes_by_row: Dict[str, Dict[str, Any]]) -> List[CellUpdate]:
+        """
+        Flatten {row_id: {field: {old, new}}} into CellUpdates. A removed row
+        becomes one '_removed' cell; other markers (_added) are skipped.
+        """
+        updates = []
+        for row_id, changes in changes_by_row.items():
+            if changes.get('_removed'):
+                updates.append(CellUpdate(
+                    grid_type=grid_type, row_id=row_id, column='_removed',
+                    old_value=None, new_value=True,
+                ))
+                continue
+            for field_name, change in changes.items():
+                if field_name.startswith('_'):
+                    continue
+                updates.append(CellUpdate(
+                    grid_type=grid_type,
+                    row_id=row_id,
+                    column=field_name,
+                    old_value=change.get('old'),
+                    new_value=change.get('new'),
+                ))
+        return updates
+
+    @_locked
     def load_all_bundles(self, session) -> None:
         """Load all bundles from repositories."""
         for name in self._bundles:
             self.load_from_repositories(session, portfolio_name=name)
+        self._expiry_index.load_from_session(session)
+        self._last_full_load = datetime.utcnow()
 
+    @_locked
     def load_from_snapshot(self, snapshot) -> ContainerEvent:
         """
         Load default bundle from a MarketSnapshot.
@@ -501,6 +814,7 @@ class ContainerManager:
     # State access
     # -----------------------------------------------------------------
 
+    @_locked
     def get_full_state(self, config_name: str = None) -> Dict[str, Any]:
         """
         Get complete current state.
@@ -533,6 +847,7 @@ class ContainerManager:
             'timestamp': datetime.utcnow().isoformat(),
         }
 
+    @_locked
     def get_all_states(self) -> Dict[str, Dict[str, Any]]:
         """Get full state for all bundles."""
         return {name: bundle.get_full_state() for name, bundle in self._bundles.items()}
@@ -0,0 +1,216 @@
+"""
+Expiry Index - In-memory open trades bucketed by leg expiration date
+
+Provides:
+- Open trades keyed by every expiration date one of their legs carries
+- Range lookup "everything expiring on or before D" in O(log B + k)
+  (B = distinct expirations, k = matching trades) with no DB access
+- Earliest expiration / DTE per trade
+
+Maintained by ContainerManager: rebuilt on every full reload (boot and the
+periodic consistency reload) and patched from ContainerDelta trade ids on
+booking / close, so the 0DTE fast cycle never scans the whole book.
+"""
+
+from bisect import bisect_right, insort
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None:
+        return None
+    return value.date() if isinstance(value, datetime) else value
+
+
+@dataclass
+class ExpiringTrade:
+    """What the fast cycle needs about one open trade, without touching ORM rows"""
+    trade_id: str
+    underlying: str
+    strategy_type: str = 'unknown'
+    entry_price: float = 0.0
+    profit_target_pct: Optional[float] = None  # StrategyORM percent (50 = 50%)
+    short_strikes: List[float] = field(default_factory=list)
+    expirations: List[date] = field(default_factory=list)  # sorted, unique
+
+    @property
+    def earliest_expiration(self) -> Optional[date]:
+        return self.expirations[0] if self.expirations else None
+
+    def dte(self, today: Optional[date] = None) -> Optional[int]:
+        earliest = self.earliest_expiration
+        if earliest is None:
+            return None
+        return (earliest - (today or date.today())).days
+
+    @classmethod
+    def from_orm(cls, trade_orm) -> 'ExpiringTrade':
+        """From a TradeORM with legs, leg.symbol and strategy loaded"""
+        legs = [(leg.quantity, leg.symbol.strike, leg.symbol.expiration)
+                for leg in trade_orm.legs if leg.symbol]
+        strategy = trade_orm.strategy
+        return cls._build(
+            trade_orm.id, trade_orm.underlying_symbol, trade_orm.entry_price,
+            strategy.strategy_type if strategy else None,
+            strategy.profit_target_pct if strategy else None,
+            legs,
+        )
+
+    @classmethod
+    def _build(cls, trade_id, underlying, entry_price, strategy_type, profit_target_pct, legs) -> 'ExpiringTrade':
+        short_strikes = []
+        expirations: Set[date] = set()
+        for quantity, strike, expiration in legs:
+            if quantity and quantity < 0 and strike:
+                short_strikes.append(float(strike))
+            exp = _as_date(expiration)
+            if exp:
+                expirations.add(exp)
+        return cls(
+            trade_id=trade_id,
+            underlying=underlying,
+            strategy_type=strategy_type or 'unknown',
+            entry_price=float(entry_price or 0),
+            profit_target_pct=float(profit_target_pct) if profit_target_pct else None,
+            short_strikes=short_strikes,
+            expirations=sorted(expirations),
+        )
+
+
+class ExpiryIndex:
+    """
+    Open trades bucketed by expiration date.
+
+    Thread-safe: the fast cycle reads while container syncs write.
+    """
+
+    def __init__(self):
+        self._trades: Dict[str, ExpiringTrade] = {}
+        self._buckets: Dict[date, Set[str]] = {}
+        self._days: List[date] = []  # sorted keys of _buckets
+        self._lock = threading.Lock()
+        self.loaded_at: Optional[datetime] = None
+
+    # -----------------------------------------------------------------
+    # Loading
+    # -----------------------------------------------------------------
+
+    def load_from_session(self, session) -> int:
+        """Rebuild from every open trade with one column-projected query"""
+        from trading_cotrader.core.database.schema import LegORM, StrategyORM, SymbolORM, TradeORM
+
+        rows = (
+            session.query(
+                TradeORM.id, TradeORM.underlying_symbol, TradeORM.entry_price,
+                StrategyORM.strategy_type, StrategyORM.profit_target_pct,
+                LegORM.quantity, SymbolORM.strike, SymbolORM.expiration,
+            )
+            .join(LegORM, LegORM.trade_id == TradeORM.id)
+            .join(SymbolORM, SymbolORM.id == LegORM.symbol_id)
+            .outerjoin(StrategyORM, StrategyORM.id == TradeORM.strategy_id)
+            .filter(TradeORM.is_open == True)
+            .all()
+        )
+
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for tid, underlying, entry, stype, target, qty, strike, expiration in rows:
+            g = grouped.setdefault(tid, {'head': (underlying, entry, stype, target), 'legs': []})
+            g['legs'].append((qty, strike, expiration))
+
+        self.rebuild(
+            ExpiringTrade._build(tid, *g['head'], g['legs']) for tid, g in grouped.items()
+        )
+        return len(self._trades)
+
+    def rebuild(self, entries: Iterable[ExpiringTrade]) -> None:
+        """Replace the whole index"""
+        trades = {e.trade_id: e for e in entries}
+        buckets: Dict[date, Set[str]] = {}
+        for entry in trades.values():
+            for exp in entry.expirations:
+                buckets.setdefault(exp, set()).add(entry.trade_id)
+        with self._lock:
+            self._trades = trades
+            self._buckets = buckets
+            self._days = sorted(buckets)
+            self.loaded_at = datetime.utcnow()
+        logger.debug(f"Expiry index rebuilt: {len(trades)} open trades, {len(buckets)} expirations")
+
+    # -----------------------------------------------------------------
+    # Incremental maintenance
+    # -----------------------------------------------------------------
+
+    def upsert_trade(self, trade_orm) -> None:
+        """Index an open trade (or drop it if it is no longer open)"""
+        if not trade_orm.is_open:
+            self.remove(trade_orm.id)
+            return
+        self.upsert(ExpiringTrade.from_orm(trade_orm))
+
+    def upsert(self, entry: ExpiringTrade) -> None:
+        with self._lock:
+            self._remove_locked(entry.trade_id)
+            self._trades[entry.trade_id] = entry
+            for exp in entry.expirations:
+                bucket = self._buckets.get(exp)
+                if bucket is None:
+                    bucket = self._buckets[exp] = set()
+                    insort(self._days, exp)
+                bucket.add(entry.trade_id)
+
+    def remove(self, trade_id: str) -> None:
+        with self._lock:
+            self._remove_locked(trade_id)
+
+    def _remove_locked(self, trade_id: str) -> None:
+        entry = self._trades.pop(trade_id, None)
+        if entry is None:
+            return
+        for exp in entry.expirations:
+            bucket = self._buckets.get(exp)
+            if bucket is None:
+                continue
+            bucket.discard(trade_id)
+            if not bucket:
+                del self._buckets[exp]
+                self._days.pop(bisect_right(self._days, exp) - 1)
+
+    # -----------------------------------------------------------------
+    # Queries
+    # -----------------------------------------------------------------
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def __len__(self) -> int:
+        return len(self._trades)
+
+    def __contains__(self, trade_id: str) -> bool:
+        return trade_id in self._trades
+
+    def get(self, trade_id: str) -> Optional[ExpiringTrade]:
+        return self._trades.get(trade_id)
+
+    def expiring_by(self, day: date) -> List[ExpiringTrade]:
+        """Open trades with at least one leg expiring on or before `day`"""
+        with self._lock:
+            ids: Set[str] = set()
+            for exp in self._days[:bisect_right(self._days, day)]:
+                ids |= self._buckets[exp]
+            return [self._trades[tid] for tid in ids]
+
+    def earliest_expiration(self, trade_id: str) -> Optional[date]:
+        entry = self._trades.get(trade_id)
+        return entry.earliest_expiration if entry else None
+
+    def dte(self, trade_id: str, today: Optional[date] = None) -> Optional[int]:
+        """Days to the trade's earliest leg expiration, None if not indexed"""
+        entry = self._trades.get(trade_id)
+        return entry.dte(today) if entry else None
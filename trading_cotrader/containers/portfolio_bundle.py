@@ -40,10 +40,27 @@ class PortfolioBundle:
     risk_factors: RiskFactorContainer = field(default_factory=RiskFactorContainer)
     trades: TradeContainer = field(default_factory=TradeContainer)
 
+    # Monotonic change counter: bumped by the containers' change listeners and
+    # by ContainerManager for every event on this bundle. Views built from the
+    # bundle (trading dashboard) are memoized per version.
+    version: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        for container in (self.portfolio, self.positions, self.risk_factors, self.trades):
+            container.add_change_listener(self._on_change)
+
+    def _on_change(self, *_args) -> None:
+        self.touch()
+
+    def touch(self) -> None:
+        """Mark the bundle changed."""
+        self.version += 1
+
     def add_portfolio_id(self, portfolio_id: str) -> None:
         """Register a portfolio ID (real or whatif) with this bundle."""
         if portfolio_id not in self.portfolio_ids:
             self.portfolio_ids.append(portfolio_id)
+            self.touch()
 
     def get_full_state(self) -> Dict[str, Any]:
         """Get complete state for this bundle (for UI/API)."""
@@ -44,6 +44,7 @@ class PortfolioState:
 
     # Risk metrics
     var_1d_95: Decimal = Decimal('0')
+    var_1d_99: Decimal = Decimal('0')
     position_count: int = 0
 
     # Risk status
@@ -78,6 +79,7 @@ class PortfolioState:
             'realized_pnl': float(self.realized_pnl),
             'unrealized_pnl': float(self.unrealized_pnl),
             'var_1d_95': float(self.var_1d_95),
+            'var_1d_99': float(self.var_1d_99),
             'position_count': self.position_count,
             'risk_status': self.risk_status,
             'max_delta': float(self.max_delta),
@@ -160,6 +162,7 @@ class PortfolioContainer:
             realized_pnl=portfolio_orm.realized_pnl or Decimal('0'),
             unrealized_pnl=portfolio_orm.unrealized_pnl or Decimal('0'),
             var_1d_95=portfolio_orm.var_1d_95 or Decimal('0'),
+            var_1d_99=portfolio_orm.var_1d_99 or Decimal('0'),
             max_delta=portfolio_orm.max_portfolio_delta or Decimal('500'),
             max_gamma=portfolio_orm.max_portfolio_gamma or Decimal('50'),
             min_theta=portfolio_orm.min_portfolio_theta or Decimal('-500'),
@@ -197,66 +197,7 @@ class PositionContainer:
         self._positions.clear()
 
         for pos_orm in positions_orm:
-            # Get symbol details from related symbol ORM
-            symbol_orm = pos_orm.symbol if hasattr(pos_orm, 'symbol') else None
-
-            underlying = symbol_orm.ticker if symbol_orm else 'UNKNOWN'
-            option_type = symbol_orm.option_type.upper() if symbol_orm and symbol_orm.option_type else None
-            strike = symbol_orm.strike if symbol_orm else None
-            expiry = symbol_orm.expiration.strftime('%Y-%m-%d') if symbol_orm and symbol_orm.expiration else None
-
-            # Calculate DTE
-            dte = None
-            if symbol_orm and symbol_orm.expiration:
-                dte = (symbol_orm.expiration.date() - datetime.utcnow().date()).days
-
-            # Compute P&L from prices: (current - entry) * qty * multiplier
-            entry = pos_orm.entry_price or Decimal('0')
-            current = pos_orm.current_price or Decimal('0')
-            qty = pos_orm.quantity or 0
-            multiplier = Decimal(str(symbol_orm.multiplier)) if symbol_orm and symbol_orm.multiplier else (Decimal('100') if option_type else Decimal('1'))
-            computed_pnl = (current - entry) * qty * multiplier if entry and current else Decimal('0')
-            entry_value = abs(entry * qty * multiplier)
-            pnl_pct = (computed_pnl / entry_value * 100) if entry_value else Decimal('0')
-
-            # Build proper symbol name: ticker for stocks, full description for options
-            if symbol_orm:
-                if option_type:
-                    sym_name = f"{underlying} {expiry} {strike}{option_type[0]}" if expiry and strike else symbol_orm.description or underlying
-                else:
-                    sym_name = underlying
-            else:
-                sym_name = pos_orm.id
-
-            state = PositionState(
-                position_id=pos_orm.id,
-                symbol=sym_name,
-                underlying=underlying,
-                option_type=option_type,
-                strike=Decimal(str(strike)) if strike else None,
-                expiry=expiry,
-                dte=dte,
-                quantity=qty,
-                entry_price=entry,
-                current_price=current,
-                underlying_price=Decimal(str(pos_orm.current_underlying_price)) if pos_orm.current_underlying_price else (current if not option_type else Decimal('0')),
-                market_value=pos_orm.market_value or Decimal('0'),
-                delta=pos_orm.delta or Decimal('0'),
-                gamma=pos_orm.gamma or Decimal('0'),
-                theta=pos_orm.theta or Decimal('0'),
-                vega=pos_orm.vega or Decimal('0'),
-                rho=pos_orm.rho or Decimal('0'),
-                unrealized_pnl=computed_pnl,
-                unrealized_pnl_pct=pnl_pct,
-                pnl_delta=pos_orm.delta_pnl or Decimal('0'),
-                pnl_gamma=pos_orm.gamma_pnl or Decimal('0'),
-                pnl_theta=pos_orm.theta_pnl or Decimal('0'),
-                pnl_vega=pos_orm.vega_pnl or Decimal('0'),
-                pnl_unexplained=pos_orm.unexplained_pnl or Decimal('0'),
-                last_updated=pos_orm.last_updated or datetime.utcnow(),
-            )
-
-            self._positions[pos_orm.id] = state
+            self._positions[pos_orm.id] = self._state_from_orm(pos_orm)
 
         self._rebuild_underlying_index()
         self._initialized = True
@@ -264,6 +205,106 @@ class PositionContainer:
         # Detect all changes
         return self._detect_all_changes()
 
+    def apply_orm_changes(self, upserted_orm: List, removed_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Apply a partial reload: upsert the given ORM rows, drop removed ids.
+        Other positions are left untouched.
+        Returns dict of {position_id: changes} for WebSocket push.
+        """
+        all_changes: Dict[str, Dict[str, Any]] = {}
+
+        for pos_orm in upserted_orm:
+            previous = self._positions.get(pos_orm.id)
+            state = self._state_from_orm(pos_orm)
+            self._positions[pos_orm.id] = state
+            if previous is None or previous.underlying != state.underlying:
+                if previous is not None:
+                    self._unindex(pos_orm.id, previous.underlying)
+                self._by_underlying.setdefault(state.underlying, []).append(pos_orm.id)
+            changes = self._diff(previous.to_dict() if previous else {}, state.to_dict())
+            if changes:
+                all_changes[pos_orm.id] = changes
+                self._notify_changes(pos_orm.id, changes)
+
+        for pid in removed_ids:
+            removed = self._positions.pop(pid, None)
+            if removed is not None:
+                self._unindex(pid, removed.underlying)
+                all_changes[pid] = {'_removed': True}
+
+        self._initialized = True
+        return all_changes
+
+    def _unindex(self, position_id: str, underlying: str) -> None:
+        """Drop one position from the underlying index."""
+        ids = self._by_underlying.get(underlying)
+        if ids and position_id in ids:
+            ids.remove(position_id)
+            if not ids:
+                del self._by_underlying[underlying]
+
+    @staticmethod
+    def _state_from_orm(pos_orm) -> PositionState:
+        """Build a PositionState from a PositionORM (with its symbol relationship)."""
+        # Get symbol details from related symbol ORM
+        symbol_orm = pos_orm.symbol if hasattr(pos_orm, 'symbol') else None
+
+        underlying = symbol_orm.ticker if symbol_orm else 'UNKNOWN'
+        option_type = symbol_orm.option_type.upper() if symbol_orm and symbol_orm.option_type else None
+        strike = symbol_orm.strike if symbol_orm else None
+        expiry = symbol_orm.expiration.strftime('%Y-%m-%d') if symbol_orm and symbol_orm.expiration else None
+
+        # Calculate DTE
+        dte = None
+        if symbol_orm and symbol_orm.expiration:
+            dte = (symbol_orm.expiration.date() - datetime.utcnow().date()).days
+
+        # Compute P&L from prices: (current - entry) * qty * multiplier
+        entry = pos_orm.entry_price or Decimal('0')
+        current = pos_orm.current_price or Decimal('0')
+        qty = pos_orm.quantity or 0
+        multiplier = Decimal(str(symbol_orm.multiplier)) if symbol_orm and symbol_orm.multiplier else (Decimal('100') if option_type else Decimal('1'))
+        computed_pnl = (current - entry) * qty * multiplier if entry and current else Decimal('0')
+        entry_value = abs(entry * qty * multiplier)
+        pnl_pct = (computed_pnl / entry_value * 100) if entry_value else Decimal('0')
+
+        # Build proper symbol name: ticker for stocks, full description for options
+        if symbol_orm:
+            if option_type:
+                sym_name = f"{underlying} {expiry} {strike}{option_type[0]}" if expiry and strike else symbol_orm.description or underlying
+            else:
+                sym_name = underlying
+        else:
+            sym_name = pos_orm.id
+
+        return PositionState(
+            position_id=pos_orm.id,
+            symbol=sym_name,
+            underlying=underlying,
+            option_type=option_type,
+            strike=Decimal(str(strike)) if strike else None,
+            expiry=expiry,
+            dte=dte,
+            quantity=qty,
+            entry_price=entry,
+            current_price=current,
+            underlying_price=Decimal(str(pos_orm.current_underlying_price)) if pos_orm.current_underlying_price else (current if not option_type else Decimal('0')),
+            market_value=pos_orm.market_value or Decimal('0'),
+            delta=pos_orm.delta or Decimal('0'),
+            gamma=pos_orm.gamma or Decimal('0'),
+            theta=pos_orm.theta or Decimal('0'),
+            vega=pos_orm.vega or Decimal('0'),
+            rho=pos_orm.rho or Decimal('0'),
+            unrealized_pnl=computed_pnl,
+            unrealized_pnl_pct=pnl_pct,
+            pnl_delta=pos_orm.delta_pnl or Decimal('0'),
+            pnl_gamma=pos_orm.gamma_pnl or Decimal('0'),
+            pnl_theta=pos_orm.theta_pnl or Decimal('0'),
+            pnl_vega=pos_orm.vega_pnl or Decimal('0'),
+            pnl_unexplained=pos_orm.unexplained_pnl or Decimal('0'),
+            last_updated=pos_orm.last_updated or datetime.utcnow(),
+        )
+
     def load_from_snapshot_positions(self, positions: List) -> Dict[str, Dict[str, Any]]:
         """
         Load from MarketSnapshot positions (PositionWithMarket objects).
@@ -326,15 +367,7 @@ class PositionContainer:
 
         # Check existing positions for changes
         for pid, pos in self._positions.items():
-            current = pos.to_dict()
-            previous = self._previous_states.get(pid, {})
-
-            changes = {}
-            for key, new_value in current.items():
-                old_value = previous.get(key)
-                if old_value != new_value:
-                    changes[key] = {'old': old_value, 'new': new_value}
-
+            changes = self._diff(self._previous_states.get(pid, {}), pos.to_dict())
             if changes:
                 all_changes[pid] = changes
                 self._notify_changes(pid, changes)
@@ -346,6 +379,16 @@ class PositionContainer:
 
         return all_changes
 
+    @staticmethod
+    def _diff(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+        """Field-level {field: {old, new}} between two to_dict() snapshots."""
+        changes = {}
+        for key, new_value in current.items():
+            old_value = previous.get(key)
+            if old_value != new_value:
+                changes[key] = {'old': old_value, 'new': new_value}
+        return changes
+
     def update_position_field(self, position_id: str, field_name: str, value: Any) -> Dict[str, Any]:
         """Update a single field on a position"""
         pos = self._positions.get(position_id)
@@ -14,12 +14,24 @@ or by the agent during workflow cycles.
 
 from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _mutates(method):
+    """Bump ResearchContainer.version once the write has completed."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.version += 1
+    return wrapper
+
+
 @dataclass
 class ResearchEntry:
     """Comprehensive research data for a single symbol."""
@@ -435,11 +447,19 @@ class ResearchContainer:
         self._macro: MacroContext = MacroContext()
         self._watchlist_config: List[Dict[str, str]] = []
         self._loaded_from_db: bool = False
+        # Raw market_analyzer results (RegimeResult, TechnicalSnapshot, ...)
+        # for consumers that need the model objects, not the flattened fields.
+        # {symbol: {kind: (result, cached_at)}} — in-memory only.
+        self._analysis: Dict[str, Dict[str, Tuple[Any, datetime]]] = {}
+        # Bumped after every write (see _mutates) so views built from this
+        # container can be memoized per version.
+        self.version: int = 0
 
     # -----------------------------------------------------------------
     # Watchlist config (owned by this container)
     # -----------------------------------------------------------------
 
+    @_mutates
     def load_watchlist_config(self, items: List[Dict[str, str]]) -> None:
         """Store watchlist config items (ticker, name, asset_class)."""
         self._watchlist_config = items
@@ -463,6 +483,7 @@ class ResearchContainer:
     # Technicals update (from market_analyzer TechnicalSnapshot)
     # -----------------------------------------------------------------
 
+    @_mutates
     def update_technicals(self, symbol: str, tech: dict) -> None:
         """
         Update from market_analyzer TechnicalSnapshot (already model_dump'd to dict).
@@ -567,6 +588,7 @@ class ResearchContainer:
     # Regime update (from market_analyzer detect)
     # -----------------------------------------------------------------
 
+    @_mutates
     def update_regime(self, symbol: str, regime_data: dict) -> None:
         """
         Update HMM regime fields from detect() result dict.
@@ -585,6 +607,7 @@ class ResearchContainer:
     # Fundamentals update (from market_analyzer fetch_fundamentals)
     # -----------------------------------------------------------------
 
+    @_mutates
     def update_fundamentals(self, symbol: str, fund: dict) -> None:
         """
         Update fundamentals summary from fetch_fundamentals() model_dump'd dict.
@@ -633,6 +656,7 @@ class ResearchContainer:
     # Macro context update
     # -----------------------------------------------------------------
 
+    @_mutates
     def update_macro(self, macro_data: dict) -> None:
         """
         Update global macro context from get_macro_calendar() model_dump'd dict.
@@ -660,6 +684,7 @@ class ResearchContainer:
     # Phase update (from PhaseService.detect)
     # -----------------------------------------------------------------
 
+    @_mutates
     def update_phase(self, symbol: str, phase_data: dict) -> None:
         """
         Update enhanced phase fields from PhaseService.detect() model_dump'd dict.
@@ -700,6 +725,7 @@ class ResearchContainer:
     # Opportunity update (from OpportunityService.assess_*)
     # -----------------------------------------------------------------
 
+    @_mutates
     def update_opportunities(self, symbol: str, opps: dict) -> None:
         """
         Update opportunity fields from OpportunityService assess results.
@@ -749,6 +775,7 @@ class ResearchContainer:
     # Levels update (from LevelsService.analyze)
     # -----------------------------------------------------------------
 
+    @_mutates
     def update_levels(self, symbol: str, levels_data: dict) -> None:
         """
         Update levels fields from LevelsService.analyze() model_dump'd dict.
@@ -813,11 +840,30 @@ class ResearchContainer:
     # Screening update
     # -----------------------------------------------------------------
 
+    @_mutates
     def set_triggered_templates(self, symbol: str, templates: List[str]) -> None:
         """Set which research templates triggered for a symbol."""
         entry = self._get_or_create(symbol)
         entry.triggered_templates = templates
 
+    # -----------------------------------------------------------------
+    # Raw analysis objects (reused by health checks)
+    # -----------------------------------------------------------------
+
+    def cache_analysis(self, symbol: str, kind: str, result: Any) -> None:
+        """Keep the raw MA result of one kind ('regime', 'technicals') for a symbol."""
+        self._analysis.setdefault(symbol, {})[kind] = (result, datetime.utcnow())
+
+    def get_analysis(self, symbol: str, kind: str, max_age_seconds: float = 300) -> Optional[Any]:
+        """Raw MA result if cached within max_age_seconds, else None."""
+        cached = self._analysis.get(symbol, {}).get(kind)
+        if cached is None:
+            return None
+        result, cached_at = cached
+        if (datetime.utcnow() - cached_at).total_seconds() > max_age_seconds:
+            return None
+        return result
+
     # -----------------------------------------------------------------
     # Accessors
     # -----------------------------------------------------------------
@@ -862,6 +908,7 @@ class ResearchContainer:
     # Backward compat: MarketDataContainer interface
     # -----------------------------------------------------------------
 
+    @_mutates
     def update_from_snapshot(self, snap) -> Dict[str, Any]:
         """
         Backward compat: update from TechnicalSnapshot object
@@ -903,6 +950,7 @@ class ResearchContainer:
     # DB persistence (load / save)
     # -----------------------------------------------------------------
 
+    @_mutates
     def load_from_db(self, session) -> int:
         """
         Load latest research snapshots from DB into in-memory container.
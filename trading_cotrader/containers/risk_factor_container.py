@@ -152,8 +152,6 @@ class RiskFactorContainer:
         Aggregate risk factors from position container.
         Returns dict of {underlying: changes}.
         """
-        from .position_container import PositionContainer
-
         # Capture previous states
         self._previous_states = {u: rf.to_dict() for u, rf in self._risk_factors.items()}
 
@@ -161,53 +159,82 @@ class RiskFactorContainer:
         self._risk_factors.clear()
 
         for underlying in position_container.underlyings:
+            self._risk_factors[underlying] = self._aggregate_underlying(
+                underlying, position_container.get_by_underlying(underlying)
+            )
+
+        self._apply_concentration()
+        self._initialized = True
+        return self._detect_all_changes()
+
+    def apply_position_deltas(self, position_container, underlyings) -> Dict[str, Dict[str, Any]]:
+        """
+        Re-aggregate only the given underlyings (those whose positions changed).
+
+        Untouched underlyings keep their sums; concentration and risk status are
+        recomputed for all of them since total gross exposure may have moved.
+        Returns dict of {underlying: changes}.
+        """
+        self._previous_states = {u: rf.to_dict() for u, rf in self._risk_factors.items()}
+
+        for underlying in underlyings:
             positions = position_container.get_by_underlying(underlying)
+            if positions:
+                self._risk_factors[underlying] = self._aggregate_underlying(underlying, positions)
+            else:
+                self._risk_factors.pop(underlying, None)
 
-            rf = RiskFactorState(underlying=underlying)
-
-            for pos in positions:
-                rf.delta += pos.delta
-                rf.gamma += pos.gamma
-                rf.theta += pos.theta
-                rf.vega += pos.vega
-                rf.position_count += 1
-                rf.unrealized_pnl += pos.unrealized_pnl
-
-                if pos.quantity > 0:
-                    rf.long_count += 1
-                else:
-                    rf.short_count += 1
-
-                # Track exposure
-                pos_value = abs(pos.market_value)
-                rf.gross_exposure += pos_value
-                rf.net_exposure += pos.market_value
-
-                # Pick up underlying spot price from any position that has it
-                if rf.spot_price == 0 and hasattr(pos, 'underlying_price') and pos.underlying_price:
-                    rf.spot_price = pos.underlying_price
-                # For stock positions, current_price IS the spot price
-                if rf.spot_price == 0 and not getattr(pos, 'is_option', True) and pos.current_price:
-                    rf.spot_price = pos.current_price
-
-            # Calculate dollar exposures
-            if rf.spot_price > 0:
-                rf.delta_dollars = rf.delta * rf.spot_price
-                rf.gamma_dollars = rf.gamma * rf.spot_price * rf.spot_price * Decimal('0.01')
-
-            # Use real limits from config (or defaults)
-            rf.delta_limit = self.limits.max_portfolio_delta
-
-            # Calculate utilization
-            if rf.delta_limit > 0:
-                rf.delta_utilization_pct = abs(rf.delta) / rf.delta_limit * 100
-
-            rf.last_updated = datetime.utcnow()
-            self._risk_factors[underlying] = rf
+        self._apply_concentration()
+        self._initialized = True
+        return self._detect_all_changes()
 
-        # Calculate concentration (each underlying's exposure as % of total)
+    def _aggregate_underlying(self, underlying: str, positions: List) -> RiskFactorState:
+        """Sum Greeks, counts and exposure for one underlying's positions."""
+        rf = RiskFactorState(underlying=underlying)
+
+        for pos in positions:
+            rf.delta += pos.delta
+            rf.gamma += pos.gamma
+            rf.theta += pos.theta
+            rf.vega += pos.vega
+            rf.position_count += 1
+            rf.unrealized_pnl += pos.unrealized_pnl
+
+            if pos.quantity > 0:
+                rf.long_count += 1
+            else:
+                rf.short_count += 1
+
+            # Track exposure
+            pos_value = abs(pos.market_value)
+            rf.gross_exposure += pos_value
+            rf.net_exposure += pos.market_value
+
+            # Pick up underlying spot price from any position that has it
+            if rf.spot_price == 0 and hasattr(pos, 'underlying_price') and pos.underlying_price:
+                rf.spot_price = pos.underlying_price
+            # For stock positions, current_price IS the spot price
+            if rf.spot_price == 0 and not getattr(pos, 'is_option', True) and pos.current_price:
+                rf.spot_price = pos.current_price
+
+        # Calculate dollar exposures
+        if rf.spot_price > 0:
+            rf.delta_dollars = rf.delta * rf.spot_price
+            rf.gamma_dollars = rf.gamma * rf.spot_price * rf.spot_price * Decimal('0.01')
+
+        # Use real limits from config (or defaults)
+        rf.delta_limit = self.limits.max_portfolio_delta
+
+        # Calculate utilization
+        if rf.delta_limit > 0:
+            rf.delta_utilization_pct = abs(rf.delta) / rf.delta_limit * 100
+
+        rf.last_updated = datetime.utcnow()
+        return rf
+
+    def _apply_concentration(self) -> None:
+        """Concentration (each underlying's exposure as % of total) and risk status."""
         total_gross = sum(rf.gross_exposure for rf in self._risk_factors.values())
-        total_positions = sum(rf.position_count for rf in self._risk_factors.values())
         for rf in self._risk_factors.values():
             if total_gross > 0:
                 rf.concentration_pct = rf.gross_exposure / total_gross * 100
@@ -221,9 +248,6 @@ class RiskFactorContainer:
             else:
                 rf.risk_status = "OK"
 
-        self._initialized = True
-        return self._detect_all_changes()
-
     def load_from_snapshot_risk(self, risk_by_underlying: Dict) -> Dict[str, Dict[str, Any]]:
         """
         Load from MarketSnapshot risk_by_underlying (RiskBucket objects).
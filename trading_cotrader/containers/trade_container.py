@@ -91,6 +91,7 @@ class TradeState:
     trade_type: str = "what_if"  # real, paper, what_if, backtest
     trade_status: str = "intent"  # intent, evaluated, pending, executed, closed
     strategy_type: str = "custom"
+    portfolio_id: str = ""  # owning DB portfolio (real or whatif desk)
 
     legs: List[LegState] = field(default_factory=list)
 
@@ -107,6 +108,7 @@ class TradeState:
     # Risk metrics
     max_profit: Optional[Decimal] = None
     max_loss: Optional[Decimal] = None
+    max_risk: Optional[Decimal] = None
     breakeven_points: List[Decimal] = field(default_factory=list)
 
     # Metadata
@@ -391,63 +393,85 @@ class TradeContainer:
         self._trades.clear()
 
         for trade_orm in trades_orm:
-            legs = []
-            for leg_orm in getattr(trade_orm, 'legs', []):
-                symbol_orm = getattr(leg_orm, 'symbol', None)
-                legs.append(LegState(
-                    leg_id=leg_orm.id,
-                    symbol=f"{symbol_orm.ticker if symbol_orm else ''} {symbol_orm.expiration.strftime('%Y-%m-%d') if symbol_orm and symbol_orm.expiration else ''} {symbol_orm.strike if symbol_orm else ''} {(symbol_orm.option_type or '')[0].upper() if symbol_orm and symbol_orm.option_type else ''}",
-                    underlying=symbol_orm.ticker if symbol_orm else trade_orm.underlying_symbol,
-                    option_type=symbol_orm.option_type.upper() if symbol_orm and symbol_orm.option_type else None,
-                    strike=Decimal(str(symbol_orm.strike)) if symbol_orm and symbol_orm.strike else None,
-                    expiry=symbol_orm.expiration.strftime('%Y-%m-%d') if symbol_orm and symbol_orm.expiration else None,
-                    quantity=leg_orm.quantity,
-                    side=leg_orm.side or 'buy',
-                    entry_price=Decimal(str(leg_orm.entry_price or 0)),
-                    current_price=Decimal(str(leg_orm.current_price or leg_orm.entry_price or 0)),
-                    delta=Decimal(str(leg_orm.delta or 0)),
-                    gamma=Decimal(str(leg_orm.gamma or 0)),
-                    theta=Decimal(str(leg_orm.theta or 0)),
-                    vega=Decimal(str(leg_orm.vega or 0)),
-                ))
-
-            trade = TradeState(
-                trade_id=trade_orm.id,
-                underlying=trade_orm.underlying_symbol,
-                trade_type=trade_orm.trade_type or 'real',
-                trade_status=trade_orm.trade_status or 'executed',
-                strategy_type=trade_orm.strategy.strategy_type if trade_orm.strategy else 'custom',
-                legs=legs,
-                entry_price=Decimal(str(trade_orm.entry_price or 0)),
-                current_price=Decimal(str(trade_orm.current_price or 0)),
-                delta=Decimal(str(trade_orm.current_delta or 0)),
-                gamma=Decimal(str(trade_orm.current_gamma or 0)),
-                theta=Decimal(str(trade_orm.current_theta or 0)),
-                vega=Decimal(str(trade_orm.current_vega or 0)),
-                notes=trade_orm.notes or '',
-                created_at=trade_orm.created_at or datetime.utcnow(),
-                last_updated=trade_orm.last_updated or datetime.utcnow(),
-            )
-
-            self._trades[trade_orm.id] = trade
+            self._trades[trade_orm.id] = self._state_from_orm(trade_orm)
 
         self._initialized = True
         return self._detect_all_changes()
 
+    def apply_orm_changes(self, upserted_orm: List, removed_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Apply a partial reload: upsert the given ORM rows, drop removed ids.
+        Other trades are left untouched.
+        Returns dict of {trade_id: changes} for WebSocket push.
+        """
+        all_changes: Dict[str, Dict[str, Any]] = {}
+
+        for trade_orm in upserted_orm:
+            previous = self._trades.get(trade_orm.id)
+            state = self._state_from_orm(trade_orm)
+            self._trades[trade_orm.id] = state
+            changes = self._diff(previous.to_dict() if previous else {}, state.to_dict())
+            if changes:
+                all_changes[trade_orm.id] = changes
+                self._notify_changes(trade_orm.id, changes)
+
+        for tid in removed_ids:
+            if self._trades.pop(tid, None) is not None:
+                all_changes[tid] = {'_removed': True}
+                self._notify_changes(tid, {'_removed': True})
+
+        self._initialized = True
+        return all_changes
+
+    @staticmethod
+    def _state_from_orm(trade_orm) -> TradeState:
+        """Build a TradeState from a TradeORM (with legs/symbol/strategy relationships)."""
+        legs = []
+        for leg_orm in getattr(trade_orm, 'legs', []):
+            symbol_orm = getattr(leg_orm, 'symbol', None)
+            legs.append(LegState(
+                leg_id=leg_orm.id,
+                symbol=f"{symbol_orm.ticker if symbol_orm else ''} {symbol_orm.expiration.strftime('%Y-%m-%d') if symbol_orm and symbol_orm.expiration else ''} {symbol_orm.strike if symbol_orm else ''} {(symbol_orm.option_type or '')[0].upper() if symbol_orm and symbol_orm.option_type else ''}",
+                underlying=symbol_orm.ticker if symbol_orm else trade_orm.underlying_symbol,
+                option_type=symbol_orm.option_type.upper() if symbol_orm and symbol_orm.option_type else None,
+                strike=Decimal(str(symbol_orm.strike)) if symbol_orm and symbol_orm.strike else None,
+                expiry=symbol_orm.expiration.strftime('%Y-%m-%d') if symbol_orm and symbol_orm.expiration else None,
+                quantity=leg_orm.quantity,
+                side=leg_orm.side or 'buy',
+                entry_price=Decimal(str(leg_orm.entry_price or 0)),
+                current_price=Decimal(str(leg_orm.current_price or leg_orm.entry_price or 0)),
+                delta=Decimal(str(leg_orm.delta or 0)),
+                gamma=Decimal(str(leg_orm.gamma or 0)),
+                theta=Decimal(str(leg_orm.theta or 0)),
+                vega=Decimal(str(leg_orm.vega or 0)),
+            ))
+
+        return TradeState(
+            trade_id=trade_orm.id,
+            underlying=trade_orm.underlying_symbol,
+            portfolio_id=trade_orm.portfolio_id or '',
+            trade_type=trade_orm.trade_type or 'real',
+            trade_status=trade_orm.trade_status or 'executed',
+            strategy_type=trade_orm.strategy.strategy_type if trade_orm.strategy else 'custom',
+            legs=legs,
+            entry_price=Decimal(str(trade_orm.entry_price or 0)),
+            current_price=Decimal(str(trade_orm.current_price or 0)),
+            delta=Decimal(str(trade_orm.current_delta or 0)),
+            gamma=Decimal(str(trade_orm.current_gamma or 0)),
+            theta=Decimal(str(trade_orm.current_theta or 0)),
+            vega=Decimal(str(trade_orm.current_vega or 0)),
+            max_risk=Decimal(str(trade_orm.max_risk)) if trade_orm.max_risk is not None else None,
+            notes=trade_orm.notes or '',
+            created_at=trade_orm.created_at or datetime.utcnow(),
+            last_updated=trade_orm.last_updated or datetime.utcnow(),
+        )
+
     def _detect_all_changes(self) -> Dict[str, Dict[str, Any]]:
         """Detect changes for all trades"""
         all_changes = {}
 
         for tid, trade in self._trades.items():
-            current = trade.to_dict()
-            previous = self._previous_states.get(tid, {})
-
-            changes = {}
-            for key, new_value in current.items():
-                old_value = previous.get(key)
-                if old_value != new_value:
-                    changes[key] = {'old': old_value, 'new': new_value}
-
+            changes = self._diff(self._previous_states.get(tid, {}), trade.to_dict())
             if changes:
                 all_changes[tid] = changes
 
@@ -457,6 +481,16 @@ class TradeContainer:
 
         return all_changes
 
+    @staticmethod
+    def _diff(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+        """Field-level {field: {old, new}} between two to_dict() snapshots."""
+        changes = {}
+        for key, new_value in current.items():
+            old_value = previous.get(key)
+            if old_value != new_value:
+                changes[key] = {'old': old_value, 'new': new_value}
+        return changes
+
     def to_grid_rows(self) -> List[Dict[str, Any]]:
         """Convert all trades to AG Grid row format"""
         rows = []
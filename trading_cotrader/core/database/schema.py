@@ -283,6 +283,7 @@ class PositionGreeksSnapshotORM(Base):
     __tablename__ = 'position_greeks_snapshots'
     
     __table_args__ = (
+        UniqueConstraint('position_id', 'timestamp', name='uix_position_greeks_time'),
         Index('idx_position_greeks_time', 'position_id', 'timestamp'),
     )
     
@@ -315,6 +316,7 @@ class PositionPnLSnapshotORM(Base):
     __tablename__ = 'position_pnl_snapshots'
     
     __table_args__ = (
+        UniqueConstraint('position_id', 'timestamp', name='uix_position_pnl_time'),
         Index('idx_position_pnl_time', 'position_id', 'timestamp'),
         Index('idx_position_pnl_date', 'position_id', 'snapshot_date'),
     )
@@ -364,6 +366,7 @@ class TradeORM(Base):
         Index('idx_trade_type', 'trade_type'),
         Index('idx_trade_status', 'trade_status'),
         Index('idx_opened_at', 'opened_at'),
+        Index('idx_trades_closed_at', 'closed_at'),
     )
     
     id = Column(String(36), primary_key=True)
@@ -764,6 +767,7 @@ class GreeksHistoryORM(Base):
     __tablename__ = 'greeks_history'
     
     __table_args__ = (
+        UniqueConstraint('position_id', 'timestamp', name='uix_greeks_history_time'),
         Index('idx_position_greeks', 'position_id', 'timestamp'),
     )
     
@@ -787,6 +791,52 @@ class GreeksHistoryORM(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
 
+class TimeSeriesRollupORM(Base):
+    """
+    Downsampled snapshot history (5m / 1h / 1d OHLC buckets).
+
+    Intraday position Greeks / P&L snapshots are compacted into coarser
+    tiers as they age (services/snapshot_rollup.py); history queries read
+    the coarsest tier that covers the requested range.
+    """
+    __tablename__ = 'timeseries_rollups'
+
+    __table_args__ = (
+        UniqueConstraint('series', 'entity_id', 'tier', 'bucket_start', name='uix_rollup_bucket'),
+        Index('idx_rollup_lookup', 'series', 'entity_id', 'tier', 'bucket_start'),
+        Index('idx_rollup_tier_time', 'series', 'tier', 'bucket_start'),
+    )
+
+    id = Column(String(36), primary_key=True)
+    series = Column(String(30), nullable=False)  # position_greeks, position_pnl
+    entity_id = Column(String(36), nullable=False)  # position_id
+    tier = Column(String(5), nullable=False)  # 5m, 1h, 1d
+    bucket_start = Column(DateTime, nullable=False)
+    samples = Column(Integer, default=0)
+
+    # OHLC of the tracked values
+    delta_open = Column(Numeric(10, 4))
+    delta_high = Column(Numeric(10, 4))
+    delta_low = Column(Numeric(10, 4))
+    delta_close = Column(Numeric(10, 4))
+    theta_open = Column(Numeric(10, 4))
+    theta_high = Column(Numeric(10, 4))
+    theta_low = Column(Numeric(10, 4))
+    theta_close = Column(Numeric(10, 4))
+    pnl_open = Column(Numeric(15, 2))
+    pnl_high = Column(Numeric(15, 2))
+    pnl_low = Column(Numeric(15, 2))
+    pnl_close = Column(Numeric(15, 2))
+
+    # Close-only values
+    gamma_close = Column(Numeric(10, 6))
+    vega_close = Column(Numeric(10, 4))
+    underlying_close = Column(Numeric(10, 4))
+
+    # Audit
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 # ============================================================================
 # What-If Configuration
 # ============================================================================
@@ -5,15 +5,19 @@ Provides:
 - Database engine creation
 - Session factory
 - Context managers for transactions
+- Bounded DB executor for running session work off the asyncio event loop
 - Database initialization
 """
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Generator
+from typing import Awaitable, Callable, Generator, Optional, TypeVar
 from sqlalchemy import text
+import asyncio
+import functools
 import logging
 
 from trading_cotrader.config.settings import get_settings
@@ -21,6 +25,8 @@ from trading_cotrader.core.database.schema import Base
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 
 # ============================================================================
 # Engine & Session Factory
@@ -40,6 +46,7 @@ class DatabaseManager:
         self.database_url = database_url or settings.database_url
         self.engine = None
         self.SessionLocal = None
+        self._executor: Optional[ThreadPoolExecutor] = None
         
         self._create_engine()
     
@@ -124,6 +131,47 @@ class DatabaseManager:
         finally:
             session.close()
     
+    # ------------------------------------------------------------------
+    # Async access — bounded DB executor
+    # ------------------------------------------------------------------
+
+    @property
+    def executor_workers(self) -> int:
+        """
+        DB executor size. SQLite uses a single shared connection (StaticPool),
+        so its work is serialized on one thread; pooled engines get one
+        worker per pooled connection.
+        """
+        if 'sqlite' in self.database_url:
+            return 1
+        return getattr(self.engine.pool, 'size', lambda: 5)()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.executor_workers, thread_name_prefix='db',
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run blocking DB work (anything using session_scope) on the DB executor
+        so the event loop stays free for other requests.
+
+        Usage:
+            rows = await db.run(load_rows, portfolio_id)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(fn, *args, **kwargs),
+        )
+
+    def shutdown_executor(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
     def health_check(self) -> bool:
         """Check if database is accessible"""
         try:
@@ -193,6 +241,37 @@ def session_scope() -> Generator[Session, None, None]:
         yield session
 
 
+async def run_db(fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run blocking DB work on the global DB executor (convenience function)
+
+    Usage:
+        from core.database.session import run_db
+
+        trades = await run_db(load_trades, portfolio_id)
+    """
+    return await get_db_manager().run(fn, *args, **kwargs)
+
+
+def db_offload(fn: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """
+    Turn a blocking route handler into an async one that runs on the DB executor.
+
+    The signature is preserved, so FastAPI still resolves path/query params.
+
+    Usage:
+        @router.get("/portfolios")
+        @db_offload
+        def get_portfolios():
+            with session_scope() as session:
+                ...
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await run_db(fn, *args, **kwargs)
+    return wrapper
+
+
 def init_database():
     """
     Initialize database (create tables if they don't exist)
@@ -0,0 +1,233 @@
+"""
+OptionKey — Interned, immutable identity of one listed option contract.
+
+One OptionKey exists per (ticker, expiration, call/put, strike). Parsing and
+formatting happen once per contract: the OCC and DXLink strings and the
+domain Symbol are computed on first use and stored on the key, and string
+lookups go through intern tables, so marking/booking paths stop paying
+strftime/regex costs per call. Keys are hashable and compare by value, so
+they can be used directly as dict keys in the quote/Greeks caches.
+
+Formats:
+    DXLink streamer: ".SPY260320P550"   (strike without padding, ".5" kept)
+    OCC:             "SPY   260320P00550000"  (ticker padded to 6, strike × 1000)
+
+Usage:
+    from trading_cotrader.core.models.option_key import OptionKey, streamer_symbol_for
+    key = OptionKey.from_occ("IWM   260213P00263000")
+    key.streamer_symbol            # ".IWM260213P263"
+    OptionKey.from_streamer(".IWM260213P263") is key   # True — interned
+    streamer_symbol_for(symbol_orm)  # equity → ticker, option → DXLink symbol
+"""
+
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Optional, Tuple
+import re
+
+_STREAMER_RE = re.compile(r'^\.([A-Z0-9/]+?)(\d{6})([PC])(\d+(?:\.\d+)?)$')
+
+# Intern tables. Bounded by the option universe seen in one process; cleared
+# wholesale if that ever grows past _MAX_INTERNED.
+_MAX_INTERNED = 200_000
+_BY_IDENTITY: Dict[Tuple[str, date, str, Decimal], 'OptionKey'] = {}
+_BY_STREAMER: Dict[str, 'OptionKey'] = {}
+_BY_OCC: Dict[str, 'OptionKey'] = {}
+
+
+def _as_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    raise ValueError(f"Invalid expiration: {value!r}")
+
+
+def _as_right(value: Any) -> str:
+    """'C' / 'P' from 'call', 'put', 'C', 'P' or an OptionType enum."""
+    raw = getattr(value, 'value', value)
+    right = str(raw or '').strip().upper()[:1]
+    if right not in ('C', 'P'):
+        raise ValueError(f"Invalid option type: {value!r}")
+    return right
+
+
+def _as_strike(value: Any) -> Decimal:
+    try:
+        strike = value if isinstance(value, Decimal) else Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"Invalid strike: {value!r}")
+    if not strike.is_finite() or strike <= 0:
+        raise ValueError(f"Invalid strike: {value!r}")
+    # 550.000 → 550, 552.50 → 552.5 so equal strikes intern to one key
+    return strike.quantize(Decimal(1)) if strike == strike.to_integral_value() else strike.normalize()
+
+
+class OptionKey:
+    """Immutable option contract identity. Build via the classmethods, not directly."""
+
+    __slots__ = ('ticker', 'expiration', 'option_type', 'strike',
+                 '_hash', '_streamer', '_occ', '_symbol')
+
+    def __init__(self, ticker: str, expiration: date, option_type: str, strike: Decimal):
+        set_ = object.__setattr__
+        set_(self, 'ticker', ticker)
+        set_(self, 'expiration', expiration)
+        set_(self, 'option_type', option_type)  # 'C' or 'P'
+        set_(self, 'strike', strike)
+        set_(self, '_hash', hash((ticker, expiration, option_type, strike)))
+        set_(self, '_streamer', None)
+        set_(self, '_occ', None)
+        set_(self, '_symbol', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("OptionKey is immutable")
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, OptionKey):
+            return NotImplemented
+        return (self.ticker, self.expiration, self.option_type, self.strike) == \
+            (other.ticker, other.expiration, other.option_type, other.strike)
+
+    def __repr__(self) -> str:
+        return f"OptionKey({self.streamer_symbol})"
+
+    def __reduce__(self):
+        return (OptionKey.of, (self.ticker, self.expiration, self.option_type, self.strike))
+
+    # -----------------------------------------------------------------
+    # Construction (all interned)
+    # -----------------------------------------------------------------
+
+    @classmethod
+    def of(cls, ticker: str, expiration: Any, option_type: Any, strike: Any) -> 'OptionKey':
+        """Key from parts. Accepts date/datetime/ISO expiration and call/put/C/P/OptionType."""
+        identity = (ticker.strip(), _as_date(expiration), _as_right(option_type), _as_strike(strike))
+        key = _BY_IDENTITY.get(identity)
+        if key is None:
+            if len(_BY_IDENTITY) >= _MAX_INTERNED:
+                clear_intern_tables()
+            key = _BY_IDENTITY.setdefault(identity, cls(*identity))
+        return key
+
+    @classmethod
+    def from_streamer(cls, symbol: str) -> 'OptionKey':
+        """Parse a DXLink option symbol (".SPY260320P550"). Raises ValueError if not one."""
+        key = _BY_STREAMER.get(symbol)
+        if key is not None:
+            return key
+        match = _STREAMER_RE.match(symbol)
+        if not match:
+            raise ValueError(f"Invalid option streamer symbol: {symbol}")
+        ticker, yymmdd, right, strike = match.groups()
+        key = cls.of(ticker, _parse_yymmdd(yymmdd), right, strike)
+        _BY_STREAMER[symbol] = key
+        return key
+
+    @classmethod
+    def from_occ(cls, occ_symbol: str) -> 'OptionKey':
+        """Parse an OCC option symbol ("IWM   260213P00263000"). Raises ValueError if not one."""
+        key = _BY_OCC.get(occ_symbol)
+        if key is not None:
+            return key
+        if len(occ_symbol) < 21:
+            raise ValueError(f"Invalid OCC symbol length: {occ_symbol}")
+        ticker = occ_symbol[:6].strip()
+        right = occ_symbol[12]
+        if right not in ('C', 'P') or not occ_symbol[13:21].isdigit():
+            raise ValueError(f"Invalid OCC symbol: {occ_symbol}")
+        key = cls.of(ticker, _parse_yymmdd(occ_symbol[6:12]), right, Decimal(occ_symbol[13:21]) / 1000)
+        _BY_OCC[occ_symbol] = key
+        return key
+
+    @classmethod
+    def from_symbol(cls, symbol: Any) -> Optional['OptionKey']:
+        """
+        Key for a domain Symbol or SymbolORM (anything with ticker/expiration/
+        option_type/strike). None when it is not a fully specified option.
+        """
+        if symbol is None or not symbol.expiration or not symbol.strike or not symbol.option_type:
+            return None
+        try:
+            return cls.of(symbol.ticker, symbol.expiration, symbol.option_type, symbol.strike)
+        except ValueError:
+            return None
+
+    # -----------------------------------------------------------------
+    # Formats (computed once per key)
+    # -----------------------------------------------------------------
+
+    @property
+    def is_call(self) -> bool:
+        return self.option_type == 'C'
+
+    @property
+    def streamer_symbol(self) -> str:
+        """DXLink symbol, e.g. ".SPY260320P550" """
+        s = self._streamer
+        if s is None:
+            s = f".{self.ticker}{self.expiration:%y%m%d}{self.option_type}{self.strike}"
+            object.__setattr__(self, '_streamer', s)
+            _BY_STREAMER.setdefault(s, self)
+        return s
+
+    @property
+    def occ_symbol(self) -> str:
+        """OCC symbol, e.g. "SPY   260320P00550000" """
+        s = self._occ
+        if s is None:
+            s = f"{self.ticker:<6}{self.expiration:%y%m%d}{self.option_type}{int(self.strike * 1000):08d}"
+            object.__setattr__(self, '_occ', s)
+            _BY_OCC.setdefault(s, self)
+        return s
+
+    def to_symbol(self):
+        """Domain Symbol (frozen, so the one instance is shared)."""
+        sym = self._symbol
+        if sym is None:
+            from trading_cotrader.core.models import domain as dm
+            sym = dm.Symbol(
+                ticker=self.ticker,
+                asset_type=dm.AssetType.OPTION,
+                option_type=dm.OptionType.CALL if self.is_call else dm.OptionType.PUT,
+                strike=self.strike,
+                expiration=datetime(self.expiration.year, self.expiration.month, self.expiration.day),
+                multiplier=100,
+            )
+            object.__setattr__(self, '_symbol', sym)
+        return sym
+
+
+def _parse_yymmdd(yymmdd: str) -> date:
+    try:
+        return date(2000 + int(yymmdd[:2]), int(yymmdd[2:4]), int(yymmdd[4:6]))
+    except ValueError:
+        raise ValueError(f"Invalid expiration: {yymmdd}")
+
+
+def streamer_symbol_for(symbol: Any) -> Optional[str]:
+    """
+    DXLink symbol for a SymbolORM / domain Symbol: the ticker for equities,
+    the option symbol for fully specified options, else None.
+    """
+    if symbol is None:
+        return None
+    asset_type = getattr(symbol.asset_type, 'value', symbol.asset_type)
+    if asset_type == 'equity':
+        return symbol.ticker
+    key = OptionKey.from_symbol(symbol)
+    return key.streamer_symbol if key else None
+
+
+def clear_intern_tables() -> None:
+    """Drop all interned keys (existing keys stay valid, just no longer shared)."""
+    _BY_IDENTITY.clear()
+    _BY_STREAMER.clear()
+    _BY_OCC.clear()
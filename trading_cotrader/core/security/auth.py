@@ -5,12 +5,19 @@ SaaS authentication layer:
   - Email + password registration/login
   - JWT access + refresh tokens
   - OAuth stub (Google, GitHub — future)
+  - Principal cache: a verified access token maps to its user dict for a
+    short TTL (bounded LRU), so authenticated requests skip both the JWT
+    decode and the UserORM SELECT. deactivate_user / set_subscription_tier
+    invalidate the user's entries; invalidate_user() for other writers.
 """
 
 import uuid
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Set, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -26,6 +33,10 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 REFRESH_TOKEN_EXPIRE_DAYS = 30
 
+# Principal cache bounds: entries live until min(TTL, token expiry)
+PRINCIPAL_CACHE_TTL_SECONDS = 300
+PRINCIPAL_CACHE_MAX_ENTRIES = 4096
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -52,6 +63,7 @@ def create_access_token(user_id: str, email: str) -> str:
         "email": email,
         "exp": expire,
         "type": "access",
+        "jti": uuid.uuid4().hex,
     }
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
@@ -75,6 +87,97 @@ def decode_token(token: str) -> Optional[dict]:
         return None
 
 
+# ---------------------------------------------------------------------------
+# Principal cache
+# ---------------------------------------------------------------------------
+
+class PrincipalCache:
+    """
+    LRU + TTL map from access token to the authenticated user dict.
+
+    One entry per issued token (each carries its own jti). A token is only
+    inserted after its signature and expiry were verified, so a hit needs no
+    decode; the entry expires with the token or after `ttl` seconds,
+    whichever is first. Entries are indexed by user id for invalidation.
+    """
+
+    def __init__(self, ttl: float = PRINCIPAL_CACHE_TTL_SECONDS,
+                 max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Tuple[dict, float]]' = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            user, expires_at = entry
+            if time.time() >= expires_at:
+                self._drop(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return dict(user)
+
+    def put(self, token: str, user: dict, token_exp: Optional[float] = None) -> None:
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        with self._lock:
+            self._drop(token)
+            self._entries[token] = (dict(user), expires_at)
+            self._by_user.setdefault(user['id'], set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: str) -> int:
+        """Drop every cached token of a user. Returns the number dropped."""
+        with self._lock:
+            tokens = list(self._by_user.get(user_id, ()))
+            for token in tokens:
+                self._drop(token)
+            return len(tokens)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, token: str) -> None:
+        """Remove one entry. Caller must hold the lock."""
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_id = entry[0]['id']
+        tokens = self._by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_user[user_id]
+
+
+_principal_cache = PrincipalCache()
+
+
+def get_principal_cache() -> PrincipalCache:
+    return _principal_cache
+
+
+def invalidate_user(user_id: str) -> int:
+    """Forget cached principals for a user (call after any change to the user row)."""
+    return _principal_cache.invalidate_user(user_id)
+
+
 # ---------------------------------------------------------------------------
 # User operations
 # ---------------------------------------------------------------------------
@@ -129,6 +232,10 @@ def authenticate_user(email: str, password: str) -> Optional[dict]:
 
 def get_user_from_token(token: str) -> Optional[dict]:
     """Get user from JWT token. Returns user dict or None."""
+    cached = _principal_cache.get(token)
+    if cached is not None:
+        return cached
+
     payload = decode_token(token)
     if not payload or payload.get('type') != 'access':
         return None
@@ -143,9 +250,36 @@ def get_user_from_token(token: str) -> Optional[dict]:
         if not user:
             return None
 
-        return {
+        principal = {
             'id': user.id,
             'email': user.email,
             'name': user.name,
             'subscription_tier': user.subscription_tier,
         }
+
+    _principal_cache.put(token, principal, payload.get('exp'))
+    return principal
+
+
+def deactivate_user(user_id: str) -> bool:
+    """Deactivate a user; their tokens stop authenticating immediately."""
+    with session_scope() as session:
+        user = session.get(UserORM, user_id)
+        if not user:
+            return False
+        user.is_active = False
+        session.commit()
+    invalidate_user(user_id)
+    return True
+
+
+def set_subscription_tier(user_id: str, tier: str) -> bool:
+    """Change a user's subscription tier; cached principals are refreshed on next request."""
+    with session_scope() as session:
+        user = session.get(UserORM, user_id)
+        if not user:
+            return False
+        user.subscription_tier = tier
+        session.commit()
+    invalidate_user(user_id)
+    return True
@@ -2,7 +2,9 @@
 Credential Encryption — AES-256 for broker tokens at rest.
 
 Uses Fernet (AES-128-CBC with HMAC) from the cryptography library.
-Per-user encryption key derived from SECRET_KEY + user_id.
+Per-user encryption key derived from SECRET_KEY + user_id. The derived
+Fernet instance is cached per user (bounded LRU), so repeated decrypts
+skip the key derivation.
 
 Usage:
     from trading_cotrader.core.security.encryption import encrypt_token, decrypt_token
@@ -19,6 +21,7 @@ import os
 import hashlib
 import base64
 import logging
+from functools import lru_cache
 from typing import Optional
 
 from cryptography.fernet import Fernet, InvalidToken
@@ -40,6 +43,12 @@ def _derive_key(user_id: str) -> bytes:
     return base64.urlsafe_b64encode(digest)
 
 
+@lru_cache(maxsize=1024)
+def _fernet(user_id: str) -> Fernet:
+    """Per-user Fernet, built once per user id."""
+    return Fernet(_derive_key(user_id))
+
+
 def encrypt_token(plaintext: str, user_id: str) -> str:
     """Encrypt a broker token for storage.
 
@@ -50,9 +59,7 @@ def encrypt_token(plaintext: str, user_id: str) -> str:
     Returns:
         Encrypted string (base64, safe for DB storage)
     """
-    key = _derive_key(user_id)
-    f = Fernet(key)
-    encrypted = f.encrypt(plaintext.encode('utf-8'))
+    encrypted = _fernet(user_id).encrypt(plaintext.encode('utf-8'))
     return encrypted.decode('utf-8')
 
 
@@ -69,9 +76,7 @@ def decrypt_token(encrypted: str, user_id: str) -> Optional[str]:
     if not encrypted:
         return None
     try:
-        key = _derive_key(user_id)
-        f = Fernet(key)
-        decrypted = f.decrypt(encrypted.encode('utf-8'))
+        decrypted = _fernet(user_id).decrypt(encrypted.encode('utf-8'))
         return decrypted.decode('utf-8')
     except InvalidToken:
         logger.error("Failed to decrypt token — key may have changed or data corrupted")
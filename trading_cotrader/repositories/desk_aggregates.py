@@ -0,0 +1,188 @@
+"""
+Desk Aggregates — per-desk Greek, risk and P&L attribution totals.
+
+Cross-desk analytics (Atlas B14/K7, Steward K6) used to load every desk and
+then every trade of every desk, summing in Python: 1 + N queries and one ORM
+object per trade. Here each view is a single GROUP BY over portfolios LEFT
+JOIN trades, so the cost is one statement and one row per desk regardless of
+how many desks or trades exist. Desks without trades come back with zeros.
+
+When the ContainerManager already holds every desk's open trades (bundles
+loaded by Steward), risk_from_containers() sums them in memory instead and
+only the desk list is read from the DB.
+
+Usage:
+    with session_scope() as session:
+        repo = DeskAggregateRepository(session)
+        desks = repo.desks()                       # id, name, capital — no trades
+        risk = risk_from_containers(cm, desks) or repo.risk_by_desk()
+        attribution = repo.attribution_by_desk()
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, List, Optional
+import logging
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from trading_cotrader.core.database.schema import PortfolioORM, TradeORM
+
+if TYPE_CHECKING:
+    from trading_cotrader.containers.container_manager import ContainerManager
+
+logger = logging.getLogger(__name__)
+
+DESK_PORTFOLIO_TYPE = 'what_if'
+
+RISK_COLUMNS = {
+    'delta': TradeORM.current_delta,
+    'gamma': TradeORM.current_gamma,
+    'theta': TradeORM.current_theta,
+    'vega': TradeORM.current_vega,
+    'risk': TradeORM.max_risk,
+}
+
+ATTRIBUTION_COLUMNS = {
+    'delta_pnl': TradeORM.delta_pnl,
+    'theta_pnl': TradeORM.theta_pnl,
+    'gamma_pnl': TradeORM.gamma_pnl,
+    'vega_pnl': TradeORM.vega_pnl,
+    'unexplained_pnl': TradeORM.unexplained_pnl,
+    'total_pnl': TradeORM.total_pnl,
+}
+
+
+@dataclass(frozen=True)
+class Desk:
+    """A desk portfolio without its trades."""
+    id: str
+    name: str
+    initial_capital: float = 0.0
+
+
+@dataclass
+class DeskRisk:
+    """Open-trade Greek and risk totals for one desk."""
+    portfolio_id: str
+    name: str
+    delta: float = 0.0
+    gamma: float = 0.0
+    theta: float = 0.0
+    vega: float = 0.0
+    risk: float = 0.0
+    positions: int = 0
+
+
+@dataclass
+class DeskAttribution:
+    """P&L attribution totals (open and closed trades) for one desk."""
+    portfolio_id: str
+    name: str
+    delta_pnl: float = 0.0
+    theta_pnl: float = 0.0
+    gamma_pnl: float = 0.0
+    vega_pnl: float = 0.0
+    unexplained_pnl: float = 0.0
+    total_pnl: float = 0.0
+
+
+def _sum(column):
+    return func.coalesce(func.sum(func.coalesce(column, 0)), 0)
+
+
+class DeskAggregateRepository:
+    """Set-based reads over desks and their trades. One statement per method."""
+
+    def __init__(self, session: Session, portfolio_type: str = DESK_PORTFOLIO_TYPE):
+        self.session = session
+        self.portfolio_type = portfolio_type
+
+    def desks(self) -> List[Desk]:
+        """Desk id, name and capital — a column projection, no ORM objects."""
+        rows = self.session.query(
+            PortfolioORM.id, PortfolioORM.name, PortfolioORM.initial_capital,
+        ).filter(
+            PortfolioORM.portfolio_type == self.portfolio_type,
+        ).order_by(PortfolioORM.name).all()
+        return [Desk(id=pid, name=name, initial_capital=float(capital or 0))
+                for pid, name, capital in rows]
+
+    def risk_by_desk(self) -> List[DeskRisk]:
+        """Open-trade Greeks, max risk and position count per desk."""
+        rows = self._grouped(RISK_COLUMNS, TradeORM.is_open == True)
+        return [
+            DeskRisk(portfolio_id=row.id, name=row.name, positions=int(row.positions),
+                     **{key: float(getattr(row, key)) for key in RISK_COLUMNS})
+            for row in rows
+        ]
+
+    def attribution_by_desk(self) -> List[DeskAttribution]:
+        """Greek P&L attribution per desk across all of its trades."""
+        rows = self._grouped(ATTRIBUTION_COLUMNS)
+        return [
+            DeskAttribution(portfolio_id=row.id, name=row.name,
+                            **{key: float(getattr(row, key)) for key in ATTRIBUTION_COLUMNS})
+            for row in rows
+        ]
+
+    def _grouped(self, columns: Dict, *trade_criteria):
+        """portfolios LEFT JOIN trades ... GROUP BY portfolio, one row per desk."""
+        join_on = and_(TradeORM.portfolio_id == PortfolioORM.id, *trade_criteria)
+        return self.session.query(
+            PortfolioORM.id,
+            PortfolioORM.name,
+            func.count(TradeORM.id).label('positions'),
+            *[_sum(column).label(key) for key, column in columns.items()],
+        ).outerjoin(
+            TradeORM, join_on,
+        ).filter(
+            PortfolioORM.portfolio_type == self.portfolio_type,
+        ).group_by(
+            PortfolioORM.id, PortfolioORM.name,
+        ).order_by(PortfolioORM.name).all()
+
+
+# =============================================================================
+# Container fast path
+# =============================================================================
+
+def risk_from_containers(cm: Optional['ContainerManager'],
+                         desks: List[Desk]) -> Optional[List[DeskRisk]]:
+    """
+    Desk risk totals from the loaded trade containers, or None when any desk
+    is not covered by a loaded bundle (caller falls back to risk_by_desk()).
+
+    Bundle trade containers hold exactly the open trades of the portfolios
+    they own, kept current by ContainerManager full and incremental loads.
+    """
+    if cm is None:
+        return None
+
+    bundles = {}
+    for desk in desks:
+        bundle = cm.get_trade_bundle(desk.id)
+        if bundle is None or not bundle.trades.is_initialized:
+            return None
+        bundles[bundle.config_name] = bundle
+
+    totals = {desk.id: DeskRisk(portfolio_id=desk.id, name=desk.name) for desk in desks}
+    sums = {pid: [Decimal('0')] * 5 for pid in totals}
+    for bundle in bundles.values():
+        for trade in bundle.trades.get_all():
+            acc = sums.get(trade.portfolio_id)
+            if acc is None:
+                continue
+            acc[0] += trade.delta
+            acc[1] += trade.gamma
+            acc[2] += trade.theta
+            acc[3] += trade.vega
+            acc[4] += trade.max_risk or 0
+            totals[trade.portfolio_id].positions += 1
+
+    for pid, (delta, gamma, theta, vega, risk) in sums.items():
+        desk = totals[pid]
+        desk.delta, desk.gamma, desk.theta = float(delta), float(gamma), float(theta)
+        desk.vega, desk.risk = float(vega), float(risk)
+    return list(totals.values())
@@ -0,0 +1,202 @@
+"""
+Snapshot Repository — Bulk upsert for time-series snapshot tables.
+
+Daily / intraday snapshots write one row per position (or portfolio) per
+timestamp. Instead of probing each key with filter_by(...).first() and
+adding rows one by one, rows are built in memory and written with a
+multi-row INSERT ... ON CONFLICT DO UPDATE per table (SQLite and
+PostgreSQL). Other dialects fall back to one SELECT of the existing keys
+plus bulk insert / update mappings.
+
+ON CONFLICT needs a unique index on the conflict key. New databases get it
+from the UniqueConstraint in schema.py; databases created before it existed
+get it on first use (CREATE UNIQUE INDEX), once per engine and table.
+
+Usage:
+    repo = SnapshotRepository(session)
+    repo.upsert_greeks_history([
+        {'id': str(uuid.uuid4()), 'position_id': pid, 'timestamp': ts, 'delta': d, ...},
+    ])
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set
+import logging
+import weakref
+
+from sqlalchemy import inspect, text, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from trading_cotrader.core.database.schema import (
+    DailyPerformanceORM,
+    GreeksHistoryORM,
+    PositionGreeksSnapshotORM,
+    PositionPnLSnapshotORM,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bind parameters per statement (SQLite's historical SQLITE_MAX_VARIABLE_NUMBER,
+# PostgreSQL's protocol limit is 65535)
+MAX_BIND_PARAMS = {'sqlite': 999, 'postgresql': 32000}
+
+# Columns never overwritten on conflict
+IMMUTABLE_COLUMNS = {'id', 'created_at'}
+
+# engine -> {table: True if ON CONFLICT can be used}
+_conflict_ready: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+class SnapshotRepository:
+    """Set-based writes for snapshot tables."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    # -----------------------------------------------------------------
+    # Table-specific upserts
+    # -----------------------------------------------------------------
+
+    def upsert_greeks_history(self, rows: List[dict]) -> int:
+        """Daily Greeks per position (greeks_history), keyed by position + timestamp."""
+        return self.upsert_rows(GreeksHistoryORM, rows, ('position_id', 'timestamp'))
+
+    def upsert_position_greeks(self, rows: List[dict]) -> int:
+        """Intraday Greeks per position (position_greeks_snapshots)."""
+        return self.upsert_rows(PositionGreeksSnapshotORM, rows, ('position_id', 'timestamp'))
+
+    def upsert_position_pnl(self, rows: List[dict]) -> int:
+        """P&L attribution per position (position_pnl_snapshots)."""
+        return self.upsert_rows(PositionPnLSnapshotORM, rows, ('position_id', 'timestamp'))
+
+    def upsert_daily_performance(self, rows: List[dict]) -> int:
+        """Portfolio-level daily snapshot, keyed by portfolio + date."""
+        return self.upsert_rows(DailyPerformanceORM, rows, ('portfolio_id', 'date'))
+
+    # -----------------------------------------------------------------
+    # Generic upsert
+    # -----------------------------------------------------------------
+
+    def upsert_rows(
+        self,
+        model,
+        rows: List[dict],
+        conflict_cols: Sequence[str],
+        update_cols: Optional[Sequence[str]] = None,
+    ) -> int:
+        """
+        Insert rows, updating the existing row on a conflict_cols match.
+
+        Every row must carry the same keys. update_cols defaults to every
+        supplied column except the key, id and created_at. Returns len(rows).
+        """
+        if not rows:
+            return 0
+        rows = _dedupe(rows, conflict_cols)
+        columns = list(rows[0])
+        if update_cols is None:
+            update_cols = [c for c in columns if c not in IMMUTABLE_COLUMNS and c not in conflict_cols]
+
+        # Pending ORM changes must reach the DB before the Core statement
+        self.session.flush()
+        dialect = self.session.get_bind().dialect.name
+        if dialect in MAX_BIND_PARAMS and self._ensure_conflict_index(model, conflict_cols):
+            self._upsert_on_conflict(model, rows, conflict_cols, update_cols, dialect)
+        else:
+            self._upsert_by_lookup(model, rows, conflict_cols, update_cols)
+
+        # Rows already in the identity map were rewritten behind the ORM's back
+        for obj in list(self.session.identity_map.values()):
+            if isinstance(obj, model):
+                self.session.expire(obj)
+        return len(rows)
+
+    def _upsert_on_conflict(self, model, rows, conflict_cols, update_cols, dialect: str) -> None:
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        chunk = max(1, MAX_BIND_PARAMS[dialect] // len(rows[0]))
+        for start in range(0, len(rows), chunk):
+            stmt = insert(model.__table__).values(rows[start:start + chunk])
+            if update_cols:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(conflict_cols),
+                    set_={c: stmt.excluded[c] for c in update_cols},
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_cols))
+            self.session.execute(stmt)
+
+    def _upsert_by_lookup(self, model, rows, conflict_cols, update_cols) -> None:
+        """Portable path: one SELECT of existing keys, then bulk insert/update."""
+        key_columns = [getattr(model, c) for c in conflict_cols]
+        keys = [tuple(r[c] for c in conflict_cols) for r in rows]
+        existing: Dict[tuple, str] = {}
+        chunk = max(1, 900 // len(conflict_cols))
+        for start in range(0, len(keys), chunk):
+            for row in (
+                self.session.query(model.id, *key_columns)
+                .filter(tuple_(*key_columns).in_(keys[start:start + chunk]))
+            ):
+                existing[tuple(row[1:])] = row[0]
+
+        inserts, updates = [], []
+        for key, row in zip(keys, rows):
+            if key in existing:
+                updates.append({'id': existing[key], **{c: row[c] for c in update_cols}})
+            else:
+                inserts.append(row)
+        if inserts:
+            self.session.bulk_insert_mappings(model, inserts)
+        if updates and update_cols:
+            self.session.bulk_update_mappings(model, updates)
+        self.session.flush()
+
+    def _ensure_conflict_index(self, model, conflict_cols: Sequence[str]) -> bool:
+        """Make sure conflict_cols has a unique index (legacy DBs predate it)."""
+        table = model.__tablename__
+        ready = _conflict_ready.setdefault(self.session.get_bind(), {})
+        if table in ready:
+            return ready[table]
+
+        wanted = set(conflict_cols)
+        try:
+            inspector = inspect(self.session.connection())
+            unique_sets: List[Set[str]] = [
+                set(uc['column_names']) for uc in inspector.get_unique_constraints(table)
+            ] + [
+                set(ix['column_names']) for ix in inspector.get_indexes(table) if ix.get('unique')
+            ]
+            if wanted in unique_sets:
+                ready[table] = True
+                return True
+
+            name = f"uix_{table}_{'_'.join(conflict_cols)}"
+            with self.session.begin_nested():
+                self.session.execute(text(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(conflict_cols)})"
+                ))
+            logger.info(f"Created unique index {name} for snapshot upserts")
+            ready[table] = True
+        except SQLAlchemyError as e:
+            # Typically duplicate keys already in the table — keep working without ON CONFLICT
+            logger.warning(f"No unique index on {table}({', '.join(conflict_cols)}), using lookup upsert: {e}")
+            ready[table] = False
+        return ready[table]
+
+
+def _dedupe(rows: List[dict], conflict_cols: Sequence[str]) -> List[dict]:
+    """Last row wins per key — ON CONFLICT cannot touch one row twice per statement."""
+    by_key = {tuple(r[c] for c in conflict_cols): r for r in rows}
+    return list(by_key.values()) if len(by_key) != len(rows) else rows
+
+
+def snapshot_timestamp(at: Optional[datetime] = None, resolution_seconds: int = 60) -> datetime:
+    """Truncate a timestamp to the snapshot resolution so re-runs within a bucket upsert."""
+    at = (at or datetime.utcnow()).replace(microsecond=0)
+    seconds = at.hour * 3600 + at.minute * 60 + at.second
+    bucket = seconds - seconds % max(1, min(resolution_seconds, 86400))
+    return at.replace(hour=bucket // 3600, minute=(bucket % 3600) // 60, second=bucket % 60)
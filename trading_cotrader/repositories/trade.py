@@ -8,15 +8,18 @@ Updated for enhanced domain.py with:
 - Lifecycle methods
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session, Query, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 import logging
 
 from trading_cotrader.repositories.position import SymbolRepository
 from trading_cotrader.repositories.base import BaseRepository
-from trading_cotrader.core.database.schema import TradeORM, LegORM, StrategyORM
+from trading_cotrader.core.database.schema import (
+    TradeORM, LegORM, StrategyORM, PortfolioORM, SymbolORM,
+)
 import trading_cotrader.core.models.domain as dm
 
 logger = logging.getLogger(__name__)
@@ -635,3 +638,184 @@ class StrategyRepository(BaseRepository[dm.Strategy, StrategyORM]):
                 strategy_kwargs[field] = getattr(strategy_orm, field, None)
         
         return dm.Strategy(**strategy_kwargs)
+
+
+# =============================================================================
+# Trade read path — eager / projected loading for serialization
+# =============================================================================
+
+# Chunk size for the `trade_id IN (...)` leg lookup in TradeQuery.rows()
+# (stays under SQLite's bound-parameter limit).
+LEG_FETCH_CHUNK = 500
+
+
+class ProjectedRow:
+    """
+    Read-only attribute view over a flat result row.
+
+    Exposes the same attribute names as the ORM object it stands in for, so
+    serializers written against TradeORM/LegORM work unchanged on projected rows.
+    """
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self) -> str:
+        return f"ProjectedRow(id={self._data.get('id')!r})"
+
+
+class TradeQuery:
+    """
+    Fluent builder for trade reads that never lazy-loads.
+
+    Serializing a trade touches portfolio, strategy, legs and each leg's symbol.
+    Loading those lazily costs 1 + N + N*legs SELECTs; this builder loads them in
+    a fixed number of queries regardless of how many trades match.
+
+    Two read modes:
+      all()/first() — ORM objects with portfolio/strategy joined and
+                      legs -> symbol selectin-loaded (3 queries)
+      rows()        — flat column projection, no ORM identity map or object
+                      construction (2 queries, plus one per extra 500 trades)
+
+    Usage:
+        trades = TradeQuery(session).portfolio(p.id).status('open').all()
+        rows = TradeQuery(session, tenant_query(session, TradeORM)).page(100, 0).rows()
+        payload = [_serialize_trade(t) for t in rows]
+    """
+
+    def __init__(self, session: Session, query: Optional[Query] = None):
+        self.session = session
+        self._query = query if query is not None else session.query(TradeORM)
+        self._limit: Optional[int] = None
+        self._offset: Optional[int] = None
+
+    # -----------------------------------------------------------------
+    # Builder
+    # -----------------------------------------------------------------
+
+    def filter(self, *criteria) -> 'TradeQuery':
+        self._query = self._query.filter(*criteria)
+        return self
+
+    def portfolio(self, portfolio_id: str) -> 'TradeQuery':
+        return self.filter(TradeORM.portfolio_id == portfolio_id)
+
+    def status(self, status: Optional[str]) -> 'TradeQuery':
+        """'open' / 'closed' filter on is_open; anything else means all."""
+        if status == 'open':
+            return self.filter(TradeORM.is_open == True)
+        if status == 'closed':
+            return self.filter(TradeORM.is_open == False)
+        return self
+
+    def order_by(self, *clauses) -> 'TradeQuery':
+        self._query = self._query.order_by(*clauses)
+        return self
+
+    def page(self, limit: Optional[int], offset: int = 0) -> 'TradeQuery':
+        """Limit/offset are applied last, after joins in either read mode."""
+        self._limit = limit
+        self._offset = offset or None
+        return self
+
+    # -----------------------------------------------------------------
+    # ORM mode
+    # -----------------------------------------------------------------
+
+    def count(self) -> int:
+        """Total matching trades, ignoring page()."""
+        return self._query.order_by(None).count()
+
+    def all(self) -> List[TradeORM]:
+        return self._paged(self._query.options(*self._eager_options())).all()
+
+    def first(self) -> Optional[TradeORM]:
+        return self._query.options(*self._eager_options()).first()
+
+    @staticmethod
+    def _eager_options() -> list:
+        return [
+            joinedload(TradeORM.portfolio),
+            joinedload(TradeORM.strategy),
+            selectinload(TradeORM.legs).selectinload(LegORM.symbol),
+        ]
+
+    def _paged(self, query: Query) -> Query:
+        if self._offset:
+            query = query.offset(self._offset)
+        if self._limit is not None:
+            query = query.limit(self._limit)
+        return query
+
+    # -----------------------------------------------------------------
+    # Projection mode
+    # -----------------------------------------------------------------
+
+    def rows(self) -> List[ProjectedRow]:
+        """
+        Matching trades as flat ProjectedRows (portfolio/strategy/legs/symbol
+        nested the same way as on the ORM), built straight from result tuples.
+        """
+        trade_cols = list(TradeORM.__table__.c)
+        query = self._paged(
+            self._query
+            .outerjoin(PortfolioORM, TradeORM.portfolio_id == PortfolioORM.id)
+            .outerjoin(StrategyORM, TradeORM.strategy_id == StrategyORM.id)
+            .with_entities(
+                *trade_cols,
+                PortfolioORM.id.label('_portfolio_id'),
+                PortfolioORM.name.label('_portfolio_name'),
+                StrategyORM.id.label('_strategy_id'),
+                StrategyORM.strategy_type.label('_strategy_type'),
+            )
+        )
+
+        trades: List[ProjectedRow] = []
+        by_id: Dict[str, List[ProjectedRow]] = {}
+        for row in query:
+            data = dict(row._mapping)
+            portfolio_id, name = data.pop('_portfolio_id'), data.pop('_portfolio_name')
+            strategy_id, strategy_type = data.pop('_strategy_id'), data.pop('_strategy_type')
+            data['portfolio'] = ProjectedRow({'id': portfolio_id, 'name': name}) if portfolio_id else None
+            data['strategy'] = (
+                ProjectedRow({'id': strategy_id, 'strategy_type': strategy_type}) if strategy_id else None
+            )
+            data['legs'] = by_id[data['id']] = []
+            trades.append(ProjectedRow(data))
+
+        self._attach_legs(by_id)
+        return trades
+
+    def _attach_legs(self, legs_by_trade: Dict[str, List[ProjectedRow]]) -> None:
+        if not legs_by_trade:
+            return
+        leg_cols = list(LegORM.__table__.c)
+        sym_cols = [c.label(f'_symbol_{c.key}') for c in SymbolORM.__table__.c]
+        prefix = len('_symbol_')
+        trade_ids = list(legs_by_trade)
+
+        for start in range(0, len(trade_ids), LEG_FETCH_CHUNK):
+            chunk = trade_ids[start:start + LEG_FETCH_CHUNK]
+            stmt = (
+                select(*leg_cols, *sym_cols)
+                .outerjoin(SymbolORM, LegORM.symbol_id == SymbolORM.id)
+                .where(LegORM.trade_id.in_(chunk))
+            )
+            for row in self.session.execute(stmt):
+                data, symbol = {}, {}
+                for key, value in row._mapping.items():
+                    if key.startswith('_symbol_'):
+                        symbol[key[prefix:]] = value
+                    else:
+                        data[key] = value
+                data['symbol'] = ProjectedRow(symbol) if symbol.get('id') else None
+                legs_by_trade[data['trade_id']].append(ProjectedRow(data))
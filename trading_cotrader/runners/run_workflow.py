@@ -184,6 +184,11 @@ def main():
                 brokers['tastytrade'] = tt
                 primary_broker = tt
                 logger.info(f"TastyTrade: connected (account={tt.account_id})")
+                # One long-lived DXLink connection for quotes/Greeks (cache-backed reads)
+                try:
+                    tt.start_streaming()
+                except Exception as e:
+                    logger.warning(f"TastyTrade: persistent streaming unavailable, using one-shot fetches: {e}")
         except Exception as e:
             logger.debug(f"TastyTrade: {e}")
 
@@ -279,6 +284,10 @@ def main():
         print("\nShutting down...")
 
     scheduler.stop()
+    engine.stop()
+    for adapter in brokers.values():
+        if hasattr(adapter, 'stop_streaming'):
+            adapter.stop_streaming()
     print("Workflow engine stopped.")
 
 
@@ -0,0 +1,178 @@
+"""
+Load-test the v2 API under concurrent dashboard polling.
+
+Seeds a throwaway SQLite DB with portfolios/trades/legs, serves the v2 router
+with uvicorn, then runs N concurrent pollers against the DB-heavy dashboard
+endpoints while a separate probe hits /health. Reports poller throughput and
+/health latency — if DB work blocks the event loop, /health latency tracks
+the slowest query instead of staying near zero.
+
+Usage:
+    python -m trading_cotrader.scripts.benchmark_api_v2
+    python -m trading_cotrader.scripts.benchmark_api_v2 --pollers 32 --seconds 15 --trades 400
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+
+POLLED_PATHS = [
+    '/api/v2/portfolios',
+    '/api/v2/portfolios/{name}/trades',
+    '/api/v2/positions',
+]
+
+
+def seed(db, portfolios: int, trades: int) -> list:
+    """Create portfolios with open trades, 4 option legs each."""
+    from trading_cotrader.core.database.schema import (
+        LegORM, PortfolioORM, StrategyORM, SymbolORM, TradeORM,
+    )
+
+    names = []
+    expiry = datetime.utcnow() + timedelta(days=30)
+    with db.session_scope() as session:
+        strategy = StrategyORM(id=str(uuid.uuid4()), name='IC', strategy_type='iron_condor')
+        session.add(strategy)
+        symbols = []
+        for strike in (480, 490, 510, 520):
+            sym = SymbolORM(
+                id=str(uuid.uuid4()), ticker='SPY', asset_type='option',
+                option_type='put' if strike < 500 else 'call',
+                strike=Decimal(strike), expiration=expiry, multiplier=100,
+            )
+            session.add(sym)
+            symbols.append(sym)
+
+        for p in range(portfolios):
+            name = f'bench_{p}'
+            names.append(name)
+            pid = str(uuid.uuid4())
+            session.add(PortfolioORM(
+                id=pid, name=name, portfolio_type='what_if',
+                cash_balance=Decimal('100000'), buying_power=Decimal('100000'),
+            ))
+            for _ in range(trades):
+                tid = str(uuid.uuid4())
+                session.add(TradeORM(
+                    id=tid, portfolio_id=pid, strategy_id=strategy.id, underlying_symbol='SPY',
+                    trade_type='what_if', trade_status='executed', is_open=True,
+                    entry_price=Decimal('1.50'), current_price=Decimal('1.10'),
+                ))
+                for i, sym in enumerate(symbols):
+                    session.add(LegORM(
+                        id=str(uuid.uuid4()), trade_id=tid, symbol_id=sym.id,
+                        quantity=-1 if i in (1, 2) else 1, side='sell' if i in (1, 2) else 'buy',
+                        entry_price=Decimal('1.00'), current_price=Decimal('0.80'),
+                    ))
+    return names
+
+
+def serve(app, port: int):
+    import uvicorn
+
+    config = uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning')
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+async def run_load(base_url: str, names: list, pollers: int, seconds: float) -> dict:
+    import httpx
+
+    deadline = time.monotonic() + seconds
+    counts = {'ok': 0, 'error': 0}
+    poll_latency, health_latency = [], []
+
+    async def poller(i: int):
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            n = i
+            while time.monotonic() < deadline:
+                path = POLLED_PATHS[n % len(POLLED_PATHS)].format(name=names[n % len(names)])
+                n += 1
+                start = time.perf_counter()
+                resp = await client.get(path)
+                poll_latency.append(time.perf_counter() - start)
+                counts['ok' if resp.status_code == 200 else 'error'] += 1
+
+    async def probe():
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                await client.get('/health')
+                health_latency.append(time.perf_counter() - start)
+                await asyncio.sleep(0.05)
+
+    await asyncio.gather(probe(), *(poller(i) for i in range(pollers)))
+
+    def pct(values, q):
+        return statistics.quantiles(values, n=100)[q - 1] * 1000 if len(values) > 1 else 0.0
+
+    return {
+        'requests': counts['ok'],
+        'errors': counts['error'],
+        'throughput_rps': counts['ok'] / seconds,
+        'poll_p50_ms': pct(poll_latency, 50),
+        'poll_p95_ms': pct(poll_latency, 95),
+        'health_p50_ms': pct(health_latency, 50),
+        'health_p95_ms': pct(health_latency, 95),
+        'health_max_ms': max(health_latency) * 1000 if health_latency else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pollers', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--portfolios', type=int, default=4)
+    parser.add_argument('--trades', type=int, default=200, help='open trades per portfolio')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    from fastapi import FastAPI
+    import trading_cotrader.core.database.session as db_session
+    from trading_cotrader.web.api_v2 import create_v2_router
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    db = db_session.DatabaseManager(database_url=f'sqlite:///{path}')
+    db.create_all_tables()
+    db_session._db_manager = db  # route session_scope() to the bench DB
+    names = seed(db, args.portfolios, args.trades)
+
+    app = FastAPI()
+
+    @app.get('/health')
+    async def health():
+        return {'status': 'ok'}
+
+    app.include_router(create_v2_router(None), prefix='/api/v2')
+    server, thread = serve(app, args.port)
+
+    print(f"Polling {len(POLLED_PATHS)} endpoints with {args.pollers} clients for {args.seconds:.0f}s "
+          f"({args.portfolios} portfolios x {args.trades} open trades)...")
+    try:
+        stats = asyncio.run(run_load(f'http://127.0.0.1:{args.port}', names, args.pollers, args.seconds))
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+    print(f"  requests:    {stats['requests']} ok, {stats['errors']} errors")
+    print(f"  throughput:  {stats['throughput_rps']:.1f} req/s")
+    print(f"  poll:        p50 {stats['poll_p50_ms']:.0f} ms, p95 {stats['poll_p95_ms']:.0f} ms")
+    print(f"  /health:     p50 {stats['health_p50_ms']:.1f} ms, p95 {stats['health_p95_ms']:.1f} ms, "
+          f"max {stats['health_max_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,10 @@ to avoid redundant market data fetches, then split results by desk.
 """
 
 from datetime import date as date_cls
-from pathlib import Path
 from typing import Any, Optional
 import logging
 import time
 
-import yaml
-
 logger = logging.getLogger(__name__)
 
 # Map desk keys → market_analyzer StrategyType string values
@@ -27,14 +24,18 @@ PLAN_TIMEOUT_S = 180  # Total timeout for plan generation (13 tickers × multi-s
 
 
 def load_desk_configs() -> list[dict]:
-    """Load desk portfolio configs from risk_config.yaml."""
-    config_path = Path(__file__).parent.parent / "config" / "risk_config.yaml"
-    if not config_path.exists():
+    """Load desk portfolio configs from risk_config.yaml (cached by the config registry)."""
+    from trading_cotrader.config.config_registry import CONFIG_DIR, get_config_registry
+    try:
+        desks = get_config_registry().get(CONFIG_DIR / "risk_config.yaml", _parse_desk_configs)
+    except FileNotFoundError:
         return []
-    with open(config_path, 'r') as f:
-        cfg = yaml.safe_load(f)
+    return [dict(d) for d in desks]
+
+
+def _parse_desk_configs(cfg: dict) -> list[dict]:
     desks = []
-    for key, pcfg in (cfg.get('portfolios', {}) or {}).items():
+    for key, pcfg in ((cfg or {}).get('portfolios', {}) or {}).items():
         if key.startswith('desk_'):
             desks.append({
                 'key': key,
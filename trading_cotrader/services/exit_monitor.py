@@ -23,7 +23,6 @@ import re
 
 from trading_cotrader.core.database.session import session_scope
 from trading_cotrader.core.database.schema import TradeORM, LegORM, StrategyORM
-from trading_cotrader.services.tradespec_bridge import trade_to_monitor_params
 
 logger = logging.getLogger(__name__)
 
@@ -177,6 +176,7 @@ class ExitMonitorService:
         """
         try:
             from market_analyzer import monitor_exit_conditions
+            from trading_cotrader.services.tradespec_bridge import trade_to_monitor_params
         except ImportError:
             return None
 
@@ -0,0 +1,383 @@
+"""
+Exit Trigger Index — Event-driven exit checks fed by live quotes.
+
+ExitMonitorService re-queries every open trade and evaluates it when the
+monitoring cycle fires (every 30 min), so a stop can be blown through long
+before the next check. This index precomputes, per open trade, the price
+levels at which an exit fires and keeps them sorted per quote symbol. Each
+quote tick bisects the symbol's two sorted books to find the crossed
+triggers (O(log n) + crossed), and ExitSignals come out immediately.
+
+Triggers per trade:
+  - PROFIT_TARGET / STOP_LOSS on each leg's option (or stock) price.
+    Trade mark V = Σ w·mid with w = +|qty|·mult for short legs, −|qty|·mult
+    for long legs (the MarkToMarketService net-price convention). P&L is
+    V − entry, as in MarkToMarketService and ExitMonitorService, so:
+        profit target  fires when V ≥ entry + target$
+        stop loss      fires when V ≤ entry − stop$
+    For leg j, holding the other legs at their last marks, that becomes a
+    single price level on leg j's symbol. When a leg ticks, the trade's
+    levels on its *other* legs are re-keyed.
+  - STRIKE_BREACH on the underlying: price ≤ short put strike or
+    ≥ short call strike.
+
+Target / stop dollars come from TradeORM.profit_target / stop_loss as
+written by Maverick._store_exit_rules; trades without them use the same
+exit rules the polling path falls back to.
+
+A trigger fires once and is disarmed; rebuilding the index (each
+monitoring cycle) re-arms whatever still applies.
+
+Usage:
+    index = ExitTriggerIndex.from_trades(open_trades, symbol_fn=_build_streamer_symbol)
+    stream.acquire(index.symbols)
+    stream.add_listener(lambda sym, quote: sink(index.on_quote(sym, quote)))
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import count
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import threading
+
+from trading_cotrader.services.exit_monitor import ExitMonitorService, ExitSignal
+
+logger = logging.getLogger(__name__)
+
+ABOVE = 'above'  # fires when price >= threshold
+BELOW = 'below'  # fires when price <= threshold
+
+PROFIT_TARGET = 'PROFIT_TARGET'
+STOP_LOSS = 'STOP_LOSS'
+STRIKE_BREACH = 'STRIKE_BREACH'
+MONEY_TRIGGERS = (PROFIT_TARGET, STOP_LOSS)
+
+_SEVERITY = {PROFIT_TARGET: 'INFO', STOP_LOSS: 'URGENT', STRIKE_BREACH: 'WARNING'}
+_ACTION = {PROFIT_TARGET: 'CLOSE', STOP_LOSS: 'CLOSE', STRIKE_BREACH: 'ADJUST'}
+
+
+@dataclass
+class ExitTrigger:
+    """One armed price level on one quote symbol."""
+    trade_id: str
+    symbol: str
+    signal_type: str   # PROFIT_TARGET, STOP_LOSS, STRIKE_BREACH
+    direction: str     # ABOVE / BELOW
+    threshold: float
+    strike: Optional[float] = None  # STRIKE_BREACH only
+    seq: int = 0                    # tie-breaker in the sorted books
+
+
+class _SymbolBook:
+    """Armed triggers on one symbol, in two lists sorted by (threshold, seq)."""
+
+    __slots__ = ('above', 'below')
+
+    def __init__(self):
+        self.above: List[Tuple[float, int, ExitTrigger]] = []
+        self.below: List[Tuple[float, int, ExitTrigger]] = []
+
+    def _side(self, trigger: ExitTrigger) -> list:
+        return self.above if trigger.direction == ABOVE else self.below
+
+    def add(self, trigger: ExitTrigger) -> None:
+        insort(self._side(trigger), (trigger.threshold, trigger.seq, trigger))
+
+    def remove(self, trigger: ExitTrigger) -> None:
+        side = self._side(trigger)
+        i = bisect_left(side, (trigger.threshold, trigger.seq))
+        if i < len(side) and side[i][2] is trigger:
+            del side[i]
+
+    def crossed(self, price: float) -> List[ExitTrigger]:
+        """Triggers whose level the price has reached, without removing them."""
+        hit = [t for _, _, t in self.above[:bisect_right(self.above, (price, float('inf')))]]
+        hit += [t for _, _, t in self.below[bisect_left(self.below, (price, -1)):]]
+        return hit
+
+    def __len__(self) -> int:
+        return len(self.above) + len(self.below)
+
+
+@dataclass
+class _TradeState:
+    """Per-trade inputs for re-keying money triggers as legs tick."""
+    trade_id: str
+    underlying: str
+    strategy_type: str
+    entry: float
+    weights: Dict[str, float]                # quote symbol -> Σ signed |qty|·mult
+    marks: Dict[str, float]                  # quote symbol -> last mid
+    profit_value: Optional[float] = None     # mark at/above which the target is hit
+    stop_value: Optional[float] = None       # mark at/below which the stop is hit
+    expiration: Optional[date] = None
+    money: Dict[Tuple[str, str], ExitTrigger] = field(default_factory=dict)  # (type, symbol)
+    breaches: List[ExitTrigger] = field(default_factory=list)
+    money_fired: bool = False
+
+    @property
+    def value(self) -> float:
+        return sum(w * self.marks.get(s, 0.0) for s, w in self.weights.items())
+
+    @property
+    def fully_marked(self) -> bool:
+        return all(self.marks.get(s, 0.0) > 0 for s in self.weights)
+
+    @property
+    def dte(self) -> Optional[int]:
+        return (self.expiration - date.today()).days if self.expiration else None
+
+
+class ExitTriggerIndex:
+    """
+    Sorted per-symbol exit levels for open trades.
+
+    Thread-safe: on_quote() is called from the stream thread while the
+    engine adds / removes trades between cycles.
+    """
+
+    def __init__(self, exit_rules: Optional[Callable[[Any], Dict]] = None):
+        self._exit_rules = exit_rules or ExitMonitorService()._get_exit_rules
+        self._books: Dict[str, _SymbolBook] = {}
+        self._trades: Dict[str, _TradeState] = {}
+        self._holders: Dict[str, Set[str]] = {}   # leg quote symbol -> trade ids
+        self._lock = threading.RLock()
+        self._seq = count()
+
+    @classmethod
+    def from_trades(
+        cls,
+        trades: Iterable[Any],
+        symbol_fn: Callable[[Any], Optional[str]],
+        exit_rules: Optional[Callable[[Any], Dict]] = None,
+    ) -> 'ExitTriggerIndex':
+        """Build from open TradeORM rows (legs + leg.symbol + strategy loaded)."""
+        index = cls(exit_rules=exit_rules)
+        for trade in trades:
+            index.add_trade(trade, symbol_fn)
+        return index
+
+    # -----------------------------------------------------------------
+    # Maintenance
+    # -----------------------------------------------------------------
+
+    @property
+    def symbols(self) -> List[str]:
+        """Every symbol a trigger can be keyed on (leg symbols + underlyings)."""
+        with self._lock:
+            return sorted(set(self._holders) | set(self._books))
+
+    @property
+    def trade_ids(self) -> Set[str]:
+        with self._lock:
+            return set(self._trades)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(b) for b in self._books.values())
+
+    def add_trade(self, trade: Any, symbol_fn: Callable[[Any], Optional[str]]) -> None:
+        """(Re)index one open trade."""
+        state = self._trade_state(trade, symbol_fn)
+        with self._lock:
+            self.remove_trade(trade.id)
+            if state is None:
+                return
+            self._trades[state.trade_id] = state
+            for symbol in state.weights:
+                self._holders.setdefault(symbol, set()).add(state.trade_id)
+            for leg in trade.legs:
+                self._arm_breach(state, leg)
+            self._rekey(state)
+
+    def remove_trade(self, trade_id: str) -> None:
+        with self._lock:
+            state = self._trades.pop(trade_id, None)
+            if state is None:
+                return
+            for trigger in list(state.money.values()) + state.breaches:
+                self._disarm(trigger)
+            for symbol in state.weights:
+                holders = self._holders.get(symbol)
+                if holders is not None:
+                    holders.discard(trade_id)
+                    if not holders:
+                        del self._holders[symbol]
+
+    def _trade_state(self, trade: Any, symbol_fn) -> Optional[_TradeState]:
+        weights: Dict[str, float] = {}
+        marks: Dict[str, float] = {}
+        expirations = []
+        for leg in trade.legs:
+            symbol = leg.symbol
+            key = symbol_fn(symbol) if symbol is not None else None
+            qty = leg.quantity or 0
+            if not key or not qty:
+                continue
+            mult = 1.0 if symbol.asset_type == 'equity' else 100.0
+            weights[key] = weights.get(key, 0.0) + (abs(qty) * mult if qty < 0 else -abs(qty) * mult)
+            if leg.current_price:
+                marks[key] = float(leg.current_price)
+            if symbol.expiration:
+                exp = symbol.expiration
+                expirations.append(exp.date() if isinstance(exp, datetime) else exp)
+        if not weights:
+            return None
+
+        entry = float(trade.entry_price or 0)
+        target, stop = self._money_levels(trade, abs(entry))
+        return _TradeState(
+            trade_id=trade.id,
+            underlying=trade.underlying_symbol,
+            strategy_type=trade.strategy.strategy_type if trade.strategy else (trade.trade_type or 'unknown'),
+            entry=entry,
+            weights=weights,
+            marks=marks,
+            profit_value=entry + target if target else None,
+            stop_value=entry - stop if stop else None,
+            expiration=min(expirations) if expirations else None,
+        )
+
+    def _money_levels(self, trade: Any, entry: float) -> Tuple[Optional[float], Optional[float]]:
+        """Profit target / stop loss in dollars: stored exit rules first, then defaults."""
+        target = abs(float(trade.profit_target)) if trade.profit_target else None
+        stop = abs(float(trade.stop_loss)) if trade.stop_loss else None
+        if (target is None or stop is None) and entry:
+            rules = self._exit_rules(trade)
+            if target is None and rules.get('profit_target_pct'):
+                target = entry * rules['profit_target_pct']
+            if stop is None and rules.get('stop_loss_pct'):
+                stop = entry * rules['stop_loss_pct']
+        return target, stop
+
+    def _arm_breach(self, state: _TradeState, leg: Any) -> None:
+        symbol = leg.symbol
+        if symbol is None or (leg.quantity or 0) >= 0 or symbol.strike is None:
+            return
+        option_type = (symbol.option_type or '').lower()
+        if option_type not in ('put', 'p', 'call', 'c'):
+            return
+        strike = float(symbol.strike)
+        if any(t.strike == strike and t.direction == (BELOW if option_type in ('put', 'p') else ABOVE)
+               for t in state.breaches):
+            return
+        trigger = ExitTrigger(
+            trade_id=state.trade_id, symbol=symbol.ticker, signal_type=STRIKE_BREACH,
+            direction=BELOW if option_type in ('put', 'p') else ABOVE,
+            threshold=strike, strike=strike,
+        )
+        state.breaches.append(trigger)
+        self._arm(trigger)
+
+    def _arm(self, trigger: ExitTrigger) -> None:
+        trigger.seq = next(self._seq)
+        self._books.setdefault(trigger.symbol, _SymbolBook()).add(trigger)
+
+    def _disarm(self, trigger: ExitTrigger) -> None:
+        book = self._books.get(trigger.symbol)
+        if book is not None:
+            book.remove(trigger)
+            if not len(book):
+                del self._books[trigger.symbol]
+
+    def _rekey(self, state: _TradeState, skip: Optional[str] = None) -> None:
+        """Recompute each leg's profit / stop price given the other legs' marks."""
+        if state.money_fired or not state.fully_marked:
+            return
+        value = state.value
+        for symbol, weight in state.weights.items():
+            if symbol == skip and any((t, symbol) in state.money for t in MONEY_TRIGGERS):
+                continue  # a leg's own level does not depend on its own mark
+            rest = value - weight * state.marks[symbol]
+            for signal_type, level in ((PROFIT_TARGET, state.profit_value), (STOP_LOSS, state.stop_value)):
+                old = state.money.pop((signal_type, symbol), None)
+                if old is not None:
+                    self._disarm(old)
+                if level is None:
+                    continue
+                # profit: V ≥ level, stop: V ≤ level; dividing by a negative weight flips it
+                fires_below = (signal_type == STOP_LOSS) == (weight > 0)
+                trigger = ExitTrigger(
+                    trade_id=state.trade_id, symbol=symbol, signal_type=signal_type,
+                    direction=BELOW if fires_below else ABOVE,
+                    threshold=(level - rest) / weight,
+                )
+                state.money[(signal_type, symbol)] = trigger
+                self._arm(trigger)
+
+    # -----------------------------------------------------------------
+    # Ticks
+    # -----------------------------------------------------------------
+
+    def on_quote(self, symbol: str, quote: Dict[str, Any]) -> List[ExitSignal]:
+        """Feed one {bid, ask} quote. Returns the ExitSignals it fired."""
+        bid = float(quote.get('bid') or 0)
+        ask = float(quote.get('ask') or 0)
+        if not (bid and ask):
+            return []
+        return self.on_price(symbol, (bid + ask) / 2)
+
+    def on_price(self, symbol: str, price: float) -> List[ExitSignal]:
+        """Feed one mid price. Returns the ExitSignals it fired."""
+        with self._lock:
+            # Trades holding this symbol as a leg move their mark, and their
+            # levels on the other legs move with it
+            for trade_id in self._holders.get(symbol, ()):
+                state = self._trades[trade_id]
+                state.marks[symbol] = price
+                self._rekey(state, skip=symbol)
+
+            book = self._books.get(symbol)
+            crossed = book.crossed(price) if book is not None else []
+
+            signals = []
+            for trigger in crossed:
+                state = self._trades[trigger.trade_id]
+                if trigger.signal_type in MONEY_TRIGGERS:
+                    if state.money_fired:
+                        continue  # profit and stop cannot both be crossed; first one wins
+                    state.money_fired = True
+                    for t in state.money.values():
+                        self._disarm(t)
+                    state.money.clear()
+                else:
+                    self._disarm(trigger)
+                    state.breaches.remove(trigger)
+                signals.append(self._signal(state, trigger, price))
+
+        for s in signals:
+            logger.info(f"Exit trigger: {s.message}")
+        return signals
+
+    def _signal(self, state: _TradeState, trigger: ExitTrigger, price: float) -> ExitSignal:
+        value = state.value
+        pnl = value - state.entry
+        pnl_pct = pnl / abs(state.entry) * 100 if state.entry else 0.0
+        label = f"{state.underlying} {state.strategy_type}"
+        if trigger.signal_type == STRIKE_BREACH:
+            side = 'put' if trigger.direction == BELOW else 'call'
+            message = f"{label} — {trigger.symbol} {price:.2f} through short {side} {trigger.strike:g}"
+            target = trigger.strike
+        else:
+            level = state.profit_value if trigger.signal_type == PROFIT_TARGET else state.stop_value
+            kind = 'hit profit target' if trigger.signal_type == PROFIT_TARGET else 'STOP LOSS'
+            message = f"{label} — P&L ${pnl:.2f} {kind} ({trigger.symbol} @ {price:.2f})"
+            target = abs(level - state.entry)
+        return ExitSignal(
+            trade_id=state.trade_id,
+            underlying=state.underlying,
+            strategy_type=state.strategy_type,
+            signal_type=trigger.signal_type,
+            severity=_SEVERITY[trigger.signal_type],
+            current_pnl=Decimal(str(round(pnl, 2))),
+            current_pnl_pct=pnl_pct,
+            message=message,
+            action=_ACTION[trigger.signal_type],
+            entry_price=Decimal(str(round(state.entry, 2))),
+            current_price=Decimal(str(round(value, 2))),
+            dte=state.dte,
+            target_value=target,
+        )
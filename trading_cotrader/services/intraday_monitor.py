@@ -8,13 +8,18 @@ Signals: PROFIT_TARGET, STOP_LOSS, GAMMA_RISK, BREACH_SHORT_STRIKE,
          APPROACHING_STRIKE, MOMENTUM_SHIFT, VOLUME_SPIKE, VIX_SPIKE,
          TIME_DECAY_WINDOW, EXPIRY_APPROACHING
 
+Positions come from the ContainerManager's ExpiryIndex (open trades bucketed
+by leg expiration), so a cycle costs time proportional to the expiring
+trades and makes no DB scan. Without an index it falls back to querying
+all open trades.
+
 Called by:
   - Engine fast cycle (every 2 min, market hours only)
 """
 
 import logging
 from dataclasses import dataclass, field
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from decimal import Decimal
 from typing import List, Optional
 
@@ -49,12 +54,14 @@ class IntradayResult:
 class IntradayMonitorService:
     """Fast-cycle monitoring for 0DTE desk positions."""
 
-    def __init__(self, ma):
+    def __init__(self, ma, expiry_index=None):
         """
         Args:
             ma: MarketAnalyzer instance (needs intraday service + market_data).
+            expiry_index: ExpiryIndex from ContainerManager. None = DB query.
         """
         self.ma = ma
+        self.expiry_index = expiry_index
 
     def run_fast_cycle(self) -> IntradayResult:
         """Run intraday monitoring on all open 0DTE positions.
@@ -125,6 +132,9 @@ class IntradayMonitorService:
 
     def _get_0dte_positions(self) -> list:
         """Get open 0DTE positions formatted for MA's IntradayService."""
+        if self.expiry_index is not None and self.expiry_index.is_loaded:
+            return self._get_0dte_positions_from_index()
+
         positions = []
         today = date.today()
 
@@ -177,3 +187,23 @@ class IntradayMonitorService:
                 })
 
         return positions
+
+    def _get_0dte_positions_from_index(self) -> list:
+        """Same selection as the DB path (a leg expiring within 1 day), from the index."""
+        positions = []
+        for entry in self.expiry_index.expiring_by(date.today() + timedelta(days=1)):
+            if not entry.short_strikes:
+                continue
+            profit_target_pct = 0.90  # default for 0DTE
+            if entry.profit_target_pct:
+                profit_target_pct = entry.profit_target_pct / 100
+            positions.append({
+                'ticker': entry.underlying,
+                'short_strikes': list(entry.short_strikes),
+                'entry_credit': abs(entry.entry_price),
+                'profit_target_pct': profit_target_pct,
+                'stop_loss_multiple': None,  # defined risk, no stop
+                'structure_type': entry.strategy_type,
+                'trade_id': entry.trade_id,  # for signal mapping
+            })
+        return positions
@@ -0,0 +1,254 @@
+"""
+Leg Store — Columnar (NumPy) leg book for vectorized mark-to-market.
+
+Every leg of every open trade in a marking cycle lives in parallel float64
+arrays (qty, multiplier, mid, delta, gamma, theta, vega), with the owning
+trade and underlying held as integer codes. Quotes are written into the
+arrays by streamer symbol, and all trade-level price / Greek / P&L aggregates
+come out of a handful of np.bincount calls. Decimal conversion happens only
+in write_back_legs() / to_decimal(), at the persistence boundary.
+
+Sign conventions match the original per-leg loop in MarkToMarketService:
+  net price  = Σ mid·|qty|·mult, short legs +, long legs −
+  delta/theta/vega = Σ greek·qty·mult     gamma = Σ gamma·|qty|·mult
+  pnl = net price − trade entry price
+
+Usage:
+    store = LegStore.from_trades(open_trades, symbol_fn=_build_streamer_symbol)
+    store.apply_marks(quotes_map, greeks_map)
+    store.write_back_legs()
+    agg = store.aggregate()
+    agg.net_current[i], agg.delta[i], agg.pnl[i]  # for store.trades[i]
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import numpy as np
+
+GREEKS = ('delta', 'gamma', 'theta', 'vega')
+
+# Column scales on LegORM / TradeORM (Numeric(10, 4) except gamma (10, 6))
+PRICE_PLACES = 4
+GREEK_PLACES = {'delta': 4, 'gamma': 6, 'theta': 4, 'vega': 4}
+
+
+def to_decimal(value: float, places: int = PRICE_PLACES) -> Decimal:
+    """float → Decimal rounded to a column's scale (persistence boundary)."""
+    return Decimal(f"{float(value):.{places}f}")
+
+
+@dataclass
+class TradeAggregates:
+    """Per-trade aggregates, aligned with LegStore.trades (index i ↔ trades[i])."""
+    net_current: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    theta: np.ndarray
+    vega: np.ndarray
+    entry_price: np.ndarray
+    pnl: np.ndarray
+    pnl_pct: np.ndarray
+    legs_marked: np.ndarray
+    legs_total: np.ndarray
+
+
+class LegStore:
+    """
+    Columnar view of the legs of a set of trades for one marking cycle.
+
+    Holds references to the ORM rows so results can be written back, but
+    all arithmetic runs on the arrays.
+    """
+
+    def __init__(
+        self,
+        trades: List[Any],
+        legs: List[Any],
+        trade_idx: np.ndarray,
+        underlyings: List[str],
+        underlying_idx: np.ndarray,
+        qty: np.ndarray,
+        multiplier: np.ndarray,
+        mid: np.ndarray,
+        greeks: Dict[str, np.ndarray],
+        entry_price: np.ndarray,
+        symbol_index: Dict[str, np.ndarray],
+    ):
+        self.trades = trades
+        self.legs = legs
+        self.trade_idx = trade_idx
+        self.underlyings = underlyings
+        self.underlying_idx = underlying_idx
+        self.qty = qty
+        self.multiplier = multiplier
+        self.mid = mid
+        self.greeks = greeks
+        self.entry_price = entry_price
+        self.symbol_index = symbol_index
+        # Legs whose price / Greeks were refreshed this cycle
+        self.price_marked = np.zeros(len(legs), dtype=bool)
+        self.greeks_marked = np.zeros(len(legs), dtype=bool)
+
+    # -----------------------------------------------------------------
+    # Construction
+    # -----------------------------------------------------------------
+
+    @classmethod
+    def from_trades(
+        cls,
+        trades: List[Any],
+        symbol_fn: Optional[Callable[[Any], Optional[str]]] = None,
+    ) -> 'LegStore':
+        """
+        Build the store from TradeORM rows (legs + leg.symbol loaded).
+
+        symbol_fn maps a leg's SymbolORM to its quote key (DXLink streamer
+        symbol); legs it returns None for are aggregated but never marked.
+        """
+        legs: List[Any] = []
+        trade_idx: List[int] = []
+        underlying_codes: Dict[str, int] = {}
+        underlying_idx: List[int] = []
+        qty: List[float] = []
+        multiplier: List[float] = []
+        mid: List[float] = []
+        greeks: Dict[str, List[float]] = {g: [] for g in GREEKS}
+        by_symbol: Dict[str, List[int]] = {}
+
+        for t, trade in enumerate(trades):
+            for leg in trade.legs:
+                symbol = leg.symbol
+                n = len(legs)
+                legs.append(leg)
+                trade_idx.append(t)
+                underlying = symbol.ticker if symbol else trade.underlying_symbol
+                underlying_idx.append(underlying_codes.setdefault(underlying, len(underlying_codes)))
+                qty.append(leg.quantity or 0)
+                multiplier.append(1.0 if symbol and symbol.asset_type == 'equity' else 100.0)
+                mid.append(float(leg.current_price or 0))
+                for g in GREEKS:
+                    greeks[g].append(float(getattr(leg, g) or 0))
+                if symbol_fn is not None:
+                    key = symbol_fn(symbol)
+                    if key:
+                        by_symbol.setdefault(key, []).append(n)
+
+        return cls(
+            trades=list(trades),
+            legs=legs,
+            trade_idx=np.asarray(trade_idx, dtype=np.intp),
+            underlyings=list(underlying_codes),
+            underlying_idx=np.asarray(underlying_idx, dtype=np.intp),
+            qty=np.asarray(qty, dtype=float),
+            multiplier=np.asarray(multiplier, dtype=float),
+            mid=np.asarray(mid, dtype=float),
+            greeks={g: np.asarray(v, dtype=float) for g, v in greeks.items()},
+            entry_price=np.asarray([float(t.entry_price or 0) for t in trades], dtype=float),
+            symbol_index={k: np.asarray(v, dtype=np.intp) for k, v in by_symbol.items()},
+        )
+
+    @property
+    def leg_count(self) -> int:
+        return len(self.legs)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.symbol_index)
+
+    # -----------------------------------------------------------------
+    # Marks
+    # -----------------------------------------------------------------
+
+    def apply_marks(self, quotes_map: Dict[str, Dict], greeks_map: Dict[str, Any]) -> int:
+        """
+        Write bid/ask mids and Greeks into the arrays, by quote key.
+
+        A symbol without a two-sided quote is left untouched (Greeks included),
+        as before. Returns the number of legs marked.
+        """
+        for sym, rows in self.symbol_index.items():
+            quote = quotes_map.get(sym) or {}
+            bid = quote.get('bid', 0) or 0
+            ask = quote.get('ask', 0) or 0
+            if not (bid and ask):
+                continue
+            self.mid[rows] = round((float(bid) + float(ask)) / 2, PRICE_PLACES)
+            self.price_marked[rows] = True
+
+            greeks = greeks_map.get(sym)
+            if greeks is None:
+                continue
+            for g in GREEKS:
+                value = getattr(greeks, g, None)
+                if value is not None:
+                    self.greeks[g][rows] = float(value)
+            self.greeks_marked[rows] = True
+
+        return int(self.price_marked.sum())
+
+    @property
+    def marked_leg_ids(self) -> Set[str]:
+        return {self.legs[i].id for i in np.flatnonzero(self.price_marked)}
+
+    def write_back_legs(self) -> int:
+        """Persist marked legs' price / Greeks onto their ORM rows as Decimal."""
+        for i in np.flatnonzero(self.price_marked):
+            leg = self.legs[i]
+            leg.current_price = to_decimal(self.mid[i])
+            if self.greeks_marked[i]:
+                for g in GREEKS:
+                    setattr(leg, g, to_decimal(self.greeks[g][i], GREEK_PLACES[g]))
+        return int(self.price_marked.sum())
+
+    # -----------------------------------------------------------------
+    # Aggregation
+    # -----------------------------------------------------------------
+
+    def aggregate(self) -> TradeAggregates:
+        """Trade-level net price, Greeks and P&L for every trade in one pass."""
+        n = len(self.trades)
+        idx = self.trade_idx
+        abs_qty = np.abs(self.qty)
+        signed = self.qty * self.multiplier
+        unsigned = abs_qty * self.multiplier
+        side = np.where(self.qty < 0, 1.0, -1.0)  # short = credit +, long = debit −
+
+        def per_trade(weights):
+            return np.bincount(idx, weights=weights, minlength=n)
+
+        net_current = per_trade(self.mid * unsigned * side)
+        entry = self.entry_price
+        pnl = net_current - entry
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl_pct = np.where(entry != 0, pnl / np.abs(entry) * 100, 0.0)
+
+        return TradeAggregates(
+            net_current=net_current,
+            delta=per_trade(self.greeks['delta'] * signed),
+            gamma=per_trade(self.greeks['gamma'] * unsigned),
+            theta=per_trade(self.greeks['theta'] * signed),
+            vega=per_trade(self.greeks['vega'] * signed),
+            entry_price=entry,
+            pnl=pnl,
+            pnl_pct=pnl_pct,
+            legs_marked=np.bincount(idx, weights=(self.mid > 0), minlength=n).astype(int),
+            legs_total=np.bincount(idx, minlength=n),
+        )
+
+    def aggregate_by_underlying(self) -> Dict[str, Dict[str, float]]:
+        """Position Greeks summed per underlying ({ticker: {delta, gamma, theta, vega}})."""
+        n = len(self.underlyings)
+        signed = self.qty * self.multiplier
+        unsigned = np.abs(self.qty) * self.multiplier
+        sums = {
+            g: np.bincount(self.underlying_idx,
+                           weights=self.greeks[g] * (unsigned if g == 'gamma' else signed),
+                           minlength=n)
+            for g in GREEKS
+        }
+        return {
+            u: {g: float(sums[g][k]) for g in GREEKS}
+            for k, u in enumerate(self.underlyings)
+        }
@@ -192,9 +192,8 @@ class MacroContextService:
         for path in self.MACRO_FILE_PATHS:
             if path.exists():
                 try:
-                    import yaml
-                    with open(path, 'r') as f:
-                        data = yaml.safe_load(f)
+                    from trading_cotrader.config.config_registry import get_config_registry
+                    data = get_config_registry().get_raw(path)
                     if data and isinstance(data, dict):
                         return MacroOverride(
                             market_probability=data.get('market_probability'),
@@ -5,8 +5,9 @@ Updates open WhatIf (and real) trades with current market data:
   1. Fetch current quotes (bid/ask) for all leg symbols via broker DXLink
   2. Fetch current Greeks for option legs
   3. Update LegORM and TradeORM current_price + current Greeks
-  4. Compute trade-level P&L
-  5. Run health check via MA's check_trade_health() (G4)
+  4. Compute trade-level P&L (vectorized over all legs via LegStore)
+  5. Run health check via MA's check_trade_health() (G4) — regime + technicals
+     resolved once per underlying, checks run on a bounded pool
   6. Refresh containers for UI
 
 Called by:
@@ -14,21 +15,25 @@ Called by:
   - CLI 'mark' command (on-demand)
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 import logging
-import re
 
 from trading_cotrader.core.database.session import session_scope
-from trading_cotrader.core.database.schema import TradeORM, LegORM, SymbolORM
+from trading_cotrader.core.database.schema import TradeORM, SymbolORM
+from trading_cotrader.core.models.option_key import streamer_symbol_for
+from trading_cotrader.repositories.trade import TradeQuery
+from trading_cotrader.services.leg_store import GREEK_PLACES, LegStore, TradeAggregates, to_decimal
+from trading_cotrader.services.market_context import MarketContextCache
 from trading_cotrader.services.tradespec_bridge import trade_to_tradespec
 
 logger = logging.getLogger(__name__)
 
-# Parse DXLink streamer symbol from leg's SymbolORM
-_OPTION_SYMBOL_RE = re.compile(r'^\.([A-Z]+)(\d{6})([PC])(\d+)$')
+# Concurrent check_trade_health calls per cycle
+HEALTH_CHECK_MAX_WORKERS = 8
 
 
 @dataclass
@@ -60,21 +65,8 @@ class MarkToMarketResult:
 
 
 def _build_streamer_symbol(symbol_orm: SymbolORM) -> Optional[str]:
-    """Build DXLink streamer symbol from SymbolORM."""
-    if not symbol_orm:
-        return None
-
-    if symbol_orm.asset_type == 'equity':
-        return symbol_orm.ticker
-
-    # Option: .TICKER YYMMDD P/C STRIKE
-    if symbol_orm.expiration and symbol_orm.strike is not None:
-        opt_char = 'C' if (symbol_orm.option_type or '').lower() in ('call', 'c') else 'P'
-        date_part = symbol_orm.expiration.strftime('%y%m%d')
-        strike_int = int(symbol_orm.strike)
-        return f".{symbol_orm.ticker}{date_part}{opt_char}{strike_int}"
-
-    return None
+    """Build DXLink streamer symbol from SymbolORM (formatted once per contract via OptionKey)."""
+    return streamer_symbol_for(symbol_orm)
 
 
 class MarkToMarketService:
@@ -87,10 +79,16 @@ class MarkToMarketService:
         print(f"Marked {result.trades_marked} trades, total P&L: ${result.total_pnl:.2f}")
     """
 
-    def __init__(self, broker, container_manager=None, ma=None):
+    def __init__(self, broker, container_manager=None, ma=None,
+                 max_workers: int = HEALTH_CHECK_MAX_WORKERS):
         self.broker = broker
         self.container_manager = container_manager
         self.ma = ma  # MarketAnalyzer instance for health checks (G4)
+        self.max_workers = max(1, max_workers)  # bounded health-check pool
+
+    def _research_container(self):
+        """ResearchContainer for reusing fresh regime/technicals, if wired."""
+        return getattr(self.container_manager, 'research', None)
 
     def mark_all_open_trades(self, trade_type: str = None) -> MarkToMarketResult:
         """
@@ -110,7 +108,7 @@ class MarkToMarketService:
             query = scoped_open_trades(session)
             if trade_type:
                 query = query.filter(TradeORM.trade_type == trade_type)
-            open_trades = query.all()
+            open_trades = TradeQuery(session, query).all()
 
             if not open_trades:
                 logger.info("No open trades to mark")
@@ -118,21 +116,16 @@ class MarkToMarketService:
 
             logger.info(f"Marking {len(open_trades)} open trades to market")
 
-            # Collect all streamer symbols across all trades
-            symbol_map: Dict[str, List[Tuple[TradeORM, LegORM, SymbolORM]]] = {}
-            for trade in open_trades:
-                for leg in trade.legs:
-                    sym = _build_streamer_symbol(leg.symbol)
-                    if sym:
-                        symbol_map.setdefault(sym, []).append((trade, leg, leg.symbol))
+            # Columnar leg book keyed by DXLink streamer symbol
+            store = LegStore.from_trades(open_trades, symbol_fn=_build_streamer_symbol)
 
-            if not symbol_map:
+            if not store.symbol_index:
                 logger.warning("No valid symbols to fetch quotes for")
                 result.trades_skipped = len(open_trades)
                 return result
 
             # Fetch quotes and Greeks in bulk
-            all_symbols = list(symbol_map.keys())
+            all_symbols = store.symbols
             option_symbols = [s for s in all_symbols if s.startswith('.')]
             equity_symbols = [s for s in all_symbols if not s.startswith('.')]
 
@@ -144,31 +137,16 @@ class MarkToMarketService:
                 f"Greeks for {len(greeks_map)}/{len(option_symbols)} options"
             )
 
-            # Update each leg
-            updated_legs = set()
-            for sym, entries in symbol_map.items():
-                quote = quotes_map.get(sym, {})
-                greeks = greeks_map.get(sym)
-                bid = quote.get('bid', 0) or 0
-                ask = quote.get('ask', 0) or 0
-                mid = (bid + ask) / 2 if (bid and ask) else 0
+            # Update legs in the arrays, then aggregate every trade at once
+            store.apply_marks(quotes_map, greeks_map)
+            store.write_back_legs()
+            updated_legs = store.marked_leg_ids
+            agg = store.aggregate()
 
-                if not mid:
-                    continue
-
-                for trade, leg, symbol_orm in entries:
-                    leg.current_price = Decimal(str(round(mid, 4)))
-                    if greeks:
-                        leg.delta = getattr(greeks, 'delta', leg.delta)
-                        leg.gamma = getattr(greeks, 'gamma', leg.gamma)
-                        leg.theta = getattr(greeks, 'theta', leg.theta)
-                        leg.vega = getattr(greeks, 'vega', leg.vega)
-                    updated_legs.add(leg.id)
-
-            # Now update trade-level aggregates
-            for trade in open_trades:
+            # Now update trade-level aggregates (Decimal only from here on)
+            for i, trade in enumerate(store.trades):
                 try:
-                    trade_result = self._update_trade_aggregates(trade)
+                    trade_result = self._apply_trade_aggregates(trade, agg, i)
                     if trade_result:
                         result.results.append(trade_result)
                         result.trades_marked += 1
@@ -181,15 +159,20 @@ class MarkToMarketService:
 
             # Run health checks via MA (G4)
             self._run_health_checks(open_trades)
+            marked_trade_ids = {t.id for t in open_trades}
 
             # Commit all updates
             session.commit()
 
-        # Refresh containers
+        # Refresh containers — only the marked trades/legs
         if self.container_manager:
             try:
+                from trading_cotrader.containers.container_manager import ContainerDelta
+                delta = ContainerDelta(
+                    source='mark_to_market', trades=marked_trade_ids, legs=updated_legs,
+                )
                 with session_scope() as session:
-                    self.container_manager.load_from_repositories(session)
+                    self.container_manager.sync(session, delta)
                 logger.info("Containers refreshed after mark-to-market")
             except Exception as e:
                 logger.warning(f"Container refresh failed: {e}")
@@ -200,67 +183,26 @@ class MarkToMarketService:
         )
         return result
 
-    def _update_trade_aggregates(self, trade: TradeORM) -> Optional[MarkResult]:
-        """Recompute trade-level price and Greeks from its legs."""
-        if not trade.legs:
+    def _apply_trade_aggregates(self, trade: TradeORM, agg: TradeAggregates, i: int) -> Optional[MarkResult]:
+        """Write trade i's vectorized price / Greek / P&L aggregates onto its ORM row."""
+        legs_total = int(agg.legs_total[i])
+        if not legs_total:
             return None
 
-        net_current = Decimal('0')
-        total_delta = Decimal('0')
-        total_gamma = Decimal('0')
-        total_theta = Decimal('0')
-        total_vega = Decimal('0')
-        legs_marked = 0
-
-        for leg in trade.legs:
-            qty = leg.quantity or 0
-            multiplier = 100  # options
-            if leg.symbol and leg.symbol.asset_type == 'equity':
-                multiplier = 1
-
-            current = Decimal(str(leg.current_price or 0))
-            entry = Decimal(str(leg.entry_price or 0))
-            is_short = qty < 0
-
-            if current > 0:
-                legs_marked += 1
-
-            # Net current price: credit (short) positive, debit (long) negative
-            leg_value = current * abs(qty) * multiplier
-            net_current += leg_value if is_short else -leg_value
-
-            # Position Greeks
-            delta = Decimal(str(leg.delta or 0))
-            gamma = Decimal(str(leg.gamma or 0))
-            theta = Decimal(str(leg.theta or 0))
-            vega = Decimal(str(leg.vega or 0))
-
-            total_delta += delta * qty * multiplier
-            total_gamma += gamma * abs(qty) * multiplier
-            total_theta += theta * qty * multiplier
-            total_vega += vega * qty * multiplier
-
-        # Update trade
-        entry_price = Decimal(str(trade.entry_price or 0))
+        # Net current price: credit (short) positive, debit (long) negative
+        net_current = to_decimal(agg.net_current[i])
         trade.current_price = net_current
-        trade.current_delta = total_delta
-        trade.current_gamma = total_gamma
-        trade.current_theta = total_theta
-        trade.current_vega = total_vega
-
-        # P&L = current_value - entry_value (for credit trades, entry is positive)
-        pnl = entry_price - net_current  # If credit trade: entry=+credit, current=-cost_to_close
-        # Actually: P&L for credit = credit_received - cost_to_close
-        # entry_price is net credit (positive), current_price should be cost to close (negative)
-        # So pnl = entry_price + current_price when using same sign convention
-        # Simpler: pnl = entry_price - abs(current net value change)
-        # Let's use the standard: pnl = current net - entry net (both in same convention)
+        trade.current_delta = to_decimal(agg.delta[i], GREEK_PLACES['delta'])
+        trade.current_gamma = to_decimal(agg.gamma[i], GREEK_PLACES['gamma'])
+        trade.current_theta = to_decimal(agg.theta[i], GREEK_PLACES['theta'])
+        trade.current_vega = to_decimal(agg.vega[i], GREEK_PLACES['vega'])
+
+        # P&L = current net - entry net (both in the same sign convention)
+        entry_price = Decimal(str(trade.entry_price or 0))
         pnl = net_current - entry_price
         trade.total_pnl = pnl
         trade.last_updated = datetime.utcnow()
 
-        pnl_pct = float(pnl / abs(entry_price) * 100) if entry_price else 0
-
         strategy = trade.strategy.strategy_type if trade.strategy else trade.trade_type
         return MarkResult(
             trade_id=trade.id,
@@ -269,9 +211,9 @@ class MarkToMarketService:
             entry_price=entry_price,
             current_price=net_current,
             pnl=pnl,
-            pnl_pct=pnl_pct,
-            legs_marked=legs_marked,
-            legs_total=len(trade.legs),
+            pnl_pct=float(agg.pnl_pct[i]),
+            legs_marked=int(agg.legs_marked[i]),
+            legs_total=legs_total,
         )
 
     def _fetch_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
@@ -290,9 +232,7 @@ class MarkToMarketService:
         if not self.broker or not option_symbols:
             return {}
         try:
-            return self.broker._run_async(
-                self.broker._fetch_greeks_via_dxlink(option_symbols)
-            )
+            return self.broker.get_greeks(option_symbols)
         except Exception as e:
             logger.error(f"Failed to fetch Greeks: {e}")
             return {}
@@ -303,6 +243,11 @@ class MarkToMarketService:
         Updates trade.health_status and trade.health_checked_at.
         Requires MA instance with regime and technicals services.
         Silently skips if MA is unavailable.
+
+        Regime + technicals are resolved once per distinct underlying
+        (reusing fresh ResearchContainer results), then check_trade_health
+        runs concurrently on a bounded pool. ORM rows are only read and
+        written on this thread.
         """
         if not self.ma:
             return
@@ -313,8 +258,11 @@ class MarkToMarketService:
             return
 
         now = datetime.utcnow()
+        time_of_day = datetime.now().time()  # E3: time-of-day urgency
         checked = 0
 
+        # Plain inputs per trade, gathered while the session is ours
+        pending = []
         for trade in trades:
             if not trade.is_open or not trade.current_price:
                 continue
@@ -323,14 +271,6 @@ class MarkToMarketService:
             if not spec:
                 continue
 
-            # Get current regime + technicals from MA
-            try:
-                regime = self.ma.regime.detect(trade.underlying_symbol)
-                technicals = self.ma.technicals.snapshot(trade.underlying_symbol)
-            except Exception as e:
-                logger.debug(f"Skipping health check for {trade.underlying_symbol}: {e}")
-                continue
-
             # Compute DTE
             dte = None
             for leg in trade.legs:
@@ -355,19 +295,46 @@ class MarkToMarketService:
 
             contracts = max(abs(leg.quantity) for leg in trade.legs if leg.quantity) if trade.legs else 1
 
-            try:
-                health = check_trade_health(
-                    trade_id=trade.id,
-                    trade_spec=spec,
-                    entry_price=float(trade.entry_price or 0),
-                    contracts=contracts,
-                    current_mid_price=float(trade.current_price or 0),
-                    dte_remaining=dte,
-                    regime=regime,
-                    technicals=technicals,
-                    entry_regime_id=entry_regime_id,
-                    time_of_day=datetime.now().time(),  # E3: time-of-day urgency
-                )
+            pending.append((trade, dict(
+                trade_id=trade.id,
+                trade_spec=spec,
+                entry_price=float(trade.entry_price or 0),
+                contracts=contracts,
+                current_mid_price=float(trade.current_price or 0),
+                dte_remaining=dte,
+                entry_regime_id=entry_regime_id,
+                time_of_day=time_of_day,
+            )))
+
+        if not pending:
+            return
+
+        # Get current regime + technicals from MA — once per underlying
+        contexts = MarketContextCache(
+            self.ma, research=self._research_container(), max_workers=self.max_workers,
+        )
+        contexts.prefetch(trade.underlying_symbol for trade, _ in pending)
+
+        def run_check(kwargs, regime, technicals):
+            return check_trade_health(regime=regime, technicals=technicals, **kwargs)
+
+        futures = {}
+        workers = min(self.max_workers, len(pending))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='health') as pool:
+            for trade, kwargs in pending:
+                context = contexts.get(trade.underlying_symbol)
+                if context is None:
+                    logger.debug(f"Skipping health check for {trade.underlying_symbol}: no market context")
+                    continue
+                futures[pool.submit(run_check, kwargs, *context)] = trade
+
+            for future in as_completed(futures):
+                trade = futures[future]
+                try:
+                    health = future.result()
+                except Exception as e:
+                    logger.debug(f"Health check failed for {trade.id}: {e}")
+                    continue
 
                 trade.health_status = health.status
                 trade.health_checked_at = now
@@ -378,8 +345,7 @@ class MarkToMarketService:
                         f"Health: {trade.underlying_symbol} = {health.status} "
                         f"(action: {health.overall_action})"
                     )
-            except Exception as e:
-                logger.debug(f"Health check failed for {trade.id}: {e}")
 
+        logger.debug(f"Health-check market context: {contexts.stats.to_dict()}")
         if checked:
             logger.info(f"Health checks completed for {checked} trades")
@@ -0,0 +1,113 @@
+"""
+Market Context Cache — Per-cycle memo of MarketAnalyzer regime + technicals.
+
+Health checks need the current regime and technical snapshot of a trade's
+underlying. Ten iron condors on SPY should cost one SPY regime detection,
+not ten. This cache resolves each distinct underlying once per cycle:
+
+  1. Reuse the raw MA result Scout left in the ResearchContainer, if fresh
+  2. Otherwise fetch it from MA — all missing underlyings concurrently on a
+     bounded thread pool
+
+Usage:
+    contexts = MarketContextCache(ma, research=cm.research)
+    contexts.prefetch({t.underlying_symbol for t in trades})
+    regime, technicals = contexts.get('SPY')
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+# Same window ResearchContainer.is_stale uses
+DEFAULT_MAX_AGE_SECONDS = 300
+
+
+@dataclass
+class MarketContextStats:
+    """How each underlying's context was resolved this cycle."""
+    from_research: int = 0
+    fetched: int = 0
+    failed: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {'from_research': self.from_research, 'fetched': self.fetched, 'failed': self.failed}
+
+
+class MarketContextCache:
+    """
+    Regime + technicals per underlying, resolved at most once per cycle.
+
+    Not shared across cycles — build a new one per mark-to-market run so
+    results never outlive the research freshness window.
+    """
+
+    def __init__(
+        self,
+        ma,
+        research=None,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        self.ma = ma
+        self.research = research
+        self.max_age_seconds = max_age_seconds
+        self.max_workers = max(1, max_workers)
+        self._contexts: Dict[str, Optional[Tuple[Any, Any]]] = {}
+        self.stats = MarketContextStats()
+
+    def prefetch(self, underlyings: Iterable[str]) -> None:
+        """Resolve every not-yet-seen underlying; MA fetches run concurrently."""
+        missing = [u for u in dict.fromkeys(underlyings) if u and u not in self._contexts]
+        to_fetch = []
+        for underlying in missing:
+            cached = self._from_research(underlying)
+            if cached is not None:
+                self._contexts[underlying] = cached
+                self.stats.from_research += 1
+            else:
+                to_fetch.append(underlying)
+
+        if not to_fetch:
+            return
+        workers = min(self.max_workers, len(to_fetch))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ma-context') as pool:
+            results = list(pool.map(self._fetch, to_fetch))
+        for underlying, context in zip(to_fetch, results):
+            self._contexts[underlying] = context
+            if context is None:
+                self.stats.failed += 1
+                continue
+            self.stats.fetched += 1
+            if self.research is not None:
+                regime, technicals = context
+                self.research.cache_analysis(underlying, 'regime', regime)
+                self.research.cache_analysis(underlying, 'technicals', technicals)
+
+    def get(self, underlying: str) -> Optional[Tuple[Any, Any]]:
+        """(regime, technicals) for an underlying, or None if MA failed for it."""
+        if underlying not in self._contexts:
+            self.prefetch([underlying])
+        return self._contexts.get(underlying)
+
+    def _from_research(self, underlying: str) -> Optional[Tuple[Any, Any]]:
+        if self.research is None:
+            return None
+        regime = self.research.get_analysis(underlying, 'regime', self.max_age_seconds)
+        technicals = self.research.get_analysis(underlying, 'technicals', self.max_age_seconds)
+        if regime is None or technicals is None:
+            return None
+        return regime, technicals
+
+    def _fetch(self, underlying: str) -> Optional[Tuple[Any, Any]]:
+        try:
+            regime = self.ma.regime.detect(underlying)
+            technicals = self.ma.technicals.snapshot(underlying)
+        except Exception as e:
+            logger.debug(f"Market context unavailable for {underlying}: {e}")
+            return None
+        return regime, technicals
@@ -12,11 +12,11 @@ All state lives in eTrading (MLStateORM). MA computes, eTrading stores.
 
 import logging
 import uuid
-from datetime import date, datetime
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
 from trading_cotrader.core.database.session import session_scope
-from trading_cotrader.core.database.schema import TradeORM, MLStateORM
+from trading_cotrader.core.database.schema import MLStateORM
 
 logger = logging.getLogger(__name__)
 
@@ -32,81 +32,14 @@ class MLLearningService:
     # -----------------------------------------------------------------
 
     def _build_outcomes(self, days: int = 180) -> list:
-        """Build MA TradeOutcome objects from closed trades in DB."""
-        from market_analyzer import TradeOutcome, TradeExitReason, StrategyType
-
-        outcomes = []
-        with session_scope() as session:
-            from datetime import timedelta
-            cutoff = datetime.utcnow() - timedelta(days=days)
-            trades = session.query(TradeORM).filter(
-                TradeORM.is_open == False,
-                TradeORM.closed_at >= cutoff,
-            ).all()
-
-            for trade in trades:
-                # Map strategy type
-                strategy_str = trade.strategy.strategy_type if trade.strategy else 'iron_condor'
-                try:
-                    strategy_type = StrategyType(strategy_str)
-                except ValueError:
-                    strategy_type = StrategyType.IRON_CONDOR
-
-                # Map exit reason
-                exit_str = trade.exit_reason or 'manual'
-                try:
-                    exit_reason = TradeExitReason(exit_str)
-                except ValueError:
-                    exit_reason = TradeExitReason.MANUAL
-
-                # Regime at entry/exit
-                regime_entry = 1
-                if trade.regime_at_entry:
-                    try:
-                        regime_entry = int(trade.regime_at_entry.replace('R', ''))
-                    except (ValueError, AttributeError):
-                        pass
-
-                entry_price = float(trade.entry_price or 0)
-                exit_price = float(trade.exit_price or 0)
-                pnl = float(trade.total_pnl or 0)
-                max_risk = float(trade.max_risk or abs(entry_price) or 1)
-                pnl_pct = pnl / max_risk if max_risk else 0
-
-                entry_date = (trade.opened_at or trade.created_at).date() if (trade.opened_at or trade.created_at) else date.today()
-                exit_date = trade.closed_at.date() if trade.closed_at else date.today()
-                holding_days = max(1, (exit_date - entry_date).days)
-
-                # Score at entry from decision lineage
-                score = 0.5
-                lineage = trade.decision_lineage or {}
-                if lineage.get('score'):
-                    score = float(lineage['score'])
-
-                try:
-                    outcomes.append(TradeOutcome(
-                        trade_id=trade.id,
-                        ticker=trade.underlying_symbol,
-                        strategy_type=strategy_type,
-                        regime_at_entry=regime_entry,
-                        regime_at_exit=regime_entry,  # approximate
-                        entry_date=entry_date,
-                        exit_date=exit_date,
-                        entry_price=entry_price,
-                        exit_price=exit_price,
-                        pnl_dollars=pnl,
-                        pnl_pct=pnl_pct,
-                        holding_days=holding_days,
-                        exit_reason=exit_reason,
-                        composite_score_at_entry=score,
-                        structure_type=strategy_str,
-                        order_side='credit' if entry_price > 0 else 'debit',
-                        iv_rank_at_entry=None,  # TODO: store at entry
-                    ))
-                except Exception as e:
-                    logger.debug(f"Skip trade {trade.id}: {e}")
-
-        return outcomes
+        """
+        MA TradeOutcome objects for trades closed in the last ``days``.
+
+        Served from the shared OutcomeDataset, so the four learning loops
+        (and Steward's desk comparison) share one closed-trade load.
+        """
+        from trading_cotrader.services.outcome_dataset import get_outcome_dataset
+        return get_outcome_dataset().trade_outcomes(days=days)
 
     # -----------------------------------------------------------------
     # ML-E1: Drift Detection
@@ -0,0 +1,401 @@
+"""
+Outcome Dataset — Shared, versioned in-memory table of closed-trade outcomes.
+
+MLLearningService used to rebuild the same closed-trade list for drift,
+bandits, thresholds and POP calibration (four 180-day queries with a lazy
+strategy load per trade), and Steward.compare_desk_performance rebuilt it
+again plus one query per desk. This dataset loads closed trades once with a
+single joined query, keeps them column-wise with desk / strategy / regime
+indexes, and afterwards only reloads the trades that changed:
+
+    - Trades closed, reopened, edited or deleted through any SQLAlchemy
+      session in this process are collected by an after_flush hook, marked
+      dirty once the transaction commits (dropped if it rolls back), and
+      reloaded on the next read (one ``id IN (...)`` query).
+    - Writes from other processes are picked up by polling
+      ``last_updated`` at most every ``max_age`` seconds.
+
+``version`` is bumped on every change, and MA TradeOutcome objects are
+memoized per row, so consumers can cheaply tell whether anything moved.
+
+Usage:
+    from trading_cotrader.services.outcome_dataset import get_outcome_dataset
+    ds = get_outcome_dataset()
+    outcomes = ds.trade_outcomes(days=90, portfolio_id=desk.id)
+    pnl = ds.column('pnl_dollars', ds.select(strategy_type='iron_condor'))
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import threading
+import time
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from trading_cotrader.core.database.schema import StrategyORM, TradeORM
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    'trade_id', 'portfolio_id', 'ticker', 'strategy_type', 'exit_reason', 'regime',
+    'entry_date', 'exit_date', 'closed_at', 'entry_price', 'exit_price',
+    'pnl_dollars', 'pnl_pct', 'holding_days', 'score', 'stamp',
+)
+INDEXED = ('portfolio_id', 'strategy_type', 'regime')
+
+# TradeORM fields that change what a trade contributes to the dataset
+_WATCHED = (
+    'is_open', 'closed_at', 'portfolio_id', 'strategy_id', 'exit_price', 'exit_reason',
+    'total_pnl', 'entry_price', 'max_risk', 'regime_at_entry', 'decision_lineage',
+)
+
+
+class OutcomeDataset:
+    """Column store of closed trades within ``horizon_days``, kept in sync incrementally."""
+
+    def __init__(self, horizon_days: int = 180, max_age: float = 300.0):
+        self.horizon_days = horizon_days
+        self.max_age = max_age
+        self.version = 0
+        self.queries = 0   # DB round trips, for diagnostics/tests
+        self._lock = threading.RLock()
+        self._dirty: Set[str] = set()
+        self._db = None
+        self._loaded = False
+        self._synced_at: Optional[datetime] = None
+        self._checked_at = 0.0
+        self._outcome_cache: Dict[str, Tuple[int, Any]] = {}
+        self._reset()
+
+    def _reset(self) -> None:
+        self._cols: Dict[str, list] = {name: [] for name in COLUMNS}
+        self._live: List[bool] = []
+        self._pos: Dict[str, int] = {}
+        self._index: Dict[str, Dict[Any, Set[int]]] = {name: defaultdict(set) for name in INDEXED}
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._pos)
+
+    # -----------------------------------------------------------------
+    # Invalidation
+    # -----------------------------------------------------------------
+
+    def mark_dirty(self, trade_ids: Iterable[str]) -> None:
+        """Reload these trades on the next read (called by the commit hook)."""
+        with self._lock:
+            self._dirty.update(trade_ids)
+
+    def invalidate(self) -> None:
+        """Drop everything; the next read does a full load."""
+        with self._lock:
+            self._loaded = False
+            self._dirty.clear()
+
+    # -----------------------------------------------------------------
+    # Reads
+    # -----------------------------------------------------------------
+
+    def select(
+        self,
+        days: Optional[int] = None,
+        portfolio_id: Optional[str] = None,
+        strategy_type: Optional[str] = None,
+        regime: Optional[int] = None,
+    ) -> List[int]:
+        """Row positions matching the filters, ordered by close time."""
+        with self._lock:
+            if days is not None and days > self.horizon_days:
+                self.horizon_days = days
+                self._loaded = False
+            self._refresh()
+
+            candidates = None
+            for name, value in (('portfolio_id', portfolio_id),
+                                ('strategy_type', strategy_type), ('regime', regime)):
+                if value is None:
+                    continue
+                rows = self._index[name].get(value, set())
+                candidates = set(rows) if candidates is None else candidates & rows
+            if candidates is None:
+                candidates = self._pos.values()
+
+            closed_at = self._cols['closed_at']
+            if days is not None:
+                cutoff = datetime.utcnow() - timedelta(days=days)
+                candidates = [p for p in candidates if closed_at[p] >= cutoff]
+            trade_ids = self._cols['trade_id']
+            return sorted(candidates, key=lambda p: (closed_at[p], trade_ids[p]))
+
+    def column(self, name: str, positions: Iterable[int]) -> list:
+        """Values of one column at the given positions."""
+        with self._lock:
+            values = self._cols[name]
+            return [values[p] for p in positions]
+
+    def records(self, positions: Iterable[int]) -> List[Dict[str, Any]]:
+        """Rows at the given positions as dicts."""
+        with self._lock:
+            return [{name: self._cols[name][p] for name in COLUMNS} for p in positions]
+
+    def trade_outcomes(self, days: Optional[int] = None, **filters) -> list:
+        """MA TradeOutcome objects for the matching rows (memoized per row version)."""
+        from market_analyzer import TradeOutcome, TradeExitReason, StrategyType
+
+        with self._lock:
+            positions = self.select(days=days, **filters)
+            cols = self._cols
+            outcomes = []
+            for p in positions:
+                trade_id, stamp = cols['trade_id'][p], cols['stamp'][p]
+                cached = self._outcome_cache.get(trade_id)
+                if cached is not None and cached[0] == stamp:
+                    outcomes.append(cached[1])
+                    continue
+
+                strategy_str = cols['strategy_type'][p]
+                try:
+                    strategy_type = StrategyType(strategy_str)
+                except ValueError:
+                    strategy_type = StrategyType.IRON_CONDOR
+                try:
+                    exit_reason = TradeExitReason(cols['exit_reason'][p])
+                except ValueError:
+                    exit_reason = TradeExitReason.MANUAL
+
+                entry_price = cols['entry_price'][p]
+                try:
+                    outcome = TradeOutcome(
+                        trade_id=trade_id,
+                        ticker=cols['ticker'][p],
+                        strategy_type=strategy_type,
+                        regime_at_entry=cols['regime'][p],
+                        regime_at_exit=cols['regime'][p],  # approximate
+                        entry_date=cols['entry_date'][p],
+                        exit_date=cols['exit_date'][p],
+                        entry_price=entry_price,
+                        exit_price=cols['exit_price'][p],
+                        pnl_dollars=cols['pnl_dollars'][p],
+                        pnl_pct=cols['pnl_pct'][p],
+                        holding_days=cols['holding_days'][p],
+                        exit_reason=exit_reason,
+                        composite_score_at_entry=cols['score'][p],
+                        structure_type=strategy_str,
+                        order_side='credit' if entry_price > 0 else 'debit',
+                        iv_rank_at_entry=None,  # TODO: store at entry
+                    )
+                except Exception as e:
+                    logger.debug(f"Skip trade {trade_id}: {e}")
+                    continue
+                self._outcome_cache[trade_id] = (stamp, outcome)
+                outcomes.append(outcome)
+            return outcomes
+
+    # -----------------------------------------------------------------
+    # Sync
+    # -----------------------------------------------------------------
+
+    def _refresh(self) -> None:
+        from trading_cotrader.core.database.session import get_db_manager
+
+        db = get_db_manager()
+        if db is not self._db:
+            self._db = db
+            self._loaded = False
+
+        if not self._loaded:
+            self._full_load(db)
+            return
+
+        criteria = []
+        if self._dirty:
+            criteria.append(TradeORM.id.in_(list(self._dirty)))
+        poll = time.monotonic() - self._checked_at >= self.max_age
+        if poll:
+            criteria.append(TradeORM.last_updated >= self._synced_at - timedelta(seconds=1))
+        if not criteria:
+            return
+
+        from sqlalchemy import or_
+        dirty, self._dirty = self._dirty, set()
+        started = datetime.utcnow()
+        rows = self._query(db, or_(*criteria))
+        seen = set()
+        changed = False
+        cutoff = datetime.utcnow() - timedelta(days=self.horizon_days)
+        for row in rows:
+            seen.add(row.id)
+            if row.is_open or row.closed_at is None or row.closed_at < cutoff:
+                changed |= self._remove(row.id)
+            else:
+                self._upsert(self._derive(row))
+                changed = True
+        for trade_id in dirty - seen:  # deleted
+            changed |= self._remove(trade_id)
+        if poll:
+            self._synced_at = started
+            self._checked_at = time.monotonic()
+        if changed:
+            self.version += 1
+
+    def _full_load(self, db) -> None:
+        started = datetime.utcnow()
+        self._dirty.clear()
+        cutoff = started - timedelta(days=self.horizon_days)
+        rows = self._query(db, TradeORM.is_open == False, TradeORM.closed_at >= cutoff)
+        self._reset()
+        self._outcome_cache.clear()
+        for row in sorted(rows, key=lambda r: (r.closed_at, r.id)):
+            self._upsert(self._derive(row))
+        self.version += 1
+        self._loaded = True
+        self._synced_at = started
+        self._checked_at = time.monotonic()
+        logger.debug(f"Outcome dataset loaded: {len(self._pos)} closed trades (v{self.version})")
+
+    def _query(self, db, *criteria) -> list:
+        self.queries += 1
+        with db.session_scope() as session:
+            return session.query(
+                TradeORM.id, TradeORM.portfolio_id, TradeORM.underlying_symbol,
+                TradeORM.is_open, TradeORM.opened_at, TradeORM.created_at, TradeORM.closed_at,
+                TradeORM.entry_price, TradeORM.exit_price, TradeORM.exit_reason,
+                TradeORM.total_pnl, TradeORM.max_risk, TradeORM.regime_at_entry,
+                TradeORM.decision_lineage, StrategyORM.strategy_type,
+            ).outerjoin(StrategyORM, TradeORM.strategy_id == StrategyORM.id).filter(*criteria).all()
+
+    def _derive(self, row) -> Dict[str, Any]:
+        """One dataset row from a query row (same mapping the ML loops always used)."""
+        regime = 1
+        if row.regime_at_entry:
+            try:
+                regime = int(row.regime_at_entry.replace('R', ''))
+            except (ValueError, AttributeError):
+                pass
+
+        entry_price = float(row.entry_price or 0)
+        pnl = float(row.total_pnl or 0)
+        max_risk = float(row.max_risk or abs(entry_price) or 1)
+        opened = row.opened_at or row.created_at
+        entry_date = opened.date() if opened else date.today()
+        exit_date = row.closed_at.date()
+
+        score = 0.5
+        lineage = row.decision_lineage or {}
+        if lineage.get('score'):
+            score = float(lineage['score'])
+
+        return {
+            'trade_id': row.id,
+            'portfolio_id': row.portfolio_id,
+            'ticker': row.underlying_symbol,
+            'strategy_type': row.strategy_type or 'iron_condor',
+            'exit_reason': row.exit_reason or 'manual',
+            'regime': regime,
+            'entry_date': entry_date,
+            'exit_date': exit_date,
+            'closed_at': row.closed_at,
+            'entry_price': entry_price,
+            'exit_price': float(row.exit_price or 0),
+            'pnl_dollars': pnl,
+            'pnl_pct': pnl / max_risk if max_risk else 0,
+            'holding_days': max(1, (exit_date - entry_date).days),
+            'score': score,
+        }
+
+    def _upsert(self, values: Dict[str, Any]) -> None:
+        values['stamp'] = self.version + 1  # the version this write is published under
+        pos = self._pos.get(values['trade_id'])
+        if pos is None:
+            pos = len(self._live)
+            for name in COLUMNS:
+                self._cols[name].append(values[name])
+            self._live.append(True)
+            self._pos[values['trade_id']] = pos
+        else:
+            self._unindex(pos)
+            for name in COLUMNS:
+                self._cols[name][pos] = values[name]
+        for name in INDEXED:
+            self._index[name][values[name]].add(pos)
+
+    def _remove(self, trade_id: str) -> bool:
+        pos = self._pos.pop(trade_id, None)
+        if pos is None:
+            return False
+        self._unindex(pos)
+        self._live[pos] = False
+        self._outcome_cache.pop(trade_id, None)
+        return True
+
+    def _unindex(self, pos: int) -> None:
+        for name in INDEXED:
+            bucket = self._index[name].get(self._cols[name][pos])
+            if bucket is not None:
+                bucket.discard(pos)
+                if not bucket:
+                    del self._index[name][self._cols[name][pos]]
+
+
+# =============================================================================
+# Singleton + close-event hook
+# =============================================================================
+
+_dataset: Optional[OutcomeDataset] = None
+_dataset_lock = threading.Lock()
+
+# session.info key for trade IDs flushed but not yet committed
+_PENDING_KEY = 'outcome_dataset_pending'
+
+
+def _on_flush(session, flush_context) -> None:
+    """Collect trades whose outcome-relevant fields changed in this flush."""
+    if _dataset is None:
+        return
+    changed = set()
+    for obj in session.deleted:
+        if isinstance(obj, TradeORM):
+            changed.add(obj.id)
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, TradeORM):
+            continue
+        if obj.is_open is not False and obj.id not in _dataset._pos:
+            continue  # open and not in the dataset — nothing to do
+        state = inspect(obj)
+        if any(state.attrs[name].history.has_changes() for name in _WATCHED):
+            changed.add(obj.id)
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+def _on_commit(session) -> None:
+    """Publish the collected trades once the outermost transaction commits."""
+    if session.in_nested_transaction():
+        return  # savepoint release — the outer transaction may still roll back
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and _dataset is not None:
+        _dataset.mark_dirty(pending)
+
+
+def _on_rollback(session, previous_transaction) -> None:
+    """Forget the collected trades when the outermost transaction rolls back."""
+    # A savepoint rollback keeps them: reloading an unchanged trade is harmless.
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+def get_outcome_dataset() -> OutcomeDataset:
+    """Process-wide outcome dataset (installs the close-event hooks on first use)."""
+    global _dataset
+    if _dataset is None:
+        with _dataset_lock:
+            if _dataset is None:
+                _dataset = OutcomeDataset()
+                event.listen(Session, 'after_flush', _on_flush)
+                event.listen(Session, 'after_commit', _on_commit)
+                event.listen(Session, 'after_soft_rollback', _on_rollback)
+    return _dataset
@@ -7,23 +7,64 @@ FIXES:
 1. Properly finds existing portfolio by (broker, account_id)
 2. Uses same session throughout to avoid detached object issues
 3. Better error handling and logging
+4. Positions are reconciled by broker_position_id (bulk insert/update/delete
+   of only what changed) instead of clear-and-rebuild, so row IDs and
+   Greeks/P&L snapshot history survive a sync. The resulting
+   PositionChangeSet can be applied to ContainerManager incrementally.
 """
 
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
 
 from trading_cotrader.core.database.session import Session
 from trading_cotrader.repositories.portfolio import PortfolioRepository
 from trading_cotrader.repositories.position import PositionRepository
 import trading_cotrader.core.models.domain as dm
 from trading_cotrader.core.database.session import session_scope
-from trading_cotrader.core.database.schema import PortfolioORM
+from trading_cotrader.core.database.schema import PortfolioORM, PositionORM
 logger = logging.getLogger(__name__)
 
 
+# Broker-owned PositionORM columns compared on every sync. Values are
+# compared at the column's stored scale so Numeric rounding is not a change.
+RECONCILED_FIELDS = (
+    'quantity', 'entry_price', 'total_cost', 'current_price', 'market_value',
+    'total_pnl', 'delta', 'gamma', 'theta', 'vega', 'rho', 'trade_ids',
+)
+
+
+@dataclass
+class PositionChangeSet:
+    """Position rows changed by one sync, by PositionORM.id."""
+    portfolio_id: str = ""
+    inserted: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def upserted(self) -> List[str]:
+        return self.inserted + self.updated
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.inserted or self.updated or self.deleted)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'portfolio_id': self.portfolio_id,
+            'inserted': list(self.inserted),
+            'updated': list(self.updated),
+            'deleted': list(self.deleted),
+            'unchanged': self.unchanged,
+        }
+
+
 @dataclass
 class SyncResult:
     """Result of portfolio sync operation"""
@@ -33,6 +74,7 @@ class SyncResult:
     positions_failed: int = 0
     error: str = ""
     warnings: List[str] = field(default_factory=list)
+    changes: Optional[PositionChangeSet] = None
 
 
 class PortfolioSyncService:
@@ -48,6 +90,7 @@ class PortfolioSyncService:
             
             if result.success:
                 print(f"Synced {result.positions_synced} positions")
+                container_manager.apply_position_changes(session, result.changes)
     """
     
     def __init__(self, session: Session, broker):
@@ -95,11 +138,12 @@ class PortfolioSyncService:
             broker_positions = self.broker.get_positions()
             logger.info(f"Broker returned {len(broker_positions)} positions")
             
-            # Step 4: Sync positions (clear and rebuild)
+            # Step 4: Reconcile positions (diff against DB by broker_position_id)
             sync_stats = self._sync_positions(portfolio.id, broker_positions)
-            result.positions_synced = sync_stats['created']
+            result.positions_synced = sync_stats['synced']
             result.positions_failed = sync_stats['failed']
             result.warnings = sync_stats.get('warnings', [])
+            result.changes = sync_stats['changes']
             
             # Step 5: Update portfolio Greeks and totals
             self._update_portfolio_aggregates(portfolio)
@@ -108,7 +152,11 @@ class PortfolioSyncService:
             self.session.commit()
             
             result.success = True
-            logger.info(f"✓ Portfolio sync complete: {result.positions_synced} positions")
+            changes = result.changes
+            logger.info(
+                f"✓ Portfolio sync complete: {result.positions_synced} positions "
+                f"(+{len(changes.inserted)} ~{len(changes.updated)} -{len(changes.deleted)})"
+            )
             
         except Exception as e:
             self.session.rollback()
@@ -167,43 +215,128 @@ class PortfolioSyncService:
     
     def _sync_positions(self, portfolio_id: str, broker_positions: List[dm.Position]) -> dict:
         """
-        Sync positions using clear-and-rebuild strategy.
-        
+        Reconcile DB positions with the broker, keyed on broker_position_id.
+
+        New broker positions are bulk-inserted, changed ones bulk-updated in
+        place (row id kept), and rows the broker no longer reports are
+        deleted. Unchanged rows are not touched.
+
         Returns:
-            dict with 'created', 'failed', 'warnings' keys
+            dict with 'synced', 'failed', 'warnings', 'changes' keys
         """
-        stats = {'created': 0, 'failed': 0, 'warnings': []}
-        
-        # Validate positions
-        valid_positions = []
+        stats = {'synced': 0, 'failed': 0, 'warnings': []}
+        changes = PositionChangeSet(portfolio_id=portfolio_id)
+        stats['changes'] = changes
+
+        # Validate positions (last one wins on duplicate broker ids)
+        incoming: Dict[str, dm.Position] = {}
         for pos in broker_positions:
             is_valid, errors = self._validate_position(pos)
-            if is_valid:
-                valid_positions.append(pos)
+            if not is_valid:
+                stats['warnings'].append(f"{pos.symbol.ticker if pos.symbol else '?'}: {errors}")
+                continue
+            if pos.broker_position_id in incoming:
+                stats['warnings'].append(f"{pos.broker_position_id}: duplicate broker position")
+            incoming[pos.broker_position_id] = pos
+
+        logger.info(f"Valid positions: {len(incoming)}, Invalid: {len(broker_positions) - len(incoming)}")
+
+        # Current rows, broker-owned columns only
+        columns = [PositionORM.id, PositionORM.broker_position_id] + [
+            getattr(PositionORM, name) for name in RECONCILED_FIELDS
+        ]
+        existing: Dict[str, Any] = {}
+        for row in self.session.query(*columns).filter(PositionORM.portfolio_id == portfolio_id):
+            if row.broker_position_id in existing or row.broker_position_id not in incoming:
+                changes.deleted.append(row.id)
             else:
-                stats['warnings'].append(f"{pos.symbol.ticker}: {errors}")
-        
-        logger.info(f"Valid positions: {len(valid_positions)}, Invalid: {len(broker_positions) - len(valid_positions)}")
-        
-        # Clear existing positions
-        deleted = self.position_repo.delete_by_portfolio(portfolio_id)
-        logger.info(f"Deleted {deleted} existing positions")
-        
-        # Create new positions
-        for pos in valid_positions:
-            try:
-                created = self.position_repo.create_from_domain(pos, portfolio_id)
-                if created:
-                    stats['created'] += 1
-                else:
+                existing[row.broker_position_id] = row
+
+        inserts, updates = [], []
+        now = datetime.utcnow()
+        for broker_id, pos in incoming.items():
+            values = self._position_values(pos)
+            row = existing.get(broker_id)
+            if row is None:
+                symbol_orm = self.position_repo.symbol_repo.get_or_create_from_domain(pos.symbol)
+                if not symbol_orm:
                     stats['failed'] += 1
-                    logger.error(f"Failed to create position: {pos.symbol.ticker}")
-            except Exception as e:
-                stats['failed'] += 1
-                logger.error(f"Error creating position {pos.symbol.ticker}: {e}")
-        
+                    logger.error(f"Failed to get/create symbol for position: {pos.symbol.ticker}")
+                    continue
+                inserts.append({
+                    **values,
+                    'id': pos.id,
+                    'portfolio_id': portfolio_id,
+                    'symbol_id': symbol_orm.id,
+                    'broker_position_id': broker_id,
+                    'created_at': now,
+                    'last_updated': now,
+                })
+                changes.inserted.append(pos.id)
+            elif self._row_differs(row, values):
+                updates.append({**values, 'id': row.id, 'last_updated': now})
+                changes.updated.append(row.id)
+            else:
+                changes.unchanged += 1
+
+        # Apply as bulk statements
+        if changes.deleted:
+            self.session.query(PositionORM).filter(
+                PositionORM.id.in_(changes.deleted)
+            ).delete(synchronize_session=False)
+        if inserts:
+            self.session.bulk_insert_mappings(PositionORM, inserts)
+        if updates:
+            self.session.bulk_update_mappings(PositionORM, updates)
+        self.session.flush()
+
+        stats['synced'] = len(changes.inserted) + len(changes.updated) + changes.unchanged
+        logger.info(
+            f"Positions reconciled: {len(changes.inserted)} inserted, {len(changes.updated)} updated, "
+            f"{len(changes.deleted)} deleted, {changes.unchanged} unchanged"
+        )
         return stats
-    
+
+    @staticmethod
+    def _position_values(position: dm.Position) -> Dict[str, Any]:
+        """Broker-owned column values for a domain position."""
+        values = {
+            'quantity': position.quantity,
+            'entry_price': position.entry_price,
+            'total_cost': position.total_cost,
+            'current_price': position.current_price,
+            'market_value': position.market_value,
+            'total_pnl': position.unrealized_pnl(),
+            'trade_ids': position.trade_ids or [],
+        }
+        greeks = position.greeks
+        if greeks and not isinstance(greeks, list):
+            values.update({
+                'delta': greeks.delta,
+                'gamma': greeks.gamma,
+                'theta': greeks.theta,
+                'vega': greeks.vega,
+                'rho': greeks.rho,
+                'greeks_updated_at': greeks.timestamp,
+            })
+        return values
+
+    @staticmethod
+    def _row_differs(row, values: Dict[str, Any]) -> bool:
+        """True if any reconciled column differs at its stored precision."""
+        table = PositionORM.__table__
+        for name in RECONCILED_FIELDS:
+            if name not in values:
+                continue
+            old, new = getattr(row, name), values[name]
+            scale = getattr(table.c[name].type, 'scale', None)
+            if scale is not None and old is not None and new is not None:
+                if round(Decimal(str(old)), scale) != round(Decimal(str(new)), scale):
+                    return True
+            elif old != new:
+                return True
+        return False
+
     def _validate_position(self, position: dm.Position) -> tuple:
         """Validate a position from broker.
 
@@ -225,29 +358,19 @@ class PortfolioSyncService:
         return (len(errors) == 0, errors)
     
     def _update_portfolio_aggregates(self, portfolio: dm.Portfolio):
-        """Update portfolio-level Greeks and totals"""
-        
-        # Get all positions for this portfolio
-        positions = self.position_repo.get_by_portfolio(portfolio.id)
-        
-        # Calculate aggregates
-        total_delta = Decimal('0')
-        total_gamma = Decimal('0')
-        total_theta = Decimal('0')
-        total_vega = Decimal('0')
-        total_pnl = Decimal('0')
-        total_value = Decimal('0')
-        
-        for pos in positions:
-            if pos.greeks:
-                total_delta += pos.greeks.delta or Decimal('0')
-                total_gamma += pos.greeks.gamma or Decimal('0')
-                total_theta += pos.greeks.theta or Decimal('0')
-                total_vega += pos.greeks.vega or Decimal('0')
-            
-            total_pnl += pos.unrealized_pnl()
-            total_value += pos.market_value or Decimal('0')
-        
+        """Update portfolio-level Greeks and totals (one SUM query)."""
+        zero = Decimal('0')
+        sums = self.session.query(
+            func.sum(PositionORM.delta),
+            func.sum(PositionORM.gamma),
+            func.sum(PositionORM.theta),
+            func.sum(PositionORM.vega),
+            func.sum(PositionORM.total_pnl),
+        ).filter(PositionORM.portfolio_id == portfolio.id).one()
+        total_delta, total_gamma, total_theta, total_vega, total_pnl = (
+            Decimal(str(v)) if v is not None else zero for v in sums
+        )
+
         # Update portfolio
         portfolio.portfolio_greeks = dm.Greeks(
             delta=total_delta,
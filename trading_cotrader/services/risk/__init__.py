@@ -1,18 +1,26 @@
 """
 Risk Management Module
 
-VaR calculations and PortfolioRiskAnalyzer moved to playground/archived_math/.
-Remaining: correlation, concentration, margin, limits.
+PortfolioRiskAnalyzer moved to playground/archived_math/.
+Remaining: VaR/ES engine, correlation (+ returns store, covariance estimators), concentration, margin, limits.
 """
 
 from trading_cotrader.services.risk.correlation import CorrelationAnalyzer, CorrelatedPair
+from trading_cotrader.services.risk.covariance import CovarianceEngine, CovarianceMethod
+from trading_cotrader.services.risk.returns_store import ReturnsStore, LocalFileProvider, YFinanceProvider
 from trading_cotrader.services.risk.concentration import ConcentrationChecker, ConcentrationResult
 from trading_cotrader.services.risk.margin import MarginEstimator, MarginRequirement
 from trading_cotrader.services.risk.limits import RiskLimits, LimitBreach, LimitCheckResult
+from trading_cotrader.services.risk.var import VaREngine, VaRMethod, VaRReport, BundleVaR
 
 __all__ = [
     'CorrelationAnalyzer',
     'CorrelatedPair',
+    'CovarianceEngine',
+    'CovarianceMethod',
+    'ReturnsStore',
+    'LocalFileProvider',
+    'YFinanceProvider',
     'ConcentrationChecker',
     'ConcentrationResult',
     'MarginEstimator',
@@ -20,4 +28,8 @@ __all__ = [
     'RiskLimits',
     'LimitBreach',
     'LimitCheckResult',
+    'VaREngine',
+    'VaRMethod',
+    'VaRReport',
+    'BundleVaR',
 ]
@@ -6,7 +6,8 @@ Analyze correlation between positions to:
 - Identify diversification opportunities
 - Understand portfolio behavior under stress
 
-Uses yfinance for real historical return data with 1-day caching.
+Historical returns come from the local ReturnsStore (yfinance or local
+files), with 1-day matrix caching.
 """
 
 from dataclasses import dataclass, field
@@ -16,6 +17,10 @@ from typing import List, Dict, Optional, Tuple
 import logging
 import numpy as np
 
+from trading_cotrader.services.risk.covariance import (
+    CovarianceEngine, CovarianceMethod, DEFAULT_EWMA_LAMBDA,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,6 +53,11 @@ class CorrelationMatrix:
     covariance_matrix: Optional[np.ndarray] = field(default=None, repr=False)
     volatilities: Optional[Dict[str, float]] = field(default=None, repr=False)
 
+    # How covariance_matrix was estimated (sample / rolling / ewma) and the
+    # Ledoit-Wolf shrinkage intensity applied to it, if any
+    covariance_method: str = "sample"
+    shrinkage: Optional[float] = None
+
     def get_correlation(self, sym1: str, sym2: str) -> Optional[float]:
         """Get correlation between two symbols."""
         if sym1 == sym2:
@@ -99,82 +109,50 @@ class CorrelationMatrix:
 
 def _fetch_returns(symbols: List[str], lookback_days: int = 252) -> Optional[Dict[str, np.ndarray]]:
     """
-    Fetch daily log returns from yfinance.
+    Fetch daily log returns from yfinance, bypassing the returns store.
 
     Returns dict of {symbol: np.array of daily log returns} or None on failure.
     """
-    try:
-        import yfinance as yf
-    except ImportError:
-        logger.warning("yfinance not installed — cannot fetch historical returns")
-        return None
+    from trading_cotrader.services.risk.returns_store import MIN_HISTORY, YFinanceProvider
 
     if not symbols:
         return None
 
-    try:
-        end = datetime.utcnow()
-        # Fetch extra days to account for weekends/holidays
-        start = end - timedelta(days=int(lookback_days * 1.5))
-
-        # Download all at once for efficiency
-        data = yf.download(
-            symbols,
-            start=start.strftime('%Y-%m-%d'),
-            end=end.strftime('%Y-%m-%d'),
-            progress=False,
-            auto_adjust=True
-        )
+    end = datetime.utcnow().date()
+    # Fetch extra days to account for weekends/holidays
+    start = end - timedelta(days=int(lookback_days * 1.5))
+    closes = YFinanceProvider().get_closes(symbols, start, end)
 
-        if data.empty:
-            logger.warning(f"No data returned from yfinance for {symbols}")
-            return None
+    returns = {}
+    for sym in symbols:
+        if sym not in closes:
+            logger.warning(f"No data for {sym}")
+            continue
+        prices = closes[sym].values.flatten()
+        if len(prices) < MIN_HISTORY:
+            logger.warning(f"Insufficient data for {sym}: {len(prices)} days")
+            continue
+        log_ret = np.diff(np.log(prices))
+        returns[sym] = log_ret[-lookback_days:]
 
-        # yfinance always returns multi-level columns: (Price, Ticker)
-        close = data['Close']
-
-        # close may be a Series (single symbol, old yfinance) or DataFrame
-        import pandas as pd
-        returns = {}
-
-        if isinstance(close, pd.Series):
-            # Old yfinance format: single symbol returns a Series
-            prices = close.dropna().values.flatten()
-            if len(prices) < 20:
-                logger.warning(f"Insufficient data for {symbols[0]}: {len(prices)} days")
-                return None
-            log_ret = np.diff(np.log(prices))
-            log_ret = log_ret[-lookback_days:] if len(log_ret) > lookback_days else log_ret
-            returns[symbols[0]] = log_ret
-        else:
-            # DataFrame — iterate columns (works for single or multiple symbols)
-            for sym in symbols:
-                if sym in close.columns:
-                    prices = close[sym].dropna().values.flatten()
-                    if len(prices) < 20:
-                        logger.warning(f"Insufficient data for {sym}: {len(prices)} days")
-                        continue
-                    log_ret = np.diff(np.log(prices))
-                    log_ret = log_ret[-lookback_days:] if len(log_ret) > lookback_days else log_ret
-                    returns[sym] = log_ret
-                else:
-                    logger.warning(f"No data for {sym}")
-
-        return returns if returns else None
-    except Exception as e:
-        logger.error(f"Error fetching returns from yfinance: {e}")
-        return None
+    return returns if returns else None
 
 
 class CorrelationAnalyzer:
     """
     Analyze correlations between portfolio positions.
 
-    Uses real yfinance historical data with 1-day caching.
-    Returns empty matrix if yfinance unavailable (no hardcoded fallbacks).
+    Returns come from a persistent per-symbol ReturnsStore (yfinance by
+    default, or any local provider for offline use), so a new symbol costs
+    one download and every other symbol is read from disk. Matrices are
+    cached for 1 day. Returns empty matrix if no history is available
+    (no hardcoded fallbacks).
 
     Usage:
         analyzer = CorrelationAnalyzer()
+        offline = CorrelationAnalyzer(returns_store=ReturnsStore(
+            'data/returns', provider=LocalFileProvider('data/prices')))
+        reactive = CorrelationAnalyzer(covariance_method=CovarianceMethod.EWMA, shrinkage=True)
 
         # Get correlation matrix
         matrix = analyzer.calculate_correlation_matrix(['AAPL', 'MSFT', 'GOOGL'])
@@ -186,10 +164,27 @@ class CorrelationAnalyzer:
         score = analyzer.diversification_score(positions)
     """
 
-    def __init__(self, market_data_provider=None):
+    def __init__(
+        self,
+        market_data_provider=None,
+        returns_store=None,
+        covariance_method: CovarianceMethod = CovarianceMethod.SAMPLE,
+        ewma_lambda: float = DEFAULT_EWMA_LAMBDA,
+        shrinkage: bool = False,
+    ):
         self.market_data = market_data_provider
+        self._returns_store = returns_store
+        self.covariance = CovarianceEngine(covariance_method, ewma_lambda=ewma_lambda, shrinkage=shrinkage)
         self._correlation_cache: Dict[str, CorrelationMatrix] = {}
 
+    @property
+    def returns_store(self):
+        """The ReturnsStore backing this analyzer (default store created lazily)."""
+        if self._returns_store is None:
+            from trading_cotrader.services.risk.returns_store import ReturnsStore
+            self._returns_store = ReturnsStore.default()
+        return self._returns_store
+
     def calculate_correlation_matrix(
         self,
         symbols: List[str],
@@ -215,14 +210,16 @@ class CorrelationAnalyzer:
             if age < 86400:  # 24 hours
                 return cached
 
-        # Fetch real returns from yfinance
-        returns_data = _fetch_returns(symbols, lookback_days)
+        # Date-aligned returns from the local store (fetches only missing days)
+        try:
+            valid_symbols, days, aligned = self.returns_store.aligned_window(symbols, lookback_days)
+        except Exception as e:
+            logger.warning(f"Returns store unavailable: {e}")
+            valid_symbols, days, aligned = [], None, None
 
-        if returns_data and len(returns_data) >= 1:
-            result = self._build_matrix_from_returns(symbols, returns_data, lookback_days)
+        if valid_symbols:
+            result = self._build_matrix_from_aligned(symbols, valid_symbols, aligned, lookback_days, days)
         else:
-            # Fallback to hardcoded estimates
-            logger.warning("Using hardcoded correlation estimates (yfinance unavailable)")
             result = self._build_matrix_from_estimates(symbols, lookback_days)
 
         self._correlation_cache[cache_key] = result
@@ -247,14 +244,29 @@ class CorrelationAnalyzer:
             logger.warning(f"Insufficient aligned data ({min_len} days), using estimates")
             return self._build_matrix_from_estimates(symbols, lookback_days)
         aligned = np.column_stack([returns_data[s][-min_len:] for s in valid_symbols])
+        return self._build_matrix_from_aligned(symbols, valid_symbols, aligned, lookback_days)
+
+    def _build_matrix_from_aligned(
+        self,
+        symbols: List[str],
+        valid_symbols: List[str],
+        aligned: np.ndarray,
+        lookback_days: int,
+        days: Optional[np.ndarray] = None
+    ) -> CorrelationMatrix:
+        """
+        Build correlation matrix from a days x symbols return matrix.
 
-        # Compute covariance and correlation matrices
-        # Daily covariance matrix
-        cov_matrix = np.cov(aligned, rowvar=False)
+        With day stamps, rolling / EWMA covariance state for this symbol set
+        is carried forward and only the new days are applied.
+        """
+        if len(aligned) < 5:
+            logger.warning(f"Insufficient aligned data ({len(aligned)} days), using estimates")
+            return self._build_matrix_from_estimates(symbols, lookback_days)
 
-        # Handle single symbol case
-        if len(valid_symbols) == 1:
-            cov_matrix = np.array([[cov_matrix]]) if cov_matrix.ndim == 0 else cov_matrix.reshape(1, 1)
+        # Daily covariance matrix (sample, rolling or EWMA; optionally shrunk)
+        estimate = self.covariance.estimate(valid_symbols, aligned, days)
+        cov_matrix = estimate.covariance.reshape(len(valid_symbols), len(valid_symbols))
 
         # Compute correlation from covariance
         std_devs = np.sqrt(np.diag(cov_matrix))
@@ -286,7 +298,9 @@ class CorrelationAnalyzer:
             lookback_days=lookback_days,
             returns_data=aligned,
             covariance_matrix=cov_matrix,
-            volatilities=volatilities
+            volatilities=volatilities,
+            covariance_method=estimate.method.value,
+            shrinkage=estimate.shrinkage,
         )
 
     def _build_matrix_from_estimates(
@@ -0,0 +1,366 @@
+"""
+Returns Store — Persistent per-symbol daily log returns for correlation / VaR.
+
+Each symbol's history lives in its own NumPy file under the data dir
+(``<data_dir>/returns/<SYMBOL>.npy``, structured rows of day / close / log
+return) and is opened memory-mapped. Refreshing a symbol fetches only the
+days it is missing — the tail since the last stored day, and the head if a
+longer lookback is requested — so adding one ticker to the book costs one
+download for that ticker, not a year of prices for every symbol.
+
+All loaded symbols share one date-aligned panel (days x symbols). Returns
+for any subset are a column slice of that panel, trimmed to the days every
+symbol in the subset has, so CorrelationAnalyzer / VaREngine inputs come
+from memory instead of the network.
+
+Prices come from a provider: YFinanceProvider (default) or
+LocalFileProvider, which reads CSV / Parquet close prices from a directory
+and lets the store work fully offline.
+
+Usage:
+    store = ReturnsStore.default()
+    symbols, returns = store.aligned_returns(['SPY', 'QQQ', 'IWM'], lookback_days=252)
+
+    offline = ReturnsStore('data/returns', provider=LocalFileProvider('data/prices'))
+"""
+
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Protocol, Tuple, Union
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ROW_DTYPE = np.dtype([('day', '<i8'), ('close', '<f8'), ('ret', '<f8')])
+
+# Same floor the yfinance path used: fewer returns than this are not usable
+MIN_HISTORY = 20
+# Calendar days fetched per trading day of lookback (weekends / holidays)
+CALENDAR_FACTOR = 1.5
+
+_EPOCH = date(1970, 1, 1)
+
+
+def _to_day(d: date) -> int:
+    return (d - _EPOCH).days
+
+
+def _from_day(day: int) -> date:
+    return _EPOCH + timedelta(days=int(day))
+
+
+# =============================================================================
+# Price providers
+# =============================================================================
+
+class PriceHistoryProvider(Protocol):
+    """Daily close prices by symbol, both dates inclusive."""
+
+    def get_closes(self, symbols: List[str], start: date, end: date) -> Dict[str, 'pd.Series']:
+        ...
+
+
+def _series_by_symbol(close, symbols: List[str]) -> Dict[str, 'pd.Series']:
+    """Split a yfinance/pandas close frame (or single Series) per symbol."""
+    import pandas as pd
+
+    if isinstance(close, pd.Series):
+        return {symbols[0]: close.dropna()} if len(symbols) == 1 else {}
+    return {s: close[s].dropna() for s in symbols if s in close.columns}
+
+
+class YFinanceProvider:
+    """Close prices from yfinance — one batched download per call."""
+
+    def get_closes(self, symbols: List[str], start: date, end: date) -> Dict[str, 'pd.Series']:
+        try:
+            import yfinance as yf
+        except ImportError:
+            logger.warning("yfinance not installed — cannot fetch historical prices")
+            return {}
+        if not symbols:
+            return {}
+
+        try:
+            data = yf.download(
+                symbols,
+                start=start.strftime('%Y-%m-%d'),
+                # yfinance's end is exclusive
+                end=(end + timedelta(days=1)).strftime('%Y-%m-%d'),
+                progress=False,
+                auto_adjust=True,
+            )
+        except Exception as e:
+            logger.error(f"Error fetching prices from yfinance: {e}")
+            return {}
+
+        if data.empty:
+            logger.warning(f"No data returned from yfinance for {symbols}")
+            return {}
+        return _series_by_symbol(data['Close'], symbols)
+
+
+class LocalFileProvider:
+    """
+    Close prices from files in a directory — ``<SYMBOL>.parquet`` or
+    ``<SYMBOL>.csv`` with a date column (``date`` / ``Date``, or the index)
+    and a ``close`` / ``Close`` / ``adj_close`` column.
+    """
+
+    DATE_COLUMNS = ('date', 'Date', 'datetime', 'timestamp')
+    CLOSE_COLUMNS = ('close', 'Close', 'adj_close', 'Adj Close')
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+
+    def get_closes(self, symbols: List[str], start: date, end: date) -> Dict[str, 'pd.Series']:
+        result = {}
+        for symbol in symbols:
+            series = self._read(symbol)
+            if series is None:
+                continue
+            days = series.index.date
+            result[symbol] = series[(days >= start) & (days <= end)]
+        return result
+
+    def _read(self, symbol: str) -> Optional['pd.Series']:
+        import pandas as pd
+
+        parquet = self.directory / f"{symbol}.parquet"
+        csv = self.directory / f"{symbol}.csv"
+        try:
+            if parquet.exists():
+                frame = pd.read_parquet(parquet)
+            elif csv.exists():
+                frame = pd.read_csv(csv)
+            else:
+                logger.debug(f"No local price file for {symbol} in {self.directory}")
+                return None
+        except Exception as e:
+            logger.warning(f"Could not read local prices for {symbol}: {e}")
+            return None
+
+        date_col = next((c for c in self.DATE_COLUMNS if c in frame.columns), None)
+        if date_col is not None:
+            frame = frame.set_index(date_col)
+        close_col = next((c for c in self.CLOSE_COLUMNS if c in frame.columns), None)
+        if close_col is None:
+            logger.warning(f"Local price file for {symbol} has no close column")
+            return None
+
+        series = frame[close_col].astype(float).dropna()
+        series.index = pd.to_datetime(series.index)
+        return series.sort_index()
+
+
+# =============================================================================
+# Store
+# =============================================================================
+
+class ReturnsStore:
+    """
+    Per-symbol daily log returns on disk, plus one shared aligned panel.
+
+    Not thread-safe; one store per process (CorrelationAnalyzer owns one).
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        provider: Optional[PriceHistoryProvider] = None,
+    ):
+        self.directory = Path(directory)
+        self.provider = provider if provider is not None else YFinanceProvider()
+        # symbol -> (day refreshed, earliest day requested from provider)
+        self._checked: Dict[str, Tuple[date, date]] = {}
+        self._version = 0
+        self._panel_version = -1
+        self._panel_days = np.empty(0, dtype='<i8')
+        self._panel = np.empty((0, 0))
+        self._columns: Dict[str, int] = {}
+
+    @classmethod
+    def default(cls) -> 'ReturnsStore':
+        """Store under ``settings.data_dir/returns`` backed by yfinance."""
+        from trading_cotrader.config.settings import get_settings
+
+        return cls(Path(get_settings().data_dir) / 'returns')
+
+    # -----------------------------------------------------------------
+    # Files
+    # -----------------------------------------------------------------
+
+    def _path(self, symbol: str) -> Path:
+        return self.directory / f"{symbol.upper()}.npy"
+
+    def read(self, symbol: str) -> np.ndarray:
+        """Stored rows for a symbol (memory-mapped, read-only); empty if none."""
+        path = self._path(symbol)
+        if not path.exists():
+            return np.empty(0, dtype=ROW_DTYPE)
+        try:
+            return np.load(path, mmap_mode='r')
+        except Exception as e:
+            logger.warning(f"Corrupt returns file for {symbol} ({e}) — refetching")
+            return np.empty(0, dtype=ROW_DTYPE)
+
+    def _write(self, symbol: str, rows: np.ndarray) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(symbol)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.save(f, rows)
+        os.replace(tmp, path)
+        self._version += 1
+
+    # -----------------------------------------------------------------
+    # Incremental refresh
+    # -----------------------------------------------------------------
+
+    def ensure(self, symbols: Iterable[str], lookback_days: int = 252, today: Optional[date] = None) -> int:
+        """
+        Fetch whatever days each symbol is missing for the lookback window.
+
+        Each symbol is refreshed at most once per day per process. Returns the
+        number of rows appended across all symbols.
+        """
+        today = today or date.today()
+        want_start = today - timedelta(days=int(lookback_days * CALENDAR_FACTOR))
+
+        # Group by fetch start so each distinct window is one provider call
+        requests: Dict[date, List[str]] = {}
+        for symbol in dict.fromkeys(symbols):
+            if not symbol:
+                continue
+            checked = self._checked.get(symbol)
+            if checked and checked[0] >= today and checked[1] <= want_start:
+                continue
+            rows = self.read(symbol)
+            if len(rows) == 0:
+                start = want_start
+            else:
+                first, last = _from_day(rows['day'][0]), _from_day(rows['day'][-1])
+                earliest = checked[1] if checked else first
+                if first > want_start and earliest > want_start:
+                    start = want_start  # head backfill (tail refetch is a few rows)
+                elif last < today and not (checked and checked[0] >= today):
+                    start = last  # overlap one day so the first new return is computable
+                else:
+                    self._checked[symbol] = (today, min(earliest, want_start))
+                    continue
+            requests.setdefault(start, []).append(symbol)
+
+        appended = 0
+        for start, batch in requests.items():
+            closes = self.provider.get_closes(batch, start, today)
+            for symbol in batch:
+                series = closes.get(symbol)
+                if series is not None and len(series):
+                    appended += self._merge(symbol, series)
+                earliest = self._checked.get(symbol, (today, start))[1]
+                self._checked[symbol] = (today, min(earliest, start))
+        if appended:
+            logger.info(f"Returns store: appended {appended} rows for {sum(map(len, requests.values()))} symbols")
+        return appended
+
+    def _merge(self, symbol: str, series) -> int:
+        """Merge fetched closes into the stored rows; only unseen days are added."""
+        import pandas as pd
+
+        days = np.asarray([_to_day(d) for d in pd.to_datetime(series.index).date], dtype='<i8')
+        closes = np.asarray(series.values, dtype=float).ravel()
+        order = np.argsort(days, kind='stable')
+        days, closes = days[order], closes[order]
+        keep = np.concatenate(([True], np.diff(days) > 0)) & (closes > 0)
+        days, closes = days[keep], closes[keep]
+        if len(days) < 2:
+            return 0
+
+        fetched = np.empty(len(days) - 1, dtype=ROW_DTYPE)
+        fetched['day'] = days[1:]
+        fetched['close'] = closes[1:]
+        fetched['ret'] = np.diff(np.log(closes))
+
+        stored = np.array(self.read(symbol))  # copy — the mmap must not outlive the rewrite
+        new = fetched[~np.isin(fetched['day'], stored['day'])]
+        if len(new) == 0:
+            return 0
+        rows = np.concatenate([stored, new])
+        rows = rows[np.argsort(rows['day'], kind='stable')]
+        self._write(symbol, rows)
+        return len(new)
+
+    # -----------------------------------------------------------------
+    # Shared aligned panel
+    # -----------------------------------------------------------------
+
+    def _build_panel(self, symbols: Iterable[str]) -> None:
+        columns = list(self._columns)
+        columns += [s for s in dict.fromkeys(symbols) if s not in self._columns]
+        histories = {s: self.read(s) for s in columns}
+        all_days = [h['day'] for h in histories.values() if len(h)]
+        days = np.unique(np.concatenate(all_days)) if all_days else np.empty(0, dtype='<i8')
+
+        panel = np.full((len(days), len(columns)), np.nan)
+        for j, symbol in enumerate(columns):
+            rows = histories[symbol]
+            if len(rows):
+                panel[np.searchsorted(days, rows['day']), j] = rows['ret']
+
+        self._panel_days = days
+        self._panel = panel
+        self._columns = {s: j for j, s in enumerate(columns)}
+        self._panel_version = self._version
+
+    def panel(self, symbols: Iterable[str] = ()) -> Tuple[np.ndarray, np.ndarray, Dict[str, int]]:
+        """(days, days x symbols log-return matrix with NaN gaps, column index)."""
+        symbols = list(symbols)
+        if self._panel_version != self._version or any(s not in self._columns for s in symbols):
+            self._build_panel(symbols)
+        return self._panel_days, self._panel, self._columns
+
+    def aligned_returns(
+        self,
+        symbols: List[str],
+        lookback_days: int = 252,
+        refresh: bool = True,
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Date-aligned log returns for a subset of symbols.
+
+        Returns (symbols with enough history, last ``lookback_days`` rows on
+        which all of them traded). Symbols with fewer than MIN_HISTORY stored
+        returns are dropped, as the download path did.
+        """
+        valid, _, returns = self.aligned_window(symbols, lookback_days, refresh)
+        return valid, returns
+
+    def aligned_window(
+        self,
+        symbols: List[str],
+        lookback_days: int = 252,
+        refresh: bool = True,
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """aligned_returns() plus the day stamp (days since epoch) of each row."""
+        if refresh:
+            self.ensure(symbols, lookback_days)
+        days, panel, columns = self.panel(symbols)
+
+        valid = []
+        for symbol in dict.fromkeys(symbols):
+            j = columns.get(symbol)
+            if j is None:
+                continue
+            if np.count_nonzero(~np.isnan(panel[:, j])) < MIN_HISTORY:
+                logger.warning(f"Insufficient stored history for {symbol}")
+                continue
+            valid.append(symbol)
+        if not valid:
+            return [], np.empty(0, dtype='<i8'), np.empty((0, 0))
+
+        subset = panel[:, [columns[s] for s in valid]]
+        complete = ~np.isnan(subset).any(axis=1)
+        return valid, days[complete][-lookback_days:], subset[complete][-lookback_days:]
@@ -0,0 +1,439 @@
+"""
+Snapshot Rollup — Downsampling tiers and retention for snapshot history.
+
+Intraday snapshot tables (PositionGreeksSnapshotORM every monitoring cycle,
+PositionPnLSnapshotORM) grow without bound. This service compacts them into
+OHLC buckets in TimeSeriesRollupORM:
+
+    raw  ──► 5m ──► 1h ──► 1d        (each tier built from the one below)
+
+Only complete buckets are rolled up. Each tier resumes from its newest
+bucket, so a run costs the rows written since the previous run. Once a tier
+has been rolled into the next one, rows older than the tier's retention are
+deleted. GreeksHistoryORM / DailyPerformanceORM are already daily and only
+get an (optional) age limit.
+
+History queries call select_tier() / load(): the finest tier that still
+holds the whole requested range within max_points rows. A one-year chart
+reads ~250 daily buckets instead of every intraday snapshot. Tiers are only
+compacted at EOD, so load() bucketizes the raw rows newer than the tier's
+last bucket on the fly — intraday reads always reach the latest snapshot.
+
+Usage:
+    svc = SnapshotRollupService(session)
+    svc.compact()                                  # rollup + retention (EOD)
+    tier, rows = svc.load('position_greeks', position_id, start=datetime.utcnow() - timedelta(days=90))
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+import uuid
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from trading_cotrader.core.database.schema import (
+    DailyPerformanceORM,
+    GreeksHistoryORM,
+    PositionGreeksSnapshotORM,
+    PositionPnLSnapshotORM,
+    TimeSeriesRollupORM,
+)
+from trading_cotrader.repositories.snapshot import SnapshotRepository, snapshot_timestamp
+
+logger = logging.getLogger(__name__)
+
+# (tier, bucket seconds) from finest to coarsest; 'raw' is the source table
+RAW_RESOLUTION_SECONDS = 60
+TIERS: Tuple[Tuple[str, int], ...] = (('5m', 300), ('1h', 3600), ('1d', 86400))
+TIER_SECONDS = dict(TIERS, raw=RAW_RESOLUTION_SECONDS)
+
+# Rows a history chart should need at most
+DEFAULT_MAX_POINTS = 500
+
+
+@dataclass(frozen=True)
+class SeriesSpec:
+    """How a raw snapshot table maps onto rollup columns."""
+    model: type
+    # rollup OHLC prefix -> raw column
+    ohlc: Dict[str, str]
+    # rollup close-only prefix -> raw column
+    closes: Dict[str, str] = field(default_factory=dict)
+    entity_column: str = 'position_id'
+
+
+SERIES: Dict[str, SeriesSpec] = {
+    'position_greeks': SeriesSpec(
+        model=PositionGreeksSnapshotORM,
+        ohlc={'delta': 'delta', 'theta': 'theta'},
+        closes={'gamma': 'gamma', 'vega': 'vega', 'underlying': 'underlying_price'},
+    ),
+    # delta / theta carry the delta / theta P&L attribution for this series
+    'position_pnl': SeriesSpec(
+        model=PositionPnLSnapshotORM,
+        ohlc={'pnl': 'actual_pnl', 'delta': 'delta_pnl', 'theta': 'theta_pnl'},
+    ),
+}
+
+
+@dataclass
+class RetentionPolicy:
+    """Age (days) after which each tier is dropped; None keeps it forever."""
+    raw_days: Optional[int] = 7
+    five_min_days: Optional[int] = 30
+    hourly_days: Optional[int] = 180
+    daily_days: Optional[int] = None
+    greeks_history_days: Optional[int] = None
+    daily_performance_days: Optional[int] = None
+
+    def tier_days(self, tier: str) -> Optional[int]:
+        return {
+            'raw': self.raw_days,
+            '5m': self.five_min_days,
+            '1h': self.hourly_days,
+            '1d': self.daily_days,
+        }[tier]
+
+
+@dataclass
+class CompactionResult:
+    """Rows written / deleted by one compaction run."""
+    rolled: Dict[str, int] = field(default_factory=dict)   # 'series:tier' -> buckets upserted
+    deleted: Dict[str, int] = field(default_factory=dict)  # 'series:tier' / table -> rows
+
+    def to_dict(self) -> Dict:
+        return {'rolled': self.rolled, 'deleted': self.deleted}
+
+
+def _num(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+class _Bucket:
+    """OHLC accumulator for one (entity, bucket) — inputs arrive in time order."""
+
+    __slots__ = ('samples', 'ohlc', 'closes')
+
+    def __init__(self):
+        self.samples = 0
+        self.ohlc: Dict[str, List[Optional[float]]] = {}
+        self.closes: Dict[str, Optional[float]] = {}
+
+    def add(self, samples: int, ohlc: Dict[str, Tuple], closes: Dict[str, Optional[float]]) -> None:
+        self.samples += samples
+        for name, (o, h, l, c) in ohlc.items():
+            if c is None:
+                continue
+            cur = self.ohlc.get(name)
+            if cur is None:
+                self.ohlc[name] = [o, h, l, c]
+            else:
+                cur[1] = max(cur[1], h)
+                cur[2] = min(cur[2], l)
+                cur[3] = c
+        for name, value in closes.items():
+            if value is not None:
+                self.closes[name] = value
+
+
+class SnapshotRollupService:
+    """Compacts snapshot history into tiers and routes history reads."""
+
+    def __init__(self, session: Session, policy: Optional[RetentionPolicy] = None):
+        self.session = session
+        self.policy = policy or RetentionPolicy()
+        self.repo = SnapshotRepository(session)
+
+    # -----------------------------------------------------------------
+    # Compaction
+    # -----------------------------------------------------------------
+
+    def compact(self, now: Optional[datetime] = None) -> CompactionResult:
+        """Roll up every series, then apply retention."""
+        now = now or datetime.utcnow()
+        result = CompactionResult()
+        for series in SERIES:
+            for tier, _ in TIERS:
+                result.rolled[f"{series}:{tier}"] = self.rollup(series, tier, now)
+        result.deleted = self.apply_retention(now)
+        self.session.flush()
+        logger.info(
+            f"Snapshot compaction: {sum(result.rolled.values())} buckets rolled, "
+            f"{sum(result.deleted.values())} rows deleted"
+        )
+        return result
+
+    def rollup(self, series: str, tier: str, now: Optional[datetime] = None) -> int:
+        """Upsert complete `tier` buckets from the tier below. Returns buckets written."""
+        now = now or datetime.utcnow()
+        seconds = TIER_SECONDS[tier]
+        cutoff = snapshot_timestamp(now, seconds)
+        # Re-aggregate the newest bucket in case its source rows arrived late
+        since = self._newest_bucket(series, tier)
+
+        buckets: Dict[Tuple[str, datetime], _Bucket] = {}
+        for entity, ts, samples, ohlc, closes in self._source_rows(series, tier, since, cutoff):
+            key = (entity, snapshot_timestamp(ts, seconds))
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = _Bucket()
+            bucket.add(samples, ohlc, closes)
+
+        if not buckets:
+            return 0
+        spec = SERIES[series]
+        now_ts = datetime.utcnow()
+        rows = []
+        for (entity, start), bucket in buckets.items():
+            row = {
+                'id': str(uuid.uuid4()),
+                'series': series,
+                'entity_id': entity,
+                'tier': tier,
+                'bucket_start': start,
+                'samples': bucket.samples,
+                'created_at': now_ts,
+            }
+            for name in spec.ohlc:
+                o, h, l, c = bucket.ohlc.get(name, (None, None, None, None))
+                row.update({f"{name}_open": o, f"{name}_high": h, f"{name}_low": l, f"{name}_close": c})
+            for name in spec.closes:
+                row[f"{name}_close"] = bucket.closes.get(name)
+            rows.append(row)
+        return self.repo.upsert_rows(
+            TimeSeriesRollupORM, rows, ('series', 'entity_id', 'tier', 'bucket_start'),
+        )
+
+    def _newest_bucket(self, series: str, tier: str) -> Optional[datetime]:
+        return self.session.query(func.max(TimeSeriesRollupORM.bucket_start)).filter(
+            TimeSeriesRollupORM.series == series,
+            TimeSeriesRollupORM.tier == tier,
+        ).scalar()
+
+    def _source_rows(
+        self, series: str, tier: str, since: Optional[datetime], cutoff: datetime,
+    ) -> Iterable[Tuple[str, datetime, int, Dict[str, Tuple], Dict[str, Optional[float]]]]:
+        """(entity, timestamp, samples, {name: (o, h, l, c)}, {name: close}) in time order."""
+        spec = SERIES[series]
+        below = self._tier_below(tier)
+
+        if below == 'raw':
+            yield from self._raw_rows(series, since, before=cutoff)
+            return
+
+        r = TimeSeriesRollupORM
+        q = self.session.query(r).filter(
+            r.series == series, r.tier == below, r.bucket_start < cutoff,
+        )
+        if since is not None:
+            q = q.filter(r.bucket_start >= since)
+        for row in q.order_by(r.bucket_start).yield_per(5000):
+            ohlc = {
+                name: tuple(_num(getattr(row, f"{name}_{part}")) for part in ('open', 'high', 'low', 'close'))
+                for name in spec.ohlc
+            }
+            closes = {name: _num(getattr(row, f"{name}_close")) for name in spec.closes}
+            yield row.entity_id, row.bucket_start, row.samples or 0, ohlc, closes
+
+    def _raw_rows(
+        self,
+        series: str,
+        since: Optional[datetime],
+        before: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        entity_id: Optional[str] = None,
+    ) -> Iterable[Tuple[str, datetime, int, Dict[str, Tuple], Dict[str, Optional[float]]]]:
+        """Raw snapshots in _source_rows() shape; `before` is exclusive, `until` inclusive."""
+        spec = SERIES[series]
+        model = spec.model
+        entity_col = getattr(model, spec.entity_column)
+        columns = [entity_col, model.timestamp]
+        columns += [getattr(model, c) for c in spec.ohlc.values()]
+        columns += [getattr(model, c) for c in spec.closes.values()]
+        q = self.session.query(*columns)
+        if entity_id is not None:
+            q = q.filter(entity_col == entity_id)
+        if since is not None:
+            q = q.filter(model.timestamp >= since)
+        if before is not None:
+            q = q.filter(model.timestamp < before)
+        if until is not None:
+            q = q.filter(model.timestamp <= until)
+        n_ohlc = len(spec.ohlc)
+        for row in q.order_by(model.timestamp).yield_per(5000):
+            values = [_num(v) for v in row[2:]]
+            ohlc = {name: (v, v, v, v) for name, v in zip(spec.ohlc, values[:n_ohlc])}
+            closes = dict(zip(spec.closes, values[n_ohlc:]))
+            yield row[0], row[1], 1, ohlc, closes
+
+    @staticmethod
+    def _tier_below(tier: str) -> str:
+        names = [t for t, _ in TIERS]
+        i = names.index(tier)
+        return 'raw' if i == 0 else names[i - 1]
+
+    # -----------------------------------------------------------------
+    # Retention
+    # -----------------------------------------------------------------
+
+    def apply_retention(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Delete rows past their tier's age, but only once rolled into the next tier."""
+        now = now or datetime.utcnow()
+        deleted: Dict[str, int] = {}
+        tier_names = ['raw'] + [t for t, _ in TIERS]
+
+        for series, spec in SERIES.items():
+            for i, tier in enumerate(tier_names):
+                days = self.policy.tier_days(tier)
+                if days is None:
+                    continue
+                cutoff = now - timedelta(days=days)
+                if i + 1 < len(tier_names):
+                    # Never drop what the next tier has not absorbed yet
+                    rolled_to = self._newest_bucket(series, tier_names[i + 1])
+                    if rolled_to is None:
+                        continue
+                    cutoff = min(cutoff, rolled_to)
+                if tier == 'raw':
+                    q = self.session.query(spec.model).filter(spec.model.timestamp < cutoff)
+                else:
+                    q = self.session.query(TimeSeriesRollupORM).filter(
+                        TimeSeriesRollupORM.series == series,
+                        TimeSeriesRollupORM.tier == tier,
+                        TimeSeriesRollupORM.bucket_start < cutoff,
+                    )
+                count = q.delete(synchronize_session=False)
+                if count:
+                    deleted[f"{series}:{tier}"] = count
+
+        for model, column, days in (
+            (GreeksHistoryORM, GreeksHistoryORM.timestamp, self.policy.greeks_history_days),
+            (DailyPerformanceORM, DailyPerformanceORM.date, self.policy.daily_performance_days),
+        ):
+            if days is None:
+                continue
+            count = self.session.query(model).filter(
+                column < now - timedelta(days=days)
+            ).delete(synchronize_session=False)
+            if count:
+                deleted[model.__tablename__] = count
+        return deleted
+
+    # -----------------------------------------------------------------
+    # Query routing
+    # -----------------------------------------------------------------
+
+    def select_tier(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        max_points: int = DEFAULT_MAX_POINTS,
+        now: Optional[datetime] = None,
+    ) -> str:
+        """
+        Finest tier that still retains `start` and needs at most max_points
+        buckets per entity for [start, end]; '1d' otherwise.
+        """
+        now = now or datetime.utcnow()
+        end = end or now
+        span = max((end - start).total_seconds(), 0)
+        age_days = (now - start).total_seconds() / 86400
+        for tier in ['raw'] + [t for t, _ in TIERS]:
+            days = self.policy.tier_days(tier)
+            if days is not None and age_days > days:
+                continue
+            if span / TIER_SECONDS[tier] <= max_points:
+                return tier
+        return TIERS[-1][0]
+
+    def load(
+        self,
+        series: str,
+        entity_id: str,
+        start: datetime,
+        end: Optional[datetime] = None,
+        tier: Optional[str] = None,
+        max_points: int = DEFAULT_MAX_POINTS,
+    ) -> Tuple[str, List[Dict]]:
+        """
+        History rows for one entity from the routed (or given) tier.
+
+        Every row has timestamp, tier, samples, and per tracked value the
+        close (``delta``) plus ``delta_open/high/low``. Raw rows have
+        open = high = low = close. Rollup reads end with the raw rows newer
+        than the tier's last compacted bucket, bucketed at the tier's width
+        (the newest bucket may be partial).
+        """
+        spec = SERIES[series]
+        tier = tier or self.select_tier(start, end, max_points)
+
+        out: List[Dict] = []
+        if tier == 'raw':
+            model = spec.model
+            q = self.session.query(model).filter(
+                getattr(model, spec.entity_column) == entity_id, model.timestamp >= start,
+            )
+            if end is not None:
+                q = q.filter(model.timestamp <= end)
+            for row in q.order_by(model.timestamp):
+                item = {'timestamp': row.timestamp, 'tier': 'raw', 'samples': 1}
+                for name, column in spec.ohlc.items():
+                    v = _num(getattr(row, column))
+                    item.update({name: v, f"{name}_open": v, f"{name}_high": v, f"{name}_low": v})
+                for name, column in spec.closes.items():
+                    item[name] = _num(getattr(row, column))
+                out.append(item)
+            return tier, out
+
+        r = TimeSeriesRollupORM
+        q = self.session.query(r).filter(
+            r.series == series, r.entity_id == entity_id, r.tier == tier, r.bucket_start >= start,
+        )
+        if end is not None:
+            q = q.filter(r.bucket_start <= end)
+        for row in q.order_by(r.bucket_start):
+            item = {'timestamp': row.bucket_start, 'tier': tier, 'samples': row.samples}
+            for name in spec.ohlc:
+                item[name] = _num(getattr(row, f"{name}_close"))
+                for part in ('open', 'high', 'low'):
+                    item[f"{name}_{part}"] = _num(getattr(row, f"{name}_{part}"))
+            for name in spec.closes:
+                item[name] = _num(getattr(row, f"{name}_close"))
+            out.append(item)
+
+        out.extend(self._live_tail(series, entity_id, tier, start, end))
+        return tier, out
+
+    def _live_tail(
+        self, series: str, entity_id: str, tier: str, start: datetime, end: Optional[datetime],
+    ) -> List[Dict]:
+        """Raw rows past the tier's newest bucket, aggregated into tier-width buckets."""
+        seconds = TIER_SECONDS[tier]
+        newest = self._newest_bucket(series, tier)
+        since = start if newest is None else max(start, newest + timedelta(seconds=seconds))
+        if end is not None and since > end:
+            return []
+
+        spec = SERIES[series]
+        buckets: Dict[datetime, _Bucket] = {}
+        for _, ts, samples, ohlc, closes in self._raw_rows(series, since, until=end, entity_id=entity_id):
+            bucket_start = snapshot_timestamp(ts, seconds)
+            bucket = buckets.get(bucket_start)
+            if bucket is None:
+                bucket = buckets[bucket_start] = _Bucket()
+            bucket.add(samples, ohlc, closes)
+
+        out = []
+        for bucket_start in sorted(buckets):
+            bucket = buckets[bucket_start]
+            item = {'timestamp': bucket_start, 'tier': tier, 'samples': bucket.samples}
+            for name in spec.ohlc:
+                o, h, l, c = bucket.ohlc.get(name, (None, None, None, None))
+                item.update({name: c, f"{name}_open": o, f"{name}_high": h, f"{name}_low": l})
+            for name in spec.closes:
+                item[name] = bucket.closes.get(name)
+            out.append(item)
+        return out
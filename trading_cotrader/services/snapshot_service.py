@@ -3,26 +3,33 @@ Snapshot Service - Capture portfolio state over time
 
 This is the foundation for all analytics and ML:
 - Daily portfolio snapshots
-- Position Greeks history
+- Position Greeks history (daily + intraday per monitoring cycle)
 - Enables time-series analysis and pattern detection
+
+All snapshot rows are built in memory and written through
+SnapshotRepository — one multi-row INSERT ... ON CONFLICT per table
+instead of a probe + add per position.
 """
 
 from trading_cotrader.config.settings import setup_logging
 from trading_cotrader.core.database.session import session_scope
 from trading_cotrader.repositories.portfolio import PortfolioRepository
 from trading_cotrader.repositories.position import PositionRepository
+from trading_cotrader.repositories.snapshot import SnapshotRepository, snapshot_timestamp
 
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime, date
 from decimal import Decimal
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from trading_cotrader.core.database.schema import (
     DailyPerformanceORM,
     GreeksHistoryORM,
     PortfolioORM,
     PositionORM,
+    TradeORM,
 )
 import trading_cotrader.core.models.domain as dm
 
@@ -41,6 +48,7 @@ class SnapshotService:
     
     def __init__(self, session: Session):
         self.session = session
+        self.repo = SnapshotRepository(session)
     
     def capture_daily_snapshot(
         self,
@@ -182,53 +190,25 @@ class SnapshotService:
         - P&L attribution by Greek
         - Identifying when Greeks changed significantly
         """
-        captured = 0
-        
+        now = datetime.utcnow()
+        rows = []
         for position in positions:
-            try:
-                if not position.greeks:
-                    continue
-                
-                # Check if already captured today
-                existing = self.session.query(GreeksHistoryORM).filter_by(
-                    position_id=position.id,
-                    timestamp=snapshot_date
-                ).first()
-                
-                if existing:
-                    # Update existing
-                    existing.delta = position.greeks.delta
-                    existing.gamma = position.greeks.gamma
-                    existing.theta = position.greeks.theta
-                    existing.vega = position.greeks.vega
-                    existing.rho = position.greeks.rho
-                    existing.underlying_price = position.current_price
-                    captured += 1
-                    continue
-                
-                # Create new history entry
-                history = GreeksHistoryORM(
-                    id=str(dm.uuid.uuid4()),
-                    position_id=position.id,
-                    timestamp=snapshot_date,
-                    delta=position.greeks.delta,
-                    gamma=position.greeks.gamma,
-                    theta=position.greeks.theta,
-                    vega=position.greeks.vega,
-                    rho=position.greeks.rho,
-                    underlying_price=position.current_price,
-                    created_at=datetime.utcnow()
-                )
-                
-                self.session.add(history)
-                captured += 1
-                
-            except Exception as e:
-                logger.warning(f"Failed to capture Greeks for position {position.id}: {e}")
+            if not position.greeks:
                 continue
-        
-        self.session.flush()
-        return captured
+            rows.append({
+                'id': str(dm.uuid.uuid4()),
+                'position_id': position.id,
+                'timestamp': snapshot_date,
+                'delta': position.greeks.delta,
+                'gamma': position.greeks.gamma,
+                'theta': position.greeks.theta,
+                'vega': position.greeks.vega,
+                'rho': position.greeks.rho,
+                'underlying_price': position.current_price,
+                'created_at': now,
+            })
+
+        return self.repo.upsert_greeks_history(rows)
     
     def capture_all_portfolio_snapshots(self) -> Dict[str, bool]:
         """
@@ -236,6 +216,8 @@ class SnapshotService:
 
         Called by the workflow engine in REPORTING state and during monitoring.
         Works directly with ORM objects — no domain conversion needed.
+        Positions and open-trade counts are loaded once for all portfolios,
+        and each snapshot table is written with a single bulk upsert.
 
         Returns:
             Dict mapping portfolio name → success bool
@@ -244,150 +226,153 @@ class SnapshotService:
         snapshot_date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
 
         try:
-            # Get all non-deprecated portfolios
-            portfolios = self.session.query(PortfolioORM).filter(
-                ~PortfolioORM.tags.contains('"deprecated"')
-            ).all()
-
-            # SQLite JSON contains workaround — filter in Python
-            active_portfolios = []
-            for p in portfolios:
-                tags = p.tags or []
-                if 'deprecated' not in tags:
-                    active_portfolios.append(p)
-
+            active_portfolios = self._active_portfolios()
             logger.info(f"Capturing snapshots for {len(active_portfolios)} portfolios")
 
+            ids = [p.id for p in active_portfolios]
+            positions_by_portfolio: Dict[str, List[PositionORM]] = {pid: [] for pid in ids}
+            if ids:
+                for pos in self.session.query(PositionORM).filter(PositionORM.portfolio_id.in_(ids)):
+                    positions_by_portfolio[pos.portfolio_id].append(pos)
+            open_trades = dict(
+                self.session.query(TradeORM.portfolio_id, func.count(TradeORM.id))
+                .filter(TradeORM.portfolio_id.in_(ids), TradeORM.is_open == True)
+                .group_by(TradeORM.portfolio_id)
+            ) if ids else {}
+
+            now = datetime.utcnow()
+            daily_rows, greeks_rows = [], []
             for portfolio_orm in active_portfolios:
                 try:
-                    success = self._capture_portfolio_snapshot_from_orm(
-                        portfolio_orm, snapshot_date
+                    positions = positions_by_portfolio[portfolio_orm.id]
+                    daily_rows.append(self._daily_performance_row(
+                        portfolio_orm, snapshot_date, len(positions),
+                        open_trades.get(portfolio_orm.id, 0), now,
+                    ))
+                    greeks_rows.extend(
+                        self._position_greeks_row(pos, snapshot_date, now)
+                        for pos in positions if self._has_greeks(pos)
                     )
-                    results[portfolio_orm.name] = success
-                    if success:
-                        logger.info(f"  Snapshot: {portfolio_orm.name} — OK")
-                    else:
-                        logger.warning(f"  Snapshot: {portfolio_orm.name} — FAILED")
+                    results[portfolio_orm.name] = True
                 except Exception as e:
                     logger.error(f"  Snapshot error for {portfolio_orm.name}: {e}")
                     results[portfolio_orm.name] = False
 
+            self.repo.upsert_daily_performance(daily_rows)
+            self.repo.upsert_greeks_history(greeks_rows)
             self.session.commit()
+            for name, success in results.items():
+                logger.info(f"  Snapshot: {name} — {'OK' if success else 'FAILED'}")
             logger.info(
-                f"Snapshots captured: {sum(results.values())}/{len(results)} portfolios"
+                f"Snapshots captured: {sum(results.values())}/{len(results)} portfolios "
+                f"({len(greeks_rows)} position Greeks rows)"
             )
 
         except Exception as e:
             self.session.rollback()
             logger.error(f"Failed to capture portfolio snapshots: {e}")
+            results = {name: False for name in results}
 
         return results
 
-    def _capture_portfolio_snapshot_from_orm(
-        self, portfolio_orm: PortfolioORM, snapshot_date: datetime
-    ) -> bool:
-        """Capture a single portfolio snapshot directly from ORM data."""
-        from trading_cotrader.core.database.schema import TradeORM
-
-        portfolio_id = portfolio_orm.id
-        equity = portfolio_orm.total_equity or Decimal('0')
-        cash = portfolio_orm.cash_balance or Decimal('0')
-        daily_pnl = portfolio_orm.daily_pnl or Decimal('0')
-        realized = portfolio_orm.realized_pnl or Decimal('0')
-        unrealized = portfolio_orm.unrealized_pnl or Decimal('0')
-
-        # Position count
-        positions = portfolio_orm.positions or []
-        num_positions = len(positions)
-
-        # Open trade count
-        open_trades = self.session.query(TradeORM).filter(
-            TradeORM.portfolio_id == portfolio_id,
-            TradeORM.is_open == True,
-        ).count()
-
-        # Upsert daily snapshot
-        existing = self.session.query(DailyPerformanceORM).filter_by(
-            portfolio_id=portfolio_id,
-            date=snapshot_date,
-        ).first()
-
-        if existing:
-            existing.total_equity = equity
-            existing.cash_balance = cash
-            existing.daily_pnl = daily_pnl
-            existing.realized_pnl = realized
-            existing.unrealized_pnl = unrealized
-            existing.num_positions = num_positions
-            existing.num_trades = open_trades
-            existing.portfolio_delta = portfolio_orm.portfolio_delta
-            existing.portfolio_gamma = portfolio_orm.portfolio_gamma
-            existing.portfolio_theta = portfolio_orm.portfolio_theta
-            existing.portfolio_vega = portfolio_orm.portfolio_vega
-            existing.var_1d_95 = portfolio_orm.var_1d_95
-            existing.var_1d_99 = portfolio_orm.var_1d_99
-        else:
-            snapshot = DailyPerformanceORM(
-                id=str(dm.uuid.uuid4()),
-                portfolio_id=portfolio_id,
-                date=snapshot_date,
-                total_equity=equity,
-                cash_balance=cash,
-                daily_pnl=daily_pnl,
-                realized_pnl=realized,
-                unrealized_pnl=unrealized,
-                num_positions=num_positions,
-                num_trades=open_trades,
-                portfolio_delta=portfolio_orm.portfolio_delta,
-                portfolio_gamma=portfolio_orm.portfolio_gamma,
-                portfolio_theta=portfolio_orm.portfolio_theta,
-                portfolio_vega=portfolio_orm.portfolio_vega,
-                var_1d_95=portfolio_orm.var_1d_95,
-                var_1d_99=portfolio_orm.var_1d_99,
-                created_at=datetime.utcnow(),
-            )
-            self.session.add(snapshot)
-
-        # Capture Greeks history for each position
-        for pos_orm in positions:
-            self._capture_position_greeks_from_orm(pos_orm, snapshot_date)
-
-        self.session.flush()
-        return True
-
-    def _capture_position_greeks_from_orm(
-        self, pos_orm: PositionORM, snapshot_date: datetime
-    ) -> None:
-        """Capture Greeks history for a single position from ORM."""
-        if not pos_orm.delta and not pos_orm.theta:
-            return  # No Greeks data
+    def capture_intraday_greeks(
+        self,
+        at: Optional[datetime] = None,
+        resolution_seconds: int = 60,
+    ) -> int:
+        """
+        Capture position Greeks for every active portfolio at cycle time.
 
-        existing = self.session.query(GreeksHistoryORM).filter_by(
-            position_id=pos_orm.id,
-            timestamp=snapshot_date,
-        ).first()
+        Writes PositionGreeksSnapshotORM rows (the intraday series) with one
+        bulk upsert. The timestamp is truncated to resolution_seconds, so a
+        re-run within the same bucket overwrites instead of adding rows.
 
-        if existing:
-            existing.delta = pos_orm.delta
-            existing.gamma = pos_orm.gamma
-            existing.theta = pos_orm.theta
-            existing.vega = pos_orm.vega
-            existing.rho = pos_orm.rho
-            existing.underlying_price = pos_orm.current_underlying_price
-        else:
-            history = GreeksHistoryORM(
-                id=str(dm.uuid.uuid4()),
-                position_id=pos_orm.id,
-                timestamp=snapshot_date,
-                delta=pos_orm.delta,
-                gamma=pos_orm.gamma,
-                theta=pos_orm.theta,
-                vega=pos_orm.vega,
-                rho=pos_orm.rho,
-                underlying_price=pos_orm.current_underlying_price,
-                created_at=datetime.utcnow(),
-            )
-            self.session.add(history)
+        Returns:
+            Number of position rows written
+        """
+        timestamp = snapshot_timestamp(at, resolution_seconds)
+        ids = [p.id for p in self._active_portfolios()]
+        if not ids:
+            return 0
+
+        rows = []
+        for pos in self.session.query(PositionORM).filter(PositionORM.portfolio_id.in_(ids)):
+            if not self._has_greeks(pos):
+                continue
+            rows.append({
+                'id': str(dm.uuid.uuid4()),
+                'position_id': pos.id,
+                'timestamp': timestamp,
+                'delta': pos.delta,
+                'gamma': pos.gamma,
+                'theta': pos.theta,
+                'vega': pos.vega,
+                'rho': pos.rho,
+                'underlying_price': pos.current_underlying_price,
+                'option_price': pos.current_price,
+                'implied_volatility': pos.current_iv,
+            })
+        written = self.repo.upsert_position_greeks(rows)
+        logger.debug(f"Intraday Greeks snapshot at {timestamp:%H:%M}: {written} positions")
+        return written
+
+    # -----------------------------------------------------------------
+    # Row builders
+    # -----------------------------------------------------------------
+
+    def _active_portfolios(self) -> List[PortfolioORM]:
+        """Non-deprecated portfolios (JSON tag filter done in Python for SQLite)."""
+        portfolios = self.session.query(PortfolioORM).filter(
+            ~PortfolioORM.tags.contains('"deprecated"')
+        ).all()
+        return [p for p in portfolios if 'deprecated' not in (p.tags or [])]
+
+    @staticmethod
+    def _has_greeks(pos_orm: PositionORM) -> bool:
+        return bool(pos_orm.delta or pos_orm.theta)
+
+    @staticmethod
+    def _daily_performance_row(
+        portfolio_orm: PortfolioORM,
+        snapshot_date: datetime,
+        num_positions: int,
+        open_trades: int,
+        now: datetime,
+    ) -> dict:
+        return {
+            'id': str(dm.uuid.uuid4()),
+            'portfolio_id': portfolio_orm.id,
+            'date': snapshot_date,
+            'total_equity': portfolio_orm.total_equity or Decimal('0'),
+            'cash_balance': portfolio_orm.cash_balance or Decimal('0'),
+            'daily_pnl': portfolio_orm.daily_pnl or Decimal('0'),
+            'realized_pnl': portfolio_orm.realized_pnl or Decimal('0'),
+            'unrealized_pnl': portfolio_orm.unrealized_pnl or Decimal('0'),
+            'num_positions': num_positions,
+            'num_trades': open_trades,
+            'portfolio_delta': portfolio_orm.portfolio_delta,
+            'portfolio_gamma': portfolio_orm.portfolio_gamma,
+            'portfolio_theta': portfolio_orm.portfolio_theta,
+            'portfolio_vega': portfolio_orm.portfolio_vega,
+            'var_1d_95': portfolio_orm.var_1d_95,
+            'var_1d_99': portfolio_orm.var_1d_99,
+            'created_at': now,
+        }
+
+    @staticmethod
+    def _position_greeks_row(pos_orm: PositionORM, snapshot_date: datetime, now: datetime) -> dict:
+        return {
+            'id': str(dm.uuid.uuid4()),
+            'position_id': pos_orm.id,
+            'timestamp': snapshot_date,
+            'delta': pos_orm.delta,
+            'gamma': pos_orm.gamma,
+            'theta': pos_orm.theta,
+            'vega': pos_orm.vega,
+            'rho': pos_orm.rho,
+            'underlying_price': pos_orm.current_underlying_price,
+            'created_at': now,
+        }
 
     def get_portfolio_history(
         self,
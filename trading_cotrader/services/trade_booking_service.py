@@ -18,11 +18,11 @@ from datetime import datetime, date
 from decimal import Decimal
 from typing import List, Dict, Any, Optional, Tuple
 import logging
-import re
 import uuid
 
 import trading_cotrader.core.models.domain as dm
 import trading_cotrader.core.models.events as ev
+from trading_cotrader.core.models.option_key import OptionKey
 from trading_cotrader.core.database.session import session_scope
 from trading_cotrader.repositories.trade import TradeRepository
 from trading_cotrader.repositories.event import EventRepository
@@ -30,11 +30,6 @@ from trading_cotrader.repositories.portfolio import PortfolioRepository
 
 logger = logging.getLogger(__name__)
 
-# Regex to parse option streamer symbols: .TICKER YYMMDD P/C STRIKE
-_OPTION_SYMBOL_RE = re.compile(
-    r'^\.([A-Z]+)(\d{6})([PC])(\d+)$'
-)
-
 from trading_cotrader.core.models.strategy_templates import get_strategy_type_from_string
 
 
@@ -193,7 +188,7 @@ class TradeBookingService:
 
             # Step 5: Update containers
             if self.container_manager:
-                self._refresh_containers()
+                self._refresh_containers(trade.id)
 
             # Step 6-7: Snapshot + ML
             self._update_snapshot_and_ml(trade)
@@ -253,9 +248,7 @@ class TradeBookingService:
         # Fetch option Greeks via DXLink
         if option_symbols:
             logger.info(f"Fetching Greeks for {len(option_symbols)} options: {option_symbols}")
-            greeks_map = self.broker._run_async(
-                self.broker._fetch_greeks_via_dxlink(option_symbols)
-            )
+            greeks_map = self.broker.get_greeks(option_symbols)
             logger.info(f"Got Greeks for {len(greeks_map)}/{len(option_symbols)} symbols")
 
             # Fetch quotes for bid/ask
@@ -285,23 +278,7 @@ class TradeBookingService:
         Equity: "SPY" → Symbol(SPY, EQUITY)
         """
         if symbol.startswith('.'):
-            match = _OPTION_SYMBOL_RE.match(symbol)
-            if not match:
-                raise ValueError(f"Invalid option streamer symbol: {symbol}")
-
-            ticker, exp_str, opt_type_char, strike_str = match.groups()
-            exp_date = datetime.strptime(exp_str, '%y%m%d').date()
-            option_type = dm.OptionType.CALL if opt_type_char == 'C' else dm.OptionType.PUT
-            strike = Decimal(strike_str)
-
-            return dm.Symbol(
-                ticker=ticker,
-                asset_type=dm.AssetType.OPTION,
-                option_type=option_type,
-                strike=strike,
-                expiration=exp_date,
-                multiplier=100,
-            )
+            return OptionKey.from_streamer(symbol).to_symbol()
         else:
             return dm.Symbol(
                 ticker=symbol,
@@ -554,11 +531,13 @@ class TradeBookingService:
             event_repo.create_from_domain(event)
             logger.info(f"Saved event to DB: {event.event_id}")
 
-    def _refresh_containers(self) -> None:
-        """Refresh containers from database for UI updates."""
+    def _refresh_containers(self, trade_id: str) -> None:
+        """Push the newly booked trade into the containers for UI updates."""
         try:
+            from trading_cotrader.containers.container_manager import ContainerDelta
+            delta = ContainerDelta(source='trade_booking', trades={trade_id})
             with session_scope() as session:
-                self.container_manager.load_from_repositories(session)
+                self.container_manager.sync(session, delta)
             logger.info("Containers refreshed")
         except Exception as e:
             logger.warning(f"Container refresh failed: {e}")
@@ -71,14 +71,16 @@ class OvernightAction:
 class TradeHealthService:
     """Orchestrates health checks + adjustment recommendations for all positions."""
 
-    def __init__(self, ma, broker=None):
+    def __init__(self, ma, broker=None, expiry_index=None):
         """
         Args:
             ma: MarketAnalyzer instance (required for regime + technicals).
             broker: Optional broker for position data.
+            expiry_index: ExpiryIndex from ContainerManager for DTE lookups.
         """
         self.ma = ma
         self.broker = broker
+        self.expiry_index = expiry_index
 
     def check_all_positions(self, trade_type: str = None) -> HealthCheckResult:
         """Run health check + adjustment recommendation for all open trades.
@@ -393,7 +395,9 @@ class TradeHealthService:
         return results
 
     def _compute_dte(self, trade: TradeORM) -> Optional[int]:
-        """Compute days to earliest leg expiration."""
+        """Compute days to earliest leg expiration (indexed trades skip the leg walk)."""
+        if self.expiry_index is not None and trade.id in self.expiry_index:
+            return self.expiry_index.dte(trade.id)
         today = date.today()
         dtes = []
         for leg in trade.legs:
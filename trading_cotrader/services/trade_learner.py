@@ -9,23 +9,35 @@ Implements a simple but effective reinforcement learning loop:
 Uses a Q-table approach (tabular RL) for interpretability and small state space.
 Patterns are stored in the RecognizedPatternORM table for persistence across sessions.
 
+Learning is incremental by default: a persisted high-water mark
+(closed_at, trade id) in MLStateORM means each call folds in only trades
+closed since the last call, and patterns keep streaming mean/variance
+accumulators so Sharpe stays exact without rescanning history.
+learn_from_history(full_rebuild=True) discards state and rescans the window.
+
 Called by:
   - After every trade close (incremental learning)
   - Daily batch learning (nightly)
-  - CLI 'learn' command (on-demand analysis)
+  - CLI 'learn' command (on-demand analysis, full rebuild)
 """
 
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import json
 import logging
 import math
+import uuid
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import selectinload
 
 from trading_cotrader.core.database.session import session_scope
-from trading_cotrader.core.database.schema import TradeORM, TradeEventORM
+from trading_cotrader.core.database.schema import (
+    LegORM, MLStateORM, TradeEventORM, TradeORM,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +57,7 @@ class TradePattern:
     avg_days_held: float = 0.0
     sharpe: float = 0.0       # Risk-adjusted score
     confidence: float = 0.0   # 0-1, increases with more trades
+    pnl_m2: float = 0.0       # Welford sum of squared deviations from avg_pnl
 
     def update(self, pnl: float, is_win: bool, days_held: int):
         """Update pattern stats with a new trade outcome."""
@@ -54,13 +67,56 @@ class TradePattern:
         else:
             self.losses += 1
         self.total_pnl += pnl
-        self.avg_pnl = self.total_pnl / self.trades
+        # Welford: avg_pnl is the running mean, pnl_m2 the running M2
+        delta = pnl - self.avg_pnl
+        self.avg_pnl += delta / self.trades
+        self.pnl_m2 += delta * (pnl - self.avg_pnl)
         self.win_rate = self.wins / self.trades if self.trades > 0 else 0
         # Running average of days held
         self.avg_days_held = ((self.avg_days_held * (self.trades - 1)) + days_held) / self.trades
         # Confidence increases with sample size (asymptotic to 1.0)
         self.confidence = 1 - (1 / (1 + self.trades * 0.2))
 
+    @property
+    def pnl_std(self) -> float:
+        """Sample standard deviation of per-trade P&L."""
+        if self.trades < 2:
+            return 0.0
+        return math.sqrt(max(self.pnl_m2, 0.0) / (self.trades - 1))
+
+    def to_state(self) -> Dict[str, Any]:
+        """Accumulator state for persistence (everything needed to keep folding)."""
+        return {
+            'strategy_type': self.strategy_type,
+            'conditions': self.conditions,
+            'trades': self.trades,
+            'wins': self.wins,
+            'losses': self.losses,
+            'total_pnl': self.total_pnl,
+            'avg_pnl': self.avg_pnl,
+            'pnl_m2': self.pnl_m2,
+            'avg_days_held': self.avg_days_held,
+        }
+
+    @classmethod
+    def from_state(cls, pattern_key: str, state: Dict[str, Any]) -> 'TradePattern':
+        trades = int(state.get('trades', 0))
+        wins = int(state.get('wins', 0))
+        return cls(
+            pattern_key=pattern_key,
+            strategy_type=state.get('strategy_type', 'unknown'),
+            conditions=state.get('conditions') or {},
+            trades=trades,
+            wins=wins,
+            losses=int(state.get('losses', 0)),
+            total_pnl=float(state.get('total_pnl', 0.0)),
+            avg_pnl=float(state.get('avg_pnl', 0.0)),
+            pnl_m2=float(state.get('pnl_m2', 0.0)),
+            avg_days_held=float(state.get('avg_days_held', 0.0)),
+            win_rate=wins / trades if trades else 0.0,
+            confidence=1 - (1 / (1 + trades * 0.2)) if trades else 0.0,
+        )
+
 
 @dataclass
 class LearningResult:
@@ -68,6 +124,8 @@ class LearningResult:
     trades_analyzed: int = 0
     patterns_updated: int = 0
     patterns_discovered: int = 0
+    full_rebuild: bool = False
+    watermark: Optional[Dict[str, str]] = None   # {'closed_at', 'trade_id'} after this run
     best_patterns: List[TradePattern] = field(default_factory=list)
     worst_patterns: List[TradePattern] = field(default_factory=list)
     insights: List[str] = field(default_factory=list)
@@ -82,58 +140,92 @@ class TradeLearner:
 
     Usage:
         learner = TradeLearner()
-        result = learner.learn_from_history(days=30)
+        result = learner.learn_from_history(days=30)                   # incremental
+        result = learner.learn_from_history(days=90, full_rebuild=True)
         score = learner.score_trade(strategy_type, regime, iv_rank, dte)
     """
 
+    STATE_TYPE = 'trade_learner'
+
     def __init__(self):
         self._patterns: Dict[str, TradePattern] = {}
         self._loaded = False
 
-    def learn_from_history(self, days: int = 90, portfolio_type: str = 'what_if') -> LearningResult:
+    def learn_from_history(self, days: int = 90, portfolio_type: str = 'what_if',
+                           full_rebuild: bool = False) -> LearningResult:
         """
-        Analyze closed trades and build/update patterns.
+        Fold closed trades into patterns.
+
+        Incremental (default): loads pattern accumulators and the high-water
+        mark from MLStateORM and processes only trades closed after it, so
+        the cost is proportional to new closes, not history. `days` only
+        bounds the first run, when no state exists yet.
+
+        Full rebuild: discards state and rescans the last `days` of closes.
 
         Args:
-            days: How many days of history to analyze
+            days: History window for a rebuild / first run
             portfolio_type: Filter by trade type
+            full_rebuild: Recompute from scratch instead of folding in new closes
 
         Returns:
             LearningResult with insights and pattern stats.
         """
-        result = LearningResult()
+        result = LearningResult(full_rebuild=full_rebuild)
+        state_type = self._state_type(portfolio_type)
+        state = None if full_rebuild else self._load_state(state_type)
+
+        if state is None:
+            result.full_rebuild = True
+            self._patterns = {}
+            watermark = None
+        else:
+            self._patterns = {
+                key: TradePattern.from_state(key, ps)
+                for key, ps in (state.get('patterns') or {}).items()
+            }
+            watermark = state.get('watermark')
+        touched: set = set()
 
         with session_scope() as session:
-            # Get closed trades with outcomes
-            cutoff = datetime.utcnow() - timedelta(days=days)
-            trades = (
+            query = (
                 session.query(TradeORM)
+                .options(
+                    selectinload(TradeORM.strategy),
+                    selectinload(TradeORM.legs).selectinload(LegORM.symbol),
+                )
                 .filter(
                     TradeORM.trade_status == 'closed',
-                    TradeORM.closed_at >= cutoff,
+                    TradeORM.closed_at.isnot(None),
                 )
-                .all()
             )
-
             if portfolio_type:
-                trades = [t for t in trades if t.trade_type == portfolio_type]
+                query = query.filter(TradeORM.trade_type == portfolio_type)
+            if watermark:
+                wm_at = datetime.fromisoformat(watermark['closed_at'])
+                query = query.filter(or_(
+                    TradeORM.closed_at > wm_at,
+                    and_(TradeORM.closed_at == wm_at, TradeORM.id > watermark['trade_id']),
+                ))
+            else:
+                query = query.filter(TradeORM.closed_at >= datetime.utcnow() - timedelta(days=days))
+            trades = query.order_by(TradeORM.closed_at, TradeORM.id).all()
 
             result.trades_analyzed = len(trades)
 
-            if not trades:
-                result.insights.append("No closed trades to learn from.")
-                return result
-
-            # Get events for market context
+            # Get entry events for market context (new trades only)
             events_by_trade = {}
-            trade_ids = [t.id for t in trades]
-            events = (
-                session.query(TradeEventORM)
-                .filter(TradeEventORM.trade_id.in_(trade_ids))
-                .all()
-            )
-            for e in events:
-                events_by_trade.setdefault(e.trade_id, []).append(e)
+            if trades:
+                events = (
+                    session.query(TradeEventORM)
+                    .filter(
+                        TradeEventORM.trade_id.in_([t.id for t in trades]),
+                        TradeEventORM.event_type == 'trade_opened',
+                    )
+                    .all()
+                )
+                for e in events:
+                    events_by_trade.setdefault(e.trade_id, []).append(e)
 
             # Build/update patterns
             for trade in trades:
@@ -141,7 +233,6 @@ class TradeLearner:
                 if not pattern_key:
                     continue
 
-                entry = float(trade.entry_price or 0)
                 pnl = float(trade.total_pnl or 0)
                 is_win = pnl > 0
                 days_held = (trade.closed_at - (trade.opened_at or trade.created_at)).days if trade.closed_at else 0
@@ -156,13 +247,28 @@ class TradeLearner:
                     result.patterns_discovered += 1
 
                 self._patterns[pattern_key].update(pnl, is_win, days_held)
-                result.patterns_updated += 1
+                touched.add(pattern_key)
+
+            if trades:
+                last = trades[-1]
+                watermark = {'closed_at': last.closed_at.isoformat(), 'trade_id': last.id}
+
+        result.patterns_updated = len(touched)
+        result.watermark = watermark
 
         # Compute Sharpe-like score for each pattern
         self._compute_scores()
+        self._loaded = True
 
-        # Save to DB
-        self._persist_patterns()
+        if not self._patterns:
+            result.insights.append("No closed trades to learn from.")
+            self._save_state(state_type, watermark)
+            return result
+
+        # Save to DB — only touched patterns change in incremental mode
+        if touched or result.full_rebuild:
+            self._save_state(state_type, watermark)
+            self._persist_patterns(None if result.full_rebuild else touched)
 
         # Generate insights
         result.best_patterns = sorted(
@@ -176,7 +282,6 @@ class TradeLearner:
         )[:5]
 
         result.insights = self._generate_insights()
-        self._loaded = True
 
         return result
 
@@ -306,37 +411,37 @@ class TradeLearner:
         return conditions
 
     def _compute_scores(self):
-        """Compute Sharpe-like scores for all patterns."""
+        """Compute Sharpe-like scores (mean / stdev of per-trade P&L) for all patterns."""
         for p in self._patterns.values():
-            if p.trades < 2:
+            if p.trades < 2 or p.avg_pnl == 0:
                 p.sharpe = 0.0
                 continue
 
-            # Collect per-trade P&L for standard deviation
-            # Since we don't store individual P&Ls, approximate from win/loss stats
-            # Sharpe ≈ avg_return / std_return
-            avg = p.avg_pnl
-            if p.trades > 1 and avg != 0:
-                # Approximate variance from win rate and average
-                # Higher win rate with consistent returns = higher Sharpe
-                variance_proxy = abs(avg) * (1 - p.win_rate) * 2
-                if variance_proxy > 0:
-                    p.sharpe = avg / variance_proxy
-                else:
-                    p.sharpe = avg / abs(avg) * 2.0 if avg else 0
+            std = p.pnl_std
+            if std > 0:
+                p.sharpe = p.avg_pnl / std
             else:
-                p.sharpe = 0.0
+                # Identical outcomes every time: cap at a strong signal
+                p.sharpe = 2.0 if p.avg_pnl > 0 else -2.0
 
-    def _persist_patterns(self):
-        """Save patterns to RecognizedPatternORM."""
+    def _persist_patterns(self, keys: Optional[set] = None):
+        """Save patterns to RecognizedPatternORM (all, or only `keys`)."""
         try:
             from trading_cotrader.core.database.schema import RecognizedPatternORM
+            keys = set(self._patterns) if keys is None else keys
+            if not keys:
+                return
             with session_scope() as session:
-                for key, pattern in self._patterns.items():
-                    existing = session.query(RecognizedPatternORM).filter_by(
-                        pattern_type='trade_rl',
-                        description=key,
-                    ).first()
+                existing_rows = {
+                    row.description: row
+                    for row in session.query(RecognizedPatternORM).filter(
+                        RecognizedPatternORM.pattern_type == 'trade_rl',
+                        RecognizedPatternORM.description.in_(keys),
+                    )
+                }
+                for key in keys:
+                    pattern = self._patterns[key]
+                    existing = existing_rows.get(key)
 
                     if existing:
                         existing.occurrences = pattern.trades
@@ -347,7 +452,7 @@ class TradeLearner:
                         existing.conditions = pattern.conditions
                     else:
                         new_pattern = RecognizedPatternORM(
-                            id=f"rl_{key}",
+                            pattern_id=str(uuid.uuid4()),
                             pattern_type='trade_rl',
                             description=key,
                             conditions=pattern.conditions,
@@ -363,7 +468,19 @@ class TradeLearner:
             logger.warning(f"Failed to persist patterns: {e}")
 
     def _load_patterns(self):
-        """Load patterns from DB."""
+        """Load patterns from DB — exact learner state if present, else pattern rows."""
+        state = None
+        try:
+            state = self._load_state(self._state_type('what_if'))
+        except Exception as e:
+            logger.debug(f"Could not load learner state: {e}")
+        if state and state.get('patterns'):
+            for key, ps in state['patterns'].items():
+                self._patterns[key] = TradePattern.from_state(key, ps)
+            self._compute_scores()
+            self._loaded = True
+            return
+
         try:
             from trading_cotrader.core.database.schema import RecognizedPatternORM
             with session_scope() as session:
@@ -390,6 +507,51 @@ class TradeLearner:
 
         self._loaded = True
 
+    # -----------------------------------------------------------------
+    # Learner state (watermark + accumulators) in MLStateORM
+    # -----------------------------------------------------------------
+
+    def _state_type(self, portfolio_type: Optional[str]) -> str:
+        return f"{self.STATE_TYPE}:{portfolio_type or 'all'}"
+
+    def _load_state(self, state_type: str) -> Optional[dict]:
+        """Load learner state, or None if never learned."""
+        with session_scope() as session:
+            row = session.query(MLStateORM).filter(
+                MLStateORM.state_type == state_type
+            ).first()
+            if row:
+                return row.state_json
+        return None
+
+    def _save_state(self, state_type: str, watermark: Optional[Dict[str, str]]) -> None:
+        """Save watermark + pattern accumulators."""
+        state_data = {
+            'watermark': watermark,
+            'patterns': {key: p.to_state() for key, p in self._patterns.items()},
+        }
+        trades = sum(p.trades for p in self._patterns.values())
+        try:
+            with session_scope() as session:
+                existing = session.query(MLStateORM).filter(
+                    MLStateORM.state_type == state_type
+                ).first()
+
+                if existing:
+                    existing.state_json = state_data
+                    existing.trades_analyzed = trades
+                    existing.last_updated = datetime.utcnow()
+                else:
+                    session.add(MLStateORM(
+                        id=str(uuid.uuid4()),
+                        state_type=state_type,
+                        state_json=state_data,
+                        trades_analyzed=trades,
+                    ))
+                session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to save learner state: {e}")
+
     def _generate_insights(self) -> List[str]:
         """Generate human-readable insights from patterns."""
         insights = []
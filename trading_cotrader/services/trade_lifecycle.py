@@ -146,7 +146,7 @@ class TradeLifecycleService:
                 'exit_price': final_exit,
             }
 
-    def auto_close_from_signals(self, exit_signals: List) -> List[Dict]:
+    def auto_close_from_signals(self, exit_signals: List, at_signal_price: bool = False) -> List[Dict]:
         """
         Auto-close trades based on exit monitor signals.
 
@@ -154,6 +154,9 @@ class TradeLifecycleService:
           - URGENT signals (stop loss, expired)
           - PROFIT_TARGET signals with INFO severity
 
+        With at_signal_price, each trade exits at the signal's current_price
+        (the live mark that fired it) instead of the DB current_price.
+
         Returns list of close results.
         """
         results = []
@@ -163,6 +166,7 @@ class TradeLifecycleService:
                 result = self.close_trade(
                     trade_id=signal.trade_id,
                     reason=signal.signal_type.lower(),
+                    exit_price=signal.current_price if at_signal_price else None,
                 )
                 results.append(result)
                 if result['success']:
@@ -171,11 +175,14 @@ class TradeLifecycleService:
                         f"{signal.signal_type}: P&L=${result['pnl']:+.2f}"
                     )
 
-        # Refresh containers after closing
-        if results and self.container_manager:
+        # Drop closed trades from containers
+        closed_ids = {r['trade_id'] for r in results if r.get('success')}
+        if closed_ids and self.container_manager:
             try:
+                from trading_cotrader.containers.container_manager import ContainerDelta
+                delta = ContainerDelta(source='auto_close', trades=closed_ids)
                 with session_scope() as session:
-                    self.container_manager.load_from_repositories(session)
+                    self.container_manager.sync(session, delta)
             except Exception as e:
                 logger.warning(f"Container refresh after close failed: {e}")
 
@@ -2,7 +2,8 @@
 Test Fixtures — Shared across all unit tests.
 
 Provides:
-- In-memory SQLite database (fresh per test)
+- In-memory SQLite database (fresh per test), optionally installed as the
+  process-wide database (global_db) and with SQL statement capture (statements)
 - Sample domain objects (Trade, Portfolio, Leg, Symbol, etc.)
 - Known Decimal constants for reproducibility
 """
@@ -12,6 +13,9 @@ from decimal import Decimal
 from datetime import datetime, timedelta
 import uuid
 
+from sqlalchemy import event
+
+import trading_cotrader.core.database.session as db_session
 from trading_cotrader.core.database.session import create_test_database
 import trading_cotrader.core.models.domain as dm
 
@@ -47,6 +51,29 @@ def session(db_manager):
         yield s
 
 
+@pytest.fixture
+def global_db(db_manager):
+    """Point the module-level session_scope()/run_db() at the test database."""
+    previous = db_session._db_manager
+    db_session._db_manager = db_manager
+    yield db_manager
+    db_manager.shutdown_executor()
+    db_session._db_manager = previous
+
+
+@pytest.fixture
+def statements(db_manager):
+    """SQL statements executed against the test database (clear() between phases)."""
+    seen = []
+
+    def record(conn, cursor, statement, *args):
+        seen.append(statement)
+
+    event.listen(db_manager.engine, 'before_cursor_execute', record)
+    yield seen
+    event.remove(db_manager.engine, 'before_cursor_execute', record)
+
+
 # =============================================================================
 # Domain object fixtures
 # =============================================================================
@@ -0,0 +1,145 @@
+"""Tests for keyset-paginated Data Explorer queries and streaming exports."""
+
+import asyncio
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from trading_cotrader.core.database.schema import PortfolioORM, TradeORM
+from trading_cotrader.web import api_explorer
+
+N_TRADES = 25
+T0 = datetime(2026, 1, 5, 10, 0)
+
+
+@pytest.fixture(autouse=True)
+def clear_count_cache():
+    api_explorer._count_cache.clear()
+
+
+@pytest.fixture
+def trades(global_db):
+    pid = str(uuid.uuid4())
+    ids = []
+    with global_db.session_scope() as session:
+        session.add(PortfolioORM(id=pid, name='desk', portfolio_type='what_if',
+                                 cash_balance=Decimal('1000'), buying_power=Decimal('1000')))
+        for i in range(N_TRADES):
+            tid = f'{i:03d}-{uuid.uuid4()}'
+            ids.append(tid)
+            session.add(TradeORM(
+                id=tid, portfolio_id=pid, underlying_symbol='SPY' if i % 2 else 'QQQ',
+                trade_type='what_if', trade_status='closed' if i % 3 else 'executed',
+                entry_price=Decimal('1.05'),
+                opened_at=T0 + timedelta(hours=i % 7),  # duplicates force pk tiebreaks
+                closed_at=None if i % 3 == 0 else T0 + timedelta(days=i % 4),
+            ))
+    return ids
+
+
+def _post(path, payloads):
+    app = FastAPI()
+    app.include_router(api_explorer.create_explorer_router(), prefix='/api/explorer')
+
+    async def call():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return [await client.post(f'/api/explorer{path}', json=p) for p in payloads]
+
+    return asyncio.run(call())
+
+
+def _walk(body):
+    """Follow next_cursor until exhausted; returns all pages."""
+    pages = []
+    cursor = None
+    while True:
+        [resp] = _post('/query', [dict(body, cursor=cursor)])
+        assert resp.status_code == 200, resp.text
+        pages.append(resp.json())
+        cursor = pages[-1]['next_cursor']
+        if cursor is None:
+            return pages
+
+
+class TestKeysetPagination:
+
+    @pytest.mark.parametrize('sort_by,desc', [
+        (None, False), ('opened_at', False), ('opened_at', True),
+        ('closed_at', False), ('closed_at', True),
+    ])
+    def test_cursor_walk_matches_offset_order(self, trades, sort_by, desc):
+        body = {'table': 'trades', 'columns': ['underlying_symbol'], 'limit': 4,
+                'sort_by': sort_by, 'sort_desc': desc}
+        pages = _walk(body)
+        rows = [r for p in pages for r in p['rows']]
+        assert len(rows) == N_TRADES
+        assert all(set(r) == {'underlying_symbol'} for r in rows)
+
+        # Same rows as a single offset page in the same order
+        [full] = _post('/query', [dict(body, columns=['id'], limit=1000)])
+        full_ids = [r['id'] for r in full.json()['rows']]
+        walked = _walk(dict(body, columns=['id']))
+        assert [r['id'] for p in walked for r in p['rows']] == full_ids
+        assert len(set(full_ids)) == N_TRADES
+
+    def test_filters_apply_to_cursor_pages_and_count(self, trades):
+        body = {'table': 'trades', 'columns': ['id', 'underlying_symbol'], 'limit': 5,
+                'sort_by': 'opened_at',
+                'filters': [{'column': 'underlying_symbol', 'operator': 'eq', 'value': 'SPY'}]}
+        pages = _walk(body)
+        rows = [r for p in pages for r in p['rows']]
+        assert len(rows) == N_TRADES // 2
+        assert {r['underlying_symbol'] for r in rows} == {'SPY'}
+        assert pages[0]['total'] == N_TRADES // 2
+        assert pages[0]['total_cached'] is False
+        assert all(p['total_cached'] for p in pages[1:])
+
+    def test_unindexed_sort_falls_back_to_offset(self, trades):
+        body = {'table': 'trades', 'columns': ['id'], 'limit': 5, 'sort_by': 'entry_price'}
+        [first, bad] = _post('/query', [body, dict(body, cursor='abc')])
+        assert first.json()['next_cursor'] is None
+        assert bad.status_code == 400
+
+    def test_cursor_page_skips_offset_scan(self, trades, statements):
+        body = {'table': 'trades', 'columns': ['id'], 'limit': 10, 'sort_by': 'opened_at'}
+        [first] = _post('/query', [body])
+        statements.clear()
+        [second] = _post('/query', [dict(body, cursor=first.json()['next_cursor'])])
+        assert len(second.json()['rows']) == 10
+        assert len(statements) == 1  # count served from cache
+        assert 'trades.opened_at >' in statements[0]  # seeks past the cursor instead of skipping rows
+        assert 'legs' not in statements[0]  # no ORM relationship loading
+
+
+class TestStreamingExport:
+
+    def test_csv_streams_all_rows(self, trades, monkeypatch):
+        monkeypatch.setattr(api_explorer, 'EXPORT_CHUNK_ROWS', 7)
+        body = {'table': 'trades', 'columns': ['id', 'entry_price'], 'limit': 0}
+        [resp] = _post('/query/csv', [body])
+        assert resp.headers['content-type'].startswith('text/csv')
+        rows = list(csv.reader(io.StringIO(resp.text)))
+        assert rows[0] == ['id', 'entry_price']
+        assert len(rows) == N_TRADES + 1
+        assert rows[1][1] == '1.05'
+
+    def test_ndjson_respects_limit_and_filters(self, trades):
+        body = {'table': 'trades', 'columns': ['id', 'closed_at'], 'limit': 3,
+                'sort_by': 'opened_at',
+                'filters': [{'column': 'trade_status', 'operator': 'eq', 'value': 'closed'}]}
+        [resp] = _post('/query/ndjson', [body])
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert len(lines) == 3
+        assert all(set(line) == {'id', 'closed_at'} and line['closed_at'] for line in lines)
+
+    def test_validation_happens_before_streaming(self, trades):
+        [resp] = _post('/query/csv', [{'table': 'trades', 'columns': ['nope']}])
+        assert resp.status_code == 400
@@ -0,0 +1,131 @@
+"""Tests for the per-bundle WebSocket container stream."""
+
+import json
+import threading
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from trading_cotrader.containers.container_manager import (
+    CellUpdate, ContainerEvent, ContainerManager, EventType,
+)
+from trading_cotrader.containers.portfolio_bundle import PortfolioBundle
+from trading_cotrader.web import api_stream
+
+
+@pytest.fixture
+def cm():
+    manager = ContainerManager()
+    manager._bundles['desk'] = PortfolioBundle(config_name='desk', currency='USD')
+    manager._default_bundle = 'desk'
+    return manager
+
+
+@pytest.fixture
+def client(cm):
+    app = FastAPI()
+    app.include_router(api_stream.create_stream_router(SimpleNamespace(container_manager=cm)),
+                       prefix='/api/v2')
+    with TestClient(app) as c:
+        yield c
+
+
+def _emit(cm, *cells, source='mark_to_market'):
+    cm._emit_event(ContainerEvent(
+        event_type=EventType.INCREMENTAL_UPDATE, source=source,
+        data={'portfolio_name': 'desk'},
+        cell_updates=[CellUpdate(grid, row, col, None, value) for grid, row, col, value in cells],
+    ))
+
+
+def _receive(ws):
+    return json.loads(ws.receive_text())
+
+
+class TestBundleStream:
+
+    def test_snapshot_then_coalesced_diff(self, client, cm):
+        with client.websocket_connect('/api/v2/stream/desk') as ws:
+            snap = _receive(ws)
+            assert snap['type'] == 'snapshot' and snap['seq'] == 0
+            assert set(snap['state']) >= {'portfolio', 'positions', 'trades'}
+
+            _emit(cm, ('trades', 't1', 'current_price', Decimal('1.10')))
+            _emit(cm, ('trades', 't1', 'current_price', Decimal('1.25')),
+                  ('positions', 'p1', 'delta', 3), source='auto_close')
+            diff = _receive(ws)
+            assert diff['seq'] == 1
+            assert sorted(diff['sources']) == ['auto_close', 'mark_to_market']
+            cells = {(c['grid'], c['rowId'], c['column']): c['value'] for c in diff['cells']}
+            assert cells == {('trades', 't1', 'current_price'): 1.25, ('positions', 'p1', 'delta'): 3}
+
+    def test_removal_replaces_pending_cells(self, client, cm):
+        with client.websocket_connect('/api/v2/stream/desk') as ws:
+            _receive(ws)
+            _emit(cm, ('trades', 't1', 'current_price', 1.0), ('trades', 't1', '_removed', True))
+            diff = _receive(ws)
+            assert diff['cells'] == [{'grid': 'trades', 'rowId': 't1', 'column': '_removed', 'value': True}]
+
+    def test_resync_replays_history_or_snapshots(self, client, cm):
+        with client.websocket_connect('/api/v2/stream/desk') as ws:
+            _receive(ws)
+            for price in (1, 2, 3):
+                _emit(cm, ('trades', 't1', 'current_price', price))
+                assert _receive(ws)['seq'] == price
+
+            ws.send_text(json.dumps({'type': 'resync', 'since': 1}))
+            assert [_receive(ws)['seq'] for _ in range(2)] == [2, 3]
+            ws.send_text(json.dumps({'type': 'resync', 'since': 999}))
+            assert _receive(ws)['type'] == 'snapshot'
+            ws.send_text(json.dumps({'type': 'ping'}))
+            assert _receive(ws) == {'type': 'pong', 'seq': 3}
+
+        # Changes while nobody listens burn a seq, so resuming takes a snapshot
+        _emit(cm, ('trades', 't1', 'current_price', 4))
+        with client.websocket_connect('/api/v2/stream/desk?since=3') as ws:
+            frame = _receive(ws)
+            assert frame['type'] == 'snapshot' and frame['seq'] == 4
+
+    def test_resume_from_history_on_reconnect(self, client, cm):
+        with client.websocket_connect('/api/v2/stream/desk') as first:
+            _receive(first)
+            with client.websocket_connect('/api/v2/stream/desk') as second:
+                _receive(second)
+                _emit(cm, ('trades', 't1', 'current_price', 1))
+                assert _receive(second)['seq'] == 1
+            _emit(cm, ('trades', 't1', 'current_price', 2))
+            assert [_receive(first)['seq'] for _ in range(2)] == [1, 2]
+            with client.websocket_connect('/api/v2/stream/desk?since=1') as resumed:
+                frame = _receive(resumed)
+                assert frame['type'] == 'diff' and frame['seq'] == 2
+
+    def test_unknown_portfolio_closes(self, client):
+        with client.websocket_connect('/api/v2/stream/nope') as ws:
+            with pytest.raises(WebSocketDisconnect) as exc:
+                ws.receive_text()
+        assert exc.value.code == 4404
+
+    def test_other_bundles_not_sent(self, client, cm):
+        cm._bundles['other'] = PortfolioBundle(config_name='other', currency='USD')
+        with client.websocket_connect('/api/v2/stream/other') as ws:
+            _receive(ws)
+            _emit(cm, ('trades', 't1', 'current_price', 1))
+            time.sleep(0.1)
+            ws.send_text(json.dumps({'type': 'ping'}))
+            assert _receive(ws) == {'type': 'pong', 'seq': 0}
+
+    def test_snapshot_waits_for_in_progress_load(self, cm):
+        hub = api_stream.BundleStreamHub(cm)
+        frames = []
+        with cm._state_lock:  # engine thread mid-reload
+            reader = threading.Thread(target=lambda: frames.append(hub.snapshot('desk')))
+            reader.start()
+            reader.join(0.2)
+            assert frames == []
+        reader.join(2)
+        assert frames[0]['type'] == 'snapshot' and frames[0]['seq'] == 0
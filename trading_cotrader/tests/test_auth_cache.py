@@ -0,0 +1,123 @@
+"""Tests for the cached JWT principal lookup and per-user Fernet cache."""
+
+import asyncio
+import time
+import uuid
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from trading_cotrader.core.database.schema import UserORM
+from trading_cotrader.core.security import auth, encryption
+from trading_cotrader.core.security.auth import (
+    PrincipalCache, create_access_token, create_refresh_token, deactivate_user,
+    get_principal_cache, get_user_from_token, set_subscription_tier,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    get_principal_cache().clear()
+    yield
+    get_principal_cache().clear()
+
+
+@pytest.fixture
+def user(global_db):
+    user_id = str(uuid.uuid4())
+    with global_db.session_scope() as session:
+        session.add(UserORM(id=user_id, email=f'{user_id}@x.io', name='trader', is_active=True))
+    return user_id
+
+
+class TestPrincipalCache:
+
+    def test_second_lookup_skips_decode_and_db(self, user, statements, monkeypatch):
+        token = create_access_token(user, 'a@x.io')
+        first = get_user_from_token(token)
+        assert first['id'] == user and first['subscription_tier'] == 'free'
+        assert statements
+
+        statements.clear()
+        monkeypatch.setattr(auth, 'decode_token', lambda t: pytest.fail('decoded a cached token'))
+        assert get_user_from_token(token) == first
+        assert statements == []
+
+    def test_tokens_carry_distinct_jti(self, user):
+        a, b = create_access_token(user, 'a@x.io'), create_access_token(user, 'a@x.io')
+        assert auth.decode_token(a)['jti'] != auth.decode_token(b)['jti']
+
+    def test_refresh_token_is_not_a_principal(self, user):
+        assert get_user_from_token(create_refresh_token(user)) is None
+        assert len(get_principal_cache()) == 0
+
+    def test_deactivation_invalidates(self, user):
+        token = create_access_token(user, 'a@x.io')
+        assert get_user_from_token(token) is not None
+        assert deactivate_user(user)
+        assert get_user_from_token(token) is None
+
+    def test_tier_change_invalidates(self, user):
+        token = create_access_token(user, 'a@x.io')
+        assert get_user_from_token(token)['subscription_tier'] == 'free'
+        assert set_subscription_tier(user, 'pro')
+        assert get_user_from_token(token)['subscription_tier'] == 'pro'
+
+    def test_ttl_and_token_expiry(self):
+        cache = PrincipalCache(ttl=60)
+        cache.put('t1', {'id': 'u'}, token_exp=time.time() - 1)  # token already expired
+        assert cache.get('t1') is None
+        cache = PrincipalCache(ttl=0.01)
+        cache.put('t2', {'id': 'u'})
+        time.sleep(0.02)
+        assert cache.get('t2') is None
+        assert len(cache) == 0
+
+    def test_lru_bound_and_returns_copies(self):
+        cache = PrincipalCache(max_entries=2)
+        cache.put('a', {'id': 'u1'})
+        cache.put('b', {'id': 'u2'})
+        cache.get('a')['id'] = 'mutated'
+        cache.put('c', {'id': 'u3'})  # evicts b (a was used more recently)
+        assert cache.get('b') is None
+        assert cache.get('a') == {'id': 'u1'}
+        assert cache.invalidate_user('u1') == 1
+        assert len(cache) == 1
+
+
+class TestMeEndpoint:
+
+    def _get(self, headers):
+        from trading_cotrader.web.api_auth import create_auth_router
+
+        app = FastAPI()
+        app.include_router(create_auth_router(), prefix='/api/auth')
+
+        async def call():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                return [await client.get('/api/auth/me', headers=headers) for _ in range(2)]
+
+        return asyncio.run(call())
+
+    def test_cached_principal_served(self, user):
+        token = create_access_token(user, 'a@x.io')
+        responses = self._get({'Authorization': f'Bearer {token}'})
+        assert [r.json()['user']['id'] for r in responses] == [user, user]
+        assert get_principal_cache().hits >= 1
+
+    def test_invalid_token_rejected(self, global_db):
+        responses = self._get({'Authorization': 'Bearer not-a-jwt'})
+        assert [r.status_code for r in responses] == [401, 401]
+
+
+class TestFernetCache:
+
+    def test_roundtrip_reuses_per_user_fernet(self):
+        encryption._fernet.cache_clear()
+        encrypted = encryption.encrypt_token('broker-secret', 'user-1')
+        assert encryption.decrypt_token(encrypted, 'user-1') == 'broker-secret'
+        assert encryption.decrypt_token(encrypted, 'user-2') is None
+        info = encryption._fernet.cache_info()
+        assert info.misses == 2 and info.hits == 1
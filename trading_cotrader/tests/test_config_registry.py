@@ -0,0 +1,121 @@
+"""Tests for the parse-once, file-watched config registry."""
+
+import os
+
+import pytest
+
+from trading_cotrader.config import config_registry
+from trading_cotrader.config.config_registry import CONFIG_DIR, ConfigRegistry, get_config_registry
+from trading_cotrader.config.risk_config_loader import RiskConfigLoader, get_risk_config
+
+
+def _write(path, text, bump_ns=0):
+    path.write_text(text)
+    if bump_ns:
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+
+
+@pytest.fixture
+def registry():
+    return ConfigRegistry(check_interval=0)
+
+
+class TestConfigRegistry:
+
+    def test_parses_once(self, tmp_path, registry, monkeypatch):
+        path = tmp_path / 'a.yaml'
+        _write(path, 'x: 1\n')
+        assert registry.get_raw(path) == {'x': 1}
+
+        monkeypatch.setattr(config_registry.yaml, 'safe_load', lambda data: pytest.fail('re-parsed'))
+        assert registry.get_raw(str(path)) == {'x': 1}
+        assert registry.loads == 1
+
+    def test_edit_reloads_and_bumps_versions(self, tmp_path, registry):
+        path = tmp_path / 'a.yaml'
+        _write(path, 'x: 1\n')
+        registry.get_raw(path)
+        assert (registry.version, registry.file_version(path)) == (1, 1)
+
+        _write(path, 'x: 2\n', bump_ns=10_000_000)
+        assert registry.get_raw(path) == {'x': 2}
+        assert (registry.version, registry.file_version(path)) == (2, 2)
+
+    def test_touch_without_change_keeps_version(self, tmp_path, registry):
+        path = tmp_path / 'a.yaml'
+        _write(path, 'x: 1\n')
+        registry.get_raw(path)
+        _write(path, 'x: 1\n', bump_ns=10_000_000)
+        registry.get_raw(path)
+        assert registry.loads == 1
+        assert registry.file_version(path) == 1
+
+    def test_typed_view_cached_per_version(self, tmp_path, registry):
+        path = tmp_path / 'a.yaml'
+        _write(path, 'x: 1\n')
+        calls = []
+
+        def parse(raw):
+            calls.append(raw)
+            return raw['x'] * 10
+
+        assert registry.get(path, parse) == 10
+        assert registry.get(path, parse) == 10
+        _write(path, 'x: 3\n', bump_ns=10_000_000)
+        assert registry.get(path, parse) == 30
+        assert len(calls) == 2
+
+    def test_check_interval_and_frozen(self, tmp_path):
+        path = tmp_path / 'a.yaml'
+        _write(path, 'x: 1\n')
+        registry = ConfigRegistry(check_interval=3600)
+        registry.get_raw(path)
+        _write(path, 'x: 2\n', bump_ns=10_000_000)
+        assert registry.get_raw(path) == {'x': 1}  # not re-checked yet
+        registry.invalidate(path)
+        assert registry.get_raw(path) == {'x': 2}
+
+    def test_frozen_pins_only_the_calling_context(self, tmp_path, registry):
+        from concurrent.futures import ThreadPoolExecutor
+        from trading_cotrader.agents.workflow.pipeline import PipelineScheduler, PipelineStage
+
+        path = tmp_path / 'a.yaml'
+        _write(path, 'x: 1\n')
+        with registry.frozen():
+            assert registry.get_raw(path) == {'x': 1}
+            _write(path, 'x: 2\n', bump_ns=10_000_000)
+            registry.invalidate(path)  # e.g. admin save from a web thread
+            with ThreadPoolExecutor(1) as pool:
+                assert pool.submit(registry.get_raw, path).result() == {'x': 2}
+            assert registry.get_raw(path) == {'x': 1}  # cycle snapshot holds
+            with registry.frozen():
+                assert registry.get_raw(path) == {'x': 1}  # nested block shares it
+            runs = PipelineScheduler([PipelineStage('stage', lambda: registry.get_raw(path))]).run()
+            assert runs['stage'].result == {'x': 1}  # pipeline workers inherit it
+        assert registry.get_raw(path) == {'x': 2}
+
+    def test_missing_and_deleted_files(self, tmp_path, registry):
+        with pytest.raises(FileNotFoundError):
+            registry.get_raw(tmp_path / 'nope.yaml')
+        path = tmp_path / 'a.yaml'
+        _write(path, 'x: 1\n')
+        registry.get_raw(path)
+        path.unlink()
+        assert registry.get_raw(path) == {'x': 1}  # last good copy
+
+
+class TestLoaders:
+
+    def test_risk_config_shared_across_loaders(self):
+        path = CONFIG_DIR / 'risk_config.yaml'
+        assert RiskConfigLoader().load(str(path)) is RiskConfigLoader().load(str(path))
+        assert get_risk_config() is get_config_registry().get(path, RiskConfigLoader._parse_config)
+
+    def test_desk_configs_from_registry(self):
+        from trading_cotrader.services.daily_plan_service import load_desk_configs
+
+        desks = load_desk_configs()
+        assert desks and all(d['key'].startswith('desk_') for d in desks)
+        desks[0]['key'] = 'mutated'
+        assert load_desk_configs()[0]['key'] != 'mutated'
@@ -0,0 +1,203 @@
+"""Tests for incremental container refresh (ContainerDelta / ContainerManager.sync)."""
+
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from trading_cotrader.containers.container_manager import (
+    ContainerDelta, ContainerManager, EventType,
+)
+from trading_cotrader.containers.portfolio_bundle import PortfolioBundle
+from trading_cotrader.core.database.schema import (
+    LegORM, PortfolioORM, PositionORM, SymbolORM, TradeORM,
+)
+
+
+def _symbol(session, ticker, strike=None, option_type=None):
+    sym = SymbolORM(
+        id=str(uuid.uuid4()), ticker=ticker, asset_type='option' if option_type else 'equity',
+        option_type=option_type, strike=Decimal(strike) if strike else None,
+        expiration=datetime.utcnow() + timedelta(days=30) if option_type else None,
+        multiplier=100 if option_type else 1,
+    )
+    session.add(sym)
+    return sym
+
+
+def _trade(session, pid, ticker, strike, price='1.00'):
+    tid = str(uuid.uuid4())
+    session.add(TradeORM(id=tid, portfolio_id=pid, underlying_symbol=ticker, trade_type='what_if',
+                         trade_status='executed', is_open=True, entry_price=Decimal('1.00'),
+                         current_price=Decimal(price)))
+    sym = _symbol(session, ticker, strike, 'put')
+    leg_id = str(uuid.uuid4())
+    session.add(LegORM(id=leg_id, trade_id=tid, symbol_id=sym.id, quantity=-1, side='sell',
+                       entry_price=Decimal('1.00'), current_price=Decimal(price),
+                       delta=Decimal('0.30')))
+    return tid, leg_id
+
+
+def _position(session, pid, ticker, qty, delta, price='100'):
+    pos_id = str(uuid.uuid4())
+    sym = _symbol(session, ticker)
+    session.add(PositionORM(id=pos_id, portfolio_id=pid, symbol_id=sym.id, quantity=qty,
+                            entry_price=Decimal(price), current_price=Decimal(price),
+                            market_value=Decimal(price) * qty, delta=Decimal(delta),
+                            total_cost=Decimal(price) * qty))
+    return pos_id
+
+
+@pytest.fixture
+def book(session):
+    """One bundle with two trades (SPY, QQQ) and positions in SPY, QQQ."""
+    pid = str(uuid.uuid4())
+    session.add(PortfolioORM(id=pid, name='desk', portfolio_type='what_if',
+                             cash_balance=Decimal('10000'), buying_power=Decimal('10000')))
+    spy_trade, spy_leg = _trade(session, pid, 'SPY', 500)
+    qqq_trade, _ = _trade(session, pid, 'QQQ', 400)
+    spy_pos = _position(session, pid, 'SPY', 10, '10')
+    qqq_pos = _position(session, pid, 'QQQ', 5, '5')
+    session.flush()
+
+    cm = ContainerManager()
+    bundle = PortfolioBundle(config_name='desk', currency='USD')
+    bundle.add_portfolio_id(pid)
+    cm._bundles['desk'] = bundle
+    cm._default_bundle = 'desk'
+    cm.load_all_bundles(session)
+    return {
+        'cm': cm, 'bundle': bundle, 'pid': pid, 'spy_trade': spy_trade, 'spy_leg': spy_leg,
+        'qqq_trade': qqq_trade, 'spy_pos': spy_pos, 'qqq_pos': qqq_pos,
+    }
+
+
+def _full_state(session, bundle):
+    """State of a fresh full reload of the same bundle, for consistency checks."""
+    cm = ContainerManager()
+    fresh = PortfolioBundle(config_name='desk', currency='USD', portfolio_ids=list(bundle.portfolio_ids))
+    cm._bundles['desk'] = fresh
+    cm.load_all_bundles(session)
+    return fresh
+
+
+class TestContainerDelta:
+
+    def test_leg_mark_updates_only_that_trade(self, session, book):
+        bundle = book['bundle']
+        untouched = bundle.trades.get(book['qqq_trade'])
+
+        session.get(LegORM, book['spy_leg']).current_price = Decimal('0.40')
+        session.flush()
+        events = book['cm'].sync(session, ContainerDelta(source='mark_to_market', legs={book['spy_leg']}))
+
+        (event,) = events
+        assert event.event_type == EventType.INCREMENTAL_UPDATE
+        assert {cu.row_id for cu in event.cell_updates} == {book['spy_trade']}
+        assert bundle.trades.get(book['spy_trade']).legs[0].current_price == Decimal('0.40')
+        assert bundle.trades.get(book['qqq_trade']) is untouched
+
+    def test_closed_trade_drops_out(self, session, book):
+        trade = session.get(TradeORM, book['spy_trade'])
+        trade.is_open, trade.trade_status = False, 'closed'
+        session.flush()
+
+        book['cm'].sync(session, ContainerDelta(source='auto_close', trades={book['spy_trade']}))
+        assert book['bundle'].trades.get(book['spy_trade']) is None
+        assert book['bundle'].trades.count == 1
+
+    def test_new_trade_is_added(self, session, book):
+        tid, _ = _trade(session, book['pid'], 'IWM', 200)
+        session.flush()
+        book['cm'].sync(session, ContainerDelta(source='trade_booking', trades={tid}))
+        assert book['bundle'].trades.get(tid).underlying == 'IWM'
+
+    def test_position_delta_reaggregates_affected_underlying(self, session, book):
+        bundle = book['bundle']
+        qqq_rf = bundle.risk_factors.get('QQQ')
+
+        session.get(PositionORM, book['spy_pos']).delta = Decimal('25')
+        iwm_pos = _position(session, book['pid'], 'IWM', 3, '3')
+        session.flush()
+        book['cm'].sync(session, ContainerDelta(
+            source='portfolio_sync', positions={book['spy_pos'], iwm_pos},
+        ))
+
+        assert bundle.risk_factors.get('SPY').delta == Decimal('25')
+        assert bundle.risk_factors.get('IWM').position_count == 1
+        assert bundle.risk_factors.get('QQQ') is qqq_rf  # sums untouched
+
+        session.delete(session.get(PositionORM, book['qqq_pos']))
+        session.flush()
+        book['cm'].sync(session, ContainerDelta(source='portfolio_sync', removed_positions={book['qqq_pos']}))
+        assert bundle.risk_factors.get('QQQ') is None
+        assert set(bundle.positions.underlyings) == {'SPY', 'IWM'}
+
+    def test_incremental_state_matches_full_reload(self, session, book):
+        bundle = book['bundle']
+        session.get(LegORM, book['spy_leg']).delta = Decimal('0.45')
+        session.get(PositionORM, book['qqq_pos']).market_value = Decimal('900')
+        new_pos = _position(session, book['pid'], 'SPY', -2, '-2')
+        session.flush()
+        book['cm'].sync(session, ContainerDelta(
+            source='test', legs={book['spy_leg']}, positions={book['qqq_pos'], new_pos},
+        ))
+
+        fresh = _full_state(session, bundle)
+        strip = lambda rows: [{k: v for k, v in r.items() if k != 'last_updated'} for r in rows]
+        assert bundle.trades.to_grid_rows() == fresh.trades.to_grid_rows()
+        assert sorted(bundle.positions.to_grid_rows(), key=lambda r: r['id']) == \
+            sorted(fresh.positions.to_grid_rows(), key=lambda r: r['id'])
+        assert strip(bundle.risk_factors.to_grid_rows()) == strip(fresh.risk_factors.to_grid_rows())
+
+    def test_full_reload_when_due_or_no_delta(self, session, book, monkeypatch):
+        cm = book['cm']
+        calls = []
+        monkeypatch.setattr(cm, 'load_all_bundles', lambda s: calls.append(s))
+
+        cm.sync(session, ContainerDelta(source='idle'))
+        assert calls == []
+
+        cm.sync(session)
+        assert len(calls) == 1
+
+        cm._last_full_load = datetime.utcnow() - cm.full_reload_interval
+        assert cm.full_reload_due
+        cm.sync(session, ContainerDelta(source='tick', trades={book['spy_trade']}))
+        assert len(calls) == 2
+
+    def test_whatif_desks_map_to_their_own_bundle(self, session):
+        pids = {}
+        for name in ('desk_a', 'desk_b', 'benchmark'):
+            pids[name] = str(uuid.uuid4())
+            session.add(PortfolioORM(id=pids[name], name=name, portfolio_type='what_if'))
+        trades = {name: _trade(session, pid, 'SPY', 500)[0] for name, pid in pids.items()}
+        session.flush()
+
+        cm = ContainerManager()
+        for name in ('real_a', 'real_b'):
+            cm._bundles[name] = PortfolioBundle(config_name=name, currency='USD')
+        cm._default_bundle = 'real_a'
+        cm._whatif_to_real = {'desk_a': 'real_a', 'desk_b': 'real_b'}
+        cm.load_all_bundles(session)
+
+        a, b = cm._bundles['real_a'], cm._bundles['real_b']
+        assert cm.get_trade_bundle(pids['desk_a']) is a
+        assert cm.get_trade_bundle(pids['desk_b']) is b
+        assert cm.get_trade_bundle(pids['benchmark']) is a
+        assert {t.trade_id for t in b.trades.get_all()} == {trades['desk_b']}
+        assert {t.trade_id for t in a.trades.get_all()} == {trades['desk_a'], trades['benchmark']}
+
+        tid, _ = _trade(session, pids['desk_b'], 'IWM', 200)
+        session.flush()
+        cm.sync(session, ContainerDelta(source='trade_booking', trades={tid}))
+        assert b.trades.get(tid) is not None
+        assert a.trades.get(tid) is None
+
+    def test_merge_and_empty(self):
+        delta = ContainerDelta(source='a', trades={'t1'})
+        delta.merge(ContainerDelta(legs={'l1'}, removed_positions={'p1'}))
+        assert not delta.is_empty
+        assert delta.to_dict()['legs'] == ['l1']
+        assert ContainerDelta().is_empty
@@ -0,0 +1,99 @@
+"""Tests for rolling / EWMA covariance estimators and Ledoit-Wolf shrinkage."""
+
+import numpy as np
+import pytest
+
+from trading_cotrader.services.risk.correlation import CorrelationAnalyzer
+from trading_cotrader.services.risk.covariance import (
+    CovarianceEngine, CovarianceMethod, EWMACovariance, RollingCovariance, ledoit_wolf_shrink,
+)
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(11)
+    cov = np.array([[1.0e-4, 0.6e-4, 0.2e-4],
+                    [0.6e-4, 2.0e-4, 0.5e-4],
+                    [0.2e-4, 0.5e-4, 1.5e-4]])
+    return rng.multivariate_normal(np.zeros(3), cov, size=400)
+
+
+class FakeStore:
+    """ReturnsStore stand-in serving a sliding window over a fixed history."""
+
+    def __init__(self, symbols, returns):
+        self.symbols, self.returns, self.end = symbols, returns, 300
+
+    def aligned_window(self, symbols, lookback_days=252):
+        days = np.arange(self.end - lookback_days, self.end)
+        cols = [self.symbols.index(s) for s in symbols if s in self.symbols]
+        return [self.symbols[c] for c in cols], days, self.returns[days][:, cols]
+
+
+class TestEstimators:
+
+    def test_rolling_update_matches_window_cov(self, returns):
+        est = RollingCovariance(window=252).fit(returns[:252])
+        for r in returns[252:300]:
+            est.update(r)
+        np.testing.assert_allclose(est.covariance, np.cov(returns[48:300], rowvar=False), rtol=1e-9)
+        assert est.observations == 252
+
+    def test_ewma_incremental_equals_batch(self, returns):
+        est = EWMACovariance(0.94).fit(returns[:250])
+        for r in returns[250:]:
+            est.update(r)
+        np.testing.assert_allclose(est.covariance, EWMACovariance(0.94).fit(returns).covariance)
+
+    def test_ewma_reacts_to_regime_change(self, returns):
+        shocked = np.vstack([returns[:300], returns[300:] * 3])
+        ewma = EWMACovariance(0.94).fit(shocked).covariance
+        sample = np.cov(shocked[-252:], rowvar=False)
+        assert ewma[0, 0] > sample[0, 0]
+
+    def test_ewma_lambda_validated(self):
+        with pytest.raises(ValueError):
+            EWMACovariance(1.0)
+
+    def test_ledoit_wolf_shrinks_toward_identity(self):
+        rng = np.random.default_rng(3)
+        x = rng.normal(0, 0.01, size=(30, 25))  # few days, many symbols
+        sample = np.cov(x, rowvar=False)
+        shrunk, intensity = ledoit_wolf_shrink(sample, x)
+        assert 0 < intensity <= 1
+        assert np.trace(shrunk) == pytest.approx(np.trace(sample))
+        assert np.linalg.cond(shrunk) < np.linalg.cond(sample)
+
+
+class TestCovarianceEngine:
+
+    def test_carries_state_forward_by_day(self, returns):
+        engine = CovarianceEngine(CovarianceMethod.ROLLING)
+        days = np.arange(0, 252)
+        engine.estimate(['A', 'B', 'C'], returns[days], days)
+        estimator, _ = engine._states[('A', 'B', 'C')]
+        updates = []
+        estimator.update = lambda r, f=estimator.update: (updates.append(r), f(r))
+
+        days = np.arange(5, 257)
+        estimate = engine.estimate(['A', 'B', 'C'], returns[days], days)
+        assert len(updates) == 5
+        np.testing.assert_allclose(estimate.covariance, np.cov(returns[days], rowvar=False), rtol=1e-9)
+
+    def test_analyzer_exposes_method_and_shrinkage(self, returns):
+        store = FakeStore(['SPY', 'QQQ', 'IWM'], returns)
+        analyzer = CorrelationAnalyzer(
+            returns_store=store, covariance_method=CovarianceMethod.EWMA, shrinkage=True,
+        )
+        matrix = analyzer.calculate_correlation_matrix(['SPY', 'QQQ'], lookback_days=252)
+        assert matrix.covariance_method == 'ewma'
+        assert 0 <= matrix.shrinkage <= 1
+        assert matrix.covariance_matrix.shape == (2, 2)
+        assert -1 <= matrix.get_correlation('SPY', 'QQQ') <= 1
+
+    def test_default_is_sample_cov(self, returns):
+        store = FakeStore(['SPY', 'QQQ'], returns)
+        matrix = CorrelationAnalyzer(returns_store=store).calculate_correlation_matrix(['SPY', 'QQQ'])
+        np.testing.assert_allclose(matrix.covariance_matrix, np.cov(returns[48:300, :2], rowvar=False))
+        assert matrix.covariance_method == 'sample'
+        assert matrix.shrinkage is None
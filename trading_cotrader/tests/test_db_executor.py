@@ -0,0 +1,72 @@
+"""Tests for the bounded DB executor (run_db / db_offload) used by the v2 API."""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException, Query
+
+from trading_cotrader.core.database.schema import PortfolioORM
+from trading_cotrader.core.database.session import db_offload, session_scope
+
+
+@pytest.fixture
+def app(global_db):
+    app = FastAPI()
+
+    @app.get("/slow")
+    @db_offload
+    def slow(delay: float = Query(0.5)):
+        with session_scope() as session:
+            time.sleep(delay)
+            return {'count': session.query(PortfolioORM).count(),
+                    'thread': threading.current_thread().name}
+
+    @app.get("/portfolio/{name}")
+    @db_offload
+    def portfolio(name: str, kind: Optional[str] = Query(None)):
+        raise HTTPException(404, f"{name}/{kind} not found")
+
+    @app.get("/health")
+    async def health():
+        return {'status': 'ok'}
+
+    return app
+
+
+def _client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test')
+
+
+class TestDBExecutor:
+
+    def test_sqlite_executor_is_single_threaded(self, global_db):
+        assert global_db.executor_workers == 1
+
+    def test_slow_query_does_not_block_event_loop(self, app):
+        async def scenario():
+            async with _client(app) as client:
+                slow = asyncio.create_task(client.get('/slow', params={'delay': 0.5}))
+                await asyncio.sleep(0.05)
+                start = time.perf_counter()
+                health = await client.get('/health')
+                health_latency = time.perf_counter() - start
+                return (await slow), health, health_latency
+
+        slow, health, latency = asyncio.run(scenario())
+        assert health.status_code == 200
+        assert latency < 0.25
+        assert slow.status_code == 200
+        assert slow.json()['thread'].startswith('db')
+
+    def test_params_and_http_errors_pass_through(self, app):
+        async def scenario():
+            async with _client(app) as client:
+                return await client.get('/portfolio/tt', params={'kind': 'real'})
+
+        resp = asyncio.run(scenario())
+        assert resp.status_code == 404
+        assert resp.json()['detail'] == 'tt/real not found'
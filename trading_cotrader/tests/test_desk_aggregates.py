@@ -0,0 +1,100 @@
+"""Tests for set-based per-desk aggregation (Atlas cross-desk risk + Greek attribution)."""
+
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from trading_cotrader.agents.domain.atlas import AtlasAgent
+from trading_cotrader.containers.container_manager import ContainerManager
+from trading_cotrader.containers.portfolio_bundle import PortfolioBundle
+from trading_cotrader.core.database.schema import PortfolioORM, TradeORM
+from trading_cotrader.repositories.desk_aggregates import DeskAggregateRepository
+from trading_cotrader.repositories.trade import TradeQuery
+
+
+def _seed(db, desks, trades_per_desk):
+    """Desk i gets trades_per_desk open trades (delta=i+1, risk=100) and one closed."""
+    ids = {}
+    with db.session_scope() as session:
+        for i in range(desks):
+            pid = str(uuid.uuid4())
+            ids[f'desk_{i}'] = pid
+            session.add(PortfolioORM(id=pid, name=f'desk_{i}', portfolio_type='what_if',
+                                     initial_capital=Decimal('10000')))
+            for j in range(trades_per_desk + 1):
+                session.add(TradeORM(
+                    id=str(uuid.uuid4()), portfolio_id=pid, underlying_symbol='SPY',
+                    trade_type='what_if', trade_status='executed', is_open=j < trades_per_desk,
+                    current_delta=Decimal(i + 1), current_theta=Decimal('2.5'),
+                    current_gamma=None, current_vega=Decimal('-1'), max_risk=Decimal('100'),
+                    theta_pnl=Decimal('10'), delta_pnl=Decimal('-4'), total_pnl=Decimal('6'),
+                ))
+        session.add(PortfolioORM(id=str(uuid.uuid4()), name='empty', portfolio_type='what_if'))
+        session.add(PortfolioORM(id=str(uuid.uuid4()), name='real', portfolio_type='real'))
+    return ids
+
+
+def _run(statements, fn):
+    statements.clear()
+    result = fn()
+    return result, len(statements)
+
+
+class TestDeskAggregates:
+
+    @pytest.mark.parametrize('desks,trades', [(2, 1), (5, 4)])
+    def test_cross_desk_risk_is_one_statement(self, global_db, statements, desks, trades):
+        _seed(global_db, desks, trades)
+        result, count = _run(statements, AtlasAgent()._compute_cross_desk_risk)
+        assert count == 1
+        assert set(result['desks']) == {f'desk_{i}' for i in range(desks)} | {'empty'}
+        assert result['desks']['empty'] == {'delta': 0, 'theta': 0, 'gamma': 0, 'vega': 0,
+                                            'positions': 0, 'risk': 0}
+        assert result['desks']['desk_1']['delta'] == 2 * trades
+        assert result['desks']['desk_1']['vega'] == -trades
+        assert result['total_positions'] == desks * trades
+        assert result['total_risk'] == 100 * desks * trades
+        assert result['total_theta'] == 2.5 * desks * trades
+
+    @pytest.mark.parametrize('desks,trades', [(2, 1), (5, 4)])
+    def test_greek_attribution_is_one_statement(self, global_db, statements, desks, trades):
+        _seed(global_db, desks, trades)
+        result, count = _run(statements, AtlasAgent()._compute_greek_attribution)
+        assert count == 1
+        per_desk = trades + 1  # closed trades count toward attribution
+        assert result['by_desk']['desk_0']['theta_pnl'] == 10 * per_desk
+        assert result['by_desk']['empty']['total_pnl'] == 0
+        assert result['total_pnl'] == 6 * per_desk * desks
+        assert result['delta_pnl'] == -4 * per_desk * desks
+
+    def test_warm_containers_skip_trade_query(self, global_db, statements):
+        ids = _seed(global_db, 3, 2)
+        expected = AtlasAgent()._compute_cross_desk_risk()
+
+        cm = ContainerManager()
+        bundle = cm._bundles['desk'] = PortfolioBundle(config_name='desk', currency='USD')
+        with global_db.session_scope() as session:
+            desk_ids = [pid for (pid,) in session.query(PortfolioORM.id).filter(
+                PortfolioORM.portfolio_type == 'what_if')]
+            bundle.trades.load_from_orm_list(TradeQuery(session).filter(
+                TradeORM.portfolio_id.in_(desk_ids), TradeORM.is_open == True).all())
+        atlas = AtlasAgent(container_manager=cm)
+
+        # Cold: not every desk maps to a loaded bundle → GROUP BY fallback
+        cm._trade_portfolio_to_bundle = {ids['desk_0']: 'desk'}
+        result, count = _run(statements, atlas._compute_cross_desk_risk)
+        assert count == 2 and result == expected
+
+        cm._trade_portfolio_to_bundle = {pid: 'desk' for pid in desk_ids}
+        result, count = _run(statements, atlas._compute_cross_desk_risk)
+        assert count == 1
+        assert 'trades' not in statements[0]
+        assert result == expected
+
+    def test_desks_projection(self, global_db):
+        _seed(global_db, 2, 0)
+        with global_db.session_scope() as session:
+            desks = DeskAggregateRepository(session).desks()
+        assert [d.name for d in desks] == ['desk_0', 'desk_1', 'empty']
+        assert desks[0].initial_capital == 10000
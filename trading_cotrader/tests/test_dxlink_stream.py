@@ -0,0 +1,137 @@
+"""Tests for the persistent DXLink stream manager and its last-value cache."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from trading_cotrader.adapters.dxlink_stream import (
+    DXLinkStreamManager, LiveMarketCache, QUOTE, GREEKS,
+)
+
+
+class FakeStreamer:
+    """In-process stand-in for DXLinkStreamer: emits one event per subscribed symbol."""
+
+    instances = []
+
+    def __init__(self, session):
+        self.subscribed = {}
+        self.unsubscribed = []
+        self._queues = {}
+        FakeStreamer.instances.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def _queue(self, event_class):
+        return self._queues.setdefault(event_class, asyncio.Queue())
+
+    async def subscribe(self, event_class, symbols):
+        self.subscribed.setdefault(event_class, set()).update(symbols)
+        for sym in symbols:
+            await self._queue(event_class).put(SimpleNamespace(
+                event_symbol=sym, bid_price=1.0, ask_price=1.2,
+                delta=0.3, gamma=0.01, theta=-0.05, vega=0.1, rho=0.0,
+            ))
+
+    async def unsubscribe(self, event_class, symbols):
+        self.subscribed.get(event_class, set()).difference_update(symbols)
+        self.unsubscribed.extend(symbols)
+
+    async def listen(self, event_class):
+        queue = self._queue(event_class)
+        while True:
+            yield await queue.get()
+
+
+@pytest.fixture
+def manager():
+    FakeStreamer.instances.clear()
+    m = DXLinkStreamManager(session=None, streamer_factory=FakeStreamer, first_event_timeout=2.0)
+    assert m.start(wait=2.0)
+    yield m
+    m.stop()
+
+
+class TestLiveMarketCache:
+
+    def test_get_returns_only_fresh_generation(self):
+        cache = LiveMarketCache()
+        cache.new_generation()
+        cache.put(QUOTE, 'SPY', {'bid': 1, 'ask': 2})
+        assert cache.get(QUOTE, ['SPY']) == {'SPY': {'bid': 1, 'ask': 2}}
+
+        cache.new_generation()  # reconnect: old values are stale
+        assert cache.get(QUOTE, ['SPY']) == {}
+
+    def test_max_age_bound(self):
+        cache = LiveMarketCache()
+        cache.put(QUOTE, 'SPY', {'bid': 1, 'ask': 2})
+        time.sleep(0.02)
+        assert cache.get(QUOTE, ['SPY'], max_age=0.01) == {}
+        assert 'SPY' in cache.get(QUOTE, ['SPY'], max_age=5)
+
+    def test_wait_for_times_out_with_partial_result(self):
+        cache = LiveMarketCache()
+        cache.put(QUOTE, 'SPY', {'bid': 1, 'ask': 2})
+        start = time.monotonic()
+        result = cache.wait_for(QUOTE, ['SPY', 'QQQ'], timeout=0.05)
+        assert set(result) == {'SPY'}
+        assert time.monotonic() - start >= 0.05
+
+
+class TestDXLinkStreamManager:
+
+    def test_single_connection_serves_repeated_reads(self, manager):
+        quotes = manager.get_quotes(['SPY', 'QQQ'])
+        assert quotes['SPY'] == {'bid': 1.0, 'ask': 1.2}
+        greeks = manager.get_greeks(['.SPY260320P550'])
+        assert float(greeks['.SPY260320P550'].delta) == pytest.approx(0.3)
+
+        # Cached: second read does not wait and does not reconnect
+        start = time.monotonic()
+        assert set(manager.get_quotes(['SPY', 'QQQ'], timeout=0)) == {'SPY', 'QQQ'}
+        assert time.monotonic() - start < 0.05
+        assert len(FakeStreamer.instances) == 1
+
+    def test_refcounted_subscriptions(self, manager):
+        manager.acquire(['SPY'], QUOTE)
+        manager.acquire(['SPY'], QUOTE)
+        assert manager.refcount('SPY', QUOTE) == 2
+
+        manager.release(['SPY'], QUOTE)
+        assert manager.refcount('SPY', QUOTE) == 1
+        assert manager.subscribed(QUOTE) == ['SPY']
+
+        manager.release(['SPY'], QUOTE)
+        assert manager.refcount('SPY', QUOTE) == 0
+        assert manager.subscribed(QUOTE) == []
+        assert manager.cache.get(QUOTE, ['SPY']) == {}
+
+        deadline = time.monotonic() + 1
+        streamer = FakeStreamer.instances[0]
+        while 'SPY' not in streamer.unsubscribed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert 'SPY' in streamer.unsubscribed
+
+    def test_kinds_are_independent(self, manager):
+        manager.acquire(['.SPY260320P550'], GREEKS)
+        assert manager.refcount('.SPY260320P550', GREEKS) == 1
+        assert manager.refcount('.SPY260320P550', QUOTE) == 0
+
+    def test_listeners_see_each_event(self, manager):
+        seen = []
+        manager.add_listener(lambda sym, quote: seen.append((sym, quote)), QUOTE)
+        manager.add_listener(lambda sym, quote: 1 / 0, QUOTE)  # failing listener is isolated
+        manager.acquire(['SPY'], QUOTE)
+
+        deadline = time.monotonic() + 1
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert seen == [('SPY', {'bid': 1.0, 'ask': 1.2})]
+        assert manager.cache.get(QUOTE, ['SPY']) == {'SPY': {'bid': 1.0, 'ask': 1.2}}
@@ -289,6 +289,24 @@ class TestTradeLifecycleService:
         assert result['success'] is False
         assert 'already closed' in result['error']
 
+    def test_auto_close_at_signal_price(self):
+        """Live trigger closes exit at the signal's mark; polling closes use the DB mark."""
+        from trading_cotrader.services.exit_monitor import ExitSignal
+        from trading_cotrader.services.trade_lifecycle import TradeLifecycleService
+
+        signal = ExitSignal(
+            trade_id='t1', underlying='SPY', strategy_type='iron_condor',
+            signal_type='STOP_LOSS', severity='URGENT', current_pnl=Decimal('-300'),
+            current_pnl_pct=-200.0, message='stop', action='CLOSE',
+            current_price=Decimal('-150.00'),
+        )
+        svc = TradeLifecycleService()
+        with patch.object(svc, 'close_trade', return_value={'success': False}) as close:
+            svc.auto_close_from_signals([signal], at_signal_price=True)
+            svc.auto_close_from_signals([signal])
+        assert close.call_args_list[0].kwargs['exit_price'] == Decimal('-150.00')
+        assert close.call_args_list[1].kwargs['exit_price'] is None
+
 
 class TestTradeLearner:
     """Test ML/RL learning service."""
@@ -326,6 +344,72 @@ class TestTradeLearner:
         score = learner.score_trade('iron_condor', 'R1', 'high', '0dte', 'credit')
         assert score == 0.0
 
+    def test_pattern_sharpe_uses_exact_variance(self):
+        """Streaming mean/variance matches a full rescan of the P&Ls."""
+        import statistics
+        from trading_cotrader.services.trade_learner import TradeLearner, TradePattern
+
+        pnls = [120.0, -80.0, 45.5, 60.0, -10.0]
+        pattern = TradePattern(pattern_key='k', strategy_type='iron_condor', conditions={})
+        for pnl in pnls:
+            pattern.update(pnl=pnl, is_win=pnl > 0, days_held=1)
+
+        assert pattern.avg_pnl == pytest.approx(statistics.mean(pnls))
+        assert pattern.pnl_std == pytest.approx(statistics.stdev(pnls))
+
+        learner = TradeLearner()
+        learner._patterns = {'k': TradePattern.from_state('k', pattern.to_state())}
+        learner._compute_scores()
+        assert learner._patterns['k'].sharpe == pytest.approx(
+            statistics.mean(pnls) / statistics.stdev(pnls))
+
+    def test_incremental_learning_folds_only_new_closes(self, db_manager):
+        """Watermark skips already-learned trades; full rebuild rescans."""
+        import uuid
+        from trading_cotrader.core.database.schema import PortfolioORM, TradeORM
+        from trading_cotrader.services.trade_learner import TradeLearner
+
+        pid = str(uuid.uuid4())
+        with db_manager.session_scope() as s:
+            s.add(PortfolioORM(id=pid, name='WI', portfolio_type='what_if',
+                               cash_balance=0, buying_power=0))
+
+        base = datetime.utcnow() - timedelta(days=5)
+
+        def close_trades(pnls, offset):
+            with db_manager.session_scope() as s:
+                for i, pnl in enumerate(pnls):
+                    s.add(TradeORM(
+                        id=str(uuid.uuid4()), portfolio_id=pid, underlying_symbol='SPY',
+                        trade_type='what_if', trade_status='closed', is_open=False,
+                        entry_price=Decimal('1.00'), total_pnl=Decimal(str(pnl)),
+                        opened_at=base, closed_at=base + timedelta(hours=offset + i),
+                    ))
+
+        with patch('trading_cotrader.services.trade_learner.session_scope', db_manager.session_scope):
+            close_trades([100, -40, 60], offset=0)
+            first = TradeLearner().learn_from_history()
+            assert first.trades_analyzed == 3
+            assert first.full_rebuild is True
+
+            again = TradeLearner().learn_from_history()
+            assert again.trades_analyzed == 0
+            assert again.full_rebuild is False
+
+            close_trades([30, -20], offset=10)
+            learner = TradeLearner()
+            third = learner.learn_from_history()
+            assert third.trades_analyzed == 2
+            (pattern,) = learner._patterns.values()
+            assert pattern.trades == 5
+            assert pattern.total_pnl == pytest.approx(130.0)
+
+            rebuilt = TradeLearner()
+            result = rebuilt.learn_from_history(full_rebuild=True)
+            assert result.trades_analyzed == 5
+            (rebuilt_pattern,) = rebuilt._patterns.values()
+            assert rebuilt_pattern.sharpe == pytest.approx(pattern.sharpe)
+
     def test_ml_gate_in_maverick(self):
         """ML score gate rejects trades with strongly negative patterns."""
         from trading_cotrader.agents.domain.maverick import MaverickAgent
@@ -0,0 +1,162 @@
+"""Tests for the quote-driven exit trigger index."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from trading_cotrader.services.exit_trigger_index import ExitTriggerIndex
+
+EXPIRY = date.today() + timedelta(days=30)
+
+
+def _leg(key, qty, price, option_type='put', strike=None, ticker='SPY'):
+    symbol = SimpleNamespace(
+        key=key, ticker=ticker, asset_type='option' if strike else 'equity',
+        option_type=option_type if strike else None,
+        strike=Decimal(str(strike)) if strike else None,
+        expiration=EXPIRY if strike else None,
+    )
+    return SimpleNamespace(symbol=symbol, quantity=qty, current_price=Decimal(str(price)))
+
+
+def _trade(trade_id, legs, entry, profit_target=None, stop_loss=None, underlying='SPY'):
+    return SimpleNamespace(
+        id=trade_id, underlying_symbol=underlying, legs=legs, trade_type='what_if',
+        entry_price=Decimal(str(entry)),
+        profit_target=Decimal(str(profit_target)) if profit_target is not None else None,
+        stop_loss=Decimal(str(stop_loss)) if stop_loss is not None else None,
+        strategy=SimpleNamespace(strategy_type='credit_spread'),
+    )
+
+
+def _put_spread(trade_id='t1', **kwargs):
+    """Short 450P @ 3.00 / long 445P @ 1.50 → 150 credit, TP 75, SL 300."""
+    legs = [
+        _leg('.SPY450P', -1, 3.00, strike=450),
+        _leg('.SPY445P', 1, 1.50, strike=445),
+    ]
+    kwargs.setdefault('profit_target', 75)
+    kwargs.setdefault('stop_loss', 300)
+    return _trade(trade_id, legs, 150, **kwargs)
+
+
+def _index(*trades, rules=None):
+    return ExitTriggerIndex.from_trades(
+        trades, symbol_fn=lambda s: s.key, exit_rules=rules or (lambda t: {}),
+    )
+
+
+def _quote(mid, half_spread=0.05):
+    return {'bid': mid - half_spread, 'ask': mid + half_spread}
+
+
+class TestMoneyTriggers:
+    """P&L = V − entry (MarkToMarketService / ExitMonitorService convention)."""
+
+    def test_profit_target_fires_on_short_leg(self):
+        index = _index(_put_spread())
+        # Short leg level = (entry + 75 − (−150)) / 100 = 3.75
+        assert index.on_quote('.SPY450P', _quote(3.70)) == []
+        [signal] = index.on_quote('.SPY450P', _quote(3.80))
+        assert signal.signal_type == 'PROFIT_TARGET'
+        assert signal.severity == 'INFO'
+        assert signal.current_pnl == Decimal('80.00')
+        assert signal.current_price == Decimal('230.00')
+        assert signal.target_value == pytest.approx(75)
+        assert signal.dte == 30
+
+    def test_other_leg_tick_rekeys_level(self):
+        index = _index(_put_spread())
+        assert index.on_quote('.SPY445P', _quote(1.00)) == []  # V = 200
+        # Short leg level is now (225 + 100) / 100 = 3.25
+        assert index.on_quote('.SPY450P', _quote(3.20)) == []
+        [signal] = index.on_quote('.SPY450P', _quote(3.30))
+        assert signal.signal_type == 'PROFIT_TARGET'
+
+    def test_stop_loss_is_urgent_and_fires_once(self):
+        index = _index(_put_spread())
+        # Long leg level = (300 − (entry − 300)) / 100 = 4.50
+        assert index.on_quote('.SPY445P', _quote(4.40)) == []
+        [signal] = index.on_quote('.SPY445P', _quote(4.60))  # V = −160
+        assert signal.signal_type == 'STOP_LOSS'
+        assert signal.severity == 'URGENT'
+        assert signal.current_pnl == Decimal('-310.00')
+        assert index.on_quote('.SPY445P', _quote(5.00)) == []
+        assert index.on_quote('.SPY445P', _quote(0.50)) == []
+
+    def test_debit_trade_levels(self):
+        legs = [_leg('.SPY500C', 1, 5.00, option_type='call', strike=500)]
+        index = _index(_trade('d1', legs, -500, profit_target=250, stop_loss=250))
+        assert index.on_quote('.SPY500C', _quote(7.00)) == []
+        [signal] = index.on_quote('.SPY500C', _quote(7.60))
+        assert signal.signal_type == 'STOP_LOSS'
+        assert signal.current_pnl == Decimal('-260.00')
+
+        index = _index(_trade('d2', legs, -500, profit_target=250, stop_loss=250))
+        [signal] = index.on_quote('.SPY500C', _quote(2.40))
+        assert signal.signal_type == 'PROFIT_TARGET'
+        assert signal.current_pnl == Decimal('260.00')
+
+    def test_agrees_with_polling_exit_monitor_sign(self):
+        index = _index(_put_spread())
+        [signal] = index.on_quote('.SPY450P', _quote(3.80))
+        assert signal.current_pnl == signal.current_price - signal.entry_price
+
+    def test_falls_back_to_exit_rules(self):
+        trade = _put_spread(profit_target=None, stop_loss=None)
+        index = _index(trade, rules=lambda t: {'profit_target_pct': 0.5, 'stop_loss_pct': None})
+        assert index.on_quote('.SPY445P', _quote(9.00)) == []  # no stop armed
+        assert index.on_quote('.SPY445P', _quote(1.50)) == []
+        [signal] = index.on_quote('.SPY450P', _quote(3.80))
+        assert signal.signal_type == 'PROFIT_TARGET'
+
+    def test_unmarked_leg_waits_for_first_quote(self):
+        trade = _put_spread()
+        trade.legs[1].current_price = None
+        index = _index(trade)
+        assert index.on_quote('.SPY450P', _quote(3.80)) == []
+        # Long leg quote completes the mark: V = 380 − 150 ≥ 225
+        [signal] = index.on_quote('.SPY445P', _quote(1.50))
+        assert signal.signal_type == 'PROFIT_TARGET'
+
+
+class TestStrikeBreach:
+
+    def test_short_put_breach_on_underlying(self):
+        index = _index(_put_spread())
+        assert '.SPY450P' in index.symbols and 'SPY' in index.symbols
+        assert index.on_quote('SPY', _quote(455)) == []
+        [signal] = index.on_quote('SPY', _quote(449))
+        assert signal.signal_type == 'STRIKE_BREACH'
+        assert signal.action == 'ADJUST'
+        assert signal.target_value == 450
+        assert index.on_quote('SPY', _quote(440)) == []
+        assert 'SPY' not in index.symbols
+
+    def test_only_crossed_strikes_fire(self):
+        trades = [
+            _trade(f't{k}', [_leg(f'.SPY{k}P', -1, 1.0, strike=k)], 100)
+            for k in range(300, 500)
+        ]
+        index = _index(*trades)
+        signals = index.on_price('SPY', 489.5)
+        assert sorted(s.target_value for s in signals) == list(range(490, 500))
+
+
+class TestMaintenance:
+
+    def test_remove_trade_clears_levels(self):
+        index = _index(_put_spread('a'), _put_spread('b'))
+        assert index.trade_ids == {'a', 'b'}
+        index.remove_trade('a')
+        [signal] = index.on_quote('.SPY450P', _quote(3.80))
+        assert signal.trade_id == 'b'
+        index.remove_trade('b')
+        assert len(index) == 0
+        assert index.symbols == []
+
+    def test_ignores_one_sided_quotes(self):
+        index = _index(_put_spread())
+        assert index.on_quote('.SPY450P', {'bid': 0, 'ask': 2.0}) == []
@@ -0,0 +1,140 @@
+"""Tests for the expiry-bucketed open-trade index and the 0DTE fast cycle."""
+
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from trading_cotrader.containers.container_manager import ContainerDelta, ContainerManager
+from trading_cotrader.containers.expiry_index import ExpiringTrade, ExpiryIndex
+from trading_cotrader.containers.portfolio_bundle import PortfolioBundle
+from trading_cotrader.core.database.schema import (
+    LegORM, PortfolioORM, StrategyORM, SymbolORM, TradeORM,
+)
+from trading_cotrader.services.intraday_monitor import IntradayMonitorService
+
+TODAY = date.today()
+
+
+def _entry(trade_id, *days, strikes=(450.0,)):
+    return ExpiringTrade(
+        trade_id=trade_id, underlying='SPY', short_strikes=list(strikes),
+        expirations=sorted(TODAY + timedelta(days=d) for d in days),
+    )
+
+
+class TestExpiryIndex:
+
+    def test_expiring_by_only_touches_matching_buckets(self):
+        index = ExpiryIndex()
+        index.rebuild([_entry('a', 0), _entry('b', 1, 30), _entry('c', 30), _entry('d', -1)])
+        ids = {e.trade_id for e in index.expiring_by(TODAY + timedelta(days=1))}
+        assert ids == {'a', 'b', 'd'}
+        assert {e.trade_id for e in index.expiring_by(TODAY - timedelta(days=5))} == set()
+
+    def test_upsert_and_remove_keep_buckets_consistent(self):
+        index = ExpiryIndex()
+        index.upsert(_entry('a', 0))
+        index.upsert(_entry('a', 7))  # rolled out: leaves the 0DTE bucket
+        assert index.expiring_by(TODAY) == []
+        assert index.dte('a') == 7
+
+        index.upsert(_entry('b', 7))
+        index.remove('a')
+        assert [e.trade_id for e in index.expiring_by(TODAY + timedelta(days=7))] == ['b']
+        index.remove('b')
+        assert len(index) == 0
+        assert index._days == []
+
+    def test_dte_uses_earliest_leg(self):
+        index = ExpiryIndex()
+        index.upsert(_entry('cal', 30, 60))
+        assert index.dte('cal') == 30
+        assert index.dte('missing') is None
+
+
+def _add_trade(session, pid, ticker, days, strike=450, qty=-1, profit_target_pct=None):
+    strategy_id = None
+    if profit_target_pct is not None:
+        strategy_id = str(uuid.uuid4())
+        session.add(StrategyORM(id=strategy_id, name='ic', strategy_type='iron_condor',
+                                profit_target_pct=Decimal(str(profit_target_pct))))
+    tid = str(uuid.uuid4())
+    session.add(TradeORM(id=tid, portfolio_id=pid, strategy_id=strategy_id, underlying_symbol=ticker,
+                         trade_type='what_if', trade_status='executed', is_open=True,
+                         entry_price=Decimal('1.20')))
+    sym = SymbolORM(id=str(uuid.uuid4()), ticker=ticker, asset_type='option', option_type='put',
+                    strike=Decimal(strike), multiplier=100,
+                    expiration=datetime.combine(TODAY + timedelta(days=days), datetime.min.time()))
+    session.add(sym)
+    session.add(LegORM(id=str(uuid.uuid4()), trade_id=tid, symbol_id=sym.id, quantity=qty,
+                       side='sell' if qty < 0 else 'buy', entry_price=Decimal('1.20')))
+    return tid
+
+
+@pytest.fixture
+def book(session):
+    pid = str(uuid.uuid4())
+    session.add(PortfolioORM(id=pid, name='desk_0dte', portfolio_type='what_if',
+                             cash_balance=Decimal('10000'), buying_power=Decimal('10000')))
+    zero = _add_trade(session, pid, 'SPX', 0, strike=5800, profit_target_pct=80)
+    monthly = _add_trade(session, pid, 'SPY', 30)
+    session.flush()
+
+    cm = ContainerManager()
+    bundle = PortfolioBundle(config_name='desk', currency='USD')
+    bundle.add_portfolio_id(pid)
+    cm._bundles['desk'] = bundle
+    cm._default_bundle = 'desk'
+    cm.load_all_bundles(session)
+    return {'cm': cm, 'pid': pid, 'zero': zero, 'monthly': monthly}
+
+
+class TestContainerMaintenance:
+
+    def test_full_load_builds_index(self, book):
+        index = book['cm'].expiry_index
+        assert index.is_loaded
+        assert index.dte(book['monthly']) == 30
+        [entry] = index.expiring_by(TODAY)
+        assert entry.trade_id == book['zero']
+        assert entry.short_strikes == [5800.0]
+        assert entry.profit_target_pct == 80.0
+
+    def test_booking_and_close_deltas(self, session, book):
+        cm = book['cm']
+        tid = _add_trade(session, book['pid'], 'QQQ', 1)
+        session.flush()
+        cm.sync(session, ContainerDelta(source='trade_booking', trades={tid}))
+        assert tid in cm.expiry_index
+
+        session.get(TradeORM, book['zero']).is_open = False
+        session.flush()
+        cm.sync(session, ContainerDelta(source='auto_close', trades={book['zero']}))
+        assert {e.trade_id for e in cm.expiry_index.expiring_by(TODAY + timedelta(days=1))} == {tid}
+
+
+class TestFastCyclePositions:
+
+    def test_positions_from_index_without_db(self, book, monkeypatch):
+        def no_db():
+            raise AssertionError("fast cycle must not open a session")
+        monkeypatch.setattr('trading_cotrader.services.intraday_monitor.session_scope', no_db)
+
+        service = IntradayMonitorService(ma=None, expiry_index=book['cm'].expiry_index)
+        [position] = service._get_0dte_positions()
+        assert position['trade_id'] == book['zero']
+        assert position['ticker'] == 'SPX'
+        assert position['short_strikes'] == [5800.0]
+        assert position['profit_target_pct'] == pytest.approx(0.80)
+        assert position['entry_credit'] == pytest.approx(1.20)
+        assert position['structure_type'] == 'iron_condor'
+
+    def test_long_only_trades_are_skipped(self, session, book):
+        cm = book['cm']
+        tid = _add_trade(session, book['pid'], 'IWM', 0, qty=1)
+        session.flush()
+        cm.sync(session, ContainerDelta(source='trade_booking', trades={tid}))
+        service = IntradayMonitorService(ma=None, expiry_index=cm.expiry_index)
+        assert [p['trade_id'] for p in service._get_0dte_positions()] == [book['zero']]
@@ -0,0 +1,124 @@
+"""Tests for the columnar LegStore used by MarkToMarketService."""
+
+import random
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from trading_cotrader.services.leg_store import LegStore, to_decimal
+
+
+def _leg(leg_id, ticker, qty, price, delta='0.30', asset_type='option', strike=500):
+    return SimpleNamespace(
+        id=leg_id, quantity=qty, current_price=Decimal(price), entry_price=Decimal('1.00'),
+        delta=Decimal(delta), gamma=Decimal('0.010000'), theta=Decimal('-0.05'), vega=Decimal('0.12'),
+        symbol=SimpleNamespace(ticker=ticker, asset_type=asset_type, strike=strike),
+    )
+
+
+def _trade(trade_id, legs, entry='1.50', underlying='SPY'):
+    return SimpleNamespace(id=trade_id, legs=legs, entry_price=Decimal(entry), underlying_symbol=underlying)
+
+
+def _streamer(symbol):
+    if symbol.asset_type == 'equity':
+        return symbol.ticker
+    return f".{symbol.ticker}P{symbol.strike}"
+
+
+def _reference(trade):
+    """The original per-leg Decimal loop from MarkToMarketService."""
+    net = delta = gamma = theta = vega = Decimal('0')
+    for leg in trade.legs:
+        qty = leg.quantity or 0
+        mult = 1 if leg.symbol.asset_type == 'equity' else 100
+        value = Decimal(str(leg.current_price or 0)) * abs(qty) * mult
+        net += value if qty < 0 else -value
+        delta += Decimal(str(leg.delta or 0)) * qty * mult
+        gamma += Decimal(str(leg.gamma or 0)) * abs(qty) * mult
+        theta += Decimal(str(leg.theta or 0)) * qty * mult
+        vega += Decimal(str(leg.vega or 0)) * qty * mult
+    return net, delta, gamma, theta, vega
+
+
+def _book(n_trades, seed=1):
+    rng = random.Random(seed)
+    trades = []
+    for t in range(n_trades):
+        legs = [
+            _leg(f'{t}-{i}', 'SPY', rng.choice([-2, -1, 1]), f'{rng.uniform(0.05, 5):.4f}',
+                 delta=f'{rng.uniform(-1, 1):.4f}', strike=480 + 10 * i)
+            for i in range(4)
+        ]
+        if t % 5 == 0:
+            legs.append(_leg(f'{t}-eq', 'SPY', 100, '501.2500', delta='1', asset_type='equity'))
+        trades.append(_trade(str(t), legs, entry=f'{rng.uniform(-3, 3):.4f}'))
+    return trades
+
+
+class TestLegStore:
+
+    def test_aggregates_match_decimal_reference(self):
+        trades = _book(40) + [_trade('empty', [])]
+        agg = LegStore.from_trades(trades).aggregate()
+
+        for i, trade in enumerate(trades):
+            net, delta, gamma, theta, vega = _reference(trade)
+            assert to_decimal(agg.net_current[i]) == net.quantize(Decimal('0.0001'))
+            assert agg.delta[i] == pytest.approx(float(delta), abs=1e-6)
+            assert agg.gamma[i] == pytest.approx(float(gamma), abs=1e-6)
+            assert agg.theta[i] == pytest.approx(float(theta), abs=1e-6)
+            assert agg.vega[i] == pytest.approx(float(vega), abs=1e-6)
+            assert agg.pnl[i] == pytest.approx(float(net - trade.entry_price), abs=1e-6)
+            assert agg.legs_total[i] == len(trade.legs)
+        assert agg.legs_total[-1] == 0 and agg.net_current[-1] == 0
+
+    def test_marks_update_only_quoted_legs_and_write_back_decimal(self):
+        trade = _trade('t1', [
+            _leg('short', 'SPY', -1, '1.00', strike=500),
+            _leg('long', 'SPY', 1, '0.50', strike=490),
+        ])
+        store = LegStore.from_trades([trade], symbol_fn=_streamer)
+        greeks = SimpleNamespace(delta=0.41234, gamma=0.0123456, theta=-0.07, vega=None)
+        marked = store.apply_marks(
+            {'.SPYP500': {'bid': 1.10, 'ask': 1.30}, '.SPYP490': {'bid': 0, 'ask': 0.6}},
+            {'.SPYP500': greeks},
+        )
+        assert marked == 1
+        assert store.marked_leg_ids == {'short'}
+
+        store.write_back_legs()
+        short, long_ = trade.legs
+        assert short.current_price == Decimal('1.2000')
+        assert short.delta == Decimal('0.4123')
+        assert short.gamma == Decimal('0.012346')
+        assert short.vega == Decimal('0.1200')  # missing Greek keeps prior value
+        assert long_.current_price == Decimal('0.50')  # one-sided quote → untouched
+
+        agg = store.aggregate()
+        assert agg.net_current[0] == pytest.approx(1.20 * 100 - 0.50 * 100)
+        assert agg.legs_marked[0] == 2
+
+    def test_aggregate_by_underlying(self):
+        trades = [
+            _trade('a', [_leg('a1', 'SPY', -1, '1', delta='0.3'), _leg('a2', 'QQQ', 2, '1', delta='0.5')]),
+            _trade('b', [_leg('b1', 'SPY', 1, '1', delta='0.2')]),
+        ]
+        totals = LegStore.from_trades(trades).aggregate_by_underlying()
+        assert totals['SPY']['delta'] == pytest.approx(-30 + 20)
+        assert totals['QQQ']['delta'] == pytest.approx(100)
+        assert totals['SPY']['gamma'] == pytest.approx(0.01 * 2 * 100)
+
+    def test_large_book_matches_decimal_reference(self):
+        trades = _book(2500)
+        store = LegStore.from_trades(trades)
+        agg = store.aggregate()
+        expected = [_reference(trade) for trade in trades]
+
+        assert store.leg_count > 10_000
+        assert [to_decimal(v) for v in agg.net_current] == [
+            net.quantize(Decimal('0.0001')) for net, *_ in expected
+        ]
+        for column, k in (('delta', 1), ('gamma', 2), ('theta', 3), ('vega', 4)):
+            assert getattr(agg, column).sum() == pytest.approx(float(sum(e[k] for e in expected)), abs=1e-6)
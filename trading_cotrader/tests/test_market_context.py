@@ -0,0 +1,80 @@
+"""Tests for MarketContextCache (per-cycle regime/technicals memo for health checks)."""
+
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from trading_cotrader.containers.research_container import ResearchContainer
+from trading_cotrader.services.market_context import MarketContextCache
+
+
+class FakeMA:
+    """MA stand-in whose regime/technicals calls are slow and counted."""
+
+    def __init__(self, delay=0.0, fail=()):
+        self.calls = Counter()
+        self.delay = delay
+        self.fail = set(fail)
+        self._lock = threading.Lock()
+        self.regime = SimpleNamespace(detect=lambda t: self._call('regime', t))
+        self.technicals = SimpleNamespace(snapshot=lambda t: self._call('technicals', t))
+
+    def _call(self, kind, ticker):
+        with self._lock:
+            self.calls[(kind, ticker)] += 1
+        time.sleep(self.delay)
+        if ticker in self.fail:
+            raise RuntimeError(f"no data for {ticker}")
+        return f"{kind}:{ticker}"
+
+
+class TestMarketContextCache:
+
+    def test_one_fetch_per_underlying(self):
+        ma = FakeMA()
+        contexts = MarketContextCache(ma)
+        contexts.prefetch(['SPY'] * 10 + ['QQQ'] * 3)
+        for _ in range(10):
+            assert contexts.get('SPY') == ('regime:SPY', 'technicals:SPY')
+
+        assert ma.calls[('regime', 'SPY')] == 1
+        assert ma.calls[('technicals', 'QQQ')] == 1
+        assert contexts.stats.fetched == 2
+
+    def test_fresh_research_results_are_reused(self):
+        research = ResearchContainer()
+        research.cache_analysis('SPY', 'regime', 'cached-regime')
+        research.cache_analysis('SPY', 'technicals', 'cached-tech')
+        research.cache_analysis('IWM', 'regime', 'old-regime')
+        research.cache_analysis('IWM', 'technicals', 'old-tech')
+        research._analysis['IWM']['regime'] = ('old-regime', datetime.utcnow() - timedelta(hours=1))
+
+        ma = FakeMA()
+        contexts = MarketContextCache(ma, research=research)
+        contexts.prefetch(['SPY', 'IWM'])
+
+        assert contexts.get('SPY') == ('cached-regime', 'cached-tech')
+        assert contexts.get('IWM') == ('regime:IWM', 'technicals:IWM')
+        assert ('regime', 'SPY') not in ma.calls
+        assert contexts.stats.to_dict() == {'from_research': 1, 'fetched': 1, 'failed': 0}
+        # Fetched results are written back for the next consumer
+        assert research.get_analysis('IWM', 'regime') == 'regime:IWM'
+
+    def test_failures_are_memoized_as_none(self):
+        ma = FakeMA(fail={'XYZ'})
+        contexts = MarketContextCache(ma)
+        assert contexts.get('XYZ') is None
+        assert contexts.get('XYZ') is None
+        assert ma.calls[('regime', 'XYZ')] == 1
+        assert contexts.stats.failed == 1
+
+    def test_fetches_run_concurrently(self):
+        ma = FakeMA(delay=0.1)
+        contexts = MarketContextCache(ma, max_workers=8)
+        start = time.perf_counter()
+        contexts.prefetch([f'T{i}' for i in range(8)])
+        # 8 underlyings x 2 calls x 0.1s serially would be 1.6s
+        assert time.perf_counter() - start < 0.6
+        assert contexts.stats.fetched == 8
@@ -0,0 +1,88 @@
+"""Tests for the interned OptionKey and its OCC / DXLink / Symbol conversions."""
+
+import pickle
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+import trading_cotrader.core.models.domain as dm
+from trading_cotrader.core.models import option_key
+from trading_cotrader.core.models.option_key import OptionKey, streamer_symbol_for
+
+
+class TestOptionKey:
+
+    def test_occ_and_streamer_round_trip_to_one_key(self):
+        key = OptionKey.from_occ('IWM   260213P00263000')
+        assert key.streamer_symbol == '.IWM260213P263'
+        assert key.occ_symbol == 'IWM   260213P00263000'
+        assert OptionKey.from_streamer('.IWM260213P263') is key
+        assert OptionKey.of('IWM', datetime(2026, 2, 13, 16), 'put', 263.0) is key
+
+    def test_fractional_strike_kept(self):
+        key = OptionKey.of('SPY', date(2026, 3, 20), dm.OptionType.CALL, Decimal('552.50'))
+        assert key.streamer_symbol == '.SPY260320C552.5'
+        assert key.occ_symbol == 'SPY   260320C00552500'
+        assert OptionKey.from_streamer('.SPY260320C552.5') is key
+
+    def test_to_symbol_is_shared_domain_option(self):
+        key = OptionKey.from_streamer('.SPY260320P550')
+        sym = key.to_symbol()
+        assert sym is key.to_symbol()
+        assert (sym.ticker, sym.option_type, sym.strike, sym.multiplier) == \
+            ('SPY', dm.OptionType.PUT, Decimal('550'), 100)
+        assert sym.expiration == datetime(2026, 3, 20)
+        assert OptionKey.from_symbol(sym) is key
+
+    def test_immutable_hashable_picklable(self):
+        key = OptionKey.from_streamer('.QQQ260417C500')
+        with pytest.raises(AttributeError):
+            key.strike = Decimal('1')
+        assert {key: 1}[OptionKey.of('QQQ', '2026-04-17', 'C', 500)] == 1
+        assert pickle.loads(pickle.dumps(key)) is key
+
+    def test_equal_after_intern_table_reset(self):
+        key = OptionKey.from_streamer('.SPY260320P550')
+        option_key.clear_intern_tables()
+        fresh = OptionKey.from_streamer('.SPY260320P550')
+        assert fresh == key and hash(fresh) == hash(key)
+
+    @pytest.mark.parametrize('bad', ['SPY', '.SPY2603P550', '.SPY261340P550', '.SPY260320X550'])
+    def test_invalid_streamer_symbols(self, bad):
+        with pytest.raises(ValueError):
+            OptionKey.from_streamer(bad)
+
+    def test_invalid_occ_symbols(self):
+        with pytest.raises(ValueError):
+            OptionKey.from_occ('IWM 260213')
+        with pytest.raises(ValueError):
+            OptionKey.from_occ('IWM   260213X00263000')
+
+
+class TestStreamerSymbolFor:
+
+    def test_equity_option_and_incomplete(self):
+        equity = SimpleNamespace(ticker='SPY', asset_type='equity')
+        option = SimpleNamespace(ticker='SPY', asset_type='option', option_type='put',
+                                 strike=Decimal('450.000'), expiration=datetime(2026, 3, 20))
+        partial = SimpleNamespace(ticker='SPY', asset_type='option', option_type='put',
+                                  strike=None, expiration=datetime(2026, 3, 20))
+        assert streamer_symbol_for(equity) == 'SPY'
+        assert streamer_symbol_for(option) == '.SPY260320P450'
+        assert streamer_symbol_for(partial) is None
+        assert streamer_symbol_for(None) is None
+
+    def test_trade_spec_legs(self):
+        from trading_cotrader.agents.domain.maverick import _trade_spec_to_leg_inputs
+
+        spec = {'legs': [
+            {'action': 'STO', 'option_type': 'put', 'strike': 580, 'expiration': '2026-03-27'},
+            {'action': 'BTO', 'option_type': 'put', 'strike': 575.0, 'expiration': date(2026, 3, 27)},
+            {'action': 'BTO', 'option_type': 'put', 'strike': 570, 'expiration': 'not-a-date'},
+        ]}
+        assert _trade_spec_to_leg_inputs('SPY', spec, position_size=2) == [
+            {'streamer_symbol': '.SPY260327P580', 'quantity': -2},
+            {'streamer_symbol': '.SPY260327P575', 'quantity': 2},
+        ]
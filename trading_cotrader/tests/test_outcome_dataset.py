@@ -0,0 +1,145 @@
+"""Tests for the shared, incrementally synced closed-trade outcome dataset."""
+
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from trading_cotrader.core.database.schema import PortfolioORM, StrategyORM, TradeORM
+from trading_cotrader.services import outcome_dataset
+from trading_cotrader.services.outcome_dataset import OutcomeDataset, get_outcome_dataset
+
+NOW = datetime.utcnow()
+
+
+@pytest.fixture
+def dataset(global_db, monkeypatch):
+    get_outcome_dataset()  # installs the flush and commit hooks
+    ds = OutcomeDataset(max_age=3600)
+    monkeypatch.setattr(outcome_dataset, '_dataset', ds)
+    return ds
+
+
+@pytest.fixture
+def desks(global_db):
+    ids = {'desk_a': str(uuid.uuid4()), 'desk_b': str(uuid.uuid4())}
+    with global_db.session_scope() as session:
+        for name, pid in ids.items():
+            session.add(PortfolioORM(id=pid, name=name, portfolio_type='what_if',
+                                     cash_balance=Decimal('1000'), buying_power=Decimal('1000')))
+        session.add(StrategyORM(id='strat-ic', name='IC', strategy_type='iron_condor'))
+        session.add(StrategyORM(id='strat-vs', name='VS', strategy_type='vertical_spread'))
+    return ids
+
+
+def _trade(pid, *, closed_days_ago=None, pnl=50, strategy='strat-ic', regime='R2'):
+    return TradeORM(
+        id=str(uuid.uuid4()), portfolio_id=pid, strategy_id=strategy,
+        underlying_symbol='SPY', trade_type='what_if', trade_status='closed',
+        entry_price=Decimal('1.00'), max_risk=Decimal('400'), total_pnl=Decimal(pnl),
+        regime_at_entry=regime, opened_at=NOW - timedelta(days=40),
+        is_open=closed_days_ago is None,
+        closed_at=None if closed_days_ago is None else NOW - timedelta(days=closed_days_ago),
+    )
+
+
+@pytest.fixture
+def trades(global_db, desks):
+    rows = [
+        _trade(desks['desk_a'], closed_days_ago=5),
+        _trade(desks['desk_a'], closed_days_ago=30, pnl=-80, strategy='strat-vs', regime='R3'),
+        _trade(desks['desk_b'], closed_days_ago=2),
+        _trade(desks['desk_b'], closed_days_ago=400),   # outside the horizon
+        _trade(desks['desk_b']),                        # still open
+    ]
+    ids = [t.id for t in rows]
+    with global_db.session_scope() as session:
+        session.add_all(rows)
+    return ids
+
+
+class TestOutcomeDataset:
+
+    def test_loads_closed_trades_once(self, dataset, trades, desks):
+        assert len(dataset) == 3
+        assert dataset.queries == 1
+        desk_a = dataset.select(portfolio_id=desks['desk_a'])
+        assert dataset.column('trade_id', desk_a) == [trades[1], trades[0]]  # by close time
+        assert dataset.column('trade_id', dataset.select(days=10)) == [trades[0], trades[2]]
+        assert dataset.queries == 1
+
+    def test_derived_columns_and_indexes(self, dataset, trades, desks):
+        [row] = dataset.records(dataset.select(strategy_type='vertical_spread'))
+        assert row['trade_id'] == trades[1]
+        assert row['regime'] == 3
+        assert row['pnl_pct'] == pytest.approx(-0.2)
+        assert row['holding_days'] == 10
+        assert len(dataset.select(regime=2, portfolio_id=desks['desk_b'])) == 1
+        assert dataset.select(regime=9) == []
+
+    def test_close_event_reloads_only_that_trade(self, dataset, trades, global_db):
+        assert len(dataset) == 3
+        version = dataset.version
+        with global_db.session_scope() as session:
+            trade = session.get(TradeORM, trades[4])
+            trade.is_open = False
+            trade.closed_at = NOW
+            trade.total_pnl = Decimal('120')
+        assert len(dataset) == 4
+        assert dataset.queries == 2
+        assert dataset.version > version
+        [pnl] = dataset.column('pnl_dollars', dataset.select(days=1))
+        assert pnl == 120
+        assert len(dataset) == 4 and dataset.queries == 2  # nothing dirty, no query
+
+    def test_reopen_and_delete_remove_rows(self, dataset, trades, desks, global_db):
+        assert len(dataset) == 3
+        with global_db.session_scope() as session:
+            session.get(TradeORM, trades[0]).is_open = True
+            session.delete(session.get(TradeORM, trades[2]))
+        assert dataset.column('trade_id', dataset.select()) == [trades[1]]
+        assert dataset.select(portfolio_id=desks['desk_b']) == []
+
+    def test_open_trade_edits_do_not_dirty(self, dataset, trades, global_db):
+        assert len(dataset) == 3
+        with global_db.session_scope() as session:
+            session.get(TradeORM, trades[4]).current_price = Decimal('2')
+        assert len(dataset) == 3
+        assert dataset.queries == 1
+
+    def test_rolled_back_close_is_never_published(self, dataset, trades, global_db):
+        assert len(dataset) == 3
+        session = global_db.get_session()
+        try:
+            trade = session.get(TradeORM, trades[4])
+            trade.is_open, trade.closed_at = False, NOW
+            session.flush()
+            assert len(dataset) == 3 and dataset.queries == 1  # flushed, not committed
+            session.rollback()
+        finally:
+            session.close()
+        assert len(dataset) == 3
+        assert dataset.queries == 1
+
+        with global_db.session_scope() as session:
+            savepoint = session.begin_nested()
+            trade = session.get(TradeORM, trades[4])
+            trade.is_open, trade.closed_at = False, NOW
+            savepoint.commit()
+            assert len(dataset) == 3  # released savepoint, outer still open
+        assert len(dataset) == 4
+
+    def test_external_writes_picked_up_by_poll(self, dataset, trades, global_db):
+        assert len(dataset) == 3
+        with global_db.engine.begin() as conn:  # bypasses the ORM flush hook
+            conn.execute(TradeORM.__table__.update().where(TradeORM.id == trades[4]).values(
+                is_open=False, closed_at=NOW, last_updated=datetime.utcnow()))
+        assert len(dataset) == 3
+        dataset.max_age = 0
+        assert len(dataset) == 4
+
+    def test_wider_window_reloads_with_bigger_horizon(self, dataset, trades):
+        assert len(dataset.select(days=90)) == 3
+        assert len(dataset.select(days=500)) == 4
+        assert dataset.horizon_days == 500
@@ -0,0 +1,129 @@
+"""Tests for the dependency-graph agent pipeline scheduler."""
+
+import threading
+import time
+
+import pytest
+
+from trading_cotrader.agents.workflow.pipeline import (
+    CANCELLED, ERROR, OK, SKIPPED, TIMEOUT, PipelineScheduler, PipelineStage,
+)
+
+
+def _sleeper(seconds, log=None, name=None, value=None):
+    def fn():
+        if log is not None:
+            log.append(('start', name))
+        time.sleep(seconds)
+        if log is not None:
+            log.append(('end', name))
+        return value
+    return fn
+
+
+class TestPipelineScheduler:
+
+    def test_independent_stages_overlap(self):
+        scheduler = PipelineScheduler([
+            PipelineStage('populate', _sleeper(0.05)),
+            PipelineStage('risk', _sleeper(0.2), after=('populate',)),
+            PipelineStage('capital', _sleeper(0.2), after=('populate',)),
+            PipelineStage('research', _sleeper(0.25)),
+            PipelineStage('trade', _sleeper(0.05), after=('risk', 'capital', 'research')),
+        ])
+        t0 = time.monotonic()
+        runs = scheduler.run()
+        wall = time.monotonic() - t0
+
+        assert all(r.status == OK for r in runs.values())
+        serial = sum(r.duration_ms for r in runs.values()) / 1000
+        critical = scheduler.critical_path_ms(runs) / 1000
+        assert wall < serial * 0.7
+        assert wall == pytest.approx(critical, abs=0.15)
+
+    def test_dependants_start_after_dependencies_finish(self):
+        log = []
+        PipelineScheduler([
+            PipelineStage('b', _sleeper(0.01, log, 'b'), after=('a',)),
+            PipelineStage('a', _sleeper(0.05, log, 'a')),
+            PipelineStage('c', _sleeper(0.01, log, 'c'), after=('b',)),
+        ]).run()
+        assert log.index(('end', 'a')) < log.index(('start', 'b'))
+        assert log.index(('end', 'b')) < log.index(('start', 'c'))
+
+    def test_timeout_does_not_block_dependants(self):
+        release = threading.Event()
+        ran = []
+        scheduler = PipelineScheduler([
+            PipelineStage('slow', release.wait, timeout=0.05),
+            PipelineStage('next', lambda: ran.append('next'), after=('slow',)),
+        ])
+        t0 = time.monotonic()
+        runs = scheduler.run()
+        release.set()
+        assert time.monotonic() - t0 < 1
+        assert runs['slow'].status == TIMEOUT
+        assert runs['slow'].duration_ms == 50
+        assert runs['next'].status == OK and ran == ['next']
+
+    def test_failure_recorded_and_dependants_still_run(self):
+        def boom():
+            raise RuntimeError('broker down')
+
+        runs = PipelineScheduler([
+            PipelineStage('scout', boom),
+            PipelineStage('maverick', lambda: 'proposals', after=('scout',)),
+        ]).run()
+        assert runs['scout'].status == ERROR and runs['scout'].error == 'broker down'
+        assert runs['maverick'].result == 'proposals'
+
+    def test_when_guard_evaluated_at_dispatch(self):
+        context = {}
+        runs = PipelineScheduler([
+            PipelineStage('propose', lambda: context.update(proposals=[1])),
+            PipelineStage('book', lambda: 'booked', after=('propose',),
+                          when=lambda: bool(context.get('proposals'))),
+            PipelineStage('close', lambda: 'closed', after=('book',),
+                          when=lambda: bool(context.get('exit_signals'))),
+            PipelineStage('report', lambda: 'ok', after=('close',)),
+        ]).run()
+        assert runs['book'].status == OK
+        assert runs['close'].status == SKIPPED
+        assert runs['report'].status == OK
+
+    def test_cancel_stops_dispatch(self):
+        cancel = threading.Event()
+
+        def first():
+            cancel.set()
+            return 1
+
+        runs = PipelineScheduler([
+            PipelineStage('first', first),
+            PipelineStage('second', lambda: 2, after=('first',)),
+        ]).run(cancel=cancel)
+        assert runs['first'].status == OK
+        assert runs['second'].status == CANCELLED
+
+    def test_stage_callback_gets_timings(self):
+        done = []
+        PipelineScheduler([
+            PipelineStage('a', _sleeper(0.02)),
+            PipelineStage('b', lambda: None, when=lambda: False),
+        ], on_stage_done=done.append).run()
+        assert [r.name for r in done] == ['a']
+        assert done[0].duration_ms >= 15
+        assert done[0].finished_at >= done[0].started_at
+
+    def test_invalid_graphs(self):
+        with pytest.raises(ValueError, match='cycle'):
+            PipelineScheduler([
+                PipelineStage('a', lambda: None, after=('b',)),
+                PipelineStage('b', lambda: None, after=('a',)),
+            ])
+        with pytest.raises(ValueError, match='unknown'):
+            PipelineScheduler([PipelineStage('a', lambda: None, after=('nope',))])
+        with pytest.raises(ValueError, match='Duplicate'):
+            PipelineScheduler([PipelineStage('a', lambda: None), PipelineStage('a', lambda: None)])
+        with pytest.raises(ValueError, match='cannot have a timeout'):
+            PipelineScheduler([PipelineStage('book', lambda: None, timeout=5, mutates=True)])
@@ -0,0 +1,136 @@
+"""Tests for PortfolioSyncService diff-based position reconciliation."""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+import trading_cotrader.core.models.domain as dm
+from trading_cotrader.containers.container_manager import ContainerManager, EventType
+from trading_cotrader.containers.portfolio_bundle import PortfolioBundle
+from trading_cotrader.core.database.schema import PositionGreeksSnapshotORM, PositionORM
+from trading_cotrader.services.portfolio_sync import PortfolioSyncService
+
+
+class FakeBroker:
+    """Broker adapter stand-in with a mutable book."""
+
+    account_id = 'ACCT1'
+
+    def __init__(self, positions):
+        self.positions = positions
+
+    def get_account_balance(self):
+        return {
+            'cash_balance': Decimal('10000'),
+            'buying_power': Decimal('20000'),
+            'net_liquidating_value': Decimal('30000'),
+        }
+
+    def get_positions(self):
+        return list(self.positions)
+
+
+def _put(broker_id, qty=-1, current='1.20', delta='0.30'):
+    symbol = dm.Symbol(
+        ticker='SPY', asset_type=dm.AssetType.OPTION, option_type=dm.OptionType.PUT,
+        strike=Decimal(broker_id.split('-')[-1]), expiration=datetime(2026, 12, 18), multiplier=100,
+    )
+    position = dm.Position(
+        symbol=symbol, quantity=qty, entry_price=Decimal('1.50'),
+        current_price=Decimal(current), market_value=Decimal(current) * qty * 100,
+        total_cost=Decimal('1.50') * qty * 100, broker_position_id=broker_id,
+    )
+    position.greeks = dm.Greeks(
+        delta=Decimal(delta) * qty, gamma=Decimal('0.01'), theta=Decimal('0.05'),
+        vega=Decimal('-0.10'), rho=Decimal('0'), timestamp=datetime.utcnow(),
+    )
+    return position
+
+
+def _sync(session, broker):
+    result = PortfolioSyncService(session, broker).sync_portfolio()
+    assert result.success, result.error
+    return result
+
+
+class TestPositionReconciliation:
+
+    def test_resync_keeps_row_ids_and_history(self, session):
+        broker = FakeBroker([_put('p-540'), _put('p-550'), _put('p-560')])
+        first = _sync(session, broker)
+        assert len(first.changes.inserted) == 3
+        ids = {r.broker_position_id: r.id for r in session.query(PositionORM)}
+
+        session.add(PositionGreeksSnapshotORM(
+            id=str(uuid.uuid4()), position_id=ids['p-540'], timestamp=datetime.utcnow(),
+        ))
+        session.flush()
+
+        # Fresh domain objects (new uuids) for the same broker positions
+        broker.positions = [_put('p-540'), _put('p-550'), _put('p-560')]
+        second = _sync(session, broker)
+        assert second.changes.is_empty
+        assert second.changes.unchanged == 3
+        assert second.positions_synced == 3
+        assert {r.broker_position_id: r.id for r in session.query(PositionORM)} == ids
+        assert session.query(PositionGreeksSnapshotORM).count() == 1
+
+    def test_change_set_covers_insert_update_delete(self, session):
+        broker = FakeBroker([_put('p-540'), _put('p-550'), _put('p-560')])
+        _sync(session, broker)
+        ids = {r.broker_position_id: r.id for r in session.query(PositionORM)}
+
+        broker.positions = [_put('p-540'), _put('p-550', qty=-2, current='0.90'), _put('p-570')]
+        changes = _sync(session, broker).changes
+
+        assert changes.updated == [ids['p-550']]
+        assert changes.deleted == [ids['p-560']]
+        assert len(changes.inserted) == 1
+        assert changes.unchanged == 1
+
+        row = session.get(PositionORM, ids['p-550'])
+        session.refresh(row)
+        assert row.quantity == -2
+        assert float(row.current_price) == pytest.approx(0.90)
+        assert sorted(r.broker_position_id for r in session.query(PositionORM)) == [
+            'p-540', 'p-550', 'p-570',
+        ]
+
+    def test_portfolio_aggregates_from_sql_sum(self, session):
+        from trading_cotrader.core.database.schema import PortfolioORM
+
+        broker = FakeBroker([_put('p-540'), _put('p-550', qty=-2)])
+        result = _sync(session, broker)
+        portfolio = session.get(PortfolioORM, result.portfolio_id)
+        session.refresh(portfolio)
+        assert float(portfolio.portfolio_delta) == pytest.approx(-0.30 - 0.60)
+
+    def test_container_manager_applies_change_set(self, session):
+        broker = FakeBroker([_put('p-540'), _put('p-550')])
+        first = _sync(session, broker)
+
+        cm = ContainerManager()
+        bundle = PortfolioBundle(config_name='tastytrade', currency='USD')
+        bundle.add_portfolio_id(first.portfolio_id)
+        cm._bundles['tastytrade'] = bundle
+        event = cm.apply_position_changes(session, first.changes)
+        assert event.event_type == EventType.POSITION_UPDATE
+        assert bundle.positions.count == 2
+        assert bundle.risk_factors.get('SPY').position_count == 2
+
+        events = []
+        cm.add_event_listener(events.append)
+        broker.positions = [_put('p-540', current='2.00')]
+        second = _sync(session, broker)
+        cm.apply_position_changes(session, second.changes)
+
+        assert bundle.positions.count == 1
+        (state,) = bundle.positions.get_all()
+        assert state.current_price == Decimal('2.00')
+        assert {cu.column for cu in events[0].cell_updates if cu.grid_type == 'positions'} >= {'current_price'}
+        assert events[0].data['deleted'] == second.changes.deleted
+
+        # Nothing changed → nothing applied
+        assert cm.apply_position_changes(session, _sync(session, broker).changes) is None
@@ -181,6 +181,151 @@ class TestScoutAgentPopulate:
         assert result.data['tickers'] == 0
 
 
+class TestScoutPopulateFanOut:
+    """Test _populate_from_library() parallel fan-out."""
+
+    @staticmethod
+    def _slow_ma(delay=0.05, hang=None, tracker=None):
+        """market_analyzer stand-in where every call sleeps `delay` seconds."""
+        import threading
+        import time
+        from types import SimpleNamespace
+
+        lock = threading.Lock()
+
+        def result(payload):
+            return SimpleNamespace(model_dump=lambda mode=None: payload)
+
+        def call(stage, payload_fn):
+            def fn(*args, **kwargs):
+                with lock:
+                    tracker['now'][stage] = tracker['now'].get(stage, 0) + 1
+                    tracker['peak'][stage] = max(tracker['peak'].get(stage, 0), tracker['now'][stage])
+                try:
+                    time.sleep(1 if hang == stage else delay)
+                    return payload_fn(*args, **kwargs)
+                finally:
+                    with lock:
+                        tracker['now'][stage] -= 1
+            return fn
+
+        ma = MagicMock()
+        ma.regime.detect_batch.side_effect = call('regime_batch', lambda tickers: {
+            t: SimpleNamespace(regime=SimpleNamespace(value=1, name='R1'), confidence=0.9,
+                               trend_direction='up') for t in tickers
+        })
+        ma.regime.research.side_effect = call(
+            'regime', lambda t: SimpleNamespace(strategy_comment=f'{t} income'))
+        ma.technicals.snapshot.side_effect = call('technicals', lambda t: result({'rsi': {'value': 55}}))
+        ma.phase.detect.side_effect = call('phase', lambda t: result({'phase': 'markup'}))
+        for name in ('assess_zero_dte', 'assess_leap', 'assess_breakout', 'assess_momentum'):
+            getattr(ma.opportunity, name).side_effect = call(
+                'opportunity', lambda t: result({'verdict': 'go', 'confidence': 0.7}))
+        ma.levels.analyze.side_effect = call('levels', lambda t: result({'direction': 'long'}))
+        ma.fundamentals.get.side_effect = call('fundamentals', lambda t: result({}))
+        ma.macro.calendar.side_effect = call('macro', lambda lookahead_days: result({}))
+        return ma
+
+    def test_stages_run_concurrently_and_stream_into_container(self):
+        import time
+        from trading_cotrader.containers.research_container import ResearchContainer
+
+        tickers = [f'T{i}' for i in range(10)]
+        tracker = {'now': {}, 'peak': {}}
+        agent = ScoutAgent(container=ResearchContainer(), max_workers=16,
+                           stage_limits={'fundamentals': 2})
+        agent._market_analyzer = self._slow_ma(tracker=tracker)
+
+        start = time.monotonic()
+        stats = agent._populate_from_library(tickers)
+        elapsed = time.monotonic() - start
+
+        # 91 calls at 50ms each would take ~4.5s serially
+        assert elapsed < 2.0
+        assert stats['errors'] == []
+        for key in ('regime', 'technicals', 'phase', 'opportunities', 'levels', 'fundamentals'):
+            assert stats[key] == 10
+        assert stats['macro'] is True
+        assert tracker['peak']['fundamentals'] <= 2
+        assert tracker['peak']['technicals'] > 1
+
+        entry = agent.container.get('T3')
+        assert entry.hmm_strategy_comment == 'T3 income'
+        assert entry.opp_leap_verdict == 'go' and entry.opp_momentum_verdict == 'go'
+
+        timings = stats['timings']
+        assert timings['opportunity']['calls'] == 40
+        assert timings['technicals']['ok'] == 10
+        assert timings['technicals']['max_seconds'] >= 0.05
+
+    def test_hung_call_times_out_without_stalling(self):
+        import time
+        from trading_cotrader.containers.research_container import ResearchContainer
+
+        agent = ScoutAgent(container=ResearchContainer(), stage_timeouts={'levels': 0.2})
+        agent._market_analyzer = self._slow_ma(delay=0.01, hang='levels',
+                                               tracker={'now': {}, 'peak': {}})
+
+        start = time.monotonic()
+        stats = agent._populate_from_library(['SPY', 'QQQ'], skip_fundamentals=True)
+        assert time.monotonic() - start < 2.0
+
+        assert stats['levels'] == 0
+        assert stats['technicals'] == 2
+        assert stats['timings']['levels']['timed_out'] == 2
+        assert 'fundamentals' not in stats['timings']
+        assert any('levels(SPY): timed out' in e for e in stats['errors'])
+
+    def test_hung_calls_hold_their_slots_until_they_return(self):
+        import threading
+        import time
+        from trading_cotrader.agents.domain.scout import _StageFanOut, _StageTask
+
+        release = threading.Event()
+        running = []
+
+        def hang():
+            running.append(1)
+            release.wait(5)
+
+        fan_out = _StageFanOut(max_workers=2, stage_limits={'levels': 1},
+                               stage_timeouts={'levels': 0.05}, deadline=0.5)
+        tasks = [_StageTask('levels', t, hang, lambda r: None) for t in ('SPY', 'QQQ', 'IWM')]
+        errors = []
+        start = time.monotonic()
+        timings, _ = fan_out.run(tasks, errors)
+
+        assert time.monotonic() - start < 2.0  # deadline, not a spin
+        assert len(running) == 1  # the hung call kept the only 'levels' slot
+        assert timings['levels'].timed_out == 3
+        assert any('QQQ' in e and 'not started' in e for e in errors)
+        assert all(t.daemon for t in threading.enumerate() if t.name.startswith('scout-'))
+
+        # Slot still held across runs until the hung call returns
+        done = []
+        fan_out.deadline = 0.2
+        fan_out.run([_StageTask('levels', 'DIA', lambda: 1, done.append)], errors)
+        assert done == []
+        release.set()
+        fan_out.deadline = 5
+        fan_out.run([_StageTask('levels', 'DIA', lambda: 1, done.append)], errors)
+        assert done == [1]
+
+    def test_failed_call_is_isolated(self):
+        from trading_cotrader.containers.research_container import ResearchContainer
+
+        agent = ScoutAgent(container=ResearchContainer())
+        ma = self._slow_ma(delay=0, tracker={'now': {}, 'peak': {}})
+        ma.technicals.snapshot.side_effect = Exception("no data")
+        agent._market_analyzer = ma
+
+        stats = agent._populate_from_library(['SPY'], skip_fundamentals=True)
+        assert stats['technicals'] == 0
+        assert stats['phase'] == 1
+        assert stats['timings']['technicals']['failed'] == 1
+        assert 'technicals(SPY): no data' in stats['errors']
+
+
 class TestTradeSourceEnum:
     """Test TradeSource enum has research values."""
 
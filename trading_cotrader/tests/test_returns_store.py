@@ -0,0 +1,140 @@
+"""Tests for the per-symbol ReturnsStore and its use by CorrelationAnalyzer."""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_cotrader.services.risk.correlation import CorrelationAnalyzer
+from trading_cotrader.services.risk.returns_store import LocalFileProvider, ReturnsStore
+
+TODAY = date.today()
+
+
+def _write_prices(directory, symbol, days, seed, fmt='csv'):
+    """Geometric random walk of `days` business days ending today."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=TODAY, periods=days)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size=days)))
+    frame = pd.DataFrame({'date': dates, 'close': closes})
+    if fmt == 'parquet':
+        frame.to_parquet(directory / f"{symbol}.parquet", index=False)
+    else:
+        frame.to_csv(directory / f"{symbol}.csv", index=False)
+    return pd.Series(closes, index=dates)
+
+
+class CountingProvider(LocalFileProvider):
+    """LocalFileProvider that records every (symbols, start) request."""
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.calls = []
+
+    def get_closes(self, symbols, start, end):
+        self.calls.append((list(symbols), start))
+        return super().get_closes(symbols, start, end)
+
+
+@pytest.fixture
+def prices(tmp_path):
+    directory = tmp_path / 'prices'
+    directory.mkdir()
+    series = {
+        'SPY': _write_prices(directory, 'SPY', 300, seed=1),
+        'QQQ': _write_prices(directory, 'QQQ', 300, seed=2, fmt='parquet'),
+        'IWM': _write_prices(directory, 'IWM', 300, seed=3),
+    }
+    return directory, series
+
+
+class TestReturnsStore:
+
+    def test_returns_match_prices_and_persist(self, tmp_path, prices):
+        directory, series = prices
+        store = ReturnsStore(tmp_path / 'returns', provider=LocalFileProvider(directory))
+        symbols, returns = store.aligned_returns(['SPY', 'QQQ'], lookback_days=100)
+
+        assert symbols == ['SPY', 'QQQ']
+        assert returns.shape == (100, 2)
+        expected = np.diff(np.log(series['QQQ'].values))[-100:]
+        np.testing.assert_allclose(returns[:, 1], expected)
+        assert (tmp_path / 'returns' / 'SPY.npy').exists()
+
+        # A new process reads from disk without touching the provider
+        offline = CountingProvider(directory / 'missing')
+        reopened = ReturnsStore(tmp_path / 'returns', provider=offline)
+        _, again = reopened.aligned_returns(['SPY', 'QQQ'], lookback_days=100)
+        np.testing.assert_allclose(again, returns)
+
+    def test_appends_only_missing_days(self, tmp_path, prices):
+        directory, series = prices
+        provider = CountingProvider(directory)
+        store = ReturnsStore(tmp_path / 'returns', provider=provider)
+        store.ensure(['SPY'], lookback_days=100, today=TODAY - timedelta(days=10))
+        stored = store.read('SPY')
+        last = stored['day'][-1]
+
+        provider.calls.clear()
+        appended = store.ensure(['SPY'], lookback_days=100)
+        ((symbols, start),) = provider.calls
+        assert symbols == ['SPY']
+        assert (start - date(1970, 1, 1)).days == last  # one-day overlap, nothing older
+        assert appended == len(series['SPY'][series['SPY'].index.date > TODAY - timedelta(days=10)])
+
+        # Already refreshed today: no further provider calls
+        provider.calls.clear()
+        store.ensure(['SPY'], lookback_days=100)
+        assert provider.calls == []
+
+    def test_new_symbol_fetches_only_that_symbol(self, tmp_path, prices):
+        directory, _ = prices
+        provider = CountingProvider(directory)
+        store = ReturnsStore(tmp_path / 'returns', provider=provider)
+        store.aligned_returns(['SPY', 'QQQ'], lookback_days=100)
+
+        provider.calls.clear()
+        store.aligned_returns(['SPY', 'QQQ', 'IWM'], lookback_days=100)
+        assert [symbols for symbols, _ in provider.calls] == [['IWM']]
+
+    def test_subset_is_column_slice_of_shared_panel(self, tmp_path, prices):
+        directory, _ = prices
+        store = ReturnsStore(tmp_path / 'returns', provider=LocalFileProvider(directory))
+        symbols = ['SPY', 'QQQ', 'IWM']
+        _, full = store.aligned_returns(symbols, lookback_days=120)
+        _, pair = store.aligned_returns(['IWM', 'SPY'], lookback_days=120)
+
+        np.testing.assert_allclose(pair, full[:, [2, 0]])
+        np.testing.assert_allclose(np.cov(pair, rowvar=False), np.cov(full, rowvar=False)[np.ix_([2, 0], [2, 0])])
+
+    def test_short_history_symbol_is_dropped(self, tmp_path, prices):
+        directory, _ = prices
+        _write_prices(directory, 'NEW', 10, seed=4)
+        store = ReturnsStore(tmp_path / 'returns', provider=LocalFileProvider(directory))
+        symbols, returns = store.aligned_returns(['SPY', 'NEW'], lookback_days=100)
+        assert symbols == ['SPY']
+        assert returns.shape == (100, 1)
+
+
+class TestCorrelationAnalyzerOffline:
+
+    def test_matrix_from_local_store(self, tmp_path, prices):
+        directory, series = prices
+        store = ReturnsStore(tmp_path / 'returns', provider=LocalFileProvider(directory))
+        analyzer = CorrelationAnalyzer(returns_store=store)
+        matrix = analyzer.calculate_correlation_matrix(['SPY', 'QQQ', 'UNKNOWN'], lookback_days=120)
+
+        spy = np.diff(np.log(series['SPY'].values))[-120:]
+        qqq = np.diff(np.log(series['QQQ'].values))[-120:]
+        assert matrix.get_correlation('SPY', 'QQQ') == pytest.approx(np.corrcoef(spy, qqq)[0, 1])
+        assert matrix.covariance_matrix.shape == (2, 2)
+        assert matrix.returns_data.shape == (120, 2)
+        assert matrix.get_correlation('SPY', 'UNKNOWN') is None
+        assert matrix.get_volatility('SPY') == pytest.approx(np.std(spy, ddof=1) * np.sqrt(252))
+
+    def test_no_history_gives_empty_matrix(self, tmp_path):
+        store = ReturnsStore(tmp_path / 'returns', provider=LocalFileProvider(tmp_path))
+        matrix = CorrelationAnalyzer(returns_store=store).calculate_correlation_matrix(['SPY', 'QQQ'])
+        assert matrix.matrix == {}
+        assert matrix.volatilities == {}
@@ -0,0 +1,231 @@
+"""Tests for snapshot downsampling tiers, retention and tier routing."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from trading_cotrader.core.database.schema import (
+    GreeksHistoryORM, PortfolioORM, PositionGreeksSnapshotORM, PositionORM, SymbolORM,
+    TimeSeriesRollupORM,
+)
+from trading_cotrader.services.snapshot_rollup import RetentionPolicy, SnapshotRollupService
+
+DAY = datetime(2026, 3, 2)
+
+
+@pytest.fixture
+def position(session):
+    portfolio = PortfolioORM(
+        id=str(uuid.uuid4()), name='rollup', portfolio_type='real',
+        cash_balance=Decimal('1000'), total_equity=Decimal('1000'), tags=[],
+    )
+    symbol = SymbolORM(
+        id=str(uuid.uuid4()), ticker='SPY', asset_type='OPTION', option_type='PUT',
+        strike=Decimal('450'), expiration=datetime(2026, 6, 19), multiplier=100,
+    )
+    session.add_all([portfolio, symbol])
+    session.flush()
+    pos = PositionORM(
+        id=str(uuid.uuid4()), portfolio_id=portfolio.id, symbol_id=symbol.id, quantity=-1,
+        entry_price=Decimal('3'), total_cost=Decimal('300'),
+    )
+    session.add(pos)
+    session.flush()
+    return pos
+
+
+def _delta(minute):
+    """Deterministic zig-zag so every bucket has distinct open/high/low/close."""
+    return round(-0.30 + 0.001 * (minute % 7) - 0.0005 * (minute // 60), 4)
+
+
+@pytest.fixture
+def intraday(session, position):
+    """One snapshot per minute from 14:00 to 16:59."""
+    for minute in range(180):
+        session.add(PositionGreeksSnapshotORM(
+            id=str(uuid.uuid4()), position_id=position.id,
+            timestamp=DAY.replace(hour=14) + timedelta(minutes=minute),
+            delta=Decimal(str(_delta(minute))), theta=Decimal('0.05'),
+            gamma=Decimal('0.01'), vega=Decimal('-0.1'), underlying_price=Decimal('450'),
+        ))
+    session.flush()
+    return position
+
+
+def _tier(session, tier):
+    return (
+        session.query(TimeSeriesRollupORM)
+        .filter_by(tier=tier)
+        .order_by(TimeSeriesRollupORM.bucket_start)
+        .all()
+    )
+
+
+class TestRollup:
+
+    def test_tiers_built_with_ohlc(self, session, intraday):
+        result = SnapshotRollupService(session).compact(now=DAY + timedelta(days=1, hours=1))
+        assert result.rolled['position_greeks:5m'] == 36
+        assert result.rolled['position_greeks:1h'] == 3
+        assert result.rolled['position_greeks:1d'] == 1
+
+        five = _tier(session, '5m')[0]
+        values = [_delta(m) for m in range(5)]
+        assert five.samples == 5
+        assert float(five.delta_open) == pytest.approx(values[0])
+        assert float(five.delta_high) == pytest.approx(max(values))
+        assert float(five.delta_low) == pytest.approx(min(values))
+        assert float(five.delta_close) == pytest.approx(values[-1])
+
+        hour = _tier(session, '1h')[1]  # 15:00, built from 5m buckets
+        values = [_delta(m) for m in range(60, 120)]
+        assert hour.samples == 60
+        assert float(hour.delta_high) == pytest.approx(max(values))
+        assert float(hour.delta_low) == pytest.approx(min(values))
+        assert float(hour.delta_close) == pytest.approx(values[-1])
+
+        day = _tier(session, '1d')[0]
+        assert day.samples == 180
+        assert float(day.delta_open) == pytest.approx(_delta(0))
+        assert float(day.delta_close) == pytest.approx(_delta(179))
+
+    def test_only_complete_buckets_and_idempotent(self, session, intraday):
+        svc = SnapshotRollupService(session)
+        svc.compact(now=DAY.replace(hour=15, minute=32))
+        assert len(_tier(session, '5m')) == 18  # 14:00 .. 15:25
+        assert len(_tier(session, '1h')) == 1
+        assert _tier(session, '1d') == []
+
+        svc.compact(now=DAY + timedelta(days=1, hours=1))
+        svc.compact(now=DAY + timedelta(days=1, hours=1))
+        assert len(_tier(session, '5m')) == 36
+        assert len(_tier(session, '1h')) == 3
+        assert len(_tier(session, '1d')) == 1
+
+    def test_retention_drops_only_rolled_rows(self, session, intraday):
+        svc = SnapshotRollupService(session, RetentionPolicy(raw_days=7, five_min_days=30))
+        # Raw rows past retention but never rolled up are kept
+        svc.apply_retention(now=DAY + timedelta(days=10))
+        assert session.query(PositionGreeksSnapshotORM).count() == 180
+
+        # The newest 5m bucket's raw rows stay until a later bucket supersedes it
+        result = svc.compact(now=DAY + timedelta(days=10))
+        assert result.deleted['position_greeks:raw'] == 175
+        assert session.query(PositionGreeksSnapshotORM).count() == 5
+        assert len(_tier(session, '5m')) == 36
+
+        svc.compact(now=DAY + timedelta(days=40))
+        assert [b.bucket_start.hour for b in _tier(session, '5m')] == [16] * 12
+        assert len(_tier(session, '1h')) == 3
+        assert len(_tier(session, '1d')) == 1
+
+
+class TestRouting:
+
+    @pytest.mark.parametrize('days,tier', [
+        (0.1, 'raw'), (1, '5m'), (15, '1h'), (90, '1d'), (365, '1d'),
+    ])
+    def test_select_tier(self, session, days, tier):
+        now = datetime(2026, 6, 1)
+        svc = SnapshotRollupService(session)
+        assert svc.select_tier(now - timedelta(days=days), now=now) == tier
+
+    def test_retention_forces_coarser_tier(self, session):
+        now = datetime(2026, 6, 1)
+        svc = SnapshotRollupService(session, RetentionPolicy(raw_days=1))
+        # Two hours, but starting three days back: raw is gone
+        start = now - timedelta(days=3)
+        assert svc.select_tier(start, start + timedelta(hours=2), now=now) == '5m'
+
+    def test_load_year_reads_daily_buckets(self, session, intraday):
+        svc = SnapshotRollupService(session)
+        svc.compact(now=DAY + timedelta(days=1, hours=1))
+        tier, rows = svc.load('position_greeks', intraday.id, DAY - timedelta(days=365), end=DAY + timedelta(days=1))
+        assert tier == '1d'
+        assert len(rows) == 1
+        assert rows[0]['samples'] == 180
+        assert rows[0]['delta'] == pytest.approx(_delta(179))
+
+    def test_load_appends_raw_tail_past_last_compaction(self, session, intraday):
+        svc = SnapshotRollupService(session)
+        svc.compact(now=DAY.replace(hour=15, minute=32))  # 5m up to 15:25, 1h up to 14:00
+
+        tier, rows = svc.load('position_greeks', intraday.id, DAY.replace(hour=14), tier='5m')
+        assert len(rows) == 36
+        assert rows[-1]['timestamp'] == DAY.replace(hour=16, minute=55)
+        assert [r['samples'] for r in rows] == [5] * 36
+        assert rows[-1]['delta'] == pytest.approx(_delta(179))
+        assert rows[-1]['delta_low'] == pytest.approx(min(_delta(m) for m in range(175, 180)))
+
+        tier, rows = svc.load('position_greeks', intraday.id, DAY.replace(hour=14), tier='1h')
+        assert [r['timestamp'].hour for r in rows] == [14, 15, 16]
+        assert [r['samples'] for r in rows] == [60, 60, 60]
+        assert rows[1]['delta_high'] == pytest.approx(max(_delta(m) for m in range(60, 120)))
+        assert rows[-1]['gamma'] == pytest.approx(0.01)
+
+        # end bound applies to the tail too
+        _, rows = svc.load('position_greeks', intraday.id, DAY.replace(hour=14),
+                           end=DAY.replace(hour=15, minute=40), tier='5m')
+        assert rows[-1]['timestamp'] == DAY.replace(hour=15, minute=40)
+        assert rows[-1]['samples'] == 1
+
+
+class TestGreeksHistoryEndpoint:
+
+    def _get(self, params):
+        from trading_cotrader.web.api_reports import create_reports_router
+
+        app = FastAPI()
+        app.include_router(create_reports_router(), prefix='/reports')
+
+        async def call():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                return await client.get('/reports/greeks-history', params=params)
+
+        resp = asyncio.run(call())
+        assert resp.status_code == 200, resp.text
+        return resp.json()
+
+    def test_routes_to_intraday_tier(self, global_db):
+        with global_db.session_scope() as session:
+            now = datetime.utcnow().replace(second=0, microsecond=0)
+            symbol = SymbolORM(id=str(uuid.uuid4()), ticker='QQQ', asset_type='EQUITY')
+            portfolio = PortfolioORM(id=str(uuid.uuid4()), name='p', portfolio_type='real',
+                                     cash_balance=Decimal('0'), total_equity=Decimal('0'), tags=[])
+            session.add_all([symbol, portfolio])
+            session.flush()
+            pos = PositionORM(id=str(uuid.uuid4()), portfolio_id=portfolio.id, symbol_id=symbol.id,
+                              quantity=1, entry_price=Decimal('1'), total_cost=Decimal('1'))
+            session.add(pos)
+            session.flush()
+            for m in range(3):
+                session.add(PositionGreeksSnapshotORM(
+                    id=str(uuid.uuid4()), position_id=pos.id,
+                    timestamp=now - timedelta(minutes=m), delta=Decimal('0.5'),
+                ))
+            session.add(GreeksHistoryORM(
+                id=str(uuid.uuid4()), position_id=pos.id, timestamp=now - timedelta(days=2),
+                delta=Decimal('0.4'), created_at=now,
+            ))
+            position_id = pos.id
+
+        rows = self._get({'position_id': position_id, 'days': 1, 'resolution': 'raw'})
+        assert [r['tier'] for r in rows] == ['raw'] * 3
+
+        # No rollups yet: the daily tier is built from the raw tail
+        [daily] = self._get({'position_id': position_id, 'days': 30})
+        assert daily['tier'] == '1d' and daily['samples'] == 3
+
+        # No intraday history at all → legacy daily table
+        with global_db.session_scope() as session:
+            session.query(PositionGreeksSnapshotORM).delete()
+        legacy = self._get({'position_id': position_id, 'days': 30})
+        assert len(legacy) == 1
+        assert legacy[0]['delta'] == pytest.approx(0.4)
@@ -23,8 +23,10 @@ from trading_cotrader.core.database.schema import (
     SymbolORM,
     DailyPerformanceORM,
     GreeksHistoryORM,
+    PositionGreeksSnapshotORM,
     TradeORM,
 )
+from trading_cotrader.repositories.snapshot import SnapshotRepository, snapshot_timestamp
 from trading_cotrader.services.snapshot_service import SnapshotService
 
 
@@ -331,6 +333,80 @@ class TestCaptureAllPortfolioSnapshots:
         assert snap.num_trades == 1
 
 
+# =============================================================================
+# SnapshotService — bulk upsert / intraday Greeks
+# =============================================================================
+
+def _many_positions(session, portfolio_orm, n):
+    symbols = []
+    for i in range(n):
+        sym = SymbolORM(
+            id=str(uuid.uuid4()), ticker='SPY', asset_type='OPTION', option_type='PUT',
+            strike=Decimal(300 + i), expiration=datetime(2026, 3, 20), multiplier=100,
+        )
+        session.add(sym)
+        symbols.append(sym)
+        session.add(PositionORM(
+            id=str(uuid.uuid4()), portfolio_id=portfolio_orm.id, symbol_id=sym.id,
+            quantity=-1, entry_price=Decimal('1.00'), total_cost=Decimal('100'),
+            current_price=Decimal('0.90'), current_underlying_price=Decimal('450'),
+            delta=Decimal('-0.10'), gamma=Decimal('0.01'), theta=Decimal('0.02'), vega=Decimal('-0.05'),
+        ))
+    session.flush()
+
+
+class TestBulkUpsert:
+    """Snapshot rows go out as multi-row INSERT ... ON CONFLICT statements."""
+
+    def test_daily_snapshot_is_constant_statement_count(self, session, portfolio_orm, statements):
+        _many_positions(session, portfolio_orm, 250)
+        svc = SnapshotService(session)
+        svc.capture_all_portfolio_snapshots()  # first run also inspects the conflict indexes
+
+        statements.clear()
+        svc.capture_all_portfolio_snapshots()
+        inserts = [s for s in statements if s.lstrip().upper().startswith('INSERT')]
+        history_inserts = [s for s in inserts if 'greeks_history' in s]
+        assert session.query(GreeksHistoryORM).count() == 250
+        assert 1 <= len(history_inserts) <= 5  # chunked by bind-parameter limit
+        assert all('ON CONFLICT' in s for s in inserts)
+        assert len(statements) < 10  # no per-position probes
+
+    def test_intraday_greeks_upsert_within_bucket(self, session, portfolio_orm, position_orm):
+        svc = SnapshotService(session)
+        at = datetime(2026, 3, 2, 14, 30, 10)
+        assert svc.capture_intraday_greeks(at=at) == 1
+
+        position_orm.delta = Decimal('-0.35')
+        session.flush()
+        svc.capture_intraday_greeks(at=at.replace(second=50))
+        rows = session.query(PositionGreeksSnapshotORM).all()
+        assert len(rows) == 1
+        assert rows[0].delta == Decimal('-0.35')
+        assert rows[0].timestamp == datetime(2026, 3, 2, 14, 30)
+
+        svc.capture_intraday_greeks(at=at.replace(minute=31))
+        assert session.query(PositionGreeksSnapshotORM).count() == 2
+
+    def test_lookup_fallback_matches_on_conflict(self, session, portfolio_orm, position_orm, monkeypatch):
+        monkeypatch.setattr(SnapshotRepository, '_ensure_conflict_index', lambda self, model, cols: False)
+        svc = SnapshotService(session)
+        svc.capture_all_portfolio_snapshots()
+        portfolio_orm.total_equity = Decimal('99000')
+        session.flush()
+        svc.capture_all_portfolio_snapshots()
+
+        assert session.query(DailyPerformanceORM).count() == 1
+        assert session.query(DailyPerformanceORM).one().total_equity == Decimal('99000')
+        assert session.query(GreeksHistoryORM).count() == 1
+
+    def test_snapshot_timestamp_buckets(self):
+        at = datetime(2026, 3, 2, 14, 37, 42, 123)
+        assert snapshot_timestamp(at, 60) == datetime(2026, 3, 2, 14, 37)
+        assert snapshot_timestamp(at, 300) == datetime(2026, 3, 2, 14, 35)
+        assert snapshot_timestamp(at, 3600) == datetime(2026, 3, 2, 14, 0)
+
+
 # =============================================================================
 # SnapshotService — history and stats
 # =============================================================================
@@ -0,0 +1,87 @@
+"""Tests for TradeQuery — constant-query-count trade loading for the v2 API."""
+
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from trading_cotrader.core.database.schema import (
+    LegORM, PortfolioORM, StrategyORM, SymbolORM, TradeORM,
+)
+from trading_cotrader.repositories.trade import TradeQuery
+from trading_cotrader.web.api_v2 import _serialize_trade
+
+
+def _seed(session, name, n_trades, legs_per_trade=4, closed_every=0):
+    """Portfolio with n multi-leg trades, each leg on its own symbol."""
+    pid = str(uuid.uuid4())
+    session.add(PortfolioORM(id=pid, name=name, portfolio_type='what_if',
+                             cash_balance=Decimal('100000'), buying_power=Decimal('100000')))
+    strategy = StrategyORM(id=str(uuid.uuid4()), name='IC', strategy_type='iron_condor')
+    session.add(strategy)
+    expiry = datetime.utcnow() + timedelta(days=30)
+    for t in range(n_trades):
+        tid = str(uuid.uuid4())
+        session.add(TradeORM(
+            id=tid, portfolio_id=pid, strategy_id=strategy.id if t % 3 else None,
+            underlying_symbol='SPY', trade_type='what_if', trade_status='executed',
+            is_open=not (closed_every and t % closed_every == 0),
+            entry_price=Decimal('1.50'), created_at=datetime.utcnow() - timedelta(minutes=t),
+        ))
+        for i in range(legs_per_trade):
+            sym = SymbolORM(id=str(uuid.uuid4()), ticker=name.upper(), asset_type='option',
+                            option_type='put' if i < 2 else 'call',
+                            strike=Decimal(1000 * i + t), expiration=expiry, multiplier=100)
+            session.add(sym)
+            session.add(LegORM(id=str(uuid.uuid4()), trade_id=tid, symbol_id=sym.id,
+                               quantity=-1 if i in (1, 2) else 1, side='sell' if i in (1, 2) else 'buy',
+                               entry_price=Decimal('1.00'), current_price=Decimal('0.80')))
+    session.flush()
+    return pid
+
+
+def _serialize_all(session, mode):
+    session.expire_all()
+    q = TradeQuery(session).order_by(TradeORM.created_at.desc())
+    trades = q.rows() if mode == 'rows' else q.all()
+    return [_serialize_trade(t) for t in trades]
+
+
+def _normalized(payload):
+    for trade in payload:
+        trade['legs'] = sorted(trade['legs'], key=lambda leg: leg['id'])
+    return payload
+
+
+class TestTradeQuery:
+
+    @pytest.mark.parametrize('mode', ['orm', 'rows'])
+    def test_query_count_independent_of_trade_count(self, session, statements, mode):
+        _seed(session, 'small', 5)
+        statements.clear()
+        assert len(_serialize_all(session, mode)) == 5
+        small = len(statements)
+
+        _seed(session, 'large', 120)
+        statements.clear()
+        assert len(_serialize_all(session, mode)) == 125
+
+        assert len(statements) == small <= 3
+
+    def test_rows_match_orm_serialization(self, session):
+        _seed(session, 'desk', 12)
+        assert _normalized(_serialize_all(session, 'rows')) == _normalized(_serialize_all(session, 'orm'))
+
+    def test_filters_count_and_page(self, session):
+        pid = _seed(session, 'desk', 10, closed_every=4)
+        _seed(session, 'other', 3)
+
+        q = TradeQuery(session).portfolio(pid).status('open').order_by(TradeORM.created_at.desc())
+        assert q.count() == 7
+        page = q.page(limit=3, offset=2).rows()
+        assert len(page) == 3
+        assert all(r.portfolio.name == 'desk' and r.is_open for r in page)
+        assert all(len(r.legs) == 4 for r in page)
+        assert [r.id for r in page] == [t.id for t in q.all()]
+        assert TradeQuery(session).portfolio(pid).status('closed').count() == 3
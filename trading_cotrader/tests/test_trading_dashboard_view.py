@@ -0,0 +1,101 @@
+"""Tests for the versioned, memoized /trading-dashboard view with ETag support."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from trading_cotrader.containers.container_manager import (
+    ContainerEvent, ContainerManager, EventType,
+)
+from trading_cotrader.containers.portfolio_bundle import PortfolioBundle
+from trading_cotrader.web import api_trading_sheet
+
+
+@pytest.fixture
+def cm():
+    manager = ContainerManager()
+    manager._bundles['desk'] = PortfolioBundle(config_name='desk', currency='USD', broker_firm='tastytrade')
+    return manager
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    calls = []
+    real = api_trading_sheet._build_trading_dashboard
+
+    def counting(cm, bundle, name):
+        calls.append(name)
+        return real(cm, bundle, name)
+
+    monkeypatch.setattr(api_trading_sheet, '_build_trading_dashboard', counting)
+    return calls
+
+
+@pytest.fixture
+def get(cm):
+    app = FastAPI()
+    app.include_router(api_trading_sheet.create_trading_sheet_router(SimpleNamespace(container_manager=cm)),
+                       prefix='/api/v2')
+
+    def _get(*header_sets):
+        async def call():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                return [await client.get('/api/v2/trading-dashboard/desk', headers=h) for h in header_sets]
+        return asyncio.run(call())
+
+    return _get
+
+
+class TestDashboardView:
+
+    def test_unchanged_polls_get_304_without_rebuild(self, get, builds):
+        first, again, revalidated = get({}, {}, {'If-None-Match': 'W/"other", "x"'})
+        assert first.status_code == 200
+        assert json.loads(first.content)['status'] == 'waiting'
+        etag = first.headers['etag']
+        assert again.headers['etag'] == etag and again.content == first.content
+        assert revalidated.status_code == 200
+
+        [not_modified] = get({'If-None-Match': etag})
+        assert not_modified.status_code == 304 and not_modified.content == b''
+        assert not_modified.headers['etag'] == etag
+        assert builds == ['desk']
+
+    def test_container_change_bumps_version(self, get, builds, cm):
+        [first] = get({})
+        bundle = cm.get_bundle('desk')
+        version = bundle.version
+
+        cm._emit_event(ContainerEvent(event_type=EventType.INCREMENTAL_UPDATE, source='test',
+                                      data={'portfolio_name': 'desk'}))
+        assert bundle.version == version + 1
+        [changed] = get({'If-None-Match': first.headers['etag']})
+        assert changed.status_code == 200
+        assert changed.headers['etag'] != first.headers['etag']
+
+        bundle.trades.update_trade_status('missing', 'closed')  # no-op: no change notified
+        [same] = get({'If-None-Match': changed.headers['etag']})
+        assert same.status_code == 304
+        assert len(builds) == 2
+
+    def test_research_update_invalidates(self, get, builds, cm):
+        [first] = get({})
+        version = cm.research.version
+        cm.research.update_regime('SPY', {'regime_id': 2})
+        assert cm.research.version > version
+        [second] = get({'If-None-Match': first.headers['etag']})
+        assert second.status_code == 200
+        assert len(builds) == 2
+
+    def test_bundle_container_listeners_bump_version(self):
+        bundle = PortfolioBundle(config_name='desk', currency='USD')
+        version = bundle.version
+        bundle.portfolio._notify_changes({'cash_balance': {'old': 0, 'new': 1}})
+        bundle.positions._notify_changes('p1', {'delta': {'old': 0, 'new': 1}})
+        bundle.add_portfolio_id('pid-1')
+        assert bundle.version == version + 3
@@ -0,0 +1,146 @@
+"""Tests for the vectorized VaR / ES engine (services/risk/var.py)."""
+
+import time
+import uuid
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from trading_cotrader.containers.portfolio_bundle import PortfolioBundle
+from trading_cotrader.containers.risk_factor_container import RiskFactorState
+from trading_cotrader.core.database.schema import PortfolioORM
+from trading_cotrader.services.risk.correlation import CorrelationMatrix
+from trading_cotrader.services.risk.var import (
+    VaREngine, VaRMethod, parametric_var, scenario_var,
+)
+
+
+class FakeCorrelation:
+    """CorrelationAnalyzer stand-in returning a fixed covariance + return history."""
+
+    def __init__(self, symbols, cov, returns):
+        self.symbols, self.cov, self.returns = symbols, cov, returns
+
+    def calculate_correlation_matrix(self, symbols, lookback_days=252):
+        idx = [self.symbols.index(s) for s in symbols if s in self.symbols]
+        valid = [self.symbols[i] for i in idx]
+        return CorrelationMatrix(
+            symbols=list(symbols),
+            matrix={},
+            returns_data=self.returns[:, idx],
+            covariance_matrix=self.cov[np.ix_(idx, idx)],
+            volatilities={s: 0.2 for s in valid},
+        )
+
+
+def _bundle(name, factors, portfolio_id=None):
+    bundle = PortfolioBundle(config_name=name, currency='USD')
+    if portfolio_id:
+        bundle.add_portfolio_id(portfolio_id)
+    for underlying, delta, gamma, spot in factors:
+        bundle.risk_factors._risk_factors[underlying] = RiskFactorState(
+            underlying=underlying, delta=Decimal(str(delta)), gamma=Decimal(str(gamma)),
+            spot_price=Decimal(str(spot)), position_count=1,
+        )
+    return bundle
+
+
+@pytest.fixture
+def market():
+    rng = np.random.default_rng(7)
+    symbols = ['SPY', 'QQQ', 'IWM']
+    cov = np.array([
+        [1.0e-4, 0.8e-4, 0.7e-4],
+        [0.8e-4, 1.5e-4, 0.9e-4],
+        [0.7e-4, 0.9e-4, 2.0e-4],
+    ])
+    returns = rng.multivariate_normal(np.zeros(3), cov, size=500)
+    return symbols, cov, returns
+
+
+class TestKernels:
+
+    def test_parametric_delta_only_matches_closed_form(self, market):
+        _, cov, _ = market
+        d = np.array([[50_000.0, -20_000.0, 10_000.0]])
+        var, es, comp = parametric_var(d, np.zeros_like(d), cov, 0.95)
+        expected = 1.6448536 * np.sqrt(d[0] @ cov @ d[0])
+        assert var[0] == pytest.approx(expected, rel=1e-6)
+        assert es[0] > var[0]
+        assert comp[0].sum() == pytest.approx(var[0])
+
+    def test_short_gamma_increases_var(self, market):
+        _, cov, _ = market
+        d = np.array([[10_000.0, 0.0, 0.0]])
+        flat, _, _ = parametric_var(d, np.zeros_like(d), cov, 0.99)
+        short_gamma, _, _ = parametric_var(d, np.array([[-5e6, 0.0, 0.0]]), cov, 0.99)
+        assert short_gamma[0] > flat[0]
+
+    def test_scenario_components_sum_to_var(self, market):
+        _, _, returns = market
+        d = np.array([[50_000.0, -20_000.0, 10_000.0], [0.0, 30_000.0, 0.0]])
+        var, es, comp = scenario_var(d, np.zeros_like(d), returns, 0.95)
+        assert np.all(es >= var)
+        np.testing.assert_allclose(comp.sum(axis=1), var)
+
+
+class TestVaREngine:
+
+    def test_monte_carlo_is_reproducible_and_close_to_parametric(self, market):
+        symbols, cov, returns = market
+        fake = FakeCorrelation(symbols, cov, returns)
+        bundles = [_bundle('tt', [('SPY', 100, 0, 500), ('QQQ', -50, 0, 400)])]
+
+        mc = VaREngine(fake, method=VaRMethod.MONTE_CARLO, n_simulations=50_000, seed=1)
+        first = mc.compute_for_bundles(bundles).bundles['tt'].var_95
+        second = mc.compute_for_bundles(bundles).bundles['tt'].var_95
+        assert first == second
+
+        param = VaREngine(fake).compute_for_bundles(bundles).bundles['tt'].var_95
+        assert first == pytest.approx(param, rel=0.05)
+
+    def test_unpriced_underlyings_are_reported(self, market):
+        symbols, cov, returns = market
+        engine = VaREngine(FakeCorrelation(symbols, cov, returns), method=VaRMethod.HISTORICAL)
+        report = engine.compute_for_bundles([
+            _bundle('tt', [('SPY', 100, 0, 500), ('XYZ', 10, 0, 50), ('QQQ', 5, 0, 0)]),
+        ])
+        bv = report.bundles['tt']
+        assert sorted(bv.unpriced) == ['QQQ', 'XYZ']
+        assert set(bv.component_var_95) == {'SPY'}
+        assert bv.var_99 >= bv.var_95 > 0
+
+    def test_persist_writes_portfolio_var(self, market, session):
+        symbols, cov, returns = market
+        pid = str(uuid.uuid4())
+        session.add(PortfolioORM(id=pid, name='TT', portfolio_type='real', cash_balance=0, buying_power=0))
+        session.flush()
+
+        engine = VaREngine(FakeCorrelation(symbols, cov, returns))
+        report = engine.compute_for_bundles([_bundle('tt', [('SPY', 100, 0, 500)], portfolio_id=pid)])
+        assert engine.persist(report, session) == 1
+
+        row = session.get(PortfolioORM, pid)
+        assert float(row.var_1d_95) == pytest.approx(report.bundles['tt'].var_95, abs=0.01)
+        assert float(row.var_1d_99) > float(row.var_1d_95)
+
+    def test_hundreds_of_underlyings_well_under_a_second(self):
+        rng = np.random.default_rng(3)
+        n = 400
+        symbols = [f'S{i}' for i in range(n)]
+        factors = rng.standard_normal((252, 5)) * 0.01
+        returns = factors @ rng.standard_normal((5, n)) * 0.3 + rng.standard_normal((252, n)) * 0.005
+        cov = np.cov(returns, rowvar=False)
+        fake = FakeCorrelation(symbols, cov, returns)
+        bundles = [
+            _bundle(f'desk{b}', [(s, rng.integers(-200, 200), rng.normal(0, 5), 100) for s in symbols])
+            for b in range(6)
+        ]
+
+        engine = VaREngine(fake, method=VaRMethod.MONTE_CARLO, n_simulations=10_000)
+        start = time.perf_counter()
+        report = engine.compute_for_bundles(bundles)
+        assert time.perf_counter() - start < 1.0
+        assert len(report.bundles) == 6
+        assert all(bv.var_95 > 0 for bv in report.bundles.values())
@@ -17,6 +17,8 @@ import yaml
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from trading_cotrader.config.config_registry import get_config_registry
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -35,10 +37,12 @@ _BROKERS_YAML = _CONFIG_DIR / "brokers.yaml"
 
 def _read_yaml(path: Path) -> dict:
     """Read a YAML file and return as dict."""
-    if not path.exists():
+    try:
+        raw = get_config_registry().get_raw(path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Config file not found: {path.name}")
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    # Callers edit and write back — never mutate the shared cached copy
+    return copy.deepcopy(raw) or {}
 
 
 def _write_yaml(path: Path, data: dict) -> None:
@@ -52,6 +56,7 @@ def _write_yaml(path: Path, data: dict) -> None:
             allow_unicode=True,
             width=120,
         )
+    get_config_registry().invalidate(path)
     logger.info(f"Config written: {path.name}")
 
 
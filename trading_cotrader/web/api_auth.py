@@ -13,9 +13,10 @@ from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
 
+from trading_cotrader.core.database.session import run_db
 from trading_cotrader.core.security.auth import (
     register_user, authenticate_user, get_user_from_token,
-    create_access_token, decode_token,
+    create_access_token, decode_token, get_principal_cache,
 )
 
 logger = logging.getLogger(__name__)
@@ -58,7 +59,11 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         # No auth header — allow anonymous for now (single-user mode)
         return None
 
-    user = get_user_from_token(credentials.credentials)
+    # Hot path: a cached principal is a dict lookup; misses hit the DB off the loop
+    token = credentials.credentials
+    user = get_principal_cache().get(token)
+    if user is None:
+        user = await run_db(get_user_from_token, token)
     if not user:
         raise HTTPException(401, "Invalid or expired token")
     return user
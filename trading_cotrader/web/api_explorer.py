@@ -3,19 +3,30 @@ Data Explorer API Router — Structured query builder for all 19 DB tables.
 
 NO raw SQL — uses table/column whitelist with typed filter execution via SQLAlchemy ORM.
 Mounted in approval_api.py at /api/explorer prefix.
+
+Queries are column-projected selects (no ORM hydration). Pages sorted on an
+indexed column (or the primary key) are keyset-paginated: each response
+carries an opaque ``next_cursor`` to pass back instead of ``offset``, so deep
+pages cost the same as the first. Row counts are cached per table+filters
+for COUNT_CACHE_TTL seconds. CSV/NDJSON exports stream from the DB in
+chunks of EXPORT_CHUNK_ROWS rows, so memory stays flat for any export size.
 """
 
+import base64
 import csv
 import io
-from datetime import datetime
+import json
+from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import logging
+import threading
+import time
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import inspect, func
+from sqlalchemy import and_, func, inspect, or_, select
 from sqlalchemy.types import (
     String as SAString,
     Text as SAText,
@@ -29,7 +40,7 @@ from sqlalchemy.types import (
     Enum as SAEnum,
 )
 
-from trading_cotrader.core.database.session import session_scope
+from trading_cotrader.core.database.session import db_offload, session_scope
 from trading_cotrader.core.database.schema import (
     SymbolORM,
     PortfolioORM,
@@ -53,6 +64,9 @@ from trading_cotrader.core.database.schema import (
 logger = logging.getLogger(__name__)
 
 MAX_ROWS = 1000
+EXPORT_MAX_ROWS = 1_000_000
+EXPORT_CHUNK_ROWS = 1000
+COUNT_CACHE_TTL = 30.0  # seconds
 
 
 # ---------------------------------------------------------------------------
@@ -92,12 +106,21 @@ class ColumnMeta:
 
 
 class TableMeta:
-    __slots__ = ('table_name', 'orm_class', 'columns')
-
-    def __init__(self, table_name: str, orm_class, columns: List[ColumnMeta]):
+    __slots__ = ('table_name', 'orm_class', 'columns', 'primary_key', 'indexed')
+
+    def __init__(
+        self,
+        table_name: str,
+        orm_class,
+        columns: List[ColumnMeta],
+        primary_key: Optional[str] = None,
+        indexed: frozenset = frozenset(),
+    ):
         self.table_name = table_name
         self.orm_class = orm_class
         self.columns = columns
+        self.primary_key = primary_key  # single-column PK attribute, keyset tiebreaker
+        self.indexed = indexed          # attributes leading an index → keyset-sortable
 
     def column_map(self) -> Dict[str, ColumnMeta]:
         return {c.name: c for c in self.columns}
@@ -130,14 +153,24 @@ def _build_registry() -> Dict[str, TableMeta]:
         table_name = orm_cls.__tablename__
         mapper = inspect(orm_cls)
         cols = []
+        attr_by_column = {}
         for attr in mapper.column_attrs:
             col = attr.columns[0]
+            attr_by_column[col.name] = attr.key
             cols.append(ColumnMeta(
                 name=attr.key,
                 logical_type=_sa_type_to_logical(col.type),
                 nullable=col.nullable if col.nullable is not None else True,
             ))
-        registry[table_name] = TableMeta(table_name, orm_cls, cols)
+
+        pk_cols = [c.name for c in mapper.primary_key]
+        primary_key = attr_by_column.get(pk_cols[0]) if len(pk_cols) == 1 else None
+        leading = {list(ix.columns)[0].name for ix in mapper.local_table.indexes}
+        leading |= {c.name for c in mapper.local_table.columns if c.index or c.unique}
+        indexed = frozenset(attr_by_column[c] for c in leading if c in attr_by_column)
+        if primary_key:
+            indexed |= {primary_key}
+        registry[table_name] = TableMeta(table_name, orm_cls, cols, primary_key, indexed)
     return registry
 
 
@@ -172,6 +205,7 @@ class ExplorerQuery(BaseModel):
     sort_desc: bool = False
     limit: int = 100
     offset: int = 0
+    cursor: Optional[str] = None  # next_cursor from the previous page (replaces offset)
 
 
 # ---------------------------------------------------------------------------
@@ -242,6 +276,240 @@ def _serialize_value(val: Any) -> Any:
     return val
 
 
+# ---------------------------------------------------------------------------
+# Keyset cursors
+# ---------------------------------------------------------------------------
+
+def _cursor_value(val: Any) -> Any:
+    """JSON-safe cursor value that round-trips exactly (no float for Decimal)."""
+    if isinstance(val, Decimal):
+        return str(val)
+    if isinstance(val, (datetime, date)):
+        return val.isoformat()
+    return val
+
+
+def _restore_value(raw: Any, sa_type) -> Any:
+    """Inverse of _cursor_value for a column's SQLAlchemy type."""
+    if raw is None:
+        return None
+    try:
+        if isinstance(sa_type, SADateTime):
+            return datetime.fromisoformat(raw)
+        if isinstance(sa_type, SADate):
+            return date.fromisoformat(raw)
+        if isinstance(sa_type, SAFloat):
+            return float(raw)
+        if isinstance(sa_type, SANumeric):
+            return Decimal(raw)
+    except (TypeError, ValueError, InvalidOperation):
+        raise HTTPException(400, "Invalid cursor")
+    return raw
+
+
+def _encode_cursor(sort_value: Any, pk_value: Any) -> str:
+    payload = json.dumps([_cursor_value(sort_value), _cursor_value(pk_value)])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[Any, Any]:
+    try:
+        sort_value, pk_value = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise HTTPException(400, "Invalid cursor")
+    return sort_value, pk_value
+
+
+def _keyset_after(sort_attr, pk_attr, sort_value, pk_value, desc: bool):
+    """
+    Rows strictly after (sort_value, pk_value) in ORDER BY sort NULLS LAST, pk.
+
+    NULL sort values are ordered last in both directions so the predicate
+    does not depend on the dialect's default NULL ordering.
+    """
+    pk_after = pk_attr < pk_value if desc else pk_attr > pk_value
+    if sort_attr is pk_attr:
+        return pk_after
+    if sort_value is None:
+        return and_(sort_attr.is_(None), pk_after)
+    sort_after = sort_attr < sort_value if desc else sort_attr > sort_value
+    return or_(sort_after, and_(sort_attr == sort_value, pk_after), sort_attr.is_(None))
+
+
+# ---------------------------------------------------------------------------
+# Row count cache
+# ---------------------------------------------------------------------------
+
+class _CountCache:
+    """Exact counts per (table, filters), reused for COUNT_CACHE_TTL seconds."""
+
+    def __init__(self, ttl: float = COUNT_CACHE_TTL, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[tuple, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                return None
+            return entry[1]
+
+    def put(self, key: tuple, count: int) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] >= now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl, count)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_count_cache = _CountCache()
+
+
+def _count_key(body: 'ExplorerQuery') -> tuple:
+    filters = tuple(
+        (f.column, f.operator, f.value, f.value2) for f in (body.filters or [])
+    )
+    return (body.table, filters)
+
+
+# ---------------------------------------------------------------------------
+# Statement building
+# ---------------------------------------------------------------------------
+
+class _PlannedQuery:
+    """Validated, column-projected select plus what is needed to page it."""
+    __slots__ = ('meta', 'select_cols', 'where', 'order_by', 'sort_attr', 'pk_attr',
+                 'keyset', 'sort_desc', 'fetch_cols')
+
+    def __init__(self, **kwargs):
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+
+    def statement(self, after=None):
+        orm_cls = self.meta.orm_class
+        stmt = select(*[getattr(orm_cls, cn) for cn in self.fetch_cols])
+        for clause in self.where:
+            stmt = stmt.where(clause)
+        if after is not None:
+            stmt = stmt.where(after)
+        return stmt.order_by(*self.order_by)
+
+    def count_statement(self):
+        stmt = select(func.count()).select_from(self.meta.orm_class)
+        for clause in self.where:
+            stmt = stmt.where(clause)
+        return stmt
+
+
+class _FilterCollector:
+    """Quacks like Query.filter() so _apply_filter can build bare where-clauses."""
+
+    def __init__(self):
+        self.clauses = []
+
+    def filter(self, clause):
+        self.clauses.append(clause)
+        return self
+
+
+def _plan_query(body: 'ExplorerQuery') -> _PlannedQuery:
+    """Validate a query body against the whitelist and plan its select."""
+    meta = TABLE_REGISTRY.get(body.table)
+    if not meta:
+        raise HTTPException(404, f"Table '{body.table}' not found")
+
+    col_map = meta.column_map()
+    orm_cls = meta.orm_class
+
+    # Validate requested columns
+    if body.columns:
+        for cn in body.columns:
+            if cn not in col_map:
+                raise HTTPException(400, f"Column '{cn}' not found in table '{body.table}'")
+        select_cols = list(body.columns)
+    else:
+        select_cols = [c.name for c in meta.columns]
+
+    # Filters
+    collector = _FilterCollector()
+    for fspec in body.filters or []:
+        if fspec.column not in col_map:
+            raise HTTPException(400, f"Column '{fspec.column}' not found in table '{body.table}'")
+        cmeta = col_map[fspec.column]
+        valid_ops = OPERATORS_BY_TYPE.get(cmeta.logical_type, [])
+        if fspec.operator not in valid_ops:
+            raise HTTPException(
+                400,
+                f"Operator '{fspec.operator}' not valid for column '{fspec.column}' (type: {cmeta.logical_type}). Valid: {valid_ops}",
+            )
+        _apply_filter(collector, orm_cls, fspec, cmeta)
+
+    # Sort — always tie-broken on the primary key so pages are stable
+    if body.sort_by and body.sort_by not in col_map:
+        raise HTTPException(400, f"Sort column '{body.sort_by}' not found")
+    pk_attr = getattr(orm_cls, meta.primary_key) if meta.primary_key else None
+    sort_attr = getattr(orm_cls, body.sort_by) if body.sort_by else pk_attr
+
+    order_by = []
+    if sort_attr is not None:
+        ordered = sort_attr.desc() if body.sort_desc else sort_attr.asc()
+        order_by.append(ordered.nulls_last() if sort_attr is not pk_attr else ordered)
+    if pk_attr is not None and sort_attr is not pk_attr:
+        order_by.append(pk_attr.desc() if body.sort_desc else pk_attr.asc())
+
+    keyset = pk_attr is not None and (body.sort_by or meta.primary_key) in meta.indexed
+    fetch_cols = list(select_cols)
+    if keyset:
+        for extra in (body.sort_by, meta.primary_key):
+            if extra and extra not in fetch_cols:
+                fetch_cols.append(extra)
+
+    return _PlannedQuery(
+        meta=meta, select_cols=select_cols, where=collector.clauses, order_by=order_by,
+        sort_attr=sort_attr, pk_attr=pk_attr, keyset=keyset, sort_desc=body.sort_desc,
+        fetch_cols=fetch_cols,
+    )
+
+
+def _after_cursor(plan: _PlannedQuery, cursor: Optional[str]):
+    """Keyset predicate for a cursor, or None to page by offset."""
+    if not cursor:
+        return None
+    if not plan.keyset:
+        raise HTTPException(400, "Cursor paging requires an indexed sort column")
+    sort_raw, pk_raw = _decode_cursor(cursor)
+    sort_value = _restore_value(sort_raw, plan.sort_attr.type)
+    pk_value = _restore_value(pk_raw, plan.pk_attr.type)
+    return _keyset_after(plan.sort_attr, plan.pk_attr, sort_value, pk_value, plan.sort_desc)
+
+
+def _stream_rows(stmt, limit: int) -> Iterator[List[tuple]]:
+    """Yield result rows in chunks of EXPORT_CHUNK_ROWS without buffering the result."""
+    with session_scope() as session:
+        result = session.execute(stmt.limit(limit).execution_options(yield_per=EXPORT_CHUNK_ROWS))
+        for partition in result.partitions():
+            yield partition
+
+
+def _export_statement(body: 'ExplorerQuery') -> Tuple[_PlannedQuery, Any, int]:
+    plan = _plan_query(body)
+    after = _after_cursor(plan, body.cursor)
+    stmt = plan.statement(after)
+    if after is None and body.offset:
+        stmt = stmt.offset(body.offset)
+    limit = min(body.limit, EXPORT_MAX_ROWS) if body.limit > 0 else EXPORT_MAX_ROWS
+    return plan, stmt, limit
+
+
 # ---------------------------------------------------------------------------
 # Router
 # ---------------------------------------------------------------------------
@@ -257,10 +525,13 @@ def create_explorer_router() -> APIRouter:
         result = []
         with session_scope() as session:
             for name, meta in sorted(TABLE_REGISTRY.items()):
-                try:
-                    count = session.query(func.count()).select_from(meta.orm_class).scalar() or 0
-                except Exception:
-                    count = 0
+                count = _count_cache.get((name, ()))
+                if count is None:
+                    try:
+                        count = session.query(func.count()).select_from(meta.orm_class).scalar() or 0
+                        _count_cache.put((name, ()), count)
+                    except Exception:
+                        count = 0
                 result.append({
                     'name': name,
                     'row_count': count,
@@ -295,121 +566,101 @@ def create_explorer_router() -> APIRouter:
         }
 
     @router.post("/query")
-    async def execute_query(body: ExplorerQuery):
-        """Execute a structured query. No raw SQL."""
-        meta = TABLE_REGISTRY.get(body.table)
-        if not meta:
-            raise HTTPException(404, f"Table '{body.table}' not found")
-
-        col_map = meta.column_map()
-        orm_cls = meta.orm_class
+    @db_offload
+    def execute_query(body: ExplorerQuery):
+        """
+        Execute a structured query. No raw SQL.
+
+        Pass ``next_cursor`` back as ``cursor`` for the next page; ``offset``
+        still works but costs O(offset) per page.
+        """
+        plan = _plan_query(body)
+        limit = min(body.limit, MAX_ROWS)
+        after = _after_cursor(plan, body.cursor)
 
-        # Validate requested columns
-        if body.columns:
-            for cn in body.columns:
-                if cn not in col_map:
-                    raise HTTPException(400, f"Column '{cn}' not found in table '{body.table}'")
-            select_cols = body.columns
-        else:
-            select_cols = [c.name for c in meta.columns]
+        stmt = plan.statement(after)
+        if after is None and body.offset:
+            stmt = stmt.offset(body.offset)
 
-        # Clamp limit
-        limit = min(body.limit, MAX_ROWS)
+        count_key = _count_key(body)
+        total = _count_cache.get(count_key)
+        total_cached = total is not None
 
         with session_scope() as session:
-            q = session.query(orm_cls)
-
-            # Apply filters
-            if body.filters:
-                for fspec in body.filters:
-                    if fspec.column not in col_map:
-                        raise HTTPException(400, f"Column '{fspec.column}' not found in table '{body.table}'")
-                    cmeta = col_map[fspec.column]
-                    valid_ops = OPERATORS_BY_TYPE.get(cmeta.logical_type, [])
-                    if fspec.operator not in valid_ops:
-                        raise HTTPException(
-                            400,
-                            f"Operator '{fspec.operator}' not valid for column '{fspec.column}' (type: {cmeta.logical_type}). Valid: {valid_ops}",
-                        )
-                    q = _apply_filter(q, orm_cls, fspec, cmeta)
-
-            # Sort
-            if body.sort_by:
-                if body.sort_by not in col_map:
-                    raise HTTPException(400, f"Sort column '{body.sort_by}' not found")
-                sort_attr = getattr(orm_cls, body.sort_by)
-                q = q.order_by(sort_attr.desc() if body.sort_desc else sort_attr.asc())
-
-            total = q.count()
-            rows = q.offset(body.offset).limit(limit).all()
-
-            data = []
-            for row in rows:
-                data.append({
-                    cn: _serialize_value(getattr(row, cn, None))
-                    for cn in select_cols
-                })
-
+            if total is None:
+                total = session.execute(plan.count_statement()).scalar() or 0
+                _count_cache.put(count_key, total)
+            rows = session.execute(stmt.limit(limit)).all()
+
+        n = len(plan.select_cols)
+        data = [
+            {cn: _serialize_value(val) for cn, val in zip(plan.select_cols, row[:n])}
+            for row in rows
+        ]
+
+        next_cursor = None
+        if plan.keyset and rows and len(rows) == limit:
+            last = rows[-1]
+            sort_key = body.sort_by or plan.meta.primary_key
+            next_cursor = _encode_cursor(
+                last[plan.fetch_cols.index(sort_key)],
+                last[plan.fetch_cols.index(plan.meta.primary_key)],
+            )
+
+        col_map = plan.meta.column_map()
         return {
             'table': body.table,
             'total': total,
-            'offset': body.offset,
+            'total_cached': total_cached,
+            'offset': body.offset if after is None else None,
             'limit': limit,
-            'columns': [col_map[cn].to_dict() for cn in select_cols],
+            'next_cursor': next_cursor,
+            'columns': [col_map[cn].to_dict() for cn in plan.select_cols],
             'rows': data,
         }
 
     @router.post("/query/csv")
     async def export_csv(body: ExplorerQuery):
-        """Execute query and return results as CSV download."""
-        meta = TABLE_REGISTRY.get(body.table)
-        if not meta:
-            raise HTTPException(404, f"Table '{body.table}' not found")
+        """Stream query results as a CSV download (limit up to EXPORT_MAX_ROWS)."""
+        plan, stmt, limit = _export_statement(body)
+        n = len(plan.select_cols)
+
+        def generate() -> Iterator[str]:
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(plan.select_cols)
+            for chunk in _stream_rows(stmt, limit):
+                writer.writerows([_serialize_value(v) for v in row[:n]] for row in chunk)
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+            if buf.tell():
+                yield buf.getvalue()
 
-        col_map = meta.column_map()
-        orm_cls = meta.orm_class
+        return StreamingResponse(
+            generate(),
+            media_type="text/csv",
+            headers={"Content-Disposition": f"attachment; filename={body.table}_export.csv"},
+        )
 
-        if body.columns:
-            for cn in body.columns:
-                if cn not in col_map:
-                    raise HTTPException(400, f"Column '{cn}' not found")
-            select_cols = body.columns
-        else:
-            select_cols = [c.name for c in meta.columns]
+    @router.post("/query/ndjson")
+    async def export_ndjson(body: ExplorerQuery):
+        """Stream query results as newline-delimited JSON, one object per row."""
+        plan, stmt, limit = _export_statement(body)
+        cols = plan.select_cols
+        n = len(cols)
 
-        limit = min(body.limit, MAX_ROWS)
+        def generate() -> Iterator[str]:
+            for chunk in _stream_rows(stmt, limit):
+                yield ''.join(
+                    json.dumps(dict(zip(cols, (_serialize_value(v) for v in row[:n]))), default=str) + '\n'
+                    for row in chunk
+                )
 
-        with session_scope() as session:
-            q = session.query(orm_cls)
-
-            if body.filters:
-                for fspec in body.filters:
-                    if fspec.column not in col_map:
-                        raise HTTPException(400, f"Column '{fspec.column}' not found")
-                    cmeta = col_map[fspec.column]
-                    q = _apply_filter(q, orm_cls, fspec, cmeta)
-
-            if body.sort_by and body.sort_by in col_map:
-                sort_attr = getattr(orm_cls, body.sort_by)
-                q = q.order_by(sort_attr.desc() if body.sort_desc else sort_attr.asc())
-
-            rows = q.offset(body.offset).limit(limit).all()
-
-            output = io.StringIO()
-            writer = csv.writer(output)
-            writer.writerow(select_cols)
-            for row in rows:
-                writer.writerow([
-                    _serialize_value(getattr(row, cn, None))
-                    for cn in select_cols
-                ])
-
-        output.seek(0)
-        filename = f"{body.table}_export.csv"
         return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
+            generate(),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f"attachment; filename={body.table}_export.ndjson"},
         )
 
     return router
@@ -490,10 +490,47 @@ def create_reports_router() -> APIRouter:
     async def greeks_history(
         position_id: str = Query(..., description="Position ID (required)"),
         days: int = Query(30, ge=1, le=365),
+        resolution: Optional[str] = Query(
+            None, pattern='^(raw|5m|1h|1d)$',
+            description="Tier to read (raw, 5m, 1h, 1d); default picks the finest that covers the range in 500 points",
+        ),
     ):
-        """Greeks history for a specific position."""
+        """
+        Greeks history for a specific position.
+
+        Reads intraday snapshots or their 5m / 1h / 1d OHLC rollups, routed
+        by range. Falls back to the daily greeks_history table when no
+        intraday history exists for the position.
+        """
+        from trading_cotrader.services.snapshot_rollup import SnapshotRollupService
+
         with session_scope() as session:
             cutoff = datetime.utcnow() - timedelta(days=days)
+            tier, rows = SnapshotRollupService(session).load(
+                'position_greeks', position_id, cutoff, tier=resolution,
+            )
+            if rows:
+                return [
+                    {
+                        'position_id': position_id,
+                        'timestamp': _iso(r['timestamp']),
+                        'tier': tier,
+                        'samples': r['samples'],
+                        'delta': r['delta'],
+                        'delta_open': r['delta_open'],
+                        'delta_high': r['delta_high'],
+                        'delta_low': r['delta_low'],
+                        'gamma': r['gamma'],
+                        'theta': r['theta'],
+                        'theta_open': r['theta_open'],
+                        'theta_high': r['theta_high'],
+                        'theta_low': r['theta_low'],
+                        'vega': r['vega'],
+                        'underlying_price': r['underlying'],
+                    }
+                    for r in rows
+                ]
+
             entries = (
                 session.query(GreeksHistoryORM)
                 .filter(
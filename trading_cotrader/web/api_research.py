@@ -14,6 +14,8 @@ import yaml
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from trading_cotrader.config.config_registry import CONFIG_DIR, get_config_registry
+
 if TYPE_CHECKING:
     from trading_cotrader.agents.workflow.engine import WorkflowEngine
 
@@ -39,19 +41,19 @@ def _get_research_container(engine: 'WorkflowEngine'):
 
 def _load_watchlist() -> list:
     """Load market_watchlist.yaml."""
-    config_path = Path(__file__).parent.parent / 'config' / 'market_watchlist.yaml'
-    if not config_path.exists():
+    try:
+        cfg = get_config_registry().get_raw(CONFIG_DIR / 'market_watchlist.yaml')
+    except FileNotFoundError:
         return []
-    with open(config_path, 'r') as f:
-        cfg = yaml.safe_load(f)
-    return cfg.get('watchlist', [])
+    return list(cfg.get('watchlist', []))
 
 
 def _save_watchlist(items: list) -> None:
     """Save watchlist back to market_watchlist.yaml."""
-    config_path = Path(__file__).parent.parent / 'config' / 'market_watchlist.yaml'
+    config_path = CONFIG_DIR / 'market_watchlist.yaml'
     with open(config_path, 'w') as f:
         yaml.dump({'watchlist': items}, f, default_flow_style=False, sort_keys=False)
+    get_config_registry().invalidate(config_path)
 
 
 class AddWatchlistTickerRequest(BaseModel):
@@ -0,0 +1,310 @@
+"""
+Container Stream — WebSocket push of ContainerManager cell updates per bundle.
+
+Dashboard hooks poll REST endpoints every 10–15s and get full payloads back.
+This channel subscribes to ContainerManager events instead and pushes only
+what changed, so server load follows the change rate, not clients × polls.
+
+Protocol (one socket per portfolio bundle, JSON frames):
+
+    server → {"type": "snapshot", "bundle", "seq", "state"}       on connect / resync
+    server → {"type": "diff", "bundle", "seq", "cells", "sources", "timestamp"}
+    client → {"type": "resync", "since": <last seq>}   missed diffs, or a snapshot
+    client → {"type": "ping"}                          server → {"type": "pong", "seq"}
+
+Cells are absolute values — {"grid", "rowId", "column", "value"} — and a
+removed row is sent as column "_removed". Applying a cell twice is harmless,
+so a snapshot may overlap the diffs that follow it. Updates arriving within
+FLUSH_INTERVAL are coalesced into one diff (last value per cell wins). Every
+diff has the next sequence number; a client that sees a gap sends resync.
+Connecting with ``?since=<seq>`` resumes from recent history when possible.
+
+Usage:
+    # Mounted by create_approval_app():
+    router = create_stream_router(engine)
+    app.include_router(router, prefix="/api/v2")
+    # ws://host/api/v2/stream/<portfolio_name>
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Set, Tuple
+import asyncio
+import json
+import logging
+import threading
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+if TYPE_CHECKING:
+    from trading_cotrader.agents.workflow.engine import WorkflowEngine
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 0.25      # seconds of updates coalesced into one diff
+HISTORY_FRAMES = 512       # diffs kept per bundle for resync
+SUBSCRIBER_QUEUE = 256     # frames buffered per client before it is resnapshotted
+
+REMOVED = '_removed'
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _dumps(frame: Dict[str, Any]) -> str:
+    return json.dumps(frame, default=_jsonable)
+
+
+# =============================================================================
+# Hub
+# =============================================================================
+
+@dataclass(eq=False)
+class _Subscriber:
+    queue: asyncio.Queue
+    overflowed: bool = False
+
+
+@dataclass
+class _Channel:
+    """Per-bundle stream state."""
+    name: str
+    seq: int = 0
+    pending: Dict[Tuple[str, str, str], Any] = field(default_factory=dict)
+    sources: Set[str] = field(default_factory=set)
+    history: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=HISTORY_FRAMES))
+    subscribers: Set[_Subscriber] = field(default_factory=set)
+    flush_scheduled: bool = False
+
+
+class BundleStreamHub:
+    """
+    Fans ContainerManager events out to WebSocket subscribers.
+
+    Events arrive on whatever thread mutated the containers; they are
+    coalesced under a lock and flushed on the event loop that owns the
+    sockets.
+    """
+
+    def __init__(self, container_manager, flush_interval: float = FLUSH_INTERVAL):
+        self.cm = container_manager
+        self.flush_interval = flush_interval
+        self._channels: Dict[str, _Channel] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        container_manager.add_event_listener(self.on_event)
+
+    def close(self) -> None:
+        self.cm.remove_event_listener(self.on_event)
+
+    def resolve(self, portfolio_name: str) -> Optional[str]:
+        """Bundle config name for a config / DB / whatif portfolio name."""
+        bundle = self.cm.get_bundle(portfolio_name)
+        return bundle.config_name if bundle else None
+
+    def _channel(self, name: str) -> _Channel:
+        channel = self._channels.get(name)
+        if channel is None:
+            channel = self._channels[name] = _Channel(name=name)
+        return channel
+
+    # -----------------------------------------------------------------
+    # Producer side (any thread)
+    # -----------------------------------------------------------------
+
+    def on_event(self, event) -> None:
+        """ContainerManager listener: fold the event's cell updates into the pending diff."""
+        name = (event.data or {}).get('portfolio_name')
+        if not name or not event.cell_updates:
+            return
+        name = self.resolve(name) or name
+        with self._lock:
+            channel = self._channel(name)
+            if not channel.subscribers:
+                # Nobody listening: skip the work but burn a seq so resuming
+                # clients notice the gap and take a snapshot.
+                channel.seq += 1
+                channel.history.clear()
+                return
+            for cu in event.cell_updates:
+                if cu.column == REMOVED:
+                    for key in [k for k in channel.pending if k[:2] == (cu.grid_type, cu.row_id)]:
+                        del channel.pending[key]
+                else:
+                    channel.pending.pop((cu.grid_type, cu.row_id, REMOVED), None)
+                channel.pending[(cu.grid_type, cu.row_id, cu.column)] = cu.new_value
+            channel.sources.add(event.source)
+            if channel.flush_scheduled or self._loop is None:
+                return
+            channel.flush_scheduled = True
+        self._loop.call_soon_threadsafe(self._schedule_flush, name)
+
+    def _schedule_flush(self, name: str) -> None:
+        self._loop.call_later(self.flush_interval, self.flush, name)
+
+    # -----------------------------------------------------------------
+    # Loop side
+    # -----------------------------------------------------------------
+
+    def flush(self, name: str) -> Optional[Dict[str, Any]]:
+        """Publish the pending diff for one bundle as the next seq. Returns the frame."""
+        with self._lock:
+            channel = self._channel(name)
+            channel.flush_scheduled = False
+            if not channel.pending:
+                return None
+            channel.seq += 1
+            frame = {
+                'type': 'diff',
+                'bundle': name,
+                'seq': channel.seq,
+                'cells': [
+                    {'grid': grid, 'rowId': row_id, 'column': column, 'value': value}
+                    for (grid, row_id, column), value in channel.pending.items()
+                ],
+                'sources': sorted(channel.sources),
+                'timestamp': datetime.utcnow().isoformat(),
+            }
+            channel.pending = {}
+            channel.sources = set()
+            channel.history.append(frame)
+            subscribers = list(channel.subscribers)
+
+        for sub in subscribers:
+            if sub.overflowed:
+                continue
+            try:
+                sub.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                sub.overflowed = True  # writer drains and sends a fresh snapshot
+        return frame
+
+    def subscribe(self, name: str) -> _Subscriber:
+        self._loop = asyncio.get_running_loop()
+        sub = _Subscriber(queue=asyncio.Queue(maxsize=SUBSCRIBER_QUEUE))
+        with self._lock:
+            self._channel(name).subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, name: str, sub: _Subscriber) -> None:
+        with self._lock:
+            channel = self._channel(name)
+            channel.subscribers.discard(sub)
+            if not channel.subscribers and channel.pending:
+                channel.pending = {}
+                channel.sources = set()
+                channel.seq += 1
+                channel.history.clear()
+
+    def catch_up(self, name: str, since: Optional[int]) -> List[Dict[str, Any]]:
+        """
+        Frames that bring a client at ``since`` up to date: the missed diffs
+        when history still covers them, otherwise a single snapshot.
+        """
+        with self._lock:
+            channel = self._channel(name)
+            seq = channel.seq
+            if since is not None and since == seq:
+                return []
+            history = list(channel.history)
+            if since is not None and 0 <= since < seq and history and history[0]['seq'] <= since + 1:
+                return [f for f in history if f['seq'] > since]
+        return [self.snapshot(name, seq)]
+
+    def snapshot(self, name: str, seq: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Full bundle state tagged with the last published seq. Pending (not yet
+        flushed) changes may already be in it; the next diff repeats them.
+
+        Blocks on the ContainerManager state lock while the engine is loading,
+        so call it (and catch_up) off the event loop.
+        """
+        if seq is None:
+            with self._lock:
+                seq = self._channel(name).seq
+        state = self.cm.get_full_state(name)
+        return {'type': 'snapshot', 'bundle': name, 'seq': seq, 'state': state}
+
+
+# =============================================================================
+# Router
+# =============================================================================
+
+def create_stream_router(engine: 'WorkflowEngine') -> APIRouter:
+    """Create the container stream router (mounted under /api/v2)."""
+    router = APIRouter()
+    hubs: Dict[int, BundleStreamHub] = {}
+
+    def get_hub() -> Optional[BundleStreamHub]:
+        cm = getattr(engine, 'container_manager', None)
+        if cm is None:
+            return None
+        hub = hubs.get(id(cm))
+        if hub is None:
+            hub = hubs[id(cm)] = BundleStreamHub(cm)
+        return hub
+
+    @router.websocket("/stream/{portfolio_name}")
+    async def stream_bundle(websocket: WebSocket, portfolio_name: str, since: Optional[int] = None):
+        hub = get_hub()
+        name = hub.resolve(portfolio_name) if hub else None
+        await websocket.accept()
+        if name is None:
+            await websocket.close(code=4404, reason=f"Unknown portfolio '{portfolio_name}'")
+            return
+
+        # Subscribe before snapshotting so nothing between the two is lost
+        sub = hub.subscribe(name)
+        last_sent = [0]
+        send_lock = asyncio.Lock()  # writer task and resync replies share the socket
+
+        async def send(frames: List[Dict[str, Any]]) -> None:
+            async with send_lock:
+                for frame in frames:
+                    await websocket.send_text(_dumps(frame))
+                    last_sent[0] = frame['seq']
+
+        async def writer() -> None:
+            while True:
+                frame = await sub.queue.get()
+                if sub.overflowed:
+                    while not sub.queue.empty():
+                        sub.queue.get_nowait()
+                    sub.overflowed = False
+                    await send([await asyncio.to_thread(hub.snapshot, name)])
+                    continue
+                if frame['seq'] <= last_sent[0]:
+                    continue  # already covered by the catch-up frames
+                await send([frame])
+
+        writer_task = None
+        try:
+            await send(await asyncio.to_thread(hub.catch_up, name, since))
+            writer_task = asyncio.create_task(writer())
+            while True:
+                message = json.loads(await websocket.receive_text())
+                kind = message.get('type')
+                if kind == 'resync':
+                    await send(await asyncio.to_thread(hub.catch_up, name, message.get('since')))
+                elif kind == 'ping':
+                    # Not via send(): the pong must not move last_sent, and its
+                    # seq is read under the lock so it matches what was sent
+                    async with send_lock:
+                        await websocket.send_text(_dumps({'type': 'pong', 'seq': last_sent[0]}))
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            logger.warning(f"Stream for {name} closed: {e}")
+        finally:
+            if writer_task is not None:
+                writer_task.cancel()
+            hub.unsubscribe(name, sub)
+
+    return router
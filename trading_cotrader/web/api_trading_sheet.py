@@ -10,16 +10,25 @@ Endpoints:
 Mounted in approval_api.py at /api/v2 prefix.
 """
 
+from dataclasses import dataclass
 from datetime import date as date_cls, datetime
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+import itertools
+import json
 import logging
 import uuid
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover — falls back to stdlib json
+    orjson = None
+
 from trading_cotrader.core.database.session import session_scope
+from trading_cotrader.core.models.option_key import OptionKey
 from trading_cotrader.core.database.schema import (
     LegORM,
     PortfolioORM,
@@ -133,15 +142,7 @@ def _leg_streamer_symbol(underlying: str, leg: LegORM) -> Optional[str]:
     if not sym or not sym.expiration or not sym.strike or not sym.option_type:
         return None
     try:
-        exp = sym.expiration
-        if isinstance(exp, datetime):
-            exp = exp.date()
-        elif isinstance(exp, str):
-            exp = datetime.fromisoformat(exp).date()
-        yymmdd = exp.strftime('%y%m%d')
-        cp = 'C' if sym.option_type.lower() == 'call' else 'P'
-        strike_int = int(float(sym.strike))
-        return f".{underlying}{yymmdd}{cp}{strike_int}"
+        return OptionKey.of(underlying, sym.expiration, sym.option_type, sym.strike).streamer_symbol
     except (ValueError, TypeError, AttributeError) as e:
         logger.warning(f"Could not build streamer symbol for leg {leg.id}: {e}")
         return None
@@ -712,6 +713,185 @@ class BookTradeRequest(BaseModel):
     whatif_trade_id: str
 
 
+# ---------------------------------------------------------------------------
+# Dashboard view (memoized per bundle version)
+# ---------------------------------------------------------------------------
+
+_BOOT_ID = uuid.uuid4().hex[:8]  # keeps ETags from colliding across restarts
+_view_seq = itertools.count(1)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date_cls)):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def _dump_bytes(payload: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=_json_default).encode()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 7232 weak comparison against an If-None-Match header."""
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(',')]
+    return '*' in tags or any(t.removeprefix('W/') == etag for t in tags)
+
+
+@dataclass
+class _DashboardView:
+    """One built dashboard payload, serialized once."""
+    key: Tuple[int, int, int, date_cls]   # (bundle identity, bundle.version, research.version, day)
+    etag: str
+    body: bytes
+
+    @classmethod
+    def build(cls, key: Tuple[int, int, int, date_cls], payload: Dict[str, Any]) -> '_DashboardView':
+        return cls(key=key, etag=f'"{_BOOT_ID}-{next(_view_seq)}"', body=_dump_bytes(payload))
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {'ETag': self.etag, 'Cache-Control': 'no-cache'}
+
+
+def _build_trading_dashboard(cm, bundle, portfolio_name: str) -> Dict[str, Any]:
+    """Build the full trading view payload from containers (no DB, no broker)."""
+    pstate = bundle.portfolio.state
+
+    if not pstate:
+        return {
+            'portfolio': {
+                'name': portfolio_name, 'portfolio_type': 'real',
+                'broker': bundle.broker_firm or '', 'total_equity': 0,
+                'cash_balance': 0, 'buying_power': 0, 'margin_used': 0,
+                'margin_used_pct': 0, 'net_delta': 0, 'net_gamma': 0,
+                'net_theta': 0, 'net_vega': 0, 'net_delta_with_whatif': 0,
+                'net_theta_with_whatif': 0, 'var_1d_95': 0, 'theta_var_ratio': 0,
+                'capital_deployed_pct': 0, 'max_delta': 0,
+                'delta_utilization_pct': 0, 'open_positions': 0,
+                'open_strategies': 0, 'whatif_count': 0,
+            },
+            'strategies': [], 'positions': [], 'whatif_trades': [],
+            'whatif_positions': [], 'whatif_risk_factors': [],
+            'risk_factors': [], 'market_context': {},
+            'status': 'waiting',  # signals frontend: engine still booting
+        }
+
+    positions = bundle.positions.get_all()
+    risk_factors = bundle.risk_factors
+    whatif_trades_container = bundle.trades.get_what_if_trades()
+
+    # Portfolio summary from container
+    equity = float(pstate.total_equity)
+    cash = float(pstate.cash_balance)
+    buying_power = float(pstate.buying_power)
+    margin_used = equity - cash if equity else 0
+    margin_pct = (margin_used / equity * 100) if equity else 0
+
+    # Position rows from container
+    position_rows = [_build_position_row(p) for p in positions]
+
+    # Aggregate portfolio Greeks from container positions
+    net_delta = sum(_dec(p.delta) for p in positions)
+    net_gamma = sum(_dec(p.gamma) for p in positions)
+    net_theta = sum(_dec(p.theta) for p in positions)
+    net_vega = sum(_dec(p.vega) for p in positions)
+
+    # Strategy-level grouping from container positions
+    real_strategies = _group_positions_into_strategies(
+        positions, equity, buying_power,
+    )
+
+    # WhatIf trades from trade container
+    whatif_trades = [
+        _build_whatif_strategy_row(t, equity, buying_power)
+        for t in whatif_trades_container
+    ]
+
+    # WhatIf position rows (leg-level)
+    whatif_position_rows: List[Dict] = []
+    for t in whatif_trades_container:
+        whatif_position_rows.extend(_build_whatif_position_rows_from_container(t))
+
+    # Risk factors from RiskFactorContainer (already aggregated by Steward)
+    risk_factor_rows = _build_risk_factors_from_container(risk_factors)
+
+    # Build spot lookup from real risk factors for WhatIf
+    spot_by_udl = {r['underlying']: r['spot'] for r in risk_factor_rows if r.get('spot')}
+
+    # WhatIf risk factors (aggregated from strategy-level data, with spots)
+    whatif_risk_factor_rows = _build_whatif_risk_factors(whatif_trades, spot_by_udl)
+
+    # WhatIf Greeks impact
+    whatif_delta = sum(w['net_delta'] for w in whatif_trades)
+    whatif_theta = sum(w['net_theta'] for w in whatif_trades)
+
+    # VaR from portfolio container
+    var_95 = float(pstate.var_1d_95)
+    theta_var = abs(net_theta / var_95) if var_95 else 0
+
+    # Market context from Scout's ResearchContainer
+    market_context = {}
+    research = cm.research
+    for underlying in bundle.positions.underlyings:
+        entry = research.get(underlying)
+        if entry:
+            market_context[underlying] = {
+                'regime': entry.hmm_regime_label,
+                'regime_id': entry.hmm_regime_id,
+                'phase': entry.phase_name,
+                'rsi': entry.rsi_14,
+                'price': entry.current_price,
+                'atr': entry.atr,
+                'opp_zero_dte_verdict': entry.opp_zero_dte_verdict,
+                'opp_leap_verdict': entry.opp_leap_verdict,
+                'levels_direction': entry.levels_direction,
+                'levels_stop_price': entry.levels_stop_price,
+                'levels_best_target_price': entry.levels_best_target_price,
+            }
+
+    return {
+        'portfolio': {
+            'name': pstate.name,
+            'portfolio_type': pstate.portfolio_type,
+            'broker': bundle.broker_firm,
+            'total_equity': equity,
+            'cash_balance': cash,
+            'buying_power': buying_power,
+            'margin_used': round(margin_used, 2),
+            'margin_used_pct': round(margin_pct, 1),
+            'net_delta': round(net_delta, 4),
+            'net_gamma': round(net_gamma, 6),
+            'net_theta': round(net_theta, 4),
+            'net_vega': round(net_vega, 4),
+            'net_delta_with_whatif': round(net_delta + whatif_delta, 4),
+            'net_theta_with_whatif': round(net_theta + whatif_theta, 4),
+            'var_1d_95': round(var_95, 2),
+            'theta_var_ratio': round(theta_var, 4),
+            'capital_deployed_pct': round(margin_pct, 1),
+            'max_delta': float(pstate.max_delta),
+            'delta_utilization_pct': round(
+                abs(net_delta) / float(pstate.max_delta) * 100, 1
+            ) if float(pstate.max_delta) else 0,
+            'open_positions': len(positions),
+            'open_strategies': len(real_strategies),
+            'whatif_count': len(whatif_trades),
+        },
+        'strategies': real_strategies,
+        'positions': position_rows,
+        'whatif_trades': whatif_trades,
+        'whatif_positions': whatif_position_rows,
+        'whatif_risk_factors': whatif_risk_factor_rows,
+        'risk_factors': risk_factor_rows,
+        'market_context': market_context,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Router factory
 # ---------------------------------------------------------------------------
@@ -722,14 +902,19 @@ def create_trading_sheet_router(engine: 'WorkflowEngine') -> APIRouter:
     # -----------------------------------------------------------------------
     # GET /trading-dashboard/{portfolio_name}
     # -----------------------------------------------------------------------
+    views: Dict[str, _DashboardView] = {}
+
     @router.get("/trading-dashboard/{portfolio_name}")
-    async def get_trading_dashboard(portfolio_name: str):
+    async def get_trading_dashboard(portfolio_name: str, request: Request):
         """Full trading view: strategies, positions, risk factors.
 
         ALL data comes from containers (Steward's PortfolioBundle + Scout's ResearchContainer).
         No DB queries, no broker calls — pure in-memory reads for instant response.
         Containers are populated by Steward.populate() on boot/monitoring.
         Use POST /refresh to trigger a broker sync + container refresh.
+
+        The payload is built once per bundle/research version and served as
+        pre-serialized bytes with an ETag; unchanged polls get 304.
         """
         cm = engine.container_manager
         if not cm:
@@ -750,135 +935,16 @@ def create_trading_sheet_router(engine: 'WorkflowEngine') -> APIRouter:
         if not bundle:
             raise HTTPException(404, f"Portfolio bundle '{portfolio_name}' not found")
 
-        pstate = bundle.portfolio.state
-
-        if not pstate:
-            return {
-                'portfolio': {
-                    'name': portfolio_name, 'portfolio_type': 'real',
-                    'broker': bundle.broker_firm or '', 'total_equity': 0,
-                    'cash_balance': 0, 'buying_power': 0, 'margin_used': 0,
-                    'margin_used_pct': 0, 'net_delta': 0, 'net_gamma': 0,
-                    'net_theta': 0, 'net_vega': 0, 'net_delta_with_whatif': 0,
-                    'net_theta_with_whatif': 0, 'var_1d_95': 0, 'theta_var_ratio': 0,
-                    'capital_deployed_pct': 0, 'max_delta': 0,
-                    'delta_utilization_pct': 0, 'open_positions': 0,
-                    'open_strategies': 0, 'whatif_count': 0,
-                },
-                'strategies': [], 'positions': [], 'whatif_trades': [],
-                'whatif_positions': [], 'whatif_risk_factors': [],
-                'risk_factors': [], 'market_context': {},
-                'status': 'waiting',  # signals frontend: engine still booting
-            }
-
-        positions = bundle.positions.get_all()
-        risk_factors = bundle.risk_factors
-        whatif_trades_container = bundle.trades.get_what_if_trades()
-
-        # Portfolio summary from container
-        equity = float(pstate.total_equity)
-        cash = float(pstate.cash_balance)
-        buying_power = float(pstate.buying_power)
-        margin_used = equity - cash if equity else 0
-        margin_pct = (margin_used / equity * 100) if equity else 0
-
-        # Position rows from container
-        position_rows = [_build_position_row(p) for p in positions]
-
-        # Aggregate portfolio Greeks from container positions
-        net_delta = sum(_dec(p.delta) for p in positions)
-        net_gamma = sum(_dec(p.gamma) for p in positions)
-        net_theta = sum(_dec(p.theta) for p in positions)
-        net_vega = sum(_dec(p.vega) for p in positions)
-
-        # Strategy-level grouping from container positions
-        real_strategies = _group_positions_into_strategies(
-            positions, equity, buying_power,
-        )
-
-        # WhatIf trades from trade container
-        whatif_trades = [
-            _build_whatif_strategy_row(t, equity, buying_power)
-            for t in whatif_trades_container
-        ]
-
-        # WhatIf position rows (leg-level)
-        whatif_position_rows: List[Dict] = []
-        for t in whatif_trades_container:
-            whatif_position_rows.extend(_build_whatif_position_rows_from_container(t))
-
-        # Risk factors from RiskFactorContainer (already aggregated by Steward)
-        risk_factor_rows = _build_risk_factors_from_container(risk_factors)
-
-        # Build spot lookup from real risk factors for WhatIf
-        spot_by_udl = {r['underlying']: r['spot'] for r in risk_factor_rows if r.get('spot')}
-
-        # WhatIf risk factors (aggregated from strategy-level data, with spots)
-        whatif_risk_factor_rows = _build_whatif_risk_factors(whatif_trades, spot_by_udl)
-
-        # WhatIf Greeks impact
-        whatif_delta = sum(w['net_delta'] for w in whatif_trades)
-        whatif_theta = sum(w['net_theta'] for w in whatif_trades)
-
-        # VaR from portfolio container
-        var_95 = float(pstate.var_1d_95)
-        theta_var = abs(net_theta / var_95) if var_95 else 0
-
-        # Market context from Scout's ResearchContainer
-        market_context = {}
-        research = cm.research
-        for underlying in bundle.positions.underlyings:
-            entry = research.get(underlying)
-            if entry:
-                market_context[underlying] = {
-                    'regime': entry.hmm_regime_label,
-                    'regime_id': entry.hmm_regime_id,
-                    'phase': entry.phase_name,
-                    'rsi': entry.rsi_14,
-                    'price': entry.current_price,
-                    'atr': entry.atr,
-                    'opp_zero_dte_verdict': entry.opp_zero_dte_verdict,
-                    'opp_leap_verdict': entry.opp_leap_verdict,
-                    'levels_direction': entry.levels_direction,
-                    'levels_stop_price': entry.levels_stop_price,
-                    'levels_best_target_price': entry.levels_best_target_price,
-                }
+        # DTEs in the payload roll over at midnight, so the date is part of the key
+        key = (id(bundle), bundle.version, cm.research.version, date_cls.today())
+        view = views.get(portfolio_name)
+        if view is None or view.key != key:
+            view = _DashboardView.build(key, _build_trading_dashboard(cm, bundle, portfolio_name))
+            views[portfolio_name] = view
 
-        return {
-            'portfolio': {
-                'name': pstate.name,
-                'portfolio_type': pstate.portfolio_type,
-                'broker': bundle.broker_firm,
-                'total_equity': equity,
-                'cash_balance': cash,
-                'buying_power': buying_power,
-                'margin_used': round(margin_used, 2),
-                'margin_used_pct': round(margin_pct, 1),
-                'net_delta': round(net_delta, 4),
-                'net_gamma': round(net_gamma, 6),
-                'net_theta': round(net_theta, 4),
-                'net_vega': round(net_vega, 4),
-                'net_delta_with_whatif': round(net_delta + whatif_delta, 4),
-                'net_theta_with_whatif': round(net_theta + whatif_theta, 4),
-                'var_1d_95': round(var_95, 2),
-                'theta_var_ratio': round(theta_var, 4),
-                'capital_deployed_pct': round(margin_pct, 1),
-                'max_delta': float(pstate.max_delta),
-                'delta_utilization_pct': round(
-                    abs(net_delta) / float(pstate.max_delta) * 100, 1
-                ) if float(pstate.max_delta) else 0,
-                'open_positions': len(positions),
-                'open_strategies': len(real_strategies),
-                'whatif_count': len(whatif_trades),
-            },
-            'strategies': real_strategies,
-            'positions': position_rows,
-            'whatif_trades': whatif_trades,
-            'whatif_positions': whatif_position_rows,
-            'whatif_risk_factors': whatif_risk_factor_rows,
-            'risk_factors': risk_factor_rows,
-            'market_context': market_context,
-        }
+        if _etag_matches(request.headers.get('if-none-match'), view.etag):
+            return Response(status_code=304, headers=view.headers)
+        return Response(content=view.body, media_type='application/json', headers=view.headers)
 
     # -----------------------------------------------------------------------
     # POST /trading-dashboard/{portfolio_name}/refresh
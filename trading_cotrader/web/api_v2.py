@@ -3,11 +3,13 @@ v2 API Router — Comprehensive endpoints for the React frontend.
 
 Mounted in approval_api.py at /api/v2 prefix.
 Existing /api/* endpoints remain unchanged.
+
+DB-backed handlers are plain functions wrapped with @db_offload: they run on
+the bounded DB executor, so a slow query never blocks the event loop.
 """
 
 from datetime import date as date_cls, datetime
 from decimal import Decimal
-from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional
 import asyncio
 import logging
@@ -16,7 +18,7 @@ from fastapi import APIRouter, Query, HTTPException
 from pydantic import BaseModel
 from sqlalchemy import func
 
-from trading_cotrader.core.database.session import session_scope
+from trading_cotrader.core.database.session import db_offload, run_db, session_scope
 from trading_cotrader.core.database.schema import (
     PortfolioORM,
     PositionORM,
@@ -28,6 +30,7 @@ from trading_cotrader.core.database.schema import (
     WorkflowStateORM,
     DailyPerformanceORM,
 )
+from trading_cotrader.repositories.trade import TradeQuery
 
 if TYPE_CHECKING:
     from trading_cotrader.agents.workflow.engine import WorkflowEngine
@@ -67,7 +70,7 @@ def _compute_dte(trade: TradeORM) -> Optional[int]:
 
 
 def _serialize_leg(leg: LegORM) -> dict:
-    """Serialize a single leg ORM to dict."""
+    """Serialize a single leg ORM (or TradeQuery projected row) to dict."""
     sym = leg.symbol
     return {
         'id': leg.id,
@@ -95,7 +98,7 @@ def _serialize_leg(leg: LegORM) -> dict:
 
 
 def _serialize_trade(trade: TradeORM) -> dict:
-    """Serialize a trade ORM with legs."""
+    """Serialize a trade ORM with legs. Accepts TradeQuery.rows() output too."""
     portfolio = trade.portfolio
     strategy = trade.strategy
     return {
@@ -159,10 +162,8 @@ def _serialize_trade(trade: TradeORM) -> dict:
 def _get_margin_buffer_multiplier() -> float:
     """Load margin_buffer_multiplier from risk_config.yaml."""
     try:
-        import yaml
-        config_path = Path(__file__).parent.parent / "config" / "risk_config.yaml"
-        with open(config_path, 'r') as f:
-            cfg = yaml.safe_load(f)
+        from trading_cotrader.config.config_registry import CONFIG_DIR, get_config_registry
+        cfg = get_config_registry().get_raw(CONFIG_DIR / "risk_config.yaml")
         return float(cfg.get('margin', {}).get('margin_buffer_multiplier', 2.0))
     except Exception:
         return 2.0
@@ -262,7 +263,8 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
     # ------------------------------------------------------------------
 
     @router.get("/portfolios")
-    async def get_portfolios():
+    @db_offload
+    def get_portfolios():
         """All non-deprecated portfolios with full detail."""
         with session_scope() as session:
             portfolios = (
@@ -287,7 +289,8 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
             ]
 
     @router.get("/portfolios/{name}")
-    async def get_portfolio(name: str):
+    @db_offload
+    def get_portfolio(name: str):
         """Single portfolio by name."""
         with session_scope() as session:
             p = (
@@ -305,7 +308,8 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
             return _serialize_portfolio(p, open_count or 0)
 
     @router.get("/portfolios/{name}/trades")
-    async def get_portfolio_trades(
+    @db_offload
+    def get_portfolio_trades(
         name: str,
         status: Optional[str] = Query(None, description="Filter: open, closed, all"),
     ):
@@ -315,22 +319,18 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
             if not p:
                 raise HTTPException(404, f"Portfolio '{name}' not found")
 
-            q = (
-                session.query(TradeORM)
-                .filter(TradeORM.portfolio_id == p.id)
+            trades = (
+                TradeQuery(session)
+                .portfolio(p.id)
+                .status(status)  # else: all
                 .order_by(TradeORM.created_at.desc())
+                .rows()
             )
-            if status == 'open':
-                q = q.filter(TradeORM.is_open == True)
-            elif status == 'closed':
-                q = q.filter(TradeORM.is_open == False)
-            # else: all
-
-            trades = q.all()
             return [_serialize_trade(t) for t in trades]
 
     @router.get("/portfolios/{name}/history")
-    async def get_portfolio_history(
+    @db_offload
+    def get_portfolio_history(
         name: str,
         days: int = Query(30, description="Number of days of history"),
     ):
@@ -378,28 +378,25 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
     # ------------------------------------------------------------------
 
     @router.get("/positions")
-    async def get_positions(
+    @db_offload
+    def get_positions(
         portfolio: Optional[str] = Query(None, description="Filter by portfolio name"),
     ):
         """All open positions (trades) with legs and P&L attribution."""
         with session_scope() as session:
-            q = (
-                session.query(TradeORM)
-                .filter(TradeORM.is_open == True)
-                .order_by(TradeORM.underlying_symbol)
-            )
+            q = TradeQuery(session).status('open').order_by(TradeORM.underlying_symbol)
             if portfolio:
                 p = session.query(PortfolioORM).filter(PortfolioORM.name == portfolio).first()
                 if p:
-                    q = q.filter(TradeORM.portfolio_id == p.id)
-            trades = q.all()
-            return [_serialize_trade(t) for t in trades]
+                    q = q.portfolio(p.id)
+            return [_serialize_trade(t) for t in q.rows()]
 
     @router.get("/positions/{trade_id}")
-    async def get_position(trade_id: str):
+    @db_offload
+    def get_position(trade_id: str):
         """Single trade with full detail including legs."""
         with session_scope() as session:
-            trade = session.query(TradeORM).filter(TradeORM.id == trade_id).first()
+            trade = TradeQuery(session).filter(TradeORM.id == trade_id).first()
             if not trade:
                 raise HTTPException(404, f"Trade '{trade_id}' not found")
             return _serialize_trade(trade)
@@ -409,13 +406,12 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
     # ------------------------------------------------------------------
 
     @router.get("/desks")
-    async def get_desks():
+    @db_offload
+    def get_desks():
         """Return desk configs from risk_config.yaml + live metrics from DB."""
-        import yaml
-        config_path = Path(__file__).parent.parent / "config" / "risk_config.yaml"
+        from trading_cotrader.config.config_registry import CONFIG_DIR, get_config_registry
         try:
-            with open(config_path, 'r') as f:
-                cfg = yaml.safe_load(f)
+            cfg = get_config_registry().get_raw(CONFIG_DIR / "risk_config.yaml")
         except Exception:
             return []
 
@@ -511,7 +507,8 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
         return desks
 
     @router.get("/desks/{desk_name}/trades")
-    async def get_desk_trades(
+    @db_offload
+    def get_desk_trades(
         desk_name: str,
         status: Optional[str] = Query(None, description="open, closed, all"),
     ):
@@ -523,16 +520,13 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
             if not portfolio:
                 raise HTTPException(404, f"Desk '{desk_name}' not found")
 
-            q = session.query(TradeORM).filter(
-                TradeORM.portfolio_id == portfolio.id
-            ).order_by(TradeORM.created_at.desc())
-
-            if status == 'open':
-                q = q.filter(TradeORM.is_open == True)
-            elif status == 'closed':
-                q = q.filter(TradeORM.is_open == False)
-
-            return [_serialize_trade(t) for t in q.all()]
+            q = (
+                TradeQuery(session)
+                .portfolio(portfolio.id)
+                .status(status)
+                .order_by(TradeORM.created_at.desc())
+            )
+            return [_serialize_trade(t) for t in q.rows()]
 
     @router.get("/report/daily")
     async def get_daily_report():
@@ -547,7 +541,8 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
             raise HTTPException(500, f"Report generation failed: {e}")
 
     @router.get("/system/events")
-    async def get_system_events(
+    @db_offload
+    def get_system_events(
         limit: int = Query(50, ge=1, le=200),
         severity: Optional[str] = Query(None),
     ):
@@ -677,9 +672,9 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
     # ------------------------------------------------------------------
 
     @router.get("/trades/{trade_id}/health")
-    async def get_trade_health(trade_id: str):
+    @db_offload
+    def get_trade_health(trade_id: str):
         """Health status + adjustment recommendation for a trade (C, D)."""
-        import asyncio
         with session_scope() as session:
             trade = session.query(TradeORM).filter(TradeORM.id == trade_id).first()
             if not trade:
@@ -738,7 +733,8 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
     # ------------------------------------------------------------------
 
     @router.get("/trades")
-    async def get_trades(
+    @db_offload
+    def get_trades(
         portfolio: Optional[str] = Query(None),
         status: Optional[str] = Query(None, description="open, closed, all"),
         limit: int = Query(100, ge=1, le=500),
@@ -747,20 +743,16 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
         """All trades, paginated and filterable."""
         with session_scope() as session:
             from trading_cotrader.core.database.tenant import tenant_query
-            q = tenant_query(session, TradeORM).order_by(TradeORM.created_at.desc())
+            q = TradeQuery(session, tenant_query(session, TradeORM)).order_by(TradeORM.created_at.desc())
 
             if portfolio:
                 p = session.query(PortfolioORM).filter(PortfolioORM.name == portfolio).first()
                 if p:
-                    q = q.filter(TradeORM.portfolio_id == p.id)
-
-            if status == 'open':
-                q = q.filter(TradeORM.is_open == True)
-            elif status == 'closed':
-                q = q.filter(TradeORM.is_open == False)
+                    q = q.portfolio(p.id)
 
+            q = q.status(status)
             total = q.count()
-            trades = q.offset(offset).limit(limit).all()
+            trades = q.page(limit, offset).rows()
             return {
                 'total': total,
                 'trades': [_serialize_trade(t) for t in trades],
@@ -848,7 +840,8 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
     # ------------------------------------------------------------------
 
     @router.get("/capital")
-    async def get_capital():
+    @db_offload
+    def get_capital():
         """Capital utilization with severity alerts."""
         ctx_capital = engine.context.get('capital_utilization', {})
         ctx_portfolios = ctx_capital.get('portfolios', {})
@@ -883,7 +876,8 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
     # ------------------------------------------------------------------
 
     @router.get("/decisions")
-    async def get_decisions(
+    @db_offload
+    def get_decisions(
         limit: int = Query(50, ge=1, le=200),
         offset: int = Query(0, ge=0),
     ):
@@ -917,7 +911,8 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
     # ------------------------------------------------------------------
 
     @router.get("/performance")
-    async def get_performance():
+    @db_offload
+    def get_performance():
         """Portfolio performance metrics."""
         with session_scope() as session:
             portfolios = (
@@ -1056,7 +1051,7 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
                         'count': cm.positions.count,
                     }
         # Fallback: load from DB directly when containers aren't initialized
-        return _load_positions_from_db(portfolio)
+        return await run_db(_load_positions_from_db, portfolio)
 
     # ------------------------------------------------------------------
     # Market Data (technical indicators from MarketDataContainer)
@@ -1462,16 +1457,13 @@ def create_v2_router(engine: 'WorkflowEngine') -> APIRouter:
         First checks ResearchContainer for cached regime data.
         Falls back to library calls only for tickers missing from container.
         """
-        import yaml
-        from pathlib import Path
+        from trading_cotrader.config.config_registry import CONFIG_DIR, get_config_registry
 
-        config_path = Path(__file__).parent.parent / 'config' / 'market_watchlist.yaml'
-        if not config_path.exists():
+        try:
+            cfg = get_config_registry().get_raw(CONFIG_DIR / 'market_watchlist.yaml')
+        except FileNotFoundError:
             raise HTTPException(404, "market_watchlist.yaml not found")
 
-        with open(config_path, 'r') as f:
-            cfg = yaml.safe_load(f)
-
         items = cfg.get('watchlist', [])
         if not items:
             return []
@@ -87,7 +87,7 @@ def create_approval_app(engine: 'WorkflowEngine') -> FastAPI:
         from trading_cotrader.core.database.session import get_db_manager
         try:
             db = get_db_manager()
-            healthy = db.health_check()
+            healthy = await db.run(db.health_check)
             return {
                 "status": "ok" if healthy else "degraded",
                 "database": "connected" if healthy else "error",
@@ -152,6 +152,13 @@ def create_approval_app(engine: 'WorkflowEngine') -> FastAPI:
     terminal_router = create_terminal_router(engine)
     app.include_router(terminal_router, prefix="/api/v2")
 
+    # ------------------------------------------------------------------
+    # Container stream (WebSocket push of cell-level diffs per bundle)
+    # ------------------------------------------------------------------
+    from trading_cotrader.web.api_stream import create_stream_router
+    stream_router = create_stream_router(engine)
+    app.include_router(stream_router, prefix="/api/v2")
+
     # Auth API
     try:
         from trading_cotrader.web.api_auth import create_auth_router